@@ -91,7 +91,10 @@ class ActivityHandlerForResultFiles:
     def _handle_image_content(self, content: ImageContent, stuff_id: str) -> None:
         # Save the image
         image_path = os.path.join(self.images_dir_path, f"{stuff_id}.{self.image_output_format}")
-        if content.url.startswith("http"):
+        if content.blob_digest and (blob_image_bytes := content.get_image_bytes()):
+            with open(image_path, "wb") as image_file:
+                image_file.write(blob_image_bytes)
+        elif content.url.startswith("http"):
             image_bytes: bytes = fetch_file_from_url_httpx(url=content.url, timeout=10)
             with open(image_path, "wb") as image_file:
                 image_file.write(image_bytes)
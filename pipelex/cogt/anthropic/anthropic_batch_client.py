@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from typing import Any, Dict, List, cast
+
+from anthropic import AsyncAnthropic
+from typing_extensions import override
+
+from pipelex.cogt.anthropic.anthropic_factory import AnthropicFactory
+from pipelex.cogt.llm.llm_batch_client_abstract import LLMBatchClientAbstract, LLMBatchRequest, LLMBatchResult, LLMBatchStatus
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
+
+
+class AnthropicBatchClient(LLMBatchClientAbstract):
+    """Runs messages through the Anthropic Message Batches API."""
+
+    def __init__(self, anthropic_client: AsyncAnthropic, default_max_tokens: int):
+        self.anthropic_client = anthropic_client
+        self.default_max_tokens = default_max_tokens
+
+    @override
+    async def make_request(self, custom_id: str, llm_job: LLMJob, llm_engine: LLMEngine) -> LLMBatchRequest:
+        params: Dict[str, Any] = {
+            "model": llm_engine.llm_id,
+            "messages": [await AnthropicFactory.make_user_message(llm_job=llm_job)],
+            "temperature": llm_job.job_params.temperature,
+            "max_tokens": llm_job.job_params.max_tokens or self.default_max_tokens,
+        }
+        if system_blocks := AnthropicFactory.make_system_blocks(llm_prompt=llm_job.llm_prompt):
+            params["system"] = system_blocks
+        return {
+            "custom_id": custom_id,
+            "params": params,
+        }
+
+    @override
+    async def submit_batch(self, requests: List[LLMBatchRequest]) -> str:
+        message_batch = await self.anthropic_client.messages.batches.create(requests=cast(Any, requests))
+        return message_batch.id
+
+    @override
+    async def get_batch_status(self, batch_id: str) -> LLMBatchStatus:
+        message_batch = await self.anthropic_client.messages.batches.retrieve(batch_id)
+        match message_batch.processing_status:
+            case "in_progress" | "canceling":
+                return LLMBatchStatus.IN_PROGRESS
+            case "ended":
+                # the requests which errored, were canceled or expired have an individual error result
+                return LLMBatchStatus.COMPLETED
+
+    @override
+    async def download_batch_results(self, batch_id: str) -> Dict[str, LLMBatchResult]:
+        results: Dict[str, LLMBatchResult] = {}
+        async for individual_response in await self.anthropic_client.messages.batches.results(batch_id):
+            custom_id = individual_response.custom_id
+            result = individual_response.result
+            if result.type != "succeeded":
+                results[custom_id] = LLMBatchResult(custom_id=custom_id, error=f"request {result.type}")
+                continue
+            message = result.message
+            content_block = message.content[0]
+            if content_block.type != "text":
+                results[custom_id] = LLMBatchResult(custom_id=custom_id, error=f"unexpected content block type: {content_block.type}")
+                continue
+            results[custom_id] = LLMBatchResult(
+                custom_id=custom_id,
+                text=content_block.text,
+                nb_tokens_by_category=AnthropicFactory.make_nb_tokens_by_category(usage=message.usage),
+            )
+        return results
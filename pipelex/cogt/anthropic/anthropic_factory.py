@@ -7,6 +7,7 @@ from typing import List, Optional, Union
 
 from anthropic import AsyncAnthropic, AsyncAnthropicBedrock
 from anthropic.types import Usage
+from anthropic.types.cache_control_ephemeral_param import CacheControlEphemeralParam
 from anthropic.types.image_block_param import ImageBlockParam
 from anthropic.types.message_param import MessageParam
 from anthropic.types.text_block_param import TextBlockParam
@@ -19,38 +20,44 @@ from pipelex import log
 from pipelex.cogt.exceptions import CogtError
 from pipelex.cogt.image.prompt_image import (
     PromptImage,
+    PromptImageBlob,
     PromptImageBytes,
     PromptImagePath,
     PromptImageTypedBytes,
     PromptImageTypedBytesOrUrl,
     PromptImageUrl,
 )
+from pipelex.cogt.image.prompt_image_factory import PromptImageFactory
 from pipelex.cogt.llm.llm_job import LLMJob
 from pipelex.cogt.llm.llm_models.llm_platform import LLMPlatform
+from pipelex.cogt.llm.llm_prompt import LLMPrompt
 from pipelex.cogt.llm.llm_report import NbTokensByCategoryDict
 from pipelex.cogt.llm.token_category import TokenCategory
 from pipelex.config import get_config
 from pipelex.hub import get_secrets_provider
-from pipelex.tools.misc.base_64 import (
-    load_binary_as_base64_async,
-)
+from pipelex.tools.utils.filetype_utils import detect_file_type_from_base64
 
 
 class AnthropicFactoryError(CogtError):
     pass
 
 
+# marks the end of a cacheable prompt prefix: the prompt up to and including this block is cached for 5 minutes
+CACHE_CONTROL_EPHEMERAL: CacheControlEphemeralParam = {"type": "ephemeral"}
+
+
 class AnthropicFactory:
     @staticmethod
     def make_anthropic_client(
         llm_platform: LLMPlatform,
     ) -> Union[AsyncAnthropic, AsyncAnthropicBedrock]:
         # TODO: also support Anthropic with VertexAI
+        # the clients don't retry on their own: retries are made by dispatch_llm_job, which would otherwise multiply them
         match llm_platform:
             case LLMPlatform.ANTHROPIC:
                 anthropic_config = get_config().cogt.llm_config.anthropic_config
                 api_key = anthropic_config.get_api_key(secrets_provider=get_secrets_provider())
-                return AsyncAnthropic(api_key=api_key)
+                return AsyncAnthropic(api_key=api_key, max_retries=0)
             case LLMPlatform.BEDROCK_ANTHROPIC:
                 aws_config = get_config().pipelex.aws_config
                 aws_access_key_id, aws_secret_access_key, aws_region = aws_config.get_aws_access_keys()
@@ -58,10 +65,31 @@ class AnthropicFactory:
                     aws_secret_key=aws_secret_access_key,
                     aws_access_key=aws_access_key_id,
                     aws_region=aws_region,
+                    max_retries=0,
                 )
             case _:
                 raise AnthropicFactoryError(f"Unsupported LLM platform for Anthropic sdk: '{llm_platform}'")
 
+    @staticmethod
+    def make_system_blocks(llm_prompt: LLMPrompt) -> Optional[List[TextBlockParam]]:
+        if not (system_text := llm_prompt.system_text):
+            return None
+        system_block: TextBlockParam = {"type": "text", "text": system_text}
+        if llm_prompt.is_system_text_cacheable:
+            system_block["cache_control"] = CACHE_CONTROL_EPHEMERAL
+        return [system_block]
+
+    @staticmethod
+    def make_user_text_blocks(llm_prompt: LLMPrompt) -> List[TextBlockParam]:
+        """The user text as text blocks, its cacheable prefix, if any, being a separate block marked as a cache breakpoint."""
+        text_blocks: List[TextBlockParam] = []
+        cacheable_prefix, user_text = llm_prompt.split_user_text()
+        if cacheable_prefix:
+            text_blocks.append({"type": "text", "text": cacheable_prefix, "cache_control": CACHE_CONTROL_EPHEMERAL})
+        if user_text:
+            text_blocks.append({"type": "text", "text": user_text})
+        return text_blocks
+
     @classmethod
     async def make_user_message(
         cls,
@@ -70,12 +98,7 @@ class AnthropicFactory:
         message: MessageParam
         content: List[Union[TextBlockParam, ImageBlockParam]] = []
 
-        if llm_job.llm_prompt.user_text:
-            text_block_param: TextBlockParam = {
-                "type": "text",
-                "text": llm_job.llm_prompt.user_text,
-            }
-            content.append(text_block_param)
+        content.extend(cls.make_user_text_blocks(llm_prompt=llm_job.llm_prompt))
         if llm_job.llm_prompt.user_images:
             tasks_to_prep_images = [cls._prep_image_for_anthropic(prompt_image) for prompt_image in llm_job.llm_prompt.user_images]
             prepped_user_images = await asyncio.gather(*tasks_to_prep_images)
@@ -115,10 +138,9 @@ class AnthropicFactory:
     # This creates a MessageParam disguised as a ChatCompletionMessageParam to please instructor type checking
     @staticmethod
     def openai_typed_user_message(
-        user_content_txt: str,
+        user_text_blocks: List[TextBlockParam],
         prepped_user_images: Optional[List[PromptImageTypedBytesOrUrl]] = None,
     ) -> ChatCompletionMessageParam:
-        text_block_param: TextBlockParam = {"type": "text", "text": user_content_txt}
         message: MessageParam
         if prepped_user_images is not None:
             log.debug(prepped_user_images)
@@ -149,7 +171,13 @@ class AnthropicFactory:
                 log.debug(image_block_param_in_loop)
                 images_block_params.append(image_block_param_in_loop)
 
-            content: List[Union[TextBlockParam, ImageBlockParam]] = images_block_params + [text_block_param]
+            # a cacheable prefix stays ahead of the images, which usually differ from one job to the next
+            content: List[Union[TextBlockParam, ImageBlockParam]] = []
+            if user_text_blocks and user_text_blocks[0].get("cache_control"):
+                content.append(user_text_blocks[0])
+                user_text_blocks = user_text_blocks[1:]
+            content.extend(images_block_params)
+            content.extend(user_text_blocks)
             message = {
                 "role": "user",
                 "content": content,
@@ -158,7 +186,7 @@ class AnthropicFactory:
         else:
             message = {
                 "role": "user",
-                "content": [text_block_param],
+                "content": user_text_blocks,
             }
 
         return message  # type: ignore
@@ -174,8 +202,11 @@ class AnthropicFactory:
         elif isinstance(prompt_image, PromptImageUrl):
             typed_bytes_or_url = prompt_image.url
         elif isinstance(prompt_image, PromptImagePath):
-            b64 = await load_binary_as_base64_async(prompt_image.file_path)
+            b64 = await PromptImageFactory.promptimage_to_b64_async(image_prompt=prompt_image)
             typed_bytes_or_url = PromptImageTypedBytes(image_bytes=b64, file_type=prompt_image.get_file_type())
+        elif isinstance(prompt_image, PromptImageBlob):
+            b64 = await PromptImageFactory.promptimage_to_b64_async(image_prompt=prompt_image)
+            typed_bytes_or_url = PromptImageTypedBytes(image_bytes=b64, file_type=detect_file_type_from_base64(b64=b64))
         else:
             raise AnthropicFactoryError(f"Unsupported PromptImage type: '{type(prompt_image).__name__}'")
         return typed_bytes_or_url
@@ -191,8 +222,9 @@ class AnthropicFactory:
         llm_prompt = llm_job.llm_prompt
         messages: List[ChatCompletionMessageParam] = []
         #### System message ####
-        if system_content := llm_prompt.system_text:
-            messages.append(ChatCompletionSystemMessageParam(role="system", content=system_content))
+        if system_blocks := cls.make_system_blocks(llm_prompt=llm_prompt):
+            # instructor passes the system blocks on to Anthropic, including their cache_control
+            messages.append(ChatCompletionSystemMessageParam(role="system", content=system_blocks))  # type: ignore
 
         prepped_user_images: Optional[List[PromptImageTypedBytesOrUrl]]
         if llm_prompt.user_images:
@@ -204,7 +236,7 @@ class AnthropicFactory:
         #### Concatenation ####
         messages.append(
             AnthropicFactory.openai_typed_user_message(
-                user_content_txt=llm_prompt.user_text if llm_prompt.user_text else "",
+                user_text_blocks=cls.make_user_text_blocks(llm_prompt=llm_prompt) or [{"type": "text", "text": ""}],
                 prepped_user_images=prepped_user_images,
             )
         )
@@ -212,8 +244,16 @@ class AnthropicFactory:
 
     @staticmethod
     def make_nb_tokens_by_category(usage: Usage) -> NbTokensByCategoryDict:
+        """
+        Anthropic's input_tokens only counts the tokens after the last cache breakpoint, so the cache reads and writes are added
+        to get the whole input, as reported by other providers. Cache reads are the discounted input_cached tokens,
+        whereas cache writes are billed above the input price, so they are left in the non-cached input.
+        """
+        nb_tokens_cache_read = usage.cache_read_input_tokens or 0
+        nb_tokens_cache_write = usage.cache_creation_input_tokens or 0
         nb_tokens_by_category: NbTokensByCategoryDict = {
-            TokenCategory.INPUT: usage.input_tokens,
+            TokenCategory.INPUT: usage.input_tokens + nb_tokens_cache_read + nb_tokens_cache_write,
+            TokenCategory.INPUT_CACHED: nb_tokens_cache_read,
             TokenCategory.OUTPUT: usage.output_tokens,
         }
         return nb_tokens_by_category
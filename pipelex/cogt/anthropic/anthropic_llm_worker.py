@@ -2,21 +2,24 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Any, Optional, Type
+from typing import Any, AsyncIterator, Optional, Type
 
 import instructor
-from anthropic import NOT_GIVEN, AsyncAnthropic, AsyncAnthropicBedrock
+from anthropic import NOT_GIVEN, APIConnectionError, APIStatusError, AsyncAnthropic, AsyncAnthropicBedrock, RateLimitError
 from typing_extensions import override
 
 from pipelex import log
+from pipelex.cogt.anthropic.anthropic_batch_client import AnthropicBatchClient
 from pipelex.cogt.anthropic.anthropic_factory import AnthropicFactory
 from pipelex.cogt.inference.inference_report_delegate import InferenceReportDelegate
+from pipelex.cogt.llm.llm_batch_client_abstract import LLMBatchClientAbstract
 from pipelex.cogt.llm.llm_job import LLMJob
-from pipelex.cogt.llm.llm_job_func import llm_job_func
+from pipelex.cogt.llm.llm_job_func import llm_job_func, llm_job_stream_func
 from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
 from pipelex.cogt.llm.llm_models.llm_platform import LLMPlatform
 from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
 from pipelex.cogt.llm.structured_output import StructureMethod
+from pipelex.tools.misc.http_helpers import parse_retry_after_seconds
 from pipelex.tools.misc.model_helpers import BaseModelType
 
 
@@ -60,6 +63,38 @@ class AnthropicLLMWorker(LLMWorkerAbstract):
     # Instance methods
     #########################################################
 
+    @property
+    @override
+    def is_text_streaming_supported(self) -> bool:
+        return True
+
+    @property
+    @override
+    def is_object_list_streaming_supported(self) -> bool:
+        return True
+
+    @override
+    def make_llm_batch_client(self) -> Optional[LLMBatchClientAbstract]:
+        # the Message Batches API is not available through Bedrock
+        if not isinstance(self.anthropic_async_client, AsyncAnthropic):
+            return None
+        return AnthropicBatchClient(anthropic_client=self.anthropic_async_client, default_max_tokens=self.default_max_tokens)
+
+    @override
+    def is_throttling_error(self, exc: BaseException) -> bool:
+        # 529 is Anthropic's "overloaded" status
+        return isinstance(exc, RateLimitError) or (isinstance(exc, APIStatusError) and exc.status_code == 529)
+
+    @override
+    def is_transient_error(self, exc: BaseException) -> bool:
+        return isinstance(exc, (RateLimitError, APIConnectionError)) or (isinstance(exc, APIStatusError) and exc.status_code >= 500)
+
+    @override
+    def get_retry_after_seconds(self, exc: BaseException) -> Optional[float]:
+        if not isinstance(exc, APIStatusError):
+            return None
+        return parse_retry_after_seconds(headers=exc.response.headers)
+
     @override
     @llm_job_func
     async def gen_text(
@@ -69,7 +104,7 @@ class AnthropicLLMWorker(LLMWorkerAbstract):
         message = await AnthropicFactory.make_user_message(llm_job=llm_job)
         response = await self.anthropic_async_client.messages.create(
             messages=[message],
-            system=llm_job.llm_prompt.system_text or NOT_GIVEN,
+            system=AnthropicFactory.make_system_blocks(llm_prompt=llm_job.llm_prompt) or NOT_GIVEN,
             model=self.llm_engine.llm_id,
             temperature=llm_job.job_params.temperature,
             max_tokens=llm_job.job_params.max_tokens or self.default_max_tokens,
@@ -90,6 +125,27 @@ class AnthropicLLMWorker(LLMWorkerAbstract):
 
         return full_reply_content
 
+    @override
+    @llm_job_stream_func
+    async def gen_text_stream(
+        self,
+        llm_job: LLMJob,
+    ) -> AsyncIterator[str]:
+        message = await AnthropicFactory.make_user_message(llm_job=llm_job)
+        async with self.anthropic_async_client.messages.stream(
+            messages=[message],
+            system=AnthropicFactory.make_system_blocks(llm_prompt=llm_job.llm_prompt) or NOT_GIVEN,
+            model=self.llm_engine.llm_id,
+            temperature=llm_job.job_params.temperature,
+            max_tokens=llm_job.job_params.max_tokens or self.default_max_tokens,
+        ) as stream:
+            async for text_chunk in stream.text_stream:
+                yield text_chunk
+            final_message = await stream.get_final_message()
+
+        if llm_tokens_usage := llm_job.job_report.llm_tokens_usage:
+            llm_tokens_usage.nb_tokens_by_category = AnthropicFactory.make_nb_tokens_by_category(usage=final_message.usage)
+
     @override
     @llm_job_func
     async def gen_object(
@@ -110,3 +166,23 @@ class AnthropicLLMWorker(LLMWorkerAbstract):
             llm_tokens_usage.nb_tokens_by_category = AnthropicFactory.make_nb_tokens_by_category(usage=usage)
 
         return result_object
+
+    @override
+    @llm_job_stream_func
+    async def gen_object_list_stream(
+        self,
+        llm_job: LLMJob,
+        schema: Type[BaseModelType],
+    ) -> AsyncIterator[BaseModelType]:
+        messages = await AnthropicFactory.make_simple_messages(llm_job=llm_job)
+        # instructor parses each item of the list as soon as its JSON is complete in the stream
+        # the token usage is not available from the iterable stream
+        async for item in self.instructor_for_objects.chat.completions.create_iterable(
+            messages=messages,
+            response_model=schema,
+            max_retries=llm_job.job_config.max_retries,
+            model=self.llm_engine.llm_id,
+            temperature=llm_job.job_params.temperature,
+            max_tokens=llm_job.job_params.max_tokens or self.default_max_tokens,
+        ):
+            yield item
@@ -2,9 +2,12 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Any, Dict, Optional, Tuple, cast
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, cast
 
 import aioboto3
+from aiobotocore.config import AioConfig
 from types_aiobotocore_bedrock_runtime.type_defs import ConverseResponseTypeDef
 from typing_extensions import override
 
@@ -13,13 +16,60 @@ from pipelex.cogt.bedrock.bedrock_client_protocol import BedrockClientProtocol
 from pipelex.cogt.bedrock.bedrock_message import BedrockMessageDictList
 from pipelex.cogt.llm.llm_report import NbTokensByCategoryDict
 from pipelex.cogt.llm.token_category import TokenCategory
+from pipelex.tools.misc.event_loop_helpers import close_loop_bound_resource
 
 
 class BedrockClientAioboto3(BedrockClientProtocol):
-    def __init__(self, aws_region: str):
+    """
+    Keeps one long-lived bedrock-runtime client for its region, so that credentials resolution and TLS handshakes
+    are not paid on every call. The client is opened on first use and bound to the event loop it was opened in.
+    """
+
+    def __init__(self, aws_region: str, max_pool_connections: int):
         log.verbose(f"Init BedrockClientAioboto3 with region '{aws_region}'")
         self.aws_region = aws_region
         self.session = aioboto3.Session()
+        # a single attempt: retries are made by dispatch_llm_job, which would otherwise multiply them
+        self.aio_config = AioConfig(max_pool_connections=max_pool_connections, retries={"total_max_attempts": 1})
+        self._client: Optional[Any] = None
+        self._client_exit_stack: Optional[AsyncExitStack] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client_lock: Optional[asyncio.Lock] = None
+
+    async def _get_client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        client_lock = self._client_lock
+        if client_lock is None or self._client_loop is not loop:
+            # the pooled connections belong to the event loop the client was opened in, they can't be used from another one
+            self.close()
+            client_lock = asyncio.Lock()
+            self._client_loop = loop
+            self._client_lock = client_lock
+        async with client_lock:
+            if self._client is None:
+                log.verbose(f"Opening pooled bedrock-runtime client for region '{self.aws_region}'")
+                client_exit_stack = AsyncExitStack()
+                self._client = await client_exit_stack.enter_async_context(
+                    self.session.client("bedrock-runtime", region_name=self.aws_region, config=self.aio_config)  # type: ignore
+                )
+                self._client_exit_stack = client_exit_stack
+        return cast(Any, self._client)  # pyright: ignore[reportUnknownMemberType]
+
+    @override
+    def close(self):
+        client_exit_stack = self._client_exit_stack
+        client_loop = self._client_loop
+        self._client = None
+        self._client_exit_stack = None
+        self._client_loop = None
+        self._client_lock = None
+        if client_exit_stack is None or client_loop is None:
+            return
+        close_loop_bound_resource(
+            make_close_coroutine=client_exit_stack.aclose,
+            resource_loop=client_loop,
+            resource_desc=f"bedrock-runtime client for region '{self.aws_region}'",
+        )
 
     @override
     async def chat(
@@ -41,13 +91,44 @@ class BedrockClientAioboto3(BedrockClientProtocol):
         if system_text:
             params["system"] = [{"text": system_text}]
 
-        async with self.session.client("bedrock-runtime", region_name=self.aws_region) as aioboto3_session:  # type: ignore
-            conversation_response: ConverseResponseTypeDef = await aioboto3_session.converse(**params)
-            resp_dict: Dict[str, Any] = cast(Dict[str, Any], conversation_response)
-            usage_dict: Dict[str, Any] = resp_dict["usage"]
-            nb_tokens_by_category: NbTokensByCategoryDict = {
-                TokenCategory.INPUT: usage_dict["inputTokens"],
-                TokenCategory.OUTPUT: usage_dict["outputTokens"],
-            }
-            response_text: str = resp_dict["output"]["message"]["content"][0]["text"]
-            return response_text, nb_tokens_by_category
+        bedrock_runtime_client = await self._get_client()
+        conversation_response: ConverseResponseTypeDef = await bedrock_runtime_client.converse(**params)
+        resp_dict: Dict[str, Any] = cast(Dict[str, Any], conversation_response)
+        usage_dict: Dict[str, Any] = resp_dict["usage"]
+        nb_tokens_by_category: NbTokensByCategoryDict = {
+            TokenCategory.INPUT: usage_dict["inputTokens"],
+            TokenCategory.OUTPUT: usage_dict["outputTokens"],
+        }
+        response_text: str = resp_dict["output"]["message"]["content"][0]["text"]
+        return response_text, nb_tokens_by_category
+
+    @override
+    async def chat_stream(
+        self,
+        messages: BedrockMessageDictList,
+        system_text: Optional[str],
+        model: str,
+        temperature: float,
+        nb_tokens_by_category: NbTokensByCategoryDict,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        params: Dict[str, Any] = {
+            "modelId": model,
+            "messages": messages,
+            "inferenceConfig": {
+                "temperature": temperature,
+                "maxTokens": max_tokens,
+            },
+        }
+        if system_text:
+            params["system"] = [{"text": system_text}]
+
+        bedrock_runtime_client = await self._get_client()
+        stream_response: Dict[str, Any] = cast(Dict[str, Any], await bedrock_runtime_client.converse_stream(**params))
+        async for event in stream_response["stream"]:
+            event_dict: Dict[str, Any] = cast(Dict[str, Any], event)
+            if text_chunk := event_dict.get("contentBlockDelta", {}).get("delta", {}).get("text"):
+                yield text_chunk
+            if usage_dict := event_dict.get("metadata", {}).get("usage"):
+                nb_tokens_by_category[TokenCategory.INPUT] = usage_dict["inputTokens"]
+                nb_tokens_by_category[TokenCategory.OUTPUT] = usage_dict["outputTokens"]
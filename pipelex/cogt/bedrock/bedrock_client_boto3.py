@@ -3,9 +3,10 @@
 # "Pipelex" is a trademark of Evotis S.A.S.
 
 import asyncio
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
 
 import boto3
+from botocore.config import Config
 from typing_extensions import override
 
 from pipelex import log
@@ -16,9 +17,18 @@ from pipelex.cogt.llm.token_category import TokenCategory
 
 
 class BedrockClientBoto3(BedrockClientProtocol):
-    def __init__(self, aws_region: str):
+    def __init__(self, aws_region: str, max_pool_connections: int):
         log.debug(f"Initializing BedrockClientBoto3 with region '{aws_region}'")
-        self.boto3_client = boto3.client(service_name="bedrock-runtime", region_name=aws_region)  # pyright: ignore
+        self.boto3_client = boto3.client(  # pyright: ignore
+            service_name="bedrock-runtime",
+            region_name=aws_region,
+            # a single attempt: retries are made by dispatch_llm_job, which would otherwise multiply them
+            config=Config(max_pool_connections=max_pool_connections, retries={"total_max_attempts": 1}),
+        )
+
+    @override
+    def close(self):
+        self.boto3_client.close()  # pyright: ignore
 
     @override
     async def chat(
@@ -50,3 +60,35 @@ class BedrockClientBoto3(BedrockClientProtocol):
         }
         response_text: str = resp_dict["output"]["message"]["content"][0]["text"]
         return response_text, nb_tokens_by_category
+
+    @override
+    async def chat_stream(
+        self,
+        messages: BedrockMessageDictList,
+        system_text: Optional[str],
+        model: str,
+        temperature: float,
+        nb_tokens_by_category: NbTokensByCategoryDict,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        params: Dict[str, Any] = {
+            "modelId": model,
+            "messages": messages,
+            "inferenceConfig": {
+                "temperature": temperature,
+                "maxTokens": max_tokens,
+            },
+        }
+        if system_text:
+            params["system"] = [{"text": system_text}]
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        resp_dict: Dict[str, Any] = await loop.run_in_executor(None, lambda: self.boto3_client.converse_stream(**params))  # pyright: ignore
+        # the boto3 event stream is blocking, so each event is read in the executor
+        events: Iterator[Dict[str, Any]] = iter(resp_dict["stream"])
+        while (event := await loop.run_in_executor(None, next, events, None)) is not None:
+            if text_chunk := event.get("contentBlockDelta", {}).get("delta", {}).get("text"):
+                yield text_chunk
+            if usage_dict := event.get("metadata", {}).get("usage"):
+                nb_tokens_by_category[TokenCategory.INPUT] = usage_dict["inputTokens"]
+                nb_tokens_by_category[TokenCategory.OUTPUT] = usage_dict["outputTokens"]
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Optional, Protocol, Tuple, runtime_checkable
+from typing import AsyncIterator, Optional, Protocol, Tuple, runtime_checkable
 
 from pipelex.cogt.bedrock.bedrock_message import BedrockMessageDictList
 from pipelex.cogt.llm.llm_report import NbTokensByCategoryDict
@@ -18,3 +18,19 @@ class BedrockClientProtocol(Protocol):
         temperature: float,
         max_tokens: Optional[int] = None,
     ) -> Tuple[str, NbTokensByCategoryDict]: ...
+
+    def chat_stream(
+        self,
+        messages: BedrockMessageDictList,
+        system_text: Optional[str],
+        model: str,
+        temperature: float,
+        nb_tokens_by_category: NbTokensByCategoryDict,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """Yield the text chunks as they arrive, and fill nb_tokens_by_category once the usage is received at the end of the stream."""
+        ...
+
+    def close(self) -> None:
+        """Close the pooled connections of the client, it can still be used afterwards and will reconnect."""
+        ...
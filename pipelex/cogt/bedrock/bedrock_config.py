@@ -17,3 +17,4 @@ class BedrockClientMethod(StrEnum):
 class BedrockConfig(ConfigModel):
     aws_region: str
     client_method: BedrockClientMethod = Field(strict=False)
+    max_pool_connections: int = Field(gt=0)
@@ -28,11 +28,11 @@ class BedrockFactory:
             case BedrockClientMethod.AIBOTO3:
                 from pipelex.cogt.bedrock.bedrock_client_aioboto3 import BedrockClientAioboto3
 
-                bedrock_async_client = BedrockClientAioboto3(aws_region=aws_region)
+                bedrock_async_client = BedrockClientAioboto3(aws_region=aws_region, max_pool_connections=bedrock_config.max_pool_connections)
             case BedrockClientMethod.BOTO3:
                 from pipelex.cogt.bedrock.bedrock_client_boto3 import BedrockClientBoto3
 
-                bedrock_async_client = BedrockClientBoto3(aws_region=aws_region)
+                bedrock_async_client = BedrockClientBoto3(aws_region=aws_region, max_pool_connections=bedrock_config.max_pool_connections)
 
         return bedrock_async_client
 
@@ -2,8 +2,9 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Any, Optional, Type
+from typing import Any, AsyncIterator, Dict, Optional, Type
 
+from botocore.exceptions import ClientError, HTTPClientError
 from typing_extensions import override
 
 from pipelex import log
@@ -12,12 +13,16 @@ from pipelex.cogt.bedrock.bedrock_factory import BedrockFactory
 from pipelex.cogt.exceptions import LLMCapabilityError, LLMEngineParameterError, SdkTypeError
 from pipelex.cogt.inference.inference_report_delegate import InferenceReportDelegate
 from pipelex.cogt.llm.llm_job import LLMJob
-from pipelex.cogt.llm.llm_job_func import llm_job_func
+from pipelex.cogt.llm.llm_job_func import llm_job_func, llm_job_stream_func
 from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
+from pipelex.cogt.llm.llm_report import NbTokensByCategoryDict
 from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
 from pipelex.cogt.llm.structured_output import StructureMethod
 from pipelex.tools.misc.model_helpers import BaseModelType
 
+BEDROCK_THROTTLING_ERROR_CODES = ("ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException")
+BEDROCK_TRANSIENT_ERROR_CODES = BEDROCK_THROTTLING_ERROR_CODES + ("InternalServerException", "ModelTimeoutException", "ModelNotReadyException")
+
 
 class BedrockLLMWorker(LLMWorkerAbstract):
     def __init__(
@@ -47,6 +52,28 @@ class BedrockLLMWorker(LLMWorkerAbstract):
             )
         self.bedrock_client_for_text = sdk_instance
 
+    @property
+    @override
+    def is_text_streaming_supported(self) -> bool:
+        return True
+
+    @override
+    def is_throttling_error(self, exc: BaseException) -> bool:
+        return self._get_client_error_code(exc=exc) in BEDROCK_THROTTLING_ERROR_CODES
+
+    @override
+    def is_transient_error(self, exc: BaseException) -> bool:
+        # HTTPClientError covers connection errors and read timeouts
+        return isinstance(exc, HTTPClientError) or self._get_client_error_code(exc=exc) in BEDROCK_TRANSIENT_ERROR_CODES
+
+    @staticmethod
+    def _get_client_error_code(exc: BaseException) -> Optional[str]:
+        if not isinstance(exc, ClientError):
+            return None
+        error_response: Dict[str, Any] = getattr(exc, "response", {})
+        error_code = error_response.get("Error", {}).get("Code")
+        return error_code if isinstance(error_code, str) else None
+
     @override
     @llm_job_func
     async def gen_text(
@@ -68,6 +95,26 @@ class BedrockLLMWorker(LLMWorkerAbstract):
             llm_tokens_usage.nb_tokens_by_category = nb_tokens_by_category
         return bedrock_response_text
 
+    @override
+    @llm_job_stream_func
+    async def gen_text_stream(
+        self,
+        llm_job: LLMJob,
+    ) -> AsyncIterator[str]:
+        message = BedrockFactory.make_simple_message(llm_job=llm_job)
+        nb_tokens_by_category: NbTokensByCategoryDict = {}
+        async for text_chunk in self.bedrock_client_for_text.chat_stream(
+            messages=message.to_dict_list(),
+            system_text=llm_job.llm_prompt.system_text,
+            model=self.llm_engine.llm_id,
+            temperature=llm_job.job_params.temperature,
+            nb_tokens_by_category=nb_tokens_by_category,
+            max_tokens=llm_job.job_params.max_tokens or self.default_max_tokens,
+        ):
+            yield text_chunk
+        if (llm_tokens_usage := llm_job.job_report.llm_tokens_usage) and nb_tokens_by_category:
+            llm_tokens_usage.nb_tokens_by_category = nb_tokens_by_category
+
     @override
     @llm_job_func
     async def gen_object(
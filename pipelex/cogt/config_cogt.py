@@ -8,10 +8,14 @@ from pydantic import Field, field_validator
 
 from pipelex.cogt.anthropic.anthropic_config import AnthropicConfig
 from pipelex.cogt.bedrock.bedrock_config import BedrockConfig
+from pipelex.cogt.image.prompt_image_cache_config import PromptImageCacheConfig
+from pipelex.cogt.image.prompt_image_prep_config import PromptImagePrepConfig
 from pipelex.cogt.imgg.imgg_handle import ImggHandle
 from pipelex.cogt.imgg.imgg_job_components import ImggJobConfig, ImggJobParams, ImggJobParamsDefaults
 from pipelex.cogt.llm.llm_job_components import LLMJobConfig
 from pipelex.cogt.llm.llm_models.llm_platform import LLMPlatform
+from pipelex.cogt.llm.llm_models.llm_rate_limits import LLMRateLimits
+from pipelex.cogt.llm.llm_response_cache_config import LLMResponseCacheConfig
 from pipelex.cogt.mistral.mistral_config import MistralConfig
 from pipelex.cogt.openai.azure_openai_config import AzureOpenAIConfig
 from pipelex.cogt.openai.openai_config import OpenAIOpenAIConfig
@@ -48,6 +52,55 @@ class InstructorConfig(ConfigModel):
     is_openai_structured_output_enabled: bool
 
 
+class LLMRateLimiterConfig(ConfigModel):
+    is_enabled: bool
+    # applied to the models of a platform which don't set their own rate_limits in the llm integrations
+    platform_rate_limits: Dict[str, LLMRateLimits]
+
+    def get_platform_rate_limits(self, llm_platform: LLMPlatform) -> Optional[LLMRateLimits]:
+        return self.platform_rate_limits.get(llm_platform)
+
+
+class LLMConcurrencyConfig(ConfigModel):
+    is_enabled: bool
+    initial_concurrency: int = Field(ge=1)
+    min_concurrency: int = Field(ge=1)
+    max_concurrency: int = Field(ge=1)
+    additive_increase: float = Field(gt=0)
+    multiplicative_decrease: float = Field(gt=0, lt=1)
+
+
+class LLMDispatchConfig(ConfigModel):
+    max_retries: int = Field(ge=0)
+    retry_base_delay_seconds: float = Field(gt=0)
+    retry_max_delay_seconds: float = Field(gt=0)
+    is_hedging_enabled: bool
+    hedging_latency_percentile: float = Field(gt=0, le=100)
+    hedging_min_nb_samples: int = Field(ge=1)
+    latency_window_size: int = Field(ge=1)
+    # per llm_name, the other platforms serving the same model, which retries and hedged requests can go to
+    alternate_platforms: Dict[str, List[LLMPlatform]] = Field(strict=False)
+
+    def get_alternate_platforms(self, llm_name: str) -> List[LLMPlatform]:
+        return self.alternate_platforms.get(llm_name, [])
+
+
+class LLMRouterConfig(ConfigModel):
+    is_enabled: bool
+    min_nb_samples: int = Field(ge=1)
+    window_size: int = Field(ge=1)
+    exploration_rate: float = Field(ge=0, le=1)
+    circuit_breaker_failure_threshold: int = Field(ge=1)
+    circuit_breaker_cool_down_seconds: float = Field(gt=0)
+
+
+class LLMBatchConfig(ConfigModel):
+    collect_window_seconds: float = Field(gt=0)
+    poll_interval_seconds: float = Field(gt=0)
+    max_wait_seconds: float = Field(gt=0)
+    cost_factor: float = Field(gt=0, le=1)
+
+
 class LLMConfig(ConfigModel):
     preferred_platforms: Dict[str, LLMPlatform]
 
@@ -61,6 +114,12 @@ class LLMConfig(ConfigModel):
 
     instructor_config: InstructorConfig
     llm_job_config: LLMJobConfig
+    llm_response_cache_config: LLMResponseCacheConfig
+    llm_rate_limiter_config: LLMRateLimiterConfig
+    llm_concurrency_config: LLMConcurrencyConfig
+    llm_dispatch_config: LLMDispatchConfig
+    llm_router_config: LLMRouterConfig
+    llm_batch_config: LLMBatchConfig
 
     default_max_images: int
 
@@ -91,6 +150,8 @@ class InferenceManagerConfig(ConfigModel):
 class Cogt(ConfigModel):
     inference_manager_config: InferenceManagerConfig
     cogt_report_config: CogtReportConfig
+    prompt_image_cache_config: PromptImageCacheConfig
+    prompt_image_prep_config: PromptImagePrepConfig
     llm_config: LLMConfig
     imgg_config: ImggConfig
     ocr_config: OcrConfig
@@ -25,6 +25,7 @@ from pipelex.cogt.image.generated_image import GeneratedImage
 from pipelex.cogt.imgg.imgg_handle import ImggHandle
 from pipelex.cogt.imgg.imgg_job_components import ImggJobConfig, ImggJobParams
 from pipelex.cogt.imgg.imgg_prompt import ImggPrompt
+from pipelex.cogt.llm.llm_job_components import LLMExecutionMode, ObjectItemSink, TextChunkSink
 from pipelex.cogt.llm.llm_models.llm_setting import LLMSetting
 from pipelex.cogt.llm.llm_prompt import LLMPrompt
 from pipelex.cogt.llm.llm_prompt_factory_abstract import LLMPromptFactoryAbstract
@@ -49,6 +50,8 @@ class ContentGenerator(ContentGeneratorProtocol):
         llm_setting_main: LLMSetting,
         llm_prompt_for_text: LLMPrompt,
         wfid: Optional[str] = None,
+        text_chunk_sink: Optional[TextChunkSink] = None,
+        llm_execution_mode: LLMExecutionMode = LLMExecutionMode.REALTIME,
     ) -> str:
         log.verbose(f"{self.__class__.__name__} make_llm_text: {llm_prompt_for_text}")
         log.verbose(f"llm_setting_main: {llm_setting_main}")
@@ -58,7 +61,11 @@ class ContentGenerator(ContentGeneratorProtocol):
             llm_prompt=llm_prompt_for_text,
         )
         log.verbose(llm_assignment.desc, title="llm_assignment")
-        generated_text = await llm_gen_text(llm_assignment=llm_assignment)
+        generated_text = await llm_gen_text(
+            llm_assignment=llm_assignment,
+            text_chunk_sink=text_chunk_sink,
+            llm_execution_mode=llm_execution_mode,
+        )
         log.verbose(f"{self.__class__.__name__} generated text: {generated_text}")
         return generated_text
 
@@ -141,6 +148,7 @@ class ContentGenerator(ContentGeneratorProtocol):
         llm_setting_for_object_list: LLMSetting,
         llm_prompt_for_object_list: LLMPrompt,
         wfid: Optional[str] = None,
+        object_item_sink: Optional[ObjectItemSink] = None,
     ) -> List[BaseModelType]:
         llm_assignment_for_object = LLMAssignment(
             job_metadata=job_metadata,
@@ -151,7 +159,7 @@ class ContentGenerator(ContentGeneratorProtocol):
             object_class=object_class,
             llm_assignment=llm_assignment_for_object,
         )
-        obj_list = await llm_gen_object_list(object_assignment=object_assignment)
+        obj_list = await llm_gen_object_list(object_assignment=object_assignment, object_item_sink=object_item_sink)
         log.verbose(f"{self.__class__.__name__} generated object list direct: {obj_list}")
         return cast(List[BaseModelType], obj_list)
 
@@ -166,6 +174,7 @@ class ContentGenerator(ContentGeneratorProtocol):
         llm_prompt_for_text: LLMPrompt,
         llm_prompt_factory_for_object_list: Optional[LLMPromptFactoryAbstract] = None,
         wfid: Optional[str] = None,
+        object_item_sink: Optional[ObjectItemSink] = None,
     ) -> List[BaseModelType]:
         llm_assignment_for_text = LLMAssignment(
             job_metadata=job_metadata,
@@ -197,7 +206,7 @@ class ContentGenerator(ContentGeneratorProtocol):
             object_class_name=object_class.__name__,
         )
 
-        obj_list = await llm_gen_object_list(object_assignment=fup_obj_assignment)
+        obj_list = await llm_gen_object_list(object_assignment=fup_obj_assignment, object_item_sink=object_item_sink)
         log.verbose(f"{self.__class__.__name__} generated object list after text: {obj_list}")
         return cast(List[BaseModelType], obj_list)
 
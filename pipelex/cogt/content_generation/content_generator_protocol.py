@@ -9,6 +9,7 @@ from pipelex.cogt.image.generated_image import GeneratedImage
 from pipelex.cogt.imgg.imgg_handle import ImggHandle
 from pipelex.cogt.imgg.imgg_job_components import ImggJobConfig, ImggJobParams
 from pipelex.cogt.imgg.imgg_prompt import ImggPrompt
+from pipelex.cogt.llm.llm_job_components import LLMExecutionMode, ObjectItemSink, TextChunkSink
 from pipelex.cogt.llm.llm_models.llm_setting import LLMSetting
 from pipelex.cogt.llm.llm_prompt import LLMPrompt
 from pipelex.cogt.llm.llm_prompt_factory_abstract import LLMPromptFactoryAbstract
@@ -54,6 +55,8 @@ class ContentGeneratorProtocol(Protocol):
         llm_setting_main: LLMSetting,
         llm_prompt_for_text: LLMPrompt,
         wfid: Optional[str] = None,
+        text_chunk_sink: Optional[TextChunkSink] = None,
+        llm_execution_mode: LLMExecutionMode = LLMExecutionMode.REALTIME,
     ) -> str: ...
 
     async def make_object_direct(
@@ -83,6 +86,7 @@ class ContentGeneratorProtocol(Protocol):
         llm_setting_for_object_list: LLMSetting,
         llm_prompt_for_object_list: LLMPrompt,
         wfid: Optional[str] = None,
+        object_item_sink: Optional[ObjectItemSink] = None,
     ) -> List[BaseModelType]: ...
 
     async def make_text_then_object_list(
@@ -94,6 +98,7 @@ class ContentGeneratorProtocol(Protocol):
         llm_prompt_for_text: LLMPrompt,
         llm_prompt_factory_for_object_list: Optional[LLMPromptFactoryAbstract] = None,
         wfid: Optional[str] = None,
+        object_item_sink: Optional[ObjectItemSink] = None,
     ) -> List[BaseModelType]: ...
 
     async def make_single_image(
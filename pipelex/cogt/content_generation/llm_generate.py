@@ -2,25 +2,144 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import List
+from typing import Any, List, Optional, Type
 
+import shortuuid
 from kajson.class_registry import class_registry
 from pydantic import BaseModel
 
 from pipelex import log
 from pipelex.cogt.content_generation.assignment_models import LLMAssignment, ObjectAssignment
+from pipelex.cogt.exceptions import LLMBatchError, LLMStreamInterruptedError
+from pipelex.cogt.llm.llm_batch_collector import LLMBatchCollector
+from pipelex.cogt.llm.llm_dispatch import dispatch_llm_job
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_job_components import LLMExecutionMode, ObjectItemSink, TextChunkSink
 from pipelex.cogt.llm.llm_job_factory import LLMJobFactory
-from pipelex.hub import get_llm_worker
+from pipelex.cogt.llm.llm_job_func import prepare_llm_job, report_llm_job
+from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract, LLMWorkerJobFuncName
+from pipelex.config import get_config
+from pipelex.hub import get_inference_manager
 
 
-async def llm_gen_text(llm_assignment: LLMAssignment) -> str:
-    llm_worker = get_llm_worker(llm_handle=llm_assignment.llm_handle)
+async def gen_text_into_sink(llm_worker: LLMWorkerAbstract, llm_job: LLMJob, text_chunk_sink: TextChunkSink) -> str:
+    """
+    Generate text, sending its chunks to the sink as they arrive, and return the whole text.
+    If streaming is disabled or not supported by the worker, the whole text is sent to the sink as a single chunk.
+    """
+    if not (llm_job.job_config.is_streaming_enabled and llm_worker.is_text_streaming_supported):
+        generated_text = await llm_worker.gen_text(llm_job=llm_job)
+        await text_chunk_sink(generated_text)
+        return generated_text
+
+    text_chunks: List[str] = []
+    try:
+        async for text_chunk in llm_worker.gen_text_stream(llm_job=llm_job):
+            text_chunks.append(text_chunk)
+            await text_chunk_sink(text_chunk)
+    except Exception as exc:
+        if text_chunks:
+            raise LLMStreamInterruptedError(
+                f"Text stream from llm '{llm_worker.llm_engine.tag}' was interrupted after {len(text_chunks)} chunks: {exc}"
+            ) from exc
+        raise
+    return "".join(text_chunks)
+
+
+class _ListSchemaBase(BaseModel):
+    items: List[Any]
+
+
+def _make_list_schema(item_class: Type[Any]) -> Type[_ListSchemaBase]:
+    class ListSchema(_ListSchemaBase):
+        items: List[item_class]  # type: ignore
+
+    return ListSchema
+
+
+async def gen_object_list_into_sink(
+    llm_worker: LLMWorkerAbstract,
+    llm_job: LLMJob,
+    item_class: Type[BaseModel],
+    object_item_sink: ObjectItemSink,
+) -> List[BaseModel]:
+    """
+    Generate a list of objects, sending each item to the sink as soon as it's parsed and validated, and return the whole list.
+    If streaming is disabled or not supported by the worker, the items are sent to the sink once the whole list is generated.
+    """
+    if not (llm_job.job_config.is_streaming_enabled and llm_worker.is_object_list_streaming_supported):
+        wrapped_list = await llm_worker.gen_object(llm_job=llm_job, schema=_make_list_schema(item_class=item_class))
+        generated_list: List[BaseModel] = wrapped_list.items
+        for item in generated_list:
+            await object_item_sink(item)
+        return generated_list
+
+    items: List[BaseModel] = []
+    try:
+        async for item in llm_worker.gen_object_list_stream(llm_job=llm_job, schema=item_class):
+            items.append(item)
+            await object_item_sink(item)
+    except Exception as exc:
+        if items:
+            raise LLMStreamInterruptedError(
+                f"Object list stream from llm '{llm_worker.llm_engine.tag}' was interrupted after {len(items)} items: {exc}"
+            ) from exc
+        raise
+    return items
+
+
+async def gen_text_in_provider_batch(llm_worker: LLMWorkerAbstract, llm_batch_collector: LLMBatchCollector, llm_job: LLMJob) -> str:
+    """Generate text through the offline batch API of the worker's provider: the job waits until the whole batch is complete."""
+    await prepare_llm_job(llm_worker=llm_worker, llm_job=llm_job, func_name=LLMWorkerJobFuncName.GEN_TEXT)
+    custom_id = shortuuid.uuid()
+    request = await llm_batch_collector.llm_batch_client.make_request(custom_id=custom_id, llm_job=llm_job, llm_engine=llm_worker.llm_engine)
+    llm_batch_result = await llm_batch_collector.run_request(custom_id=custom_id, request=request)
+    if llm_batch_result.text is None:
+        raise LLMBatchError(f"Request '{custom_id}' failed in the provider batch of '{llm_worker.llm_engine.tag}': {llm_batch_result.error}")
+
+    if llm_tokens_usage := llm_job.job_report.llm_tokens_usage:
+        if nb_tokens_by_category := llm_batch_result.nb_tokens_by_category:
+            llm_tokens_usage.nb_tokens_by_category = nb_tokens_by_category
+        llm_tokens_usage.is_provider_batch = True
+        llm_tokens_usage.cost_factor = get_config().cogt.llm_config.llm_batch_config.cost_factor
+    report_llm_job(llm_worker=llm_worker, llm_job=llm_job)
+    return llm_batch_result.text
+
+
+async def llm_gen_text(
+    llm_assignment: LLMAssignment,
+    text_chunk_sink: Optional[TextChunkSink] = None,
+    llm_execution_mode: LLMExecutionMode = LLMExecutionMode.REALTIME,
+) -> str:
     llm_job = LLMJobFactory.make_llm_job(
         job_metadata=llm_assignment.job_metadata,
         llm_prompt=llm_assignment.llm_prompt,
         llm_job_params=llm_assignment.llm_job_params,
     )
-    generated_text = await llm_worker.gen_text(llm_job=llm_job)
+    if llm_execution_mode == LLMExecutionMode.PROVIDER_BATCH:
+        inference_manager = get_inference_manager()
+        llm_worker = inference_manager.get_llm_worker(llm_handle=llm_assignment.llm_handle)
+        if llm_batch_collector := inference_manager.get_llm_batch_collector(llm_worker=llm_worker):
+            generated_text = await gen_text_in_provider_batch(llm_worker=llm_worker, llm_batch_collector=llm_batch_collector, llm_job=llm_job)
+            if text_chunk_sink:
+                await text_chunk_sink(generated_text)
+            log.verbose(generated_text, title="llm_gen_text in provider batch")
+            return generated_text
+        log.warning(f"No provider batch API for llm '{llm_worker.llm_engine.tag}', running the job in realtime")
+
+    if text_chunk_sink:
+        generated_text = await dispatch_llm_job(
+            llm_handle=llm_assignment.llm_handle,
+            llm_job=llm_job,
+            call=lambda llm_worker, llm_job: gen_text_into_sink(llm_worker=llm_worker, llm_job=llm_job, text_chunk_sink=text_chunk_sink),
+            is_streamed=True,
+        )
+    else:
+        generated_text = await dispatch_llm_job(
+            llm_handle=llm_assignment.llm_handle,
+            llm_job=llm_job,
+            call=lambda llm_worker, llm_job: llm_worker.gen_text(llm_job=llm_job),
+        )
     log.verbose(generated_text, title="llm_gen_text")
     return generated_text
 
@@ -28,7 +147,6 @@ async def llm_gen_text(llm_assignment: LLMAssignment) -> str:
 async def llm_gen_object(object_assignment: ObjectAssignment) -> BaseModel:
     llm_assignment = object_assignment.llm_assignment_for_object
     log.verbose(f"llm_gen_object to generate a: '{object_assignment.object_class_name}'")
-    llm_worker = get_llm_worker(llm_handle=llm_assignment.llm_handle)
     llm_job = LLMJobFactory.make_llm_job(
         job_metadata=llm_assignment.job_metadata,
         llm_prompt=llm_assignment.llm_prompt,
@@ -36,31 +154,42 @@ async def llm_gen_object(object_assignment: ObjectAssignment) -> BaseModel:
     )
     content_class_name = object_assignment.object_class_name
     content_class = class_registry.get_required_base_model(name=content_class_name)
-    generated_object: BaseModel = await llm_worker.gen_object(
+    generated_object: BaseModel = await dispatch_llm_job(
+        llm_handle=llm_assignment.llm_handle,
         llm_job=llm_job,
-        schema=content_class,
+        call=lambda llm_worker, llm_job: llm_worker.gen_object(llm_job=llm_job, schema=content_class),
     )
     return generated_object
 
 
-async def llm_gen_object_list(object_assignment: ObjectAssignment) -> List[BaseModel]:
+async def llm_gen_object_list(object_assignment: ObjectAssignment, object_item_sink: Optional[ObjectItemSink] = None) -> List[BaseModel]:
     llm_assignment = object_assignment.llm_assignment_for_object
     log.verbose(f"llm_gen_object_list to generate a list of '{object_assignment.object_class_name}'")
-    llm_worker = get_llm_worker(llm_handle=llm_assignment.llm_handle)
     llm_job = LLMJobFactory.make_llm_job(
         job_metadata=llm_assignment.job_metadata,
         llm_prompt=llm_assignment.llm_prompt,
         llm_job_params=llm_assignment.llm_job_params,
     )
     item_class_name = object_assignment.object_class_name
-    item_class = class_registry.get_required_class(name=item_class_name)
-
-    class ListSchema(BaseModel):
-        items: List[item_class]  # type: ignore
+    if object_item_sink:
+        item_base_model = class_registry.get_required_base_model(name=item_class_name)
+        return await dispatch_llm_job(
+            llm_handle=llm_assignment.llm_handle,
+            llm_job=llm_job,
+            call=lambda llm_worker, llm_job: gen_object_list_into_sink(
+                llm_worker=llm_worker,
+                llm_job=llm_job,
+                item_class=item_base_model,
+                object_item_sink=object_item_sink,
+            ),
+            is_streamed=True,
+        )
 
-    wrapped_list: ListSchema = await llm_worker.gen_object(
+    list_schema = _make_list_schema(item_class=class_registry.get_required_class(name=item_class_name))
+    wrapped_list = await dispatch_llm_job(
+        llm_handle=llm_assignment.llm_handle,
         llm_job=llm_job,
-        schema=ListSchema,
+        call=lambda llm_worker, llm_job: llm_worker.gen_object(llm_job=llm_job, schema=list_schema),
     )
-    generated_list: List[BaseModel] = wrapped_list.items  # pyright: ignore[reportUnknownMemberType]
+    generated_list: List[BaseModel] = wrapped_list.items
     return generated_list
@@ -55,6 +55,10 @@ class LLMCapabilityError(CogtError):
     pass
 
 
+class LLMContextWindowError(LLMCapabilityError):
+    pass
+
+
 class LLMCompletionError(CogtError):
     pass
 
@@ -75,6 +79,18 @@ class LLMPromptError(CogtError):
     pass
 
 
+class LLMResponseCacheError(CogtError):
+    pass
+
+
+class LLMBatchError(CogtError):
+    pass
+
+
+class LLMStreamInterruptedError(CogtError):
+    pass
+
+
 class PromptImageFactoryError(CogtError):
     pass
 
@@ -42,6 +42,16 @@ class PromptImageUrl(PromptImage):
         return f"PromptImageUrl(url='{self.url}')"
 
 
+class PromptImageBlob(PromptImage):
+    """An image held in the blob store, its bytes are only loaded and encoded when the prompt is sent to the provider."""
+
+    blob_digest: str
+
+    @override
+    def __str__(self) -> str:
+        return f"PromptImageBlob(blob_digest='{self.blob_digest}')"
+
+
 class PromptImageBytes(PromptImage):
     b64_image_bytes: bytes
 
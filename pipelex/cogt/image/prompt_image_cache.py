@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from pipelex import log
+from pipelex.cogt.image.prompt_image import PromptImage, PromptImageBlob, PromptImagePath, PromptImageUrl
+from pipelex.cogt.image.prompt_image_cache_config import PromptImageCacheConfig
+from pipelex.tools.utils.file_utils import ensure_directory_exists
+
+
+class PromptImageCache:
+    """
+    Keeps the base64 bytes of prompt images, so that an image referenced by many prompts is read or fetched, and encoded, only once.
+    Sources are keyed by url, or by path and modification time, and point to the digest of their content under which the bytes are held,
+    so the same image reached from several sources is held once.
+    Beyond max_memory_bytes, the least recently used images are evicted, or spilled to disk if a spill directory is set.
+    """
+
+    def __init__(self, max_memory_bytes: int, spill_directory_path: Optional[str] = None):
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_directory_path = spill_directory_path
+        self.nb_memory_bytes = 0
+        self.nb_hits = 0
+        self.nb_misses = 0
+        self._b64_by_digest: OrderedDict[str, bytes] = OrderedDict()
+        self._digest_by_source: Dict[str, str] = {}
+
+    @classmethod
+    def make_from_config(cls, prompt_image_cache_config: PromptImageCacheConfig) -> "PromptImageCache":
+        return cls(
+            max_memory_bytes=prompt_image_cache_config.max_memory_bytes,
+            spill_directory_path=prompt_image_cache_config.applied_spill_directory_path,
+        )
+
+    def teardown(self):
+        self.clear()
+
+    def clear(self):
+        self._b64_by_digest.clear()
+        self._digest_by_source.clear()
+        self.nb_memory_bytes = 0
+
+    @staticmethod
+    def make_source_key(prompt_image: PromptImage) -> Optional[str]:
+        """The key of the image's source, or None for images which are already bytes."""
+        if isinstance(prompt_image, PromptImagePath):
+            # the modification time is part of the key, so that an edited image is read again
+            return f"path:{os.path.abspath(prompt_image.file_path)}:{os.stat(prompt_image.file_path).st_mtime_ns}"
+        elif isinstance(prompt_image, PromptImageUrl):
+            return f"url:{prompt_image.url}"
+        elif isinstance(prompt_image, PromptImageBlob):
+            return f"blob:{prompt_image.blob_digest}"
+        return None
+
+    def _get_spill_file_path(self, digest: str) -> Optional[str]:
+        if not self.spill_directory_path:
+            return None
+        return os.path.join(self.spill_directory_path, f"{digest}.b64")
+
+    def get_digest(self, source_key: str) -> Optional[str]:
+        """The digest of the content of a known source, without loading its bytes."""
+        return self._digest_by_source.get(source_key)
+
+    def get_b64(self, source_key: str) -> Optional[bytes]:
+        digest = self._digest_by_source.get(source_key)
+        if digest is None:
+            self.nb_misses += 1
+            return None
+        b64_image_bytes = self._b64_by_digest.get(digest)
+        if b64_image_bytes is not None:
+            self._b64_by_digest.move_to_end(digest)
+        elif (spill_file_path := self._get_spill_file_path(digest=digest)) and os.path.exists(spill_file_path):
+            with open(spill_file_path, "rb") as spill_file:
+                b64_image_bytes = spill_file.read()
+            self._store(digest=digest, b64_image_bytes=b64_image_bytes)
+        else:
+            del self._digest_by_source[source_key]
+            self.nb_misses += 1
+            return None
+        self.nb_hits += 1
+        return b64_image_bytes
+
+    def set_b64(self, source_key: str, b64_image_bytes: bytes) -> str:
+        digest = hashlib.sha256(b64_image_bytes).hexdigest()
+        self._digest_by_source[source_key] = digest
+        if digest in self._b64_by_digest:
+            self._b64_by_digest.move_to_end(digest)
+        else:
+            self._store(digest=digest, b64_image_bytes=b64_image_bytes)
+        return digest
+
+    def _store(self, digest: str, b64_image_bytes: bytes):
+        self._b64_by_digest[digest] = b64_image_bytes
+        self.nb_memory_bytes += len(b64_image_bytes)
+        # the most recent image is always kept, even if it alone exceeds the budget
+        while self.nb_memory_bytes > self.max_memory_bytes and len(self._b64_by_digest) > 1:
+            evicted_digest, evicted_b64_image_bytes = self._b64_by_digest.popitem(last=False)
+            self.nb_memory_bytes -= len(evicted_b64_image_bytes)
+            self._spill(digest=evicted_digest, b64_image_bytes=evicted_b64_image_bytes)
+
+    def _spill(self, digest: str, b64_image_bytes: bytes):
+        spill_file_path = self._get_spill_file_path(digest=digest)
+        if spill_file_path is None or os.path.exists(spill_file_path):
+            return
+        ensure_directory_exists(os.path.dirname(spill_file_path))
+        # write then rename, so that a crash during the write never leaves a truncated image
+        tmp_file_path = f"{spill_file_path}.tmp"
+        with open(tmp_file_path, "wb") as spill_file:
+            spill_file.write(b64_image_bytes)
+        os.replace(tmp_file_path, spill_file_path)
+        log.verbose(f"Spilled prompt image {digest} to disk")
@@ -0,0 +1,24 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from typing import Optional
+
+from pydantic import Field
+
+from pipelex.tools.config.models import ConfigModel
+
+
+class PromptImageCacheConfig(ConfigModel):
+    is_enabled: bool
+    max_memory_mb: int = Field(ge=1)
+    is_disk_spill_enabled: bool
+    spill_directory_path: str
+
+    @property
+    def max_memory_bytes(self) -> int:
+        return self.max_memory_mb * 1024 * 1024
+
+    @property
+    def applied_spill_directory_path(self) -> Optional[str]:
+        return self.spill_directory_path if self.is_disk_spill_enabled else None
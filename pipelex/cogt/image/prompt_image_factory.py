@@ -2,15 +2,21 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Optional
+import asyncio
+from typing import List, Optional
 
 from pipelex.cogt.exceptions import PromptImageFactoryError
-from pipelex.cogt.image.prompt_image import PromptImage, PromptImageBytes, PromptImagePath, PromptImageUrl
+from pipelex.cogt.image.prompt_image import PromptImage, PromptImageBlob, PromptImageBytes, PromptImagePath, PromptImageUrl
+from pipelex.cogt.image.prompt_image_cache import PromptImageCache
+from pipelex.cogt.image.prompt_image_preparer import PromptImagePreparer
+from pipelex.hub import get_blob_store, get_prompt_image_cache, get_prompt_image_preparer
 from pipelex.tools.misc.base_64 import (
+    encode_to_base64,
     encode_to_base64_async,
+    load_binary_as_base64,
     load_binary_as_base64_async,
 )
-from pipelex.tools.misc.file_fetching_helpers import fetch_file_from_url_httpx_async
+from pipelex.tools.misc.file_fetching_helpers import fetch_file_from_url_httpx, fetch_file_from_url_httpx_async
 from pipelex.tools.utils.path_utils import clarify_path_or_url
 
 
@@ -21,15 +27,18 @@ class PromptImageFactory:
         file_path: Optional[str] = None,
         url: Optional[str] = None,
         base_64: Optional[bytes] = None,
+        blob_digest: Optional[str] = None,
     ) -> PromptImage:
-        if file_path:
+        if blob_digest:
+            return PromptImageBlob(blob_digest=blob_digest)
+        elif file_path:
             return PromptImagePath(file_path=file_path)
         elif url:
             return PromptImageUrl(url=url)
         elif base_64:
             return PromptImageBytes(b64_image_bytes=base_64)
         else:
-            raise PromptImageFactoryError("PromptImageFactory requires one of file_path, url, or image_bytes")
+            raise PromptImageFactoryError("PromptImageFactory requires one of file_path, url, image_bytes or blob_digest")
 
     @classmethod
     def make_prompt_image_from_uri(
@@ -53,12 +62,82 @@ class PromptImageFactory:
 
     @classmethod
     async def promptimage_to_b64_async(cls, image_prompt: PromptImage) -> bytes:
+        """Get the base64 bytes of the image, from the prompt image cache if it's enabled and holds them."""
+        if isinstance(image_prompt, PromptImageBytes):
+            return image_prompt.b64_image_bytes
+        prompt_image_cache = get_prompt_image_cache()
+        source_key = PromptImageCache.make_source_key(prompt_image=image_prompt) if prompt_image_cache else None
+        if prompt_image_cache and source_key and (cached_b64_image_bytes := prompt_image_cache.get_b64(source_key=source_key)):
+            return cached_b64_image_bytes
+
+        b64_image_bytes: bytes
         if isinstance(image_prompt, PromptImagePath):
-            return await load_binary_as_base64_async(image_prompt.file_path)
-        elif isinstance(image_prompt, PromptImageBytes):
+            b64_image_bytes = await load_binary_as_base64_async(image_prompt.file_path)
+        elif isinstance(image_prompt, PromptImageUrl):
+            b64_image_bytes = (await cls.make_promptimagebytes_from_url_async(image_prompt)).b64_image_bytes
+        elif isinstance(image_prompt, PromptImageBlob):
+            b64_image_bytes = await encode_to_base64_async(get_blob_store().get_bytes(digest=image_prompt.blob_digest))
+        else:
+            raise PromptImageFactoryError(f"Unknown PromptImage type: {image_prompt}")
+
+        if prompt_image_cache and source_key:
+            prompt_image_cache.set_b64(source_key=source_key, b64_image_bytes=b64_image_bytes)
+        return b64_image_bytes
+
+    @classmethod
+    def promptimage_to_b64(cls, image_prompt: PromptImage) -> bytes:
+        """Sync version of promptimage_to_b64_async, for the prompt builders which are not async."""
+        if isinstance(image_prompt, PromptImageBytes):
             return image_prompt.b64_image_bytes
+        prompt_image_cache = get_prompt_image_cache()
+        source_key = PromptImageCache.make_source_key(prompt_image=image_prompt) if prompt_image_cache else None
+        if prompt_image_cache and source_key and (cached_b64_image_bytes := prompt_image_cache.get_b64(source_key=source_key)):
+            return cached_b64_image_bytes
+
+        b64_image_bytes: bytes
+        if isinstance(image_prompt, PromptImagePath):
+            b64_image_bytes = load_binary_as_base64(image_prompt.file_path)
         elif isinstance(image_prompt, PromptImageUrl):
-            image_bytes = await cls.make_promptimagebytes_from_url_async(image_prompt)
-            return image_bytes.b64_image_bytes
+            b64_image_bytes = encode_to_base64(fetch_file_from_url_httpx(url=image_prompt.url))
+        elif isinstance(image_prompt, PromptImageBlob):
+            b64_image_bytes = encode_to_base64(get_blob_store().get_bytes(digest=image_prompt.blob_digest))
         else:
             raise PromptImageFactoryError(f"Unknown PromptImage type: {image_prompt}")
+
+        if prompt_image_cache and source_key:
+            prompt_image_cache.set_b64(source_key=source_key, b64_image_bytes=b64_image_bytes)
+        return b64_image_bytes
+
+    @classmethod
+    async def prepare_prompt_images_async(cls, prompt_images: List[PromptImage], max_image_edge: int) -> List[PromptImage]:
+        """Fit the prompt images within the max image edge of the target model, if the prompt image preparer is enabled."""
+        prompt_image_preparer = get_prompt_image_preparer()
+        if not prompt_image_preparer:
+            return prompt_images
+        tasks_to_prep_images = [
+            cls._prepare_prompt_image_async(prompt_image=prompt_image, max_image_edge=max_image_edge, prompt_image_preparer=prompt_image_preparer)
+            for prompt_image in prompt_images
+        ]
+        return list(await asyncio.gather(*tasks_to_prep_images))
+
+    @classmethod
+    async def _prepare_prompt_image_async(
+        cls,
+        prompt_image: PromptImage,
+        max_image_edge: int,
+        prompt_image_preparer: PromptImagePreparer,
+    ) -> PromptImage:
+        if isinstance(prompt_image, PromptImageUrl):
+            # the provider fetches urls itself, fetching them here to downscale them would cost more than it saves
+            return prompt_image
+        b64_image_bytes = await cls.promptimage_to_b64_async(image_prompt=prompt_image)
+        prompt_image_cache = get_prompt_image_cache()
+        # the prepared variant is cached like a source of its own, so that an image sent to many prompts of the same model is prepared once
+        prepared_key = prompt_image_preparer.make_prepared_key(b64_image_bytes=b64_image_bytes, max_image_edge=max_image_edge)
+        if prompt_image_cache and (cached_b64_image_bytes := prompt_image_cache.get_b64(source_key=prepared_key)):
+            return PromptImageBytes(b64_image_bytes=cached_b64_image_bytes)
+
+        prepared_b64_image_bytes = await prompt_image_preparer.prepare_b64_async(b64_image_bytes=b64_image_bytes, max_image_edge=max_image_edge)
+        if prompt_image_cache:
+            prompt_image_cache.set_b64(source_key=prepared_key, b64_image_bytes=prepared_b64_image_bytes)
+        return PromptImageBytes(b64_image_bytes=prepared_b64_image_bytes)
@@ -0,0 +1,29 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from enum import StrEnum
+
+from pydantic import Field
+
+from pipelex.tools.config.models import ConfigModel
+
+
+class PromptImagePrepFormat(StrEnum):
+    JPEG = "jpeg"
+    WEBP = "webp"
+
+    @property
+    def pil_format(self) -> str:
+        match self:
+            case PromptImagePrepFormat.JPEG:
+                return "JPEG"
+            case PromptImagePrepFormat.WEBP:
+                return "WEBP"
+
+
+class PromptImagePrepConfig(ConfigModel):
+    is_enabled: bool
+    output_format: PromptImagePrepFormat = Field(strict=False)
+    quality: int = Field(ge=1, le=100)
+    max_nb_workers: int = Field(ge=1)
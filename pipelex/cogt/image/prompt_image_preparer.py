@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+import base64
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Optional
+
+from PIL import Image
+
+from pipelex import log
+from pipelex.cogt.image.prompt_image_prep_config import PromptImagePrepConfig, PromptImagePrepFormat
+
+
+class PromptImagePreparer:
+    """
+    Downscales prompt images to the longest edge a model actually looks at, and recompresses them, before they are uploaded.
+    Decoding and encoding images is CPU-bound, so it runs in a thread pool rather than in the event loop.
+    Images already within the edge are left as they are, to avoid a lossy recompression which would save nothing.
+    """
+
+    def __init__(self, output_format: PromptImagePrepFormat, quality: int, max_nb_workers: int):
+        self.output_format = output_format
+        self.quality = quality
+        self.max_nb_workers = max_nb_workers
+        self.nb_prepared = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def make_from_config(cls, prompt_image_prep_config: PromptImagePrepConfig) -> "PromptImagePreparer":
+        return cls(
+            output_format=prompt_image_prep_config.output_format,
+            quality=prompt_image_prep_config.quality,
+            max_nb_workers=prompt_image_prep_config.max_nb_workers,
+        )
+
+    def setup(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_nb_workers, thread_name_prefix="prompt_image_prep")
+
+    def teardown(self):
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        log.verbose(f"PromptImagePreparer teardown done, {self.nb_prepared} images prepared")
+
+    def make_prepared_key(self, b64_image_bytes: bytes, max_image_edge: int) -> str:
+        """The key of the prepared variant of an image, which depends on the image and on the edge of the target model."""
+        digest = hashlib.sha256(b64_image_bytes).hexdigest()
+        return f"prepared:{digest}:{max_image_edge}:{self.output_format}:{self.quality}"
+
+    async def prepare_b64_async(self, b64_image_bytes: bytes, max_image_edge: int) -> bytes:
+        """Get the base64 bytes of the image fitted within max_image_edge, or the same bytes if it already fits."""
+        loop = asyncio.get_running_loop()
+        prepared_b64_image_bytes = await loop.run_in_executor(self._executor, self.prepare_b64, b64_image_bytes, max_image_edge)
+        if prepared_b64_image_bytes is not b64_image_bytes:
+            self.nb_prepared += 1
+        return prepared_b64_image_bytes
+
+    def prepare_b64(self, b64_image_bytes: bytes, max_image_edge: int) -> bytes:
+        with Image.open(BytesIO(base64.b64decode(b64_image_bytes))) as image:
+            if max(image.size) <= max_image_edge:
+                return b64_image_bytes
+            original_size = image.size
+            image.thumbnail((max_image_edge, max_image_edge), Image.Resampling.LANCZOS)
+            prepared_image = self._convert_for_output_format(image=image)
+            buffer = BytesIO()
+            prepared_image.save(buffer, format=self.output_format.pil_format, quality=self.quality)
+        log.debug(f"Prompt image downscaled from {original_size} to {prepared_image.size} as {self.output_format}")
+        return base64.b64encode(buffer.getvalue())
+
+    def _convert_for_output_format(self, image: Image.Image) -> Image.Image:
+        is_transparent = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        if not is_transparent:
+            return image if image.mode in ("RGB", "L") else image.convert("RGB")
+        match self.output_format:
+            case PromptImagePrepFormat.WEBP:
+                return image.convert("RGBA")
+            case PromptImagePrepFormat.JPEG:
+                # JPEG has no alpha channel, transparent areas are flattened onto white as most viewers would show them
+                rgba_image = image.convert("RGBA")
+                flattened_image = Image.new("RGB", rgba_image.size, "white")
+                flattened_image.paste(rgba_image, mask=rgba_image.getchannel("A"))
+                return flattened_image
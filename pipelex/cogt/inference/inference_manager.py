@@ -2,25 +2,33 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from typing_extensions import override
 
 from pipelex import log
-from pipelex.cogt.exceptions import InferenceManagerWorkerSetupError
+from pipelex.cogt.bedrock.bedrock_client_protocol import BedrockClientProtocol
+from pipelex.cogt.exceptions import CogtError, InferenceManagerWorkerSetupError
 from pipelex.cogt.imgg.imgg_engine_factory import ImggEngineFactory
 from pipelex.cogt.imgg.imgg_worker_abstract import ImggWorkerAbstract
 from pipelex.cogt.imgg.imgg_worker_factory import ImggWorkerFactory
 from pipelex.cogt.inference.inference_manager_protocol import InferenceManagerProtocol
+from pipelex.cogt.llm.llm_batch_collector import LLMBatchCollector
+from pipelex.cogt.llm.llm_concurrency_limiter import LLMConcurrencyLimiter, LLMConcurrencyMetrics
+from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
 from pipelex.cogt.llm.llm_models.llm_engine_blueprint import LLMEngineBlueprint
 from pipelex.cogt.llm.llm_models.llm_engine_factory import LLMEngineFactory
+from pipelex.cogt.llm.llm_rate_limiter import LLMRateLimiter
+from pipelex.cogt.llm.llm_router import LLMRouter
 from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
 from pipelex.cogt.llm.llm_worker_factory import LLMWorkerFactory
 from pipelex.cogt.ocr.ocr_engine_factory import OcrEngineFactory
 from pipelex.cogt.ocr.ocr_worker_abstract import OcrWorkerAbstract
 from pipelex.cogt.ocr.ocr_worker_factory import OcrWorkerFactory
+from pipelex.cogt.plugin_manager import PluginHandle
 from pipelex.config import get_config
-from pipelex.hub import get_llm_deck, get_report_delegate
+from pipelex.hub import get_llm_deck, get_plugin_manager, get_report_delegate
+from pipelex.tools.misc.latency_tracker import LatencyTracker
 
 
 class InferenceManager(InferenceManagerProtocol):
@@ -30,6 +38,12 @@ class InferenceManager(InferenceManagerProtocol):
         self.llm_workers: Dict[str, LLMWorkerAbstract] = {}
         self.imgg_workers: Dict[str, ImggWorkerAbstract] = {}
         self.ocr_workers: Dict[str, OcrWorkerAbstract] = {}
+        self.llm_rate_limiters: Dict[str, Optional[LLMRateLimiter]] = {}
+        self.llm_concurrency_limiters: Dict[str, LLMConcurrencyLimiter] = {}
+        self.llm_latency_trackers: Dict[str, LatencyTracker] = {}
+        self.alternate_llm_workers: Dict[str, List[LLMWorkerAbstract]] = {}
+        self.llm_router: Optional[LLMRouter] = None
+        self.llm_batch_collectors: Dict[str, Optional[LLMBatchCollector]] = {}
 
     @override
     def teardown(self):
@@ -38,6 +52,16 @@ class InferenceManager(InferenceManagerProtocol):
         self.llm_workers.clear()
         self.imgg_workers.clear()
         self.ocr_workers.clear()
+        self.llm_rate_limiters.clear()
+        self.llm_concurrency_limiters.clear()
+        self.llm_latency_trackers.clear()
+        self.alternate_llm_workers.clear()
+        self.llm_router = None
+        self.llm_batch_collectors.clear()
+        # the bedrock client keeps its connections open across calls
+        bedrock_client = get_plugin_manager().get_llm_sdk_instance(llm_sdk_handle=PluginHandle.BEDROCK_ASYNC)
+        if isinstance(bedrock_client, BedrockClientProtocol):
+            bedrock_client.close()
         log.verbose("InferenceManagerAsync reset")
 
     def print_workers(self):
@@ -103,6 +127,114 @@ class InferenceManager(InferenceManagerProtocol):
 
         return llm_worker
 
+    @override
+    def get_llm_rate_limiter(self, llm_engine: LLMEngine) -> Optional[LLMRateLimiter]:
+        # rate limits apply to a model on a platform, so workers of different llm handles for the same model share the limiter
+        llm_rate_limiter_config = get_config().cogt.llm_config.llm_rate_limiter_config
+        if not llm_rate_limiter_config.is_enabled:
+            return None
+        limiter_key = f"{llm_engine.llm_platform}/{llm_engine.llm_id}"
+        if limiter_key not in self.llm_rate_limiters:
+            rate_limits = llm_engine.llm_model.rate_limits.get(llm_engine.llm_platform) or llm_rate_limiter_config.get_platform_rate_limits(
+                llm_platform=llm_engine.llm_platform
+            )
+            llm_rate_limiter: Optional[LLMRateLimiter] = None
+            if rate_limits and rate_limits.is_limited:
+                log.verbose(f"Setting up LLM rate limiter for '{limiter_key}': {rate_limits}")
+                llm_rate_limiter = LLMRateLimiter(rate_limits=rate_limits)
+            self.llm_rate_limiters[limiter_key] = llm_rate_limiter
+        return self.llm_rate_limiters[limiter_key]
+
+    @override
+    def get_llm_concurrency_limiter(self, llm_engine: LLMEngine) -> Optional[LLMConcurrencyLimiter]:
+        llm_concurrency_config = get_config().cogt.llm_config.llm_concurrency_config
+        if not llm_concurrency_config.is_enabled:
+            return None
+        limiter_key = f"{llm_engine.llm_platform}/{llm_engine.llm_id}"
+        if limiter_key not in self.llm_concurrency_limiters:
+            log.verbose(f"Setting up LLM concurrency limiter for '{limiter_key}'")
+            self.llm_concurrency_limiters[limiter_key] = LLMConcurrencyLimiter(
+                llm_platform=llm_engine.llm_platform,
+                llm_id=llm_engine.llm_id,
+                initial_ceiling=llm_concurrency_config.initial_concurrency,
+                min_ceiling=llm_concurrency_config.min_concurrency,
+                max_ceiling=llm_concurrency_config.max_concurrency,
+                additive_increase=llm_concurrency_config.additive_increase,
+                multiplicative_decrease=llm_concurrency_config.multiplicative_decrease,
+            )
+        return self.llm_concurrency_limiters[limiter_key]
+
+    @override
+    def get_llm_concurrency_metrics(self) -> List[LLMConcurrencyMetrics]:
+        return [llm_concurrency_limiter.metrics for llm_concurrency_limiter in self.llm_concurrency_limiters.values()]
+
+    @override
+    def get_llm_latency_tracker(self, llm_engine: LLMEngine) -> LatencyTracker:
+        tracker_key = f"{llm_engine.llm_platform}/{llm_engine.llm_id}"
+        if tracker_key not in self.llm_latency_trackers:
+            latency_window_size = get_config().cogt.llm_config.llm_dispatch_config.latency_window_size
+            self.llm_latency_trackers[tracker_key] = LatencyTracker(max_nb_samples=latency_window_size)
+        return self.llm_latency_trackers[tracker_key]
+
+    @override
+    def get_alternate_llm_workers(self, llm_handle: str) -> List[LLMWorkerAbstract]:
+        """Workers for the same model as the llm handle's worker, on the alternate platforms set in the llm_dispatch_config."""
+        if llm_handle in self.alternate_llm_workers:
+            return self.alternate_llm_workers[llm_handle]
+        llm_engine = self.get_llm_worker(llm_handle=llm_handle).llm_engine
+        llm_model = llm_engine.llm_model
+        alternate_llm_workers: List[LLMWorkerAbstract] = []
+        alternate_platforms = get_config().cogt.llm_config.llm_dispatch_config.get_alternate_platforms(llm_name=llm_model.llm_name)
+        for llm_platform in alternate_platforms:
+            if llm_platform == llm_engine.llm_platform or llm_platform not in llm_model.enabled_platforms:
+                continue
+            try:
+                alternate_llm_worker = LLMWorkerFactory.make_llm_worker(
+                    llm_engine=LLMEngine(llm_platform=llm_platform, llm_model=llm_model),
+                    report_delegate=get_report_delegate(),
+                )
+            except CogtError as exc:
+                log.warning(f"Could not set up alternate LLM worker for '{llm_handle}' on '{llm_platform}': {exc}")
+                continue
+            log.verbose(f"Setup alternate LLM worker for '{llm_handle}' on {llm_platform}")
+            alternate_llm_workers.append(alternate_llm_worker)
+        self.alternate_llm_workers[llm_handle] = alternate_llm_workers
+        return alternate_llm_workers
+
+    @override
+    def get_llm_router(self) -> Optional[LLMRouter]:
+        llm_router_config = get_config().cogt.llm_config.llm_router_config
+        if not llm_router_config.is_enabled:
+            return None
+        if self.llm_router is None:
+            self.llm_router = LLMRouter(
+                min_nb_samples=llm_router_config.min_nb_samples,
+                window_size=llm_router_config.window_size,
+                exploration_rate=llm_router_config.exploration_rate,
+                failure_threshold=llm_router_config.circuit_breaker_failure_threshold,
+                cool_down_seconds=llm_router_config.circuit_breaker_cool_down_seconds,
+            )
+        return self.llm_router
+
+    @override
+    def get_llm_batch_collector(self, llm_worker: LLMWorkerAbstract) -> Optional[LLMBatchCollector]:
+        """The collector of the provider batches for the worker's model and platform, or None if the platform has no batch API."""
+        llm_engine = llm_worker.llm_engine
+        collector_key = f"{llm_engine.llm_platform}/{llm_engine.llm_id}"
+        if collector_key not in self.llm_batch_collectors:
+            llm_batch_collector: Optional[LLMBatchCollector] = None
+            if llm_batch_client := llm_worker.make_llm_batch_client():
+                llm_batch_config = get_config().cogt.llm_config.llm_batch_config
+                log.verbose(f"Setting up LLM batch collector for '{collector_key}'")
+                llm_batch_collector = LLMBatchCollector(
+                    llm_batch_client=llm_batch_client,
+                    collect_window_seconds=llm_batch_config.collect_window_seconds,
+                    poll_interval_seconds=llm_batch_config.poll_interval_seconds,
+                    max_wait_seconds=llm_batch_config.max_wait_seconds,
+                )
+            self.llm_batch_collectors[collector_key] = llm_batch_collector
+        return self.llm_batch_collectors[collector_key]
+
     ####################################################################################################
     # Manage IMGG Workers
     ####################################################################################################
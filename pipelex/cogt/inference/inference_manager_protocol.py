@@ -2,12 +2,18 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Optional, Protocol
+from typing import List, Optional, Protocol
 
 from pipelex.cogt.imgg.imgg_worker_abstract import ImggWorkerAbstract
+from pipelex.cogt.llm.llm_batch_collector import LLMBatchCollector
+from pipelex.cogt.llm.llm_concurrency_limiter import LLMConcurrencyLimiter, LLMConcurrencyMetrics
+from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
 from pipelex.cogt.llm.llm_models.llm_engine_blueprint import LLMEngineBlueprint
+from pipelex.cogt.llm.llm_rate_limiter import LLMRateLimiter
+from pipelex.cogt.llm.llm_router import LLMRouter
 from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
 from pipelex.cogt.ocr.ocr_worker_abstract import OcrWorkerAbstract
+from pipelex.tools.misc.latency_tracker import LatencyTracker
 
 
 class InferenceManagerProtocol(Protocol):
@@ -30,6 +36,20 @@ class InferenceManagerProtocol(Protocol):
         specific_llm_engine_blueprint: Optional[LLMEngineBlueprint] = None,
     ) -> LLMWorkerAbstract: ...
 
+    def get_llm_rate_limiter(self, llm_engine: LLMEngine) -> Optional[LLMRateLimiter]: ...
+
+    def get_llm_concurrency_limiter(self, llm_engine: LLMEngine) -> Optional[LLMConcurrencyLimiter]: ...
+
+    def get_llm_concurrency_metrics(self) -> List[LLMConcurrencyMetrics]: ...
+
+    def get_llm_latency_tracker(self, llm_engine: LLMEngine) -> LatencyTracker: ...
+
+    def get_alternate_llm_workers(self, llm_handle: str) -> List[LLMWorkerAbstract]: ...
+
+    def get_llm_router(self) -> Optional[LLMRouter]: ...
+
+    def get_llm_batch_collector(self, llm_worker: LLMWorkerAbstract) -> Optional[LLMBatchCollector]: ...
+
     ####################################################################################################
     # IMG Generation Workers
     ####################################################################################################
@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from abc import ABC, abstractmethod
+from enum import StrEnum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
+from pipelex.cogt.llm.token_category import NbTokensByCategoryDict
+
+LLMBatchRequest = Dict[str, Any]
+
+
+class LLMBatchStatus(StrEnum):
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class LLMBatchResult(BaseModel):
+    custom_id: str
+    text: Optional[str] = None
+    nb_tokens_by_category: Optional[NbTokensByCategoryDict] = None
+    error: Optional[str] = None
+
+
+class LLMBatchClientAbstract(ABC):
+    """
+    The submit / poll / download cycle of a provider batch API.
+    Each request carries a custom_id, which is used to match the results with the requests.
+    """
+
+    @abstractmethod
+    async def make_request(self, custom_id: str, llm_job: LLMJob, llm_engine: LLMEngine) -> LLMBatchRequest:
+        pass
+
+    @abstractmethod
+    async def submit_batch(self, requests: List[LLMBatchRequest]) -> str:
+        """Submit the requests as a single batch and return the batch id."""
+        pass
+
+    @abstractmethod
+    async def get_batch_status(self, batch_id: str) -> LLMBatchStatus:
+        pass
+
+    @abstractmethod
+    async def download_batch_results(self, batch_id: str) -> Dict[str, LLMBatchResult]:
+        """Download the results of a completed batch, by custom_id."""
+        pass
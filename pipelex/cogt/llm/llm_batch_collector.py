@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from pipelex import log
+from pipelex.cogt.exceptions import LLMBatchError
+from pipelex.cogt.llm.llm_batch_client_abstract import LLMBatchClientAbstract, LLMBatchRequest, LLMBatchResult, LLMBatchStatus
+
+
+class LLMBatchCollector:
+    """
+    Collects the requests sent to one model on one platform within a time window, and runs them as a single provider batch:
+    the batch is submitted, polled until it's complete, then each caller gets the result matching its request.
+    """
+
+    def __init__(
+        self,
+        llm_batch_client: LLMBatchClientAbstract,
+        collect_window_seconds: float,
+        poll_interval_seconds: float,
+        max_wait_seconds: float,
+    ):
+        self.llm_batch_client = llm_batch_client
+        self.collect_window_seconds = collect_window_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.nb_batches_submitted = 0
+        self._pending_requests: Dict[str, LLMBatchRequest] = {}
+        self._pending_futures: Dict[str, "asyncio.Future[LLMBatchResult]"] = {}
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+
+    async def run_request(self, custom_id: str, request: LLMBatchRequest) -> LLMBatchResult:
+        """Add the request to the batch being collected, and wait for its result."""
+        if custom_id in self._pending_requests:
+            raise LLMBatchError(f"A request with custom_id '{custom_id}' is already pending in the batch")
+        future: "asyncio.Future[LLMBatchResult]" = asyncio.get_running_loop().create_future()
+        self._pending_requests[custom_id] = request
+        self._pending_futures[custom_id] = future
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.collect_window_seconds)
+        futures = self._pending_futures
+        requests: List[LLMBatchRequest] = [
+            request for custom_id, request in self._pending_requests.items() if not self._pending_futures[custom_id].cancelled()
+        ]
+        self._pending_requests = {}
+        self._pending_futures = {}
+        self._flush_task = None
+        if not requests:
+            return
+
+        try:
+            results = await self._run_batch(requests=requests)
+        except Exception as exc:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for custom_id, future in futures.items():
+            if future.done():
+                continue
+            if result := results.get(custom_id):
+                future.set_result(result)
+            else:
+                future.set_exception(LLMBatchError(f"No result for request '{custom_id}' in the provider batch"))
+
+    async def _run_batch(self, requests: List[LLMBatchRequest]) -> Dict[str, LLMBatchResult]:
+        batch_id = await self.llm_batch_client.submit_batch(requests=requests)
+        self.nb_batches_submitted += 1
+        log.info(f"Submitted provider batch '{batch_id}' with {len(requests)} requests")
+        started_at = time.monotonic()
+        while True:
+            batch_status = await self.llm_batch_client.get_batch_status(batch_id=batch_id)
+            match batch_status:
+                case LLMBatchStatus.COMPLETED:
+                    break
+                case LLMBatchStatus.FAILED:
+                    raise LLMBatchError(f"Provider batch '{batch_id}' failed")
+                case LLMBatchStatus.IN_PROGRESS:
+                    if time.monotonic() - started_at > self.max_wait_seconds:
+                        raise LLMBatchError(f"Provider batch '{batch_id}' was not complete after {self.max_wait_seconds}s")
+                    await asyncio.sleep(self.poll_interval_seconds)
+        log.info(f"Provider batch '{batch_id}' completed after {time.monotonic() - started_at:.1f}s")
+        return await self.llm_batch_client.download_batch_results(batch_id=batch_id)
@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from pydantic import BaseModel
+
+from pipelex.cogt.llm.llm_models.llm_platform import LLMPlatform
+from pipelex.tools.misc.aimd_limiter import AIMDLimiter
+
+
+class LLMConcurrencyMetrics(BaseModel):
+    llm_platform: LLMPlatform
+    llm_id: str
+    concurrency_ceiling: float
+    nb_in_flight: int
+    nb_throttled: int
+
+
+class LLMConcurrencyLimiter(AIMDLimiter):
+    """Adaptive concurrency ceiling of one model on one platform, decreased when the provider throttles."""
+
+    def __init__(
+        self,
+        llm_platform: LLMPlatform,
+        llm_id: str,
+        initial_ceiling: float,
+        min_ceiling: float,
+        max_ceiling: float,
+        additive_increase: float,
+        multiplicative_decrease: float,
+    ):
+        super().__init__(
+            initial_ceiling=initial_ceiling,
+            min_ceiling=min_ceiling,
+            max_ceiling=max_ceiling,
+            additive_increase=additive_increase,
+            multiplicative_decrease=multiplicative_decrease,
+        )
+        self.llm_platform = llm_platform
+        self.llm_id = llm_id
+
+    @property
+    def metrics(self) -> LLMConcurrencyMetrics:
+        return LLMConcurrencyMetrics(
+            llm_platform=self.llm_platform,
+            llm_id=self.llm_id,
+            concurrency_ceiling=self.ceiling,
+            nb_in_flight=self.nb_in_flight,
+            nb_throttled=self.nb_throttled,
+        )
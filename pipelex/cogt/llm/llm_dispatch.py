@@ -0,0 +1,171 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+import random
+import time
+from typing import Any, Callable, Coroutine, List, Optional, Set, TypeVar
+
+from pipelex import log
+from pipelex.cogt.exceptions import LLMStreamInterruptedError
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_router import LLMRouter
+from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
+from pipelex.config import get_config
+from pipelex.hub import get_inference_manager
+from pipelex.tools.exceptions import iter_exception_chain
+
+ResultType = TypeVar("ResultType")
+
+LLMJobCall = Callable[[LLMWorkerAbstract, LLMJob], Coroutine[Any, Any, ResultType]]
+
+
+def compute_retry_delay(attempt_index: int, base_delay_seconds: float, max_delay_seconds: float) -> float:
+    """Full-jitter exponential backoff: a random delay between 0 and base * 2^attempt, capped at max."""
+    return random.uniform(0, min(max_delay_seconds, base_delay_seconds * 2**attempt_index))
+
+
+def is_transient_llm_error(llm_worker: LLMWorkerAbstract, exc: BaseException) -> bool:
+    return any(llm_worker.is_transient_error(exc=chained_exc) for chained_exc in iter_exception_chain(exc))
+
+
+def get_retry_after_seconds(llm_worker: LLMWorkerAbstract, exc: BaseException) -> Optional[float]:
+    for chained_exc in iter_exception_chain(exc):
+        if (retry_after_seconds := llm_worker.get_retry_after_seconds(exc=chained_exc)) is not None:
+            return retry_after_seconds
+    return None
+
+
+def _get_hedging_delay(llm_worker: LLMWorkerAbstract) -> Optional[float]:
+    llm_dispatch_config = get_config().cogt.llm_config.llm_dispatch_config
+    latency_tracker = get_inference_manager().get_llm_latency_tracker(llm_engine=llm_worker.llm_engine)
+    if latency_tracker.nb_samples < llm_dispatch_config.hedging_min_nb_samples:
+        # not enough observed latencies yet to know what is slow for this platform
+        return None
+    return latency_tracker.get_percentile(percentile=llm_dispatch_config.hedging_latency_percentile)
+
+
+def _make_health_recording_call(llm_router: LLMRouter, llm_handle: str, call: LLMJobCall[ResultType]) -> LLMJobCall[ResultType]:
+    """Wrap the call to record its outcome in the health of the platform. Only transient errors count against the platform."""
+
+    async def health_recording_call(llm_worker: LLMWorkerAbstract, llm_job: LLMJob) -> ResultType:
+        platform_health = llm_router.get_platform_health(llm_handle=llm_handle, llm_platform=llm_worker.llm_engine.llm_platform)
+        platform_health.circuit_breaker.record_call_start()
+        started_at = time.perf_counter()
+        try:
+            result = await call(llm_worker, llm_job)
+        except asyncio.CancelledError:
+            platform_health.circuit_breaker.record_call_abandoned()
+            raise
+        except Exception as exc:
+            if is_transient_llm_error(llm_worker=llm_worker, exc=exc):
+                platform_health.record_failure()
+            else:
+                platform_health.circuit_breaker.record_call_abandoned()
+            raise
+        platform_health.record_success(latency_seconds=time.perf_counter() - started_at)
+        return result
+
+    return health_recording_call
+
+
+async def _call_with_hedging(
+    llm_job: LLMJob,
+    call: LLMJobCall[ResultType],
+    primary_llm_worker: LLMWorkerAbstract,
+    hedging_llm_worker: Optional[LLMWorkerAbstract],
+) -> ResultType:
+    """
+    Call the primary worker and, if it hasn't answered within its hedging delay, the hedging worker as well.
+    The first successful answer wins and the other call is cancelled. If both fail, the primary's error is raised.
+    """
+    hedging_delay = _get_hedging_delay(llm_worker=primary_llm_worker) if hedging_llm_worker else None
+    if hedging_llm_worker is None or hedging_delay is None:
+        return await call(primary_llm_worker, llm_job)
+
+    primary_task = asyncio.create_task(call(primary_llm_worker, llm_job))
+    pending_tasks: Set["asyncio.Task[ResultType]"] = {primary_task}
+    try:
+        done_tasks, _ = await asyncio.wait(pending_tasks, timeout=hedging_delay)
+        if done_tasks:
+            return primary_task.result()
+
+        log.debug(
+            f"LLM job not answered by '{primary_llm_worker.llm_engine.tag}' after {hedging_delay:.2f}s, "
+            f"hedging on '{hedging_llm_worker.llm_engine.tag}'"
+        )
+        # the hedged call gets its own copy of the job, as both calls write their job report concurrently
+        hedging_llm_job = llm_job.model_copy(deep=True)
+        hedging_task = asyncio.create_task(call(hedging_llm_worker, hedging_llm_job))
+        pending_tasks.add(hedging_task)
+        while pending_tasks:
+            done_tasks, pending_tasks = await asyncio.wait(pending_tasks, return_when=asyncio.FIRST_COMPLETED)
+            for done_task in done_tasks:
+                if done_task.exception() is None:
+                    if done_task is hedging_task:
+                        llm_job.job_report = hedging_llm_job.job_report
+                    return done_task.result()
+        # both calls failed
+        if hedging_task.exception():
+            log.debug(f"Hedged LLM job also failed on '{hedging_llm_worker.llm_engine.tag}': {hedging_task.exception()}")
+        return primary_task.result()
+    finally:
+        for pending_task in pending_tasks:
+            pending_task.cancel()
+
+
+async def dispatch_llm_job(llm_handle: str, llm_job: LLMJob, call: LLMJobCall[ResultType], is_streamed: bool = False) -> ResultType:
+    """
+    Run an LLM job through the worker of the llm handle, resiliently:
+    if the model has alternate platforms, the router sends the job to the healthiest one,
+    transient provider errors are retried with jittered exponential backoff, or after the delay asked by the provider, rotating through the platforms,
+    and, if hedging is enabled, a job which is slower than the observed latency percentile is also sent to another platform.
+
+    A streamed job is never hedged, as both calls would feed the same sink,
+    and it is not retried once its stream was interrupted, as chunks were already delivered.
+    """
+    llm_dispatch_config = get_config().cogt.llm_config.llm_dispatch_config
+    inference_manager = get_inference_manager()
+    llm_workers: List[LLMWorkerAbstract] = [inference_manager.get_llm_worker(llm_handle=llm_handle)]
+    llm_workers.extend(inference_manager.get_alternate_llm_workers(llm_handle=llm_handle))
+    if len(llm_workers) > 1 and (llm_router := inference_manager.get_llm_router()):
+        llm_workers = llm_router.rank_llm_workers(llm_handle=llm_handle, llm_workers=llm_workers)
+        call = _make_health_recording_call(llm_router=llm_router, llm_handle=llm_handle, call=call)
+
+    attempt_index = 0
+    while True:
+        primary_llm_worker = llm_workers[attempt_index % len(llm_workers)]
+        hedging_llm_worker: Optional[LLMWorkerAbstract] = None
+        if llm_dispatch_config.is_hedging_enabled and not is_streamed and len(llm_workers) > 1:
+            hedging_llm_worker = llm_workers[(attempt_index + 1) % len(llm_workers)]
+        try:
+            return await _call_with_hedging(
+                llm_job=llm_job,
+                call=call,
+                primary_llm_worker=primary_llm_worker,
+                hedging_llm_worker=hedging_llm_worker,
+            )
+        except LLMStreamInterruptedError:
+            raise
+        except Exception as exc:
+            if attempt_index >= llm_dispatch_config.max_retries or not is_transient_llm_error(llm_worker=primary_llm_worker, exc=exc):
+                raise
+            retry_delay = compute_retry_delay(
+                attempt_index=attempt_index,
+                base_delay_seconds=llm_dispatch_config.retry_base_delay_seconds,
+                max_delay_seconds=llm_dispatch_config.retry_max_delay_seconds,
+            )
+            # the Retry-After of the provider is honoured, up to the max delay, when the retry goes back to the same platform
+            next_llm_worker = llm_workers[(attempt_index + 1) % len(llm_workers)]
+            if (
+                next_llm_worker is primary_llm_worker
+                and (retry_after_seconds := get_retry_after_seconds(llm_worker=primary_llm_worker, exc=exc)) is not None
+            ):
+                retry_delay = max(retry_delay, min(retry_after_seconds, llm_dispatch_config.retry_max_delay_seconds))
+            log.warning(
+                f"Transient error with llm '{primary_llm_worker.llm_engine.tag}', "
+                f"retry {attempt_index + 1}/{llm_dispatch_config.max_retries} in {retry_delay:.2f}s: {exc}"
+            )
+            await asyncio.sleep(retry_delay)
+            attempt_index += 1
@@ -11,6 +11,7 @@ from pipelex.cogt.llm.llm_job_components import LLMJobConfig, LLMJobParams, LLMJ
 from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
 from pipelex.cogt.llm.llm_prompt import LLMPrompt
 from pipelex.cogt.llm.llm_report import LLMTokensUsage
+from pipelex.cogt.llm.token_category import TokenCategory
 
 
 class LLMJob(InferenceJobAbstract):
@@ -41,5 +42,11 @@ class LLMJob(InferenceJobAbstract):
             nb_tokens_by_category={},
         )
 
+    def llm_job_after_cache_hit(self):
+        # a response from the cache or shared with an identical job in flight is reported as a job that consumed no tokens
+        if llm_tokens_usage := self.job_report.llm_tokens_usage:
+            llm_tokens_usage.is_cache_hit = True
+            llm_tokens_usage.nb_tokens_by_category = {TokenCategory.INPUT: 0, TokenCategory.OUTPUT: 0}
+
     def llm_job_after_complete(self):
         self.job_metadata.completed_at = datetime.now()
@@ -2,7 +2,8 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Optional
+from enum import StrEnum
+from typing import Awaitable, Callable, Optional
 
 from pydantic import BaseModel, Field
 
@@ -19,8 +20,17 @@ class LLMJobParams(BaseModel):
     seed: Optional[int] = Field(None, ge=0)
 
 
+class LLMExecutionMode(StrEnum):
+    # each job is sent to the provider as soon as it's ready
+    REALTIME = "realtime"
+    # jobs are collected into an offline provider batch, cheaper but answered within hours
+    PROVIDER_BATCH = "provider_batch"
+
+
 class LLMJobConfig(BaseModel):
     is_streaming_enabled: bool
+    is_single_flight_enabled: bool = False
+    is_context_window_guard_enabled: bool = True
     max_retries: int = Field(..., ge=1, le=10)
 
 
@@ -31,3 +41,19 @@ class LLMJobConfig(BaseModel):
 
 class LLMJobReport(BaseModel):
     llm_tokens_usage: Optional[LLMTokensUsage] = None
+    # for streamed jobs: the time to the first text chunk or list item
+    time_to_first_token_seconds: Optional[float] = None
+    # pre-flight estimates, made before the job is sent
+    nb_tokens_input_estimate: Optional[int] = None
+    cost_estimate_usd: Optional[float] = None
+
+
+########################################################################
+### Streaming
+########################################################################
+
+# receives the chunks of a streamed text generation as they arrive
+TextChunkSink = Callable[[str], Awaitable[None]]
+
+# receives the items of a streamed object list generation as soon as each one is parsed and validated
+ObjectItemSink = Callable[[BaseModel], Awaitable[None]]
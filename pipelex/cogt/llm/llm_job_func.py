@@ -2,17 +2,154 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
+import inspect
+import time
 from functools import wraps
-from typing import Any, Awaitable, Callable, TypeVar, cast
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Type, TypeVar, cast
 
 from instructor.exceptions import InstructorRetryException
+from pydantic import BaseModel
 
 from pipelex import log
-from pipelex.cogt.exceptions import LLMWorkerError
+from pipelex.cogt.exceptions import LLMResponseCacheError, LLMWorkerError
+from pipelex.cogt.image.prompt_image_factory import PromptImageFactory
+from pipelex.cogt.llm.llm_concurrency_limiter import LLMConcurrencyLimiter
 from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_rate_limiter import LLMRateLimiter, estimate_llm_job_nb_tokens
+from pipelex.cogt.llm.llm_response_cache import make_llm_response_cache_key_async
 from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract, LLMWorkerJobFuncName
+from pipelex.hub import get_inference_manager, get_llm_response_cache
+from pipelex.tools.exceptions import iter_exception_chain
 
 F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+StreamF = TypeVar("StreamF", bound=Callable[..., AsyncIterator[Any]])
+
+
+def _get_schema(func_name: LLMWorkerJobFuncName, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[Type[BaseModel]]:
+    match func_name:
+        case LLMWorkerJobFuncName.GEN_TEXT | LLMWorkerJobFuncName.GEN_TEXT_STREAM:
+            return None
+        case LLMWorkerJobFuncName.GEN_OBJECT | LLMWorkerJobFuncName.GEN_OBJECT_LIST_STREAM:
+            schema = kwargs.get("schema", args[0] if args else None)
+            if not inspect.isclass(schema) or not issubclass(schema, BaseModel):
+                raise LLMResponseCacheError(f"Cannot cache the response of '{func_name}' without a pydantic schema, got '{schema}'")
+            return schema
+
+
+def _dump_response(result: Any) -> str:
+    if isinstance(result, BaseModel):
+        return result.model_dump_json()
+    elif isinstance(result, str):
+        return result
+    else:
+        raise LLMResponseCacheError(f"Cannot cache an LLM response of type '{type(result).__name__}'")
+
+
+def _copy_response(result: Any) -> Any:
+    # each caller of a shared job gets its own copy, so that one caller mutating its result does not affect the others
+    if isinstance(result, BaseModel):
+        return result.model_copy(deep=True)
+    return result
+
+
+def _load_response(cached_response: str, schema: Optional[Type[BaseModel]]) -> Any:
+    if schema:
+        return schema.model_validate_json(cached_response)
+    return cached_response
+
+
+async def prepare_llm_job(llm_worker: LLMWorkerAbstract, llm_job: LLMJob, func_name: LLMWorkerJobFuncName):
+    log.debug(f"LLM Working async job function: '{func_name}'")
+    log.verbose(f"\n{llm_worker.llm_engine.desc}")
+    log.verbose(llm_job.params_desc)
+
+    # Verify that the job is valid
+    llm_job.validate_before_execution()
+
+    # Prepare job, before the feasibility check which writes its pre-flight estimates into the fresh job report
+    llm_job.llm_job_before_start(llm_engine=llm_worker.llm_engine)
+
+    # Fit the images to the model, so that the feasibility check estimates the tokens of the images which are sent
+    await prepare_llm_job_images(llm_worker=llm_worker, llm_job=llm_job)
+
+    # Verify feasibility
+    llm_worker.check_can_perform_job(llm_job=llm_job, func_name=func_name)
+
+    # TODO: Fix printing prompts that contain image bytes
+    # log.verbose(llm_job.llm_prompt.desc, title="llm_prompt")
+
+    # metadata
+    llm_job.job_metadata.unit_job_id = llm_worker.unit_job_id(func_name=func_name)
+
+
+async def prepare_llm_job_images(llm_worker: LLMWorkerAbstract, llm_job: LLMJob):
+    """Fit the prompt images within the max image edge of the LLM, if the prompt image preparer is enabled."""
+    max_image_edge = llm_worker.llm_engine.llm_model.max_image_edge
+    if not max_image_edge or not llm_job.llm_prompt.user_images:
+        return
+    prepared_user_images = await PromptImageFactory.prepare_prompt_images_async(
+        prompt_images=llm_job.llm_prompt.user_images,
+        max_image_edge=max_image_edge,
+    )
+    # the prompt is copied rather than updated, as it may be shared with other jobs
+    llm_job.llm_prompt = llm_job.llm_prompt.model_copy(update={"user_images": prepared_user_images})
+
+
+def report_llm_job(llm_worker: LLMWorkerAbstract, llm_job: LLMJob):
+    llm_job.llm_job_after_complete()
+    if llm_worker.report_delegate:
+        llm_worker.report_delegate.report_inference_job(inference_job=llm_job)
+
+
+async def _reserve_rate_limit(llm_worker: LLMWorkerAbstract, llm_job: LLMJob) -> Tuple[Optional[LLMRateLimiter], int]:
+    llm_rate_limiter = get_inference_manager().get_llm_rate_limiter(llm_engine=llm_worker.llm_engine)
+    nb_tokens_reserved = 0
+    if llm_rate_limiter:
+        nb_tokens_reserved = await llm_rate_limiter.reserve(nb_tokens=estimate_llm_job_nb_tokens(llm_job=llm_job))
+    return llm_rate_limiter, nb_tokens_reserved
+
+
+def _reconcile_rate_limit(llm_job: LLMJob, llm_rate_limiter: Optional[LLMRateLimiter], nb_tokens_reserved: int):
+    if llm_rate_limiter:
+        llm_tokens_usage = llm_job.job_report.llm_tokens_usage
+        llm_rate_limiter.reconcile(
+            nb_tokens_reserved=nb_tokens_reserved,
+            nb_tokens_by_category=llm_tokens_usage.nb_tokens_by_category if llm_tokens_usage else None,
+        )
+
+
+def _release_concurrency_slot(
+    llm_worker: LLMWorkerAbstract,
+    llm_concurrency_limiter: LLMConcurrencyLimiter,
+    epoch: int,
+    exc: Optional[BaseException],
+):
+    if exc is None:
+        llm_concurrency_limiter.release(epoch=epoch)
+        return
+    is_throttled = any(llm_worker.is_throttling_error(exc=chained_exc) for chained_exc in iter_exception_chain(exc))
+    previous_ceiling = llm_concurrency_limiter.ceiling
+    llm_concurrency_limiter.release(epoch=epoch, is_success=False, is_throttled=is_throttled)
+    if llm_concurrency_limiter.ceiling < previous_ceiling:
+        log.verbose(
+            f"LLM '{llm_worker.llm_engine.tag}' was throttled, concurrency ceiling lowered "
+            f"from {previous_ceiling:.1f} to {llm_concurrency_limiter.ceiling:.1f}"
+        )
+
+
+async def _run_with_concurrency_limiter(
+    llm_worker: LLMWorkerAbstract,
+    llm_concurrency_limiter: LLMConcurrencyLimiter,
+    call: Callable[[], Awaitable[Any]],
+) -> Any:
+    epoch = await llm_concurrency_limiter.acquire()
+    try:
+        result = await call()
+    except BaseException as exc:
+        _release_concurrency_slot(llm_worker=llm_worker, llm_concurrency_limiter=llm_concurrency_limiter, epoch=epoch, exc=exc)
+        raise
+    _release_concurrency_slot(llm_worker=llm_worker, llm_concurrency_limiter=llm_concurrency_limiter, epoch=epoch, exc=None)
+    return result
 
 
 def llm_job_func(func: F) -> F:
@@ -20,7 +157,8 @@ def llm_job_func(func: F) -> F:
     A decorator for asynchronous LLM job functions.
 
     This decorator wraps an asynchronous function that performs an LLM job,
-    adding logging, integrity checks, feasibility checks, job preparation,
+    adding logging, integrity checks, feasibility checks, job preparation, downscaling of prompt images,
+    response caching, de-duplication of identical in-flight jobs, rate limiting, adaptive concurrency,
     execution timing, and reporting.
 
     Args:
@@ -38,42 +176,136 @@ def llm_job_func(func: F) -> F:
         **kwargs: Any,
     ) -> Any:
         func_name = LLMWorkerJobFuncName(func.__name__)
-        log.debug(f"LLM Working async job function: '{func_name}'")
-        log.verbose(f"\n{self.llm_engine.desc}")
-        log.verbose(llm_job.params_desc)
-
-        # Verify that the job is valid
-        llm_job.validate_before_execution()
+        await prepare_llm_job(llm_worker=self, llm_job=llm_job, func_name=func_name)
 
-        # Verify feasibility
-        self.check_can_perform_job(llm_job=llm_job, func_name=func_name)
+        # Make the request key, shared by the response cache and the de-duplication of identical in-flight jobs
+        llm_response_cache = get_llm_response_cache()
+        is_single_flight_enabled = llm_job.job_config.is_single_flight_enabled
+        request_key: Optional[str] = None
+        schema: Optional[Type[BaseModel]] = None
+        if llm_response_cache or is_single_flight_enabled:
+            schema = _get_schema(func_name=func_name, args=args, kwargs=kwargs)
+            request_key = await make_llm_response_cache_key_async(func_name=func_name, llm_job=llm_job, llm_id=self.llm_engine.llm_id, schema=schema)
 
-        # TODO: Fix printing prompts that contain image bytes
-        # log.verbose(llm_job.llm_prompt.desc, title="llm_prompt")
+        async def call_func() -> Any:
+            started_at = time.perf_counter()
+            func_result = await func(self, llm_job, *args, **kwargs)
+            get_inference_manager().get_llm_latency_tracker(llm_engine=self.llm_engine).record(latency_seconds=time.perf_counter() - started_at)
+            return func_result
 
-        # metadata
-        llm_job.job_metadata.unit_job_id = self.unit_job_id(func_name=func_name)
-
-        # Prepare job
-        llm_job.llm_job_before_start(llm_engine=self.llm_engine)
+        async def execute_job() -> Any:
+            llm_rate_limiter, nb_tokens_reserved = await _reserve_rate_limit(llm_worker=self, llm_job=llm_job)
+            llm_concurrency_limiter = get_inference_manager().get_llm_concurrency_limiter(llm_engine=self.llm_engine)
+            try:
+                if llm_concurrency_limiter:
+                    job_result = await _run_with_concurrency_limiter(llm_worker=self, llm_concurrency_limiter=llm_concurrency_limiter, call=call_func)
+                else:
+                    job_result = await call_func()
+            except InstructorRetryException as exc:
+                raise LLMWorkerError(
+                    f"LLM Worker error: Instructor failed after retry with llm '{self.llm_engine.tag}': {exc}\nLLMPrompt: {llm_job.llm_prompt.desc}"
+                ) from exc
+            finally:
+                _reconcile_rate_limit(llm_job=llm_job, llm_rate_limiter=llm_rate_limiter, nb_tokens_reserved=nb_tokens_reserved)
+            if llm_response_cache and request_key:
+                llm_response_cache.set_response(cache_key=request_key, response=_dump_response(result=job_result))
+            return job_result
 
         # Execute job
-        try:
-            result = await func(self, llm_job, *args, **kwargs)
-        except InstructorRetryException as exc:
-            raise LLMWorkerError(
-                f"LLM Worker error: Instructor failed after retry with llm '{self.llm_engine.tag}': {exc}\nLLMPrompt: {llm_job.llm_prompt.desc}"
-            ) from exc
+        cached_response: Optional[str] = None
+        if llm_response_cache and request_key:
+            cached_response = llm_response_cache.get_response(cache_key=request_key)
+        if cached_response is not None:
+            log.debug(f"LLM response cache hit for '{func_name}' with llm '{self.llm_engine.tag}'")
+            result = _load_response(cached_response=cached_response, schema=schema)
+            llm_job.llm_job_after_cache_hit()
+        elif is_single_flight_enabled and request_key:
+            result, is_shared = await self.single_flight.run(key=request_key, call=execute_job)
+            if is_shared:
+                log.debug(f"LLM job '{func_name}' with llm '{self.llm_engine.tag}' joined an identical job in flight")
+                result = _copy_response(result=result)
+                llm_job.llm_job_after_cache_hit()
+        else:
+            result = await execute_job()
 
         # Cleanup result
         if hasattr(result, "_raw_response"):
             delattr(result, "_raw_response")
 
         # Report job
-        llm_job.llm_job_after_complete()
-        if self.report_delegate:
-            self.report_delegate.report_inference_job(inference_job=llm_job)
+        report_llm_job(llm_worker=self, llm_job=llm_job)
 
         return result
 
     return cast(F, wrapper)
+
+
+def llm_job_stream_func(func: StreamF) -> StreamF:
+    """
+    A decorator for LLM job functions which stream text chunks or list items as asynchronous generators.
+
+    It brings the same preparation, rate limiting, adaptive concurrency and reporting as llm_job_func,
+    and records the time to the first chunk or item in the job report. Text streams also share the response cache with gen_text:
+    a cached response is yielded as a single chunk. Streams are not de-duplicated as each caller consumes its own.
+
+    Args:
+        func (StreamF): The asynchronous generator function to be decorated.
+
+    Returns:
+        StreamF: The wrapped asynchronous generator function.
+    """
+
+    @wraps(func)
+    async def wrapper(
+        self: LLMWorkerAbstract,
+        llm_job: LLMJob,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        func_name = LLMWorkerJobFuncName(func.__name__)
+        await prepare_llm_job(llm_worker=self, llm_job=llm_job, func_name=func_name)
+
+        llm_response_cache = get_llm_response_cache() if func_name == LLMWorkerJobFuncName.GEN_TEXT_STREAM else None
+        request_key: Optional[str] = None
+        if llm_response_cache:
+            request_key = await make_llm_response_cache_key_async(
+                func_name=LLMWorkerJobFuncName.GEN_TEXT, llm_job=llm_job, llm_id=self.llm_engine.llm_id
+            )
+            if (cached_response := llm_response_cache.get_response(cache_key=request_key)) is not None:
+                log.debug(f"LLM response cache hit for '{func_name}' with llm '{self.llm_engine.tag}'")
+                llm_job.llm_job_after_cache_hit()
+                llm_job.job_report.time_to_first_token_seconds = 0
+                yield cached_response
+                report_llm_job(llm_worker=self, llm_job=llm_job)
+                return
+
+        llm_rate_limiter, nb_tokens_reserved = await _reserve_rate_limit(llm_worker=self, llm_job=llm_job)
+        llm_concurrency_limiter = get_inference_manager().get_llm_concurrency_limiter(llm_engine=self.llm_engine)
+        epoch = await llm_concurrency_limiter.acquire() if llm_concurrency_limiter else 0
+        chunks: List[Any] = []
+        started_at = time.perf_counter()
+        try:
+            async for chunk in func(self, llm_job, *args, **kwargs):
+                if not chunks:
+                    llm_job.job_report.time_to_first_token_seconds = time.perf_counter() - started_at
+                    log.debug(f"Time to first chunk with llm '{self.llm_engine.tag}': {llm_job.job_report.time_to_first_token_seconds:.3f}s")
+                chunks.append(chunk)
+                yield chunk
+        except BaseException as exc:
+            # this includes the GeneratorExit raised when the consumer stops before the end of the stream
+            if llm_concurrency_limiter:
+                _release_concurrency_slot(llm_worker=self, llm_concurrency_limiter=llm_concurrency_limiter, epoch=epoch, exc=exc)
+            raise
+        else:
+            if llm_concurrency_limiter:
+                _release_concurrency_slot(llm_worker=self, llm_concurrency_limiter=llm_concurrency_limiter, epoch=epoch, exc=None)
+        finally:
+            _reconcile_rate_limit(llm_job=llm_job, llm_rate_limiter=llm_rate_limiter, nb_tokens_reserved=nb_tokens_reserved)
+        get_inference_manager().get_llm_latency_tracker(llm_engine=self.llm_engine).record(latency_seconds=time.perf_counter() - started_at)
+
+        if llm_response_cache and request_key:
+            llm_response_cache.set_response(cache_key=request_key, response="".join(chunks))
+
+        report_llm_job(llm_worker=self, llm_job=llm_job)
+
+    return cast(StreamF, wrapper)
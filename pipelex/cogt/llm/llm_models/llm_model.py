@@ -9,6 +9,7 @@ from typing_extensions import Self
 
 from pipelex.cogt.exceptions import LLMModelDefinitionError
 from pipelex.cogt.llm.llm_models.llm_family import LLMFamily, LLMPlatform
+from pipelex.cogt.llm.llm_models.llm_rate_limits import LLMRateLimits
 from pipelex.cogt.llm.token_category import TokenCostsByCategoryDict
 
 LATEST_VERSION_NAME = "latest"
@@ -25,8 +26,13 @@ class LLMModel(BaseModel):
     cost_per_million_tokens_usd: Optional[TokenCostsByCategoryDict] = None
     platform_llm_id: Dict[LLMPlatform, str] = Field(..., min_length=1)
     max_tokens: Optional[int] = None
+    # the max number of input and output tokens, used to reject prompts which can't fit before sending them
+    context_window: Optional[int] = Field(None, gt=0)
+    # the longest image edge the model actually looks at, larger prompt images are downscaled before being uploaded
+    max_image_edge: Optional[int] = Field(None, gt=0)
 
     max_prompt_images: Optional[int] = Field(None, ge=0)
+    rate_limits: Dict[LLMPlatform, LLMRateLimits] = Field(default_factory=dict[LLMPlatform, LLMRateLimits])
 
     @model_validator(mode="after")
     def check_vision_and_nb_images(self) -> Self:
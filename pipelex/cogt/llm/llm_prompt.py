@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from pydantic import BaseModel
 from typing_extensions import override
@@ -18,6 +18,18 @@ class LLMPrompt(BaseModel):
     system_text: Optional[str] = None
     user_text: Optional[str] = None
     user_images: List[PromptImage] = []
+    # stable segments of the prompt, marked as cache breakpoints for the providers which support prompt caching:
+    # the system text, and a prefix of the user text such as a large document shared by all the items of a batch
+    is_system_text_cacheable: bool = False
+    cacheable_user_text_prefix: Optional[str] = None
+
+    def split_user_text(self) -> Tuple[Optional[str], Optional[str]]:
+        """Split the user text into its cacheable prefix, or None if it has none, and the rest of the text."""
+        prefix = self.cacheable_user_text_prefix
+        user_text = self.user_text
+        if prefix and user_text and len(user_text) > len(prefix) and user_text.startswith(prefix):
+            return prefix, user_text[len(prefix) :]
+        return None, user_text
 
     def validate_before_execution(self):
         reaction = runtime_manager.problem_reactions.job
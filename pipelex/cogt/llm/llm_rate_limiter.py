@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+import time
+from typing import Optional
+
+from pipelex import log
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_models.llm_rate_limits import LLMRateLimits
+from pipelex.cogt.llm.llm_token_estimator import NB_CHARS_PER_TOKEN_ESTIMATE, NB_TOKENS_PER_IMAGE_ESTIMATE
+from pipelex.cogt.llm.token_category import NbTokensByCategoryDict, TokenCategory
+from pipelex.tools.misc.token_bucket import TokenBucket
+
+
+def estimate_llm_job_nb_tokens(llm_job: LLMJob) -> int:
+    """
+    Estimate the tokens counted against the rate limit: the prompt, plus max_tokens which providers reserve for the output.
+    The prompt estimate made by the pre-flight check is used if there is one. Either way, it's reconciled with the actual usage.
+    """
+    nb_tokens = llm_job.job_report.nb_tokens_input_estimate
+    if nb_tokens is None:
+        llm_prompt = llm_job.llm_prompt
+        nb_chars = len(llm_prompt.system_text or "") + len(llm_prompt.user_text or "")
+        nb_tokens = nb_chars // NB_CHARS_PER_TOKEN_ESTIMATE + NB_TOKENS_PER_IMAGE_ESTIMATE * len(llm_prompt.user_images)
+    return nb_tokens + (llm_job.job_params.max_tokens or 0)
+
+
+class LLMRateLimiter:
+    """
+    Enforces the requests-per-minute and tokens-per-minute limits of one model on one platform.
+    Tokens are reserved up front from an estimate, then reconciled against the actual usage reported by the provider.
+    """
+
+    def __init__(self, rate_limits: LLMRateLimits):
+        self.rate_limits = rate_limits
+        self.request_bucket: Optional[TokenBucket] = None
+        self.token_bucket: Optional[TokenBucket] = None
+        if requests_per_minute := rate_limits.requests_per_minute:
+            self.request_bucket = TokenBucket.make_per_minute(nb_per_minute=requests_per_minute)
+        if tokens_per_minute := rate_limits.tokens_per_minute:
+            self.token_bucket = TokenBucket.make_per_minute(nb_per_minute=tokens_per_minute)
+
+    async def reserve(self, nb_tokens: int) -> int:
+        """
+        Wait for a request and the tokens to be available. Returns the number of tokens actually reserved, to be reconciled.
+        If the wait is cancelled, what was reserved is given back.
+        """
+        started_at = time.monotonic()
+        nb_tokens_reserved = 0
+        if self.request_bucket:
+            await self.request_bucket.acquire(amount=1)
+        if self.token_bucket:
+            try:
+                # the token bucket caps what it debits to its capacity, so the reservation may be smaller than the estimate
+                nb_tokens_reserved = int(await self.token_bucket.acquire(amount=nb_tokens))
+            except asyncio.CancelledError:
+                # the job is cancelled while it waits for tokens, e.g. as a sibling of a failed branch: its request is not sent
+                if self.request_bucket:
+                    self.request_bucket.adjust(amount=1)
+                raise
+        if (wait_seconds := time.monotonic() - started_at) >= 0.01:
+            log.debug(f"LLMRateLimiter: waited {wait_seconds:.2f}s to stay within {self.rate_limits}")
+        return nb_tokens_reserved
+
+    def reconcile(self, nb_tokens_reserved: int, nb_tokens_by_category: Optional[NbTokensByCategoryDict]):
+        """
+        Give back the tokens reserved in excess, or take the ones that were missing. Without usage, the whole reservation is given back.
+        nb_tokens_reserved must be what reserve() returned, not the estimate that was asked for.
+        """
+        if not self.token_bucket:
+            return
+        nb_tokens_used = 0
+        if nb_tokens_by_category:
+            nb_tokens_used = nb_tokens_by_category.get(TokenCategory.INPUT, 0) + nb_tokens_by_category.get(TokenCategory.OUTPUT, 0)
+        self.token_bucket.adjust(amount=nb_tokens_reserved - nb_tokens_used)
@@ -21,6 +21,8 @@ class LLMTokenCostReportField(StrEnum):
     LLM_FAMILY = "llm_family"
     VERSION = "version"
     PLATFORM_LLM_ID = "platform_llm_id"
+    IS_CACHE_HIT = "is_cache_hit"
+    IS_PROVIDER_BATCH = "is_provider_batch"
     NB_TOKENS_INPUT = "nb_tokens_input"
     NB_TOKENS_INPUT_CACHED = "nb_tokens_input_cached"
     NB_TOKENS_INPUT_NON_CACHED = "nb_tokens_input_non_cached"
@@ -47,6 +49,8 @@ class LLMTokenCostReport(BaseModel):
     llm_family: LLMFamily
     version: str
     platform_llm_id: str
+    is_cache_hit: bool = False
+    is_provider_batch: bool = False
 
     nb_tokens_by_category: NbTokensByCategoryDict
     costs_by_token_category: TokenCostsByCategoryDict
@@ -61,6 +65,8 @@ class LLMTokenCostReport(BaseModel):
             LLMTokenCostReportField.LLM_FAMILY: self.llm_family,
             LLMTokenCostReportField.VERSION: self.version,
             LLMTokenCostReportField.PLATFORM_LLM_ID: self.platform_llm_id,
+            LLMTokenCostReportField.IS_CACHE_HIT: self.is_cache_hit,
+            LLMTokenCostReportField.IS_PROVIDER_BATCH: self.is_provider_batch,
         }
         the_dict.update(dict_for_llm)
         dict_for_nb_tokens = {
@@ -104,10 +110,14 @@ class LLMTokensUsage(BaseModel):
     job_metadata: JobMetadata
     llm_engine: LLMEngine
     nb_tokens_by_category: NbTokensByCategoryDict
+    is_cache_hit: bool = False
+    is_provider_batch: bool = False
+    # discount applied to the model costs, e.g. for jobs run in a provider batch
+    cost_factor: float = 1.0
 
     def compute_cost_report(self) -> LLMTokenCostReport:
         costs_by_token_category: TokenCostsByCategoryDict = {
-            token_type: (model_cost_per_token(llm_engine=self.llm_engine, token_type=token_type) * nb_tokens)
+            token_type: (model_cost_per_token(llm_engine=self.llm_engine, token_type=token_type) * nb_tokens * self.cost_factor)
             for token_type, nb_tokens in self.nb_tokens_by_category.items()
         }
         token_cost_report = LLMTokenCostReport(
@@ -117,6 +127,8 @@ class LLMTokensUsage(BaseModel):
             llm_family=self.llm_engine.llm_model.llm_family,
             version=self.llm_engine.llm_model.version,
             platform_llm_id=self.llm_engine.llm_id,
+            is_cache_hit=self.is_cache_hit,
+            is_provider_batch=self.is_provider_batch,
             nb_tokens_by_category=self.nb_tokens_by_category,
             costs_by_token_category=costs_by_token_category,
         )
@@ -0,0 +1,200 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from typing_extensions import override
+
+from pipelex import log
+from pipelex.cogt.exceptions import LLMResponseCacheError
+from pipelex.cogt.image.prompt_image import PromptImage, PromptImageBlob, PromptImageBytes, PromptImagePath, PromptImageUrl
+from pipelex.cogt.image.prompt_image_cache import PromptImageCache
+from pipelex.cogt.image.prompt_image_factory import PromptImageFactory
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_response_cache_abstract import LLMResponseCacheAbstract
+from pipelex.cogt.llm.llm_response_cache_config import LLMResponseCacheConfig, LLMResponseCacheStoreType
+from pipelex.hub import get_prompt_image_cache
+from pipelex.tools.utils.file_utils import ensure_directory_exists
+
+
+async def _make_prompt_image_digest_async(prompt_image: PromptImage) -> str:
+    if isinstance(prompt_image, PromptImageBytes):
+        return hashlib.sha256(prompt_image.b64_image_bytes).hexdigest()
+    elif isinstance(prompt_image, PromptImagePath):
+        # the file contents are hashed rather than the path, so that an edited image is not answered from the cache:
+        # the digest held by the prompt image cache is reused, otherwise the file is read without blocking the event loop
+        prompt_image_cache = get_prompt_image_cache()
+        source_key = PromptImageCache.make_source_key(prompt_image=prompt_image)
+        if prompt_image_cache and source_key and (digest := prompt_image_cache.get_digest(source_key=source_key)):
+            return digest
+        b64_image_bytes = await PromptImageFactory.promptimage_to_b64_async(image_prompt=prompt_image)
+        return hashlib.sha256(b64_image_bytes).hexdigest()
+    elif isinstance(prompt_image, PromptImageBlob):
+        # the blob digest is already the sha256 of the image bytes
+        return prompt_image.blob_digest
+    elif isinstance(prompt_image, PromptImageUrl):
+        return f"url:{prompt_image.url}"
+    else:
+        raise LLMResponseCacheError(f"Cannot make a cache digest for prompt image of type '{type(prompt_image).__name__}'")
+
+
+async def make_llm_response_cache_key_async(
+    func_name: str,
+    llm_job: LLMJob,
+    llm_id: str,
+    schema: Optional[Type[BaseModel]] = None,
+) -> str:
+    """
+    Make a content hash of everything that determines the LLM response:
+    the prompt texts, the digests of the prompt images, the job params, the platform llm_id,
+    and, for object generation, the JSON schema of the response model.
+    """
+    llm_prompt = llm_job.llm_prompt
+    user_image_digests = [await _make_prompt_image_digest_async(prompt_image=prompt_image) for prompt_image in llm_prompt.user_images]
+    key_components: Dict[str, Any] = {
+        "func_name": func_name,
+        "llm_id": llm_id,
+        "system_text": llm_prompt.system_text,
+        "user_text": llm_prompt.user_text,
+        "user_images": user_image_digests,
+        "job_params": llm_job.job_params.model_dump(mode="json"),
+        "schema": schema.model_json_schema() if schema else None,
+    }
+    key_json = json.dumps(key_components, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(key_json.encode()).hexdigest()
+
+
+class MemoryLLMResponseCache(LLMResponseCacheAbstract):
+    """Keeps the responses in memory, evicting the least recently used ones beyond max_nb_entries."""
+
+    def __init__(self, max_nb_entries: int, ttl_seconds: Optional[int] = None):
+        self.max_nb_entries = max_nb_entries
+        self.ttl_seconds = ttl_seconds
+        self._responses: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+
+    @override
+    def setup(self) -> None:
+        pass
+
+    @override
+    def teardown(self) -> None:
+        self._responses.clear()
+
+    @override
+    def get_response(self, cache_key: str) -> Optional[str]:
+        cached = self._responses.get(cache_key)
+        if cached is None:
+            return None
+        created_at, response = cached
+        if self.ttl_seconds and time.time() - created_at > self.ttl_seconds:
+            del self._responses[cache_key]
+            return None
+        self._responses.move_to_end(cache_key)
+        return response
+
+    @override
+    def set_response(self, cache_key: str, response: str) -> None:
+        self._responses[cache_key] = (time.time(), response)
+        self._responses.move_to_end(cache_key)
+        while len(self._responses) > self.max_nb_entries:
+            self._responses.popitem(last=False)
+
+    @override
+    def clear(self) -> None:
+        self._responses.clear()
+
+
+class SQLiteLLMResponseCache(LLMResponseCacheAbstract):
+    """Persists the responses in a SQLite table, evicting the least recently used ones beyond max_nb_entries."""
+
+    def __init__(self, sqlite_path: str, max_nb_entries: int, ttl_seconds: Optional[int] = None):
+        self.sqlite_path = sqlite_path
+        self.max_nb_entries = max_nb_entries
+        self.ttl_seconds = ttl_seconds
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if directory_path := os.path.dirname(self.sqlite_path):
+                ensure_directory_exists(directory_path)
+            self._connection = sqlite3.connect(self.sqlite_path)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_response ("
+                "cache_key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS llm_response_last_used_at ON llm_response (last_used_at)")
+            self._connection.commit()
+        return self._connection
+
+    @override
+    def setup(self) -> None:
+        if self.ttl_seconds:
+            self.connection.execute("DELETE FROM llm_response WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self.connection.commit()
+
+    @override
+    def teardown(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @override
+    def get_response(self, cache_key: str) -> Optional[str]:
+        row = self.connection.execute("SELECT response, created_at FROM llm_response WHERE cache_key = ?", (cache_key,)).fetchone()
+        if row is None:
+            return None
+        response: str = row[0]
+        created_at: float = row[1]
+        now = time.time()
+        if self.ttl_seconds and now - created_at > self.ttl_seconds:
+            self.connection.execute("DELETE FROM llm_response WHERE cache_key = ?", (cache_key,))
+            self.connection.commit()
+            return None
+        self.connection.execute("UPDATE llm_response SET last_used_at = ? WHERE cache_key = ?", (now, cache_key))
+        self.connection.commit()
+        return response
+
+    @override
+    def set_response(self, cache_key: str, response: str) -> None:
+        now = time.time()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO llm_response (cache_key, response, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+            (cache_key, response, now, now),
+        )
+        self.connection.execute(
+            "DELETE FROM llm_response WHERE cache_key NOT IN (SELECT cache_key FROM llm_response ORDER BY last_used_at DESC LIMIT ?)",
+            (self.max_nb_entries,),
+        )
+        self.connection.commit()
+
+    @override
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM llm_response")
+        self.connection.commit()
+
+
+class LLMResponseCacheFactory:
+    @classmethod
+    def make_llm_response_cache(cls, llm_response_cache_config: LLMResponseCacheConfig) -> LLMResponseCacheAbstract:
+        log.debug(f"Making LLM response cache of type '{llm_response_cache_config.store_type}'")
+        match llm_response_cache_config.store_type:
+            case LLMResponseCacheStoreType.MEMORY:
+                return MemoryLLMResponseCache(
+                    max_nb_entries=llm_response_cache_config.max_nb_entries,
+                    ttl_seconds=llm_response_cache_config.applied_ttl_seconds,
+                )
+            case LLMResponseCacheStoreType.SQLITE:
+                return SQLiteLLMResponseCache(
+                    sqlite_path=llm_response_cache_config.sqlite_path,
+                    max_nb_entries=llm_response_cache_config.max_nb_entries,
+                    ttl_seconds=llm_response_cache_config.applied_ttl_seconds,
+                )
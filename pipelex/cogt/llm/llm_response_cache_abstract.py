@@ -0,0 +1,33 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class LLMResponseCacheAbstract(ABC):
+    """
+    Stores serialized LLM responses keyed by a content hash of the request,
+    so that identical LLM jobs are answered without calling the provider again.
+    """
+
+    @abstractmethod
+    def setup(self) -> None:
+        pass
+
+    @abstractmethod
+    def teardown(self) -> None:
+        pass
+
+    @abstractmethod
+    def get_response(self, cache_key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set_response(self, cache_key: str, response: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
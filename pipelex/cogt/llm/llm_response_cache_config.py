@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from enum import StrEnum
+from typing import Optional
+
+from pydantic import Field
+
+from pipelex.tools.config.models import ConfigModel
+
+
+class LLMResponseCacheStoreType(StrEnum):
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+
+
+class LLMResponseCacheConfig(ConfigModel):
+    is_enabled: bool
+    store_type: LLMResponseCacheStoreType = Field(strict=False)
+    max_nb_entries: int = Field(ge=1)
+    ttl_seconds: int = Field(ge=0)  # 0 means that cached responses never expire
+    sqlite_path: str
+
+    @property
+    def applied_ttl_seconds(self) -> Optional[int]:
+        return self.ttl_seconds or None
@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import random
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from pipelex import log
+from pipelex.cogt.llm.llm_models.llm_platform import LLMPlatform
+from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
+from pipelex.tools.misc.circuit_breaker import CircuitBreaker, CircuitBreakerState
+from pipelex.tools.misc.latency_tracker import LatencyTracker
+
+# the success rate used in the score is floored so that a platform with only failures still gets a finite score
+MIN_SUCCESS_RATE_FOR_SCORE = 0.05
+
+
+class LLMPlatformHealthMetrics(BaseModel):
+    llm_handle: str
+    llm_platform: LLMPlatform
+    nb_samples: int
+    median_latency_seconds: Optional[float]
+    error_rate: float
+    circuit_breaker_state: CircuitBreakerState
+
+
+class LLMPlatformHealth:
+    """Rolling latency and error statistics of an llm handle on one platform, with a circuit breaker."""
+
+    def __init__(self, window_size: int, failure_threshold: int, cool_down_seconds: float):
+        self.latency_tracker = LatencyTracker(max_nb_samples=window_size)
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.circuit_breaker = CircuitBreaker(failure_threshold=failure_threshold, cool_down_seconds=cool_down_seconds)
+
+    @property
+    def nb_samples(self) -> int:
+        return len(self.outcomes)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def score(self) -> Optional[float]:
+        """Expected time to get an answer, lower is healthier: the median latency divided by the success rate."""
+        median_latency_seconds = self.latency_tracker.get_percentile(percentile=50)
+        if median_latency_seconds is None:
+            return None
+        return median_latency_seconds / max(1 - self.error_rate, MIN_SUCCESS_RATE_FOR_SCORE)
+
+    def record_success(self, latency_seconds: float):
+        self.outcomes.append(True)
+        self.latency_tracker.record(latency_seconds=latency_seconds)
+        self.circuit_breaker.record_success()
+
+    def record_failure(self):
+        self.outcomes.append(False)
+        self.circuit_breaker.record_failure()
+
+
+class LLMRouter:
+    """
+    Orders the workers serving the model of an llm handle, one per platform, from the healthiest to the least healthy,
+    and takes the platforms whose circuit breaker is open out of rotation.
+    """
+
+    def __init__(
+        self,
+        min_nb_samples: int,
+        window_size: int,
+        exploration_rate: float,
+        failure_threshold: int,
+        cool_down_seconds: float,
+    ):
+        self.min_nb_samples = min_nb_samples
+        self.window_size = window_size
+        self.exploration_rate = exploration_rate
+        self.failure_threshold = failure_threshold
+        self.cool_down_seconds = cool_down_seconds
+        self.platform_healths: Dict[Tuple[str, LLMPlatform], LLMPlatformHealth] = {}
+
+    def get_platform_health(self, llm_handle: str, llm_platform: LLMPlatform) -> LLMPlatformHealth:
+        health_key = (llm_handle, llm_platform)
+        if health_key not in self.platform_healths:
+            self.platform_healths[health_key] = LLMPlatformHealth(
+                window_size=self.window_size,
+                failure_threshold=self.failure_threshold,
+                cool_down_seconds=self.cool_down_seconds,
+            )
+        return self.platform_healths[health_key]
+
+    def rank_llm_workers(self, llm_handle: str, llm_workers: List[LLMWorkerAbstract]) -> List[LLMWorkerAbstract]:
+        """
+        Rank the available workers, given in order of preference, by score.
+        Until a platform has min_nb_samples, the most preferred worker comes first and the other ones last.
+        Some jobs go to a random other platform instead, to keep the statistics of all platforms up to date.
+        """
+        available_llm_workers = [
+            llm_worker
+            for llm_worker in llm_workers
+            if self.get_platform_health(llm_handle=llm_handle, llm_platform=llm_worker.llm_engine.llm_platform).circuit_breaker.is_available
+        ]
+        if not available_llm_workers:
+            log.warning(f"All the platforms of llm handle '{llm_handle}' are out of rotation, trying them anyway")
+            available_llm_workers = llm_workers
+
+        def sort_key(index_and_worker: Tuple[int, LLMWorkerAbstract]) -> float:
+            index, llm_worker = index_and_worker
+            platform_health = self.get_platform_health(llm_handle=llm_handle, llm_platform=llm_worker.llm_engine.llm_platform)
+            score = platform_health.score
+            if platform_health.nb_samples < self.min_nb_samples or score is None:
+                return float("-inf") if index == 0 else float("inf")
+            return score
+
+        ranked_llm_workers = [llm_worker for _, llm_worker in sorted(enumerate(available_llm_workers), key=sort_key)]
+        if len(ranked_llm_workers) > 1 and random.random() < self.exploration_rate:
+            explored_llm_worker = random.choice(ranked_llm_workers[1:])
+            ranked_llm_workers.remove(explored_llm_worker)
+            ranked_llm_workers.insert(0, explored_llm_worker)
+        return ranked_llm_workers
+
+    def get_health_metrics(self) -> List[LLMPlatformHealthMetrics]:
+        health_metrics: List[LLMPlatformHealthMetrics] = []
+        for (llm_handle, llm_platform), platform_health in self.platform_healths.items():
+            health_metrics.append(
+                LLMPlatformHealthMetrics(
+                    llm_handle=llm_handle,
+                    llm_platform=llm_platform,
+                    nb_samples=platform_health.nb_samples,
+                    median_latency_seconds=platform_health.latency_tracker.get_percentile(percentile=50),
+                    error_rate=platform_health.error_rate,
+                    circuit_breaker_state=platform_health.circuit_breaker.state,
+                )
+            )
+        return health_metrics
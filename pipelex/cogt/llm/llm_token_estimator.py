@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import base64
+import binascii
+import importlib
+import io
+import math
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image, UnidentifiedImageError
+
+from pipelex import log
+from pipelex.cogt.image.prompt_image import PromptImage, PromptImageBlob, PromptImageBytes, PromptImagePath
+from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
+from pipelex.cogt.llm.llm_models.llm_family import LLMCreator, LLMFamily
+from pipelex.cogt.llm.llm_prompt import LLMPrompt
+from pipelex.cogt.llm.llm_report import model_cost_per_token
+from pipelex.cogt.llm.token_category import TokenCategory
+from pipelex.tools.blob.blob_store import get_hub_blob_store
+
+# fallback heuristics, for the families without a local tokenizer and the images whose size can't be read
+NB_CHARS_PER_TOKEN_ESTIMATE = 4
+NB_TOKENS_PER_IMAGE_ESTIMATE = 1000
+
+# the tiktoken encodings of the OpenAI families, used if tiktoken is installed
+TIKTOKEN_ENCODING_BY_FAMILY: Dict[LLMFamily, str] = {
+    LLMFamily.GPT_3_5: "cl100k_base",
+    LLMFamily.GPT_4: "cl100k_base",
+    LLMFamily.GPT_4O: "o200k_base",
+    LLMFamily.GPT_4_1: "o200k_base",
+    LLMFamily.GPT_4_5: "o200k_base",
+    LLMFamily.O_SERIES: "o200k_base",
+}
+
+# enough of a base64 image to decode the header holding its size, without decoding the whole image
+IMAGE_HEADER_B64_PREFIX_LENGTH = 256 * 1024
+
+
+@lru_cache(maxsize=None)
+def _get_tiktoken_encoding(encoding_name: str) -> Optional[Any]:
+    """Load the tiktoken encoding once per process, or None if tiktoken is not installed or the encoding can't be loaded."""
+    try:
+        tiktoken = importlib.import_module("tiktoken")
+        return tiktoken.get_encoding(encoding_name)
+    except ImportError:
+        return None
+    except Exception as exc:
+        # the encoding files are downloaded on first use, which can fail offline
+        log.warning(f"Could not load tiktoken encoding '{encoding_name}', falling back to the heuristic: {exc}")
+        return None
+
+
+def _get_image_size(prompt_image: PromptImage) -> Optional[Tuple[int, int]]:
+    """Read the width and height of the image from its header, or None for URLs and unreadable images."""
+    try:
+        if isinstance(prompt_image, PromptImageBytes):
+            b64_header = prompt_image.b64_image_bytes[:IMAGE_HEADER_B64_PREFIX_LENGTH]
+            with Image.open(io.BytesIO(base64.b64decode(b64_header))) as image:
+                return image.size
+        elif isinstance(prompt_image, PromptImagePath):
+            with Image.open(prompt_image.file_path) as image:
+                return image.size
+        elif isinstance(prompt_image, PromptImageBlob):
+            with Image.open(io.BytesIO(get_hub_blob_store().get_bytes(digest=prompt_image.blob_digest))) as image:
+                return image.size
+    except (OSError, UnidentifiedImageError, binascii.Error):
+        pass
+    return None
+
+
+class LLMTokenEstimator:
+    """
+    Estimates the tokens of a prompt before it's sent, to guard the context window, reserve rate limits and estimate costs.
+    OpenAI families are counted with tiktoken when it's installed, other families and images use heuristics.
+    """
+
+    @classmethod
+    def estimate_text_nb_tokens(cls, text: str, llm_family: LLMFamily) -> int:
+        if encoding_name := TIKTOKEN_ENCODING_BY_FAMILY.get(llm_family):
+            if encoding := _get_tiktoken_encoding(encoding_name=encoding_name):
+                return len(encoding.encode(text, disallowed_special=()))
+        return len(text) // NB_CHARS_PER_TOKEN_ESTIMATE
+
+    @classmethod
+    def estimate_image_nb_tokens(cls, prompt_image: PromptImage, llm_family: LLMFamily) -> int:
+        image_size = _get_image_size(prompt_image=prompt_image)
+        if image_size is None:
+            return NB_TOKENS_PER_IMAGE_ESTIMATE
+        width, height = image_size
+        match llm_family.creator:
+            case LLMCreator.OPENAI:
+                # high detail: fit within 2048x2048, scale the shortest side down to 768, then 170 tokens per 512px tile plus 85
+                scale = min(1.0, 2048 / max(width, height))
+                scale *= min(1.0, 768 / (min(width, height) * scale))
+                nb_tiles = math.ceil(width * scale / 512) * math.ceil(height * scale / 512)
+                return 85 + 170 * nb_tiles
+            case LLMCreator.ANTHROPIC:
+                # images are scaled down to fit 1568px on their long edge, then cost about one token per 750 pixels
+                scale = min(1.0, 1568 / max(width, height))
+                return math.ceil(width * scale * height * scale / 750)
+            case _:
+                return NB_TOKENS_PER_IMAGE_ESTIMATE
+
+    @classmethod
+    def estimate_prompt_nb_tokens(cls, llm_prompt: LLMPrompt, llm_family: LLMFamily) -> int:
+        nb_tokens = 0
+        for text in (llm_prompt.system_text, llm_prompt.user_text):
+            if text:
+                nb_tokens += cls.estimate_text_nb_tokens(text=text, llm_family=llm_family)
+        for prompt_image in llm_prompt.user_images:
+            nb_tokens += cls.estimate_image_nb_tokens(prompt_image=prompt_image, llm_family=llm_family)
+        return nb_tokens
+
+    @classmethod
+    def estimate_cost(cls, llm_engine: LLMEngine, nb_tokens_input: int, nb_tokens_output: int) -> float:
+        """The cost of the job in USD, without prompt caching discounts. Pass the output budget to get an upper bound."""
+        input_cost = nb_tokens_input * model_cost_per_token(llm_engine=llm_engine, token_type=TokenCategory.INPUT)
+        output_cost = nb_tokens_output * model_cost_per_token(llm_engine=llm_engine, token_type=TokenCategory.OUTPUT)
+        return input_cost + output_cost
@@ -4,23 +4,29 @@
 
 from abc import ABC, abstractmethod
 from enum import StrEnum
-from typing import Optional, Type
+from typing import Any, AsyncIterator, Optional, Type
 
 from typing_extensions import override
 
-from pipelex.cogt.exceptions import LLMCapabilityError
+from pipelex import log
+from pipelex.cogt.exceptions import LLMCapabilityError, LLMContextWindowError
 from pipelex.cogt.inference.inference_report_delegate import InferenceReportDelegate
 from pipelex.cogt.inference.inference_worker_abstract import InferenceWorkerAbstract
+from pipelex.cogt.llm.llm_batch_client_abstract import LLMBatchClientAbstract
 from pipelex.cogt.llm.llm_job import LLMJob
 from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
+from pipelex.cogt.llm.llm_token_estimator import LLMTokenEstimator
 from pipelex.cogt.llm.structured_output import StructureMethod
 from pipelex.mission.job_metadata import UnitJobId
 from pipelex.tools.misc.model_helpers import BaseModelType
+from pipelex.tools.misc.single_flight import SingleFlight
 
 
 class LLMWorkerJobFuncName(StrEnum):
     GEN_TEXT = "gen_text"
+    GEN_TEXT_STREAM = "gen_text_stream"
     GEN_OBJECT = "gen_object"
+    GEN_OBJECT_LIST_STREAM = "gen_object_list_stream"
 
 
 class LLMWorkerAbstract(InferenceWorkerAbstract, ABC):
@@ -41,6 +47,7 @@ class LLMWorkerAbstract(InferenceWorkerAbstract, ABC):
         InferenceWorkerAbstract.__init__(self, report_delegate=report_delegate)
         self.llm_engine = llm_engine
         self.structure_method = structure_method
+        self.single_flight = SingleFlight[Any]()
 
     #########################################################
     # Instance methods
@@ -51,20 +58,36 @@ class LLMWorkerAbstract(InferenceWorkerAbstract, ABC):
     def desc(self) -> str:
         return f"LLM Worker using:\n{self.llm_engine.desc}"
 
+    @property
+    def is_text_streaming_supported(self) -> bool:
+        return False
+
+    @property
+    def is_object_list_streaming_supported(self) -> bool:
+        return False
+
     def unit_job_id(self, func_name: LLMWorkerJobFuncName) -> UnitJobId:
         match func_name:
-            case LLMWorkerJobFuncName.GEN_TEXT:
+            case LLMWorkerJobFuncName.GEN_TEXT | LLMWorkerJobFuncName.GEN_TEXT_STREAM:
                 return UnitJobId.LLM_GEN_TEXT
-            case LLMWorkerJobFuncName.GEN_OBJECT:
+            case LLMWorkerJobFuncName.GEN_OBJECT | LLMWorkerJobFuncName.GEN_OBJECT_LIST_STREAM:
                 return UnitJobId.LLM_GEN_OBJECT
 
     def check_can_perform_job(self, llm_job: LLMJob, func_name: LLMWorkerJobFuncName):
         match func_name:
             case LLMWorkerJobFuncName.GEN_TEXT:
                 pass
+            case LLMWorkerJobFuncName.GEN_TEXT_STREAM:
+                if not self.is_text_streaming_supported:
+                    raise LLMCapabilityError(f"LLM Worker for '{self.llm_engine.tag}' does not support text streaming.")
             case LLMWorkerJobFuncName.GEN_OBJECT:
                 if not self.llm_engine.is_gen_object_supported:
                     raise LLMCapabilityError(f"LLM Engine '{self.llm_engine.tag}' does not support object generation.")
+            case LLMWorkerJobFuncName.GEN_OBJECT_LIST_STREAM:
+                if not self.llm_engine.is_gen_object_supported:
+                    raise LLMCapabilityError(f"LLM Engine '{self.llm_engine.tag}' does not support object generation.")
+                if not self.is_object_list_streaming_supported:
+                    raise LLMCapabilityError(f"LLM Worker for '{self.llm_engine.tag}' does not support object list streaming.")
 
         if llm_job.llm_prompt.user_images:
             if not self.llm_engine.llm_model.is_vision_supported:
@@ -75,6 +98,56 @@ class LLMWorkerAbstract(InferenceWorkerAbstract, ABC):
             if nb_images > max_prompt_images:
                 raise LLMCapabilityError(f"LLM Engine '{self.llm_engine.tag}' does not accept that many images: {nb_images}.")
 
+        self._check_context_window(llm_job=llm_job)
+
+    def _check_context_window(self, llm_job: LLMJob):
+        """
+        Estimate the tokens of the prompt and, before anything is uploaded, reject a prompt which can't fit in the context window.
+        If the prompt fits but leaves less than max_tokens for the output, max_tokens is trimmed to what is left.
+        """
+        llm_model = self.llm_engine.llm_model
+        nb_tokens_input = LLMTokenEstimator.estimate_prompt_nb_tokens(llm_prompt=llm_job.llm_prompt, llm_family=llm_model.llm_family)
+        llm_job.job_report.nb_tokens_input_estimate = nb_tokens_input
+
+        context_window = llm_model.context_window
+        if context_window and llm_job.job_config.is_context_window_guard_enabled:
+            if nb_tokens_input >= context_window:
+                raise LLMContextWindowError(
+                    f"Prompt of about {nb_tokens_input} tokens does not fit in the {context_window} tokens context window "
+                    f"of LLM Engine '{self.llm_engine.tag}'."
+                )
+            nb_tokens_left = context_window - nb_tokens_input
+            max_tokens = llm_job.job_params.max_tokens or llm_model.max_tokens
+            if max_tokens and max_tokens > nb_tokens_left:
+                log.warning(
+                    f"Prompt of about {nb_tokens_input} tokens leaves {nb_tokens_left} of the {context_window} tokens context window "
+                    f"of LLM Engine '{self.llm_engine.tag}', max_tokens trimmed from {max_tokens}"
+                )
+                llm_job.job_params.max_tokens = nb_tokens_left
+
+        if llm_model.cost_per_million_tokens_usd:
+            llm_job.job_report.cost_estimate_usd = LLMTokenEstimator.estimate_cost(
+                llm_engine=self.llm_engine,
+                nb_tokens_input=nb_tokens_input,
+                nb_tokens_output=llm_job.job_params.max_tokens or llm_model.max_tokens or 0,
+            )
+
+    def make_llm_batch_client(self) -> Optional[LLMBatchClientAbstract]:
+        """The client of the provider batch API, to be overridden by the workers whose platform has one."""
+        return None
+
+    def is_throttling_error(self, exc: BaseException) -> bool:
+        """Whether the exception is the provider throttling us (rate limited or overloaded), to be overridden by SDK-specific workers."""
+        return False
+
+    def is_transient_error(self, exc: BaseException) -> bool:
+        """Whether the job may succeed if retried: throttling, and SDK-specific timeouts, connection errors or server errors."""
+        return self.is_throttling_error(exc=exc)
+
+    def get_retry_after_seconds(self, exc: BaseException) -> Optional[float]:
+        """The delay the provider asked to wait before retrying, if the exception carries one, to be overridden by SDK-specific workers."""
+        return None
+
     @abstractmethod
     async def gen_text(
         self,
@@ -82,6 +155,13 @@ class LLMWorkerAbstract(InferenceWorkerAbstract, ABC):
     ) -> str:
         pass
 
+    def gen_text_stream(
+        self,
+        llm_job: LLMJob,
+    ) -> AsyncIterator[str]:
+        """Generate text, yielding chunks as they arrive, to be overridden by the workers which support streaming."""
+        raise LLMCapabilityError(f"LLM Worker for '{self.llm_engine.tag}' does not support text streaming.")
+
     @abstractmethod
     async def gen_object(
         self,
@@ -89,3 +169,11 @@ class LLMWorkerAbstract(InferenceWorkerAbstract, ABC):
         schema: Type[BaseModelType],
     ) -> BaseModelType:
         pass
+
+    def gen_object_list_stream(
+        self,
+        llm_job: LLMJob,
+        schema: Type[BaseModelType],
+    ) -> AsyncIterator[BaseModelType]:
+        """Generate a list of objects of the schema, yielding each item as soon as it's parsed, to be overridden by the workers which support it."""
+        raise LLMCapabilityError(f"LLM Worker for '{self.llm_engine.tag}' does not support object list streaming.")
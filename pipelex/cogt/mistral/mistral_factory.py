@@ -26,18 +26,20 @@ from openai.types.chat import (
 from pipelex.cogt.exceptions import PromptImageFormatError
 from pipelex.cogt.image.prompt_image import (
     PromptImage,
+    PromptImageBlob,
     PromptImageBytes,
     PromptImagePath,
     PromptImageUrl,
 )
+from pipelex.cogt.image.prompt_image_factory import PromptImageFactory
 from pipelex.cogt.llm.llm_job import LLMJob
 from pipelex.cogt.llm.llm_report import NbTokensByCategoryDict
 from pipelex.cogt.llm.token_category import TokenCategory
 from pipelex.cogt.ocr.ocr_output import ExtractedImageFromPage, OcrOutput, Page
 from pipelex.cogt.openai.openai_factory import OpenAIFactory
 from pipelex.config import get_config
-from pipelex.hub import get_secrets_provider
-from pipelex.tools.misc.base_64 import encode_to_base64, load_binary_as_base64
+from pipelex.hub import get_blob_store, get_secrets_provider
+from pipelex.tools.misc.base_64 import decode_base64_str
 
 
 class MistralFactory:
@@ -79,14 +81,14 @@ class MistralFactory:
     def make_mistral_image_url(cls, prompt_image: PromptImage) -> ImageURLChunk:
         if isinstance(prompt_image, PromptImageUrl):
             return ImageURLChunk(image_url=prompt_image.url)
-        elif isinstance(prompt_image, PromptImagePath):
-            image_bytes = load_binary_as_base64(prompt_image.file_path).decode("utf-8")
+        elif isinstance(prompt_image, (PromptImagePath, PromptImageBlob)):
+            image_bytes = PromptImageFactory.promptimage_to_b64(image_prompt=prompt_image).decode("utf-8")
             # TODO: use actual image type
             return ImageURLChunk(image_url=f"data:image/png;base64,{image_bytes}")
         elif isinstance(prompt_image, PromptImageBytes):
-            image_bytes = encode_to_base64(prompt_image.b64_image_bytes).decode("utf-8")
-            # TODO: use actual image type
-            return ImageURLChunk(image_url=f"data:image/png;base64,{image_bytes}")
+            # the bytes are already base64, and prepared images may be jpeg or webp
+            mime = prompt_image.get_file_type().mime
+            return ImageURLChunk(image_url=f"data:{mime};base64,{prompt_image.b64_image_bytes.decode('utf-8')}")
         else:
             raise PromptImageFormatError(f"prompt_image of type {type(prompt_image)} is not supported")
 
@@ -149,6 +151,11 @@ class MistralFactory:
             pages=pages,
         )
 
+    @classmethod
+    def _put_image_base64_in_blob_store(cls, image_base64: str) -> str:
+        """Store the decoded image once in the blob store, so that the stuff only carries its digest."""
+        return get_blob_store().put_bytes(data=decode_base64_str(b64=image_base64))
+
     @classmethod
     def make_extracted_image_from_page_from_mistral_ocr_image_obj(
         cls,
@@ -160,6 +167,8 @@ class MistralFactory:
             top_left_y=mistral_ocr_image_obj.top_left_y,
             bottom_right_x=mistral_ocr_image_obj.bottom_right_x,
             bottom_right_y=mistral_ocr_image_obj.bottom_right_y,
-            base_64=mistral_ocr_image_obj.image_base64 if mistral_ocr_image_obj.image_base64 else None,
+            blob_digest=cls._put_image_base64_in_blob_store(image_base64=mistral_ocr_image_obj.image_base64)
+            if mistral_ocr_image_obj.image_base64
+            else None,
         )
         return extracted_image
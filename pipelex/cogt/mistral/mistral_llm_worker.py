@@ -2,18 +2,19 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Any, Optional, Type
+from typing import Any, AsyncIterator, Optional, Type
 
+import httpx
 import instructor
 from mistralai import Mistral
-from mistralai.models import ChatCompletionResponse
+from mistralai.models import ChatCompletionResponse, SDKError
 from typing_extensions import override
 
 from pipelex import log
 from pipelex.cogt.exceptions import LLMCompletionError, LLMEngineParameterError, SdkTypeError
 from pipelex.cogt.inference.inference_report_delegate import InferenceReportDelegate
 from pipelex.cogt.llm.llm_job import LLMJob
-from pipelex.cogt.llm.llm_job_func import llm_job_func
+from pipelex.cogt.llm.llm_job_func import llm_job_func, llm_job_stream_func
 from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
 from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
 from pipelex.cogt.llm.structured_output import StructureMethod
@@ -49,6 +50,19 @@ class MistralLLMWorker(LLMWorkerAbstract):
         else:
             self.instructor_for_objects = instructor.from_mistral(client=sdk_instance, use_async=True)
 
+    @property
+    @override
+    def is_text_streaming_supported(self) -> bool:
+        return True
+
+    @override
+    def is_throttling_error(self, exc: BaseException) -> bool:
+        return isinstance(exc, SDKError) and exc.status_code == 429
+
+    @override
+    def is_transient_error(self, exc: BaseException) -> bool:
+        return isinstance(exc, httpx.TransportError) or (isinstance(exc, SDKError) and (exc.status_code == 429 or exc.status_code >= 500))
+
     @override
     @llm_job_func
     async def gen_text(
@@ -75,6 +89,29 @@ class MistralLLMWorker(LLMWorkerAbstract):
 
         return mistral_response_content
 
+    @override
+    @llm_job_stream_func
+    async def gen_text_stream(
+        self,
+        llm_job: LLMJob,
+    ) -> AsyncIterator[str]:
+        messages = MistralFactory.make_simple_messages(llm_job=llm_job)
+        stream = await self.mistral_client_for_text.chat.stream_async(
+            messages=messages,
+            model=self.llm_engine.llm_id,
+            temperature=llm_job.job_params.temperature,
+            max_tokens=llm_job.job_params.max_tokens or self.default_max_tokens,
+        )
+        async with stream:
+            async for event in stream:
+                chunk = event.data
+                if chunk.choices:
+                    text_chunk = chunk.choices[0].delta.content
+                    if isinstance(text_chunk, str) and text_chunk:
+                        yield text_chunk
+                if (llm_tokens_usage := llm_job.job_report.llm_tokens_usage) and (usage := chunk.usage):
+                    llm_tokens_usage.nb_tokens_by_category = MistralFactory.make_nb_tokens_by_category(usage=usage)
+
     @override
     @llm_job_func
     async def gen_object(
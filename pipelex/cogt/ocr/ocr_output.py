@@ -7,23 +7,33 @@ from typing import Dict, List, Optional
 from pydantic import Field
 
 from pipelex import log
-from pipelex.tools.misc.base_64 import save_base64_to_binary_file
+from pipelex.tools.blob.blob_store import get_hub_blob_store
+from pipelex.tools.misc.base_64 import decode_base64_str
 from pipelex.tools.misc.custom_base_model import CustomBaseModel
-from pipelex.tools.utils.file_utils import ensure_directory_exists, save_text_to_path
+from pipelex.tools.utils.file_utils import ensure_directory_exists, save_bytes_to_binary_file, save_text_to_path
 
 
 class ExtractedImage(CustomBaseModel):
     image_id: str
     base_64: Optional[str] = None
+    # reference to the image bytes in the blob store, rather than the whole image as base64 text
+    blob_digest: Optional[str] = None
     caption: Optional[str] = None
 
+    def get_image_bytes(self) -> Optional[bytes]:
+        if self.blob_digest:
+            return get_hub_blob_store().get_bytes(digest=self.blob_digest)
+        elif self.base_64:
+            return decode_base64_str(b64=self.base_64)
+        return None
+
     def save_to_directory(self, directory: str):
         ensure_directory_exists(directory)
         log.debug(f"Saving image to directory: {directory}")
-        if base_64 := self.base_64:
+        if image_bytes := self.get_image_bytes():
             filename = self.image_id
             file_path = f"{directory}/{filename}"
-            save_base64_to_binary_file(b64=base_64, file_path=file_path)
+            save_bytes_to_binary_file(file_path=file_path, byte_data=image_bytes)
 
 
 class ExtractedImageFromPage(ExtractedImage):
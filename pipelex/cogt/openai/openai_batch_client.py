@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import json
+from typing import Any, Dict, List, Literal, Optional
+
+import openai
+from typing_extensions import override
+
+from pipelex.cogt.llm.llm_batch_client_abstract import LLMBatchClientAbstract, LLMBatchRequest, LLMBatchResult, LLMBatchStatus
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
+from pipelex.cogt.llm.token_category import NbTokensByCategoryDict, TokenCategory
+from pipelex.cogt.openai.openai_factory import OpenAIFactory
+
+OPENAI_BATCH_ENDPOINT: Literal["/v1/chat/completions"] = "/v1/chat/completions"
+OPENAI_BATCH_IN_PROGRESS_STATUSES = ("validating", "in_progress", "finalizing")
+
+
+class OpenAIBatchClient(LLMBatchClientAbstract):
+    """Runs chat completions through the OpenAI Batch API: the requests are uploaded as a JSONL file, and so are the results."""
+
+    def __init__(self, openai_client: openai.AsyncOpenAI):
+        self.openai_client = openai_client
+
+    @override
+    async def make_request(self, custom_id: str, llm_job: LLMJob, llm_engine: LLMEngine) -> LLMBatchRequest:
+        body: Dict[str, Any] = {
+            "model": llm_engine.llm_id,
+            "messages": OpenAIFactory.make_simple_messages(llm_job=llm_job, llm_engine=llm_engine),
+            **OpenAIFactory.make_sampling_params(llm_job=llm_job, llm_engine=llm_engine),
+        }
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": OPENAI_BATCH_ENDPOINT,
+            "body": body,
+        }
+
+    @override
+    async def submit_batch(self, requests: List[LLMBatchRequest]) -> str:
+        jsonl_bytes = "\n".join(json.dumps(request) for request in requests).encode("utf-8")
+        input_file = await self.openai_client.files.create(file=("batch_requests.jsonl", jsonl_bytes), purpose="batch")
+        batch = await self.openai_client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=OPENAI_BATCH_ENDPOINT,
+            completion_window="24h",
+        )
+        return batch.id
+
+    @override
+    async def get_batch_status(self, batch_id: str) -> LLMBatchStatus:
+        batch = await self.openai_client.batches.retrieve(batch_id)
+        if batch.status in OPENAI_BATCH_IN_PROGRESS_STATUSES:
+            return LLMBatchStatus.IN_PROGRESS
+        elif batch.status == "completed":
+            return LLMBatchStatus.COMPLETED
+        else:
+            # failed, expired, cancelling or cancelled
+            return LLMBatchStatus.FAILED
+
+    @override
+    async def download_batch_results(self, batch_id: str) -> Dict[str, LLMBatchResult]:
+        batch = await self.openai_client.batches.retrieve(batch_id)
+        results: Dict[str, LLMBatchResult] = {}
+        # failed requests are listed in the error file
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            file_content = await self.openai_client.files.content(file_id)
+            for line in file_content.text.splitlines():
+                if line.strip():
+                    result = self._make_result(result_dict=json.loads(line))
+                    results[result.custom_id] = result
+        return results
+
+    @staticmethod
+    def _make_result(result_dict: Dict[str, Any]) -> LLMBatchResult:
+        custom_id: str = result_dict["custom_id"]
+        if error := result_dict.get("error"):
+            return LLMBatchResult(custom_id=custom_id, error=str(error))
+        response: Dict[str, Any] = result_dict.get("response") or {}
+        body: Dict[str, Any] = response.get("body") or {}
+        if response.get("status_code") != 200:
+            return LLMBatchResult(custom_id=custom_id, error=f"status {response.get('status_code')}: {body.get('error', body)}")
+        nb_tokens_by_category: Optional[NbTokensByCategoryDict] = None
+        if usage := body.get("usage"):
+            nb_tokens_by_category = {
+                TokenCategory.INPUT: usage["prompt_tokens"],
+                TokenCategory.OUTPUT: usage["completion_tokens"],
+            }
+        return LLMBatchResult(
+            custom_id=custom_id,
+            text=body["choices"][0]["message"]["content"],
+            nb_tokens_by_category=nb_tokens_by_category,
+        )
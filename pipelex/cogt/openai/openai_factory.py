@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Dict, List
+from typing import Any, Dict, List
 
 import openai
 from openai.types.chat import (
@@ -18,15 +18,16 @@ from openai.types.completion_usage import CompletionUsage
 
 from pipelex import log
 from pipelex.cogt.exceptions import CogtError
-from pipelex.cogt.image.prompt_image import PromptImage, PromptImageBytes, PromptImagePath, PromptImageUrl
+from pipelex.cogt.image.prompt_image import PromptImage, PromptImageBlob, PromptImageBytes, PromptImagePath, PromptImageUrl
+from pipelex.cogt.image.prompt_image_factory import PromptImageFactory
 from pipelex.cogt.llm.llm_job import LLMJob
 from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
+from pipelex.cogt.llm.llm_models.llm_family import LLMFamily
 from pipelex.cogt.llm.llm_models.llm_platform import LLMPlatform
 from pipelex.cogt.llm.llm_report import NbTokensByCategoryDict
 from pipelex.cogt.llm.token_category import TokenCategory
 from pipelex.config import get_config
 from pipelex.hub import get_secrets_provider
-from pipelex.tools.misc.base_64 import load_binary_as_base64
 
 
 class OpenAIFactoryError(CogtError):
@@ -36,6 +37,7 @@ class OpenAIFactoryError(CogtError):
 class OpenAIFactory:
     @classmethod
     def make_openai_client(cls, llm_platform: LLMPlatform) -> openai.AsyncClient:
+        # the clients don't retry on their own: retries are made by dispatch_llm_job, which would otherwise multiply them
         the_client: openai.AsyncOpenAI
 
         match llm_platform:
@@ -50,6 +52,7 @@ class OpenAIFactory:
                     azure_endpoint=azure_endpoint,
                     api_key=api_key,
                     api_version=api_version,
+                    max_retries=0,
                 )
             case LLMPlatform.PERPLEXITY:
                 perplexity_config = get_config().cogt.llm_config.perplexity_config
@@ -60,11 +63,12 @@ class OpenAIFactory:
                 the_client = openai.AsyncOpenAI(
                     api_key=api_key,
                     base_url=endpoint,
+                    max_retries=0,
                 )
             case LLMPlatform.OPENAI:
                 openai_openai_config = get_config().cogt.llm_config.openai_openai_config
                 api_key = openai_openai_config.get_api_key(secrets_provider=get_secrets_provider())
-                the_client = openai.AsyncOpenAI(api_key=api_key)
+                the_client = openai.AsyncOpenAI(api_key=api_key, max_retries=0)
             case LLMPlatform.VERTEXAI_OPENAI:
                 vertexai_config = get_config().cogt.llm_config.vertexai_config
                 project_id = vertexai_config.project_id
@@ -76,6 +80,7 @@ class OpenAIFactory:
                 the_client = openai.AsyncOpenAI(
                     api_key=api_key,
                     base_url=endpoint,
+                    max_retries=0,
                 )
             case _:
                 raise OpenAIFactoryError(f"Platform '{llm_platform}' is not supported by this factory '{cls.__name__}'")
@@ -110,17 +115,44 @@ class OpenAIFactory:
         messages.append(ChatCompletionUserMessageParam(role="user", content=user_contents))
         return messages
 
+    @classmethod
+    def make_sampling_params(cls, llm_job: LLMJob, llm_engine: LLMEngine) -> Dict[str, Any]:
+        """
+        Makes the temperature, max tokens and seed params of a chat completion, which depend on the LLM family.
+        The params which are not set are left out, so that they're JSON serializable for the batch API.
+        """
+        job_params = llm_job.job_params
+        sampling_params: Dict[str, Any] = {}
+        match llm_engine.llm_model.llm_family:
+            case LLMFamily.O_SERIES:
+                # for o1 models, we must use temperature=1, and tokens limit is named max_completion_tokens
+                sampling_params["temperature"] = 1
+                if max_tokens := job_params.max_tokens:
+                    sampling_params["max_completion_tokens"] = max_tokens
+            case LLMFamily.GEMINI:
+                # for gemini models, we multiply the temperature by 2 because the range is 0-2
+                sampling_params["temperature"] = job_params.temperature * 2
+                if max_tokens := job_params.max_tokens:
+                    sampling_params["max_tokens"] = max_tokens
+            case _:
+                sampling_params["temperature"] = job_params.temperature
+                if max_tokens := job_params.max_tokens:
+                    sampling_params["max_tokens"] = max_tokens
+        if job_params.seed is not None:
+            sampling_params["seed"] = job_params.seed
+        return sampling_params
+
     @classmethod
     def make_openai_image_url(cls, prompt_image: PromptImage) -> ImageURL:
         if isinstance(prompt_image, PromptImageUrl):
             url = prompt_image.url
             openai_image_url = ImageURL(url=url, detail="high")
         elif isinstance(prompt_image, PromptImageBytes):
-            # TODO: manage image type
-            url_with_bytes: str = f"data:image/jpeg;base64,{prompt_image.b64_image_bytes.decode('utf-8')}"
+            mime = prompt_image.get_file_type().mime
+            url_with_bytes: str = f"data:{mime};base64,{prompt_image.b64_image_bytes.decode('utf-8')}"
             openai_image_url = ImageURL(url=url_with_bytes, detail="high")
-        elif isinstance(prompt_image, PromptImagePath):
-            image_bytes = load_binary_as_base64(path=prompt_image.file_path)
+        elif isinstance(prompt_image, (PromptImagePath, PromptImageBlob)):
+            image_bytes = PromptImageFactory.promptimage_to_b64(image_prompt=prompt_image)
             return cls.make_openai_image_url(PromptImageBytes(b64_image_bytes=image_bytes))
         else:
             raise ValueError(f"prompt_image of type {type(prompt_image)} is not supported")
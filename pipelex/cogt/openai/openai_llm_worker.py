@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Any, Optional, Type
+from typing import Any, AsyncIterator, Dict, Optional, Type
 
 import instructor
 import openai
@@ -13,14 +13,18 @@ from typing_extensions import override
 from pipelex import log
 from pipelex.cogt.exceptions import SdkTypeError
 from pipelex.cogt.inference.inference_report_delegate import InferenceReportDelegate
+from pipelex.cogt.llm.llm_batch_client_abstract import LLMBatchClientAbstract
 from pipelex.cogt.llm.llm_job import LLMJob
-from pipelex.cogt.llm.llm_job_func import llm_job_func
+from pipelex.cogt.llm.llm_job_func import llm_job_func, llm_job_stream_func
 from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
 from pipelex.cogt.llm.llm_models.llm_family import LLMFamily
+from pipelex.cogt.llm.llm_models.llm_platform import LLMPlatform
 from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
 from pipelex.cogt.llm.structured_output import StructureMethod
+from pipelex.cogt.openai.openai_batch_client import OpenAIBatchClient
 from pipelex.cogt.openai.openai_errors import OpenAIWorkerError
 from pipelex.cogt.openai.openai_factory import OpenAIFactory
+from pipelex.tools.misc.http_helpers import parse_retry_after_seconds
 from pipelex.tools.misc.model_helpers import BaseModelType
 
 
@@ -49,6 +53,38 @@ class OpenAILLMWorker(LLMWorkerAbstract):
 
     #########################################################
 
+    @property
+    @override
+    def is_text_streaming_supported(self) -> bool:
+        return True
+
+    @property
+    @override
+    def is_object_list_streaming_supported(self) -> bool:
+        return True
+
+    @override
+    def make_llm_batch_client(self) -> Optional[LLMBatchClientAbstract]:
+        # the OpenAI-compatible platforms don't all have the batch API
+        if self.llm_engine.llm_platform != LLMPlatform.OPENAI:
+            return None
+        return OpenAIBatchClient(openai_client=self.openai_client_for_text)
+
+    @override
+    def is_throttling_error(self, exc: BaseException) -> bool:
+        return isinstance(exc, openai.RateLimitError)
+
+    @override
+    def is_transient_error(self, exc: BaseException) -> bool:
+        # APITimeoutError is a subclass of APIConnectionError
+        return isinstance(exc, (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError))
+
+    @override
+    def get_retry_after_seconds(self, exc: BaseException) -> Optional[float]:
+        if not isinstance(exc, openai.APIStatusError):
+            return None
+        return parse_retry_after_seconds(headers=exc.response.headers)
+
     @override
     @llm_job_func
     async def gen_text(
@@ -61,33 +97,12 @@ class OpenAILLMWorker(LLMWorkerAbstract):
         )
 
         try:
-            match self.llm_engine.llm_model.llm_family:
-                case LLMFamily.O_SERIES:
-                    # for o1 models, we must use temperature=1, and tokens limit is named max_completion_tokens
-                    response = await self.openai_client_for_text.chat.completions.create(
-                        model=self.llm_engine.llm_id,
-                        temperature=1,
-                        max_completion_tokens=llm_job.job_params.max_tokens or NOT_GIVEN,
-                        seed=llm_job.job_params.seed,
-                        messages=messages,
-                    )
-                case LLMFamily.GEMINI:
-                    # for gemini models, we multiply the temperature by 2 because the range is 0-2
-                    response = await self.openai_client_for_text.chat.completions.create(
-                        model=self.llm_engine.llm_id,
-                        temperature=llm_job.job_params.temperature * 2,
-                        max_tokens=llm_job.job_params.max_tokens or NOT_GIVEN,
-                        seed=llm_job.job_params.seed,
-                        messages=messages,
-                    )
-                case _:
-                    response = await self.openai_client_for_text.chat.completions.create(
-                        model=self.llm_engine.llm_id,
-                        temperature=llm_job.job_params.temperature,
-                        max_tokens=llm_job.job_params.max_tokens or NOT_GIVEN,
-                        seed=llm_job.job_params.seed,
-                        messages=messages,
-                    )
+            response = await self.openai_client_for_text.chat.completions.create(
+                model=self.llm_engine.llm_id,
+                messages=messages,
+                stream=False,
+                **OpenAIFactory.make_sampling_params(llm_job=llm_job, llm_engine=self.llm_engine),
+            )
         except NotFoundError as exc:
             raise OpenAIWorkerError(f"OpenAI model or deployment '{self.llm_engine.llm_id}' not found: {exc}") from exc
 
@@ -101,6 +116,37 @@ class OpenAILLMWorker(LLMWorkerAbstract):
             llm_tokens_usage.nb_tokens_by_category = OpenAIFactory.make_nb_tokens_by_category(usage=usage)
         return response_text
 
+    @override
+    @llm_job_stream_func
+    async def gen_text_stream(
+        self,
+        llm_job: LLMJob,
+    ) -> AsyncIterator[str]:
+        messages = OpenAIFactory.make_simple_messages(
+            llm_job=llm_job,
+            llm_engine=self.llm_engine,
+        )
+        stream_params = OpenAIFactory.make_sampling_params(llm_job=llm_job, llm_engine=self.llm_engine)
+        if self.llm_engine.llm_platform == LLMPlatform.OPENAI:
+            # the usage comes in a last chunk with no choices, other OpenAI-compatible platforms may not accept this option
+            stream_params["stream_options"] = {"include_usage": True}
+
+        try:
+            stream = await self.openai_client_for_text.chat.completions.create(
+                model=self.llm_engine.llm_id,
+                messages=messages,
+                stream=True,
+                **stream_params,
+            )
+        except NotFoundError as exc:
+            raise OpenAIWorkerError(f"OpenAI model or deployment '{self.llm_engine.llm_id}' not found: {exc}") from exc
+
+        async for chunk in stream:
+            if chunk.choices and (text_chunk := chunk.choices[0].delta.content):
+                yield text_chunk
+            if (llm_tokens_usage := llm_job.job_report.llm_tokens_usage) and (usage := chunk.usage):
+                llm_tokens_usage.nb_tokens_by_category = OpenAIFactory.make_nb_tokens_by_category(usage=usage)
+
     @override
     @llm_job_func
     async def gen_object(
@@ -113,39 +159,13 @@ class OpenAILLMWorker(LLMWorkerAbstract):
             llm_engine=self.llm_engine,
         )
         try:
-            match self.llm_engine.llm_model.llm_family:
-                case LLMFamily.O_SERIES:
-                    # for o1 models, we must use temperature=1, and tokens limit is named max_completion_tokens
-                    result_object, completion = await self.instructor_for_objects.chat.completions.create_with_completion(
-                        model=self.llm_engine.llm_id,
-                        temperature=1,
-                        max_completion_tokens=llm_job.job_params.max_tokens or NOT_GIVEN,
-                        seed=llm_job.job_params.seed,
-                        messages=messages,
-                        response_model=schema,
-                        max_retries=llm_job.job_config.max_retries,
-                    )
-                case LLMFamily.GEMINI:
-                    # for gemini models, we multiply the temperature by 2 because the range is 0-2
-                    result_object, completion = await self.instructor_for_objects.chat.completions.create_with_completion(
-                        model=self.llm_engine.llm_id,
-                        temperature=llm_job.job_params.temperature * 2,
-                        max_tokens=llm_job.job_params.max_tokens or NOT_GIVEN,
-                        seed=llm_job.job_params.seed,
-                        messages=messages,
-                        response_model=schema,
-                        max_retries=llm_job.job_config.max_retries,
-                    )
-                case _:
-                    result_object, completion = await self.instructor_for_objects.chat.completions.create_with_completion(
-                        model=self.llm_engine.llm_id,
-                        temperature=llm_job.job_params.temperature,
-                        max_tokens=llm_job.job_params.max_tokens or NOT_GIVEN,
-                        seed=llm_job.job_params.seed,
-                        messages=messages,
-                        response_model=schema,
-                        max_retries=llm_job.job_config.max_retries,
-                    )
+            result_object, completion = await self.instructor_for_objects.chat.completions.create_with_completion(
+                model=self.llm_engine.llm_id,
+                messages=messages,
+                response_model=schema,
+                max_retries=llm_job.job_config.max_retries,
+                **OpenAIFactory.make_sampling_params(llm_job=llm_job, llm_engine=self.llm_engine),
+            )
         except NotFoundError as exc:
             raise OpenAIWorkerError(f"OpenAI model or deployment '{self.llm_engine.llm_id}' not found: {exc}") from exc
 
@@ -153,3 +173,28 @@ class OpenAILLMWorker(LLMWorkerAbstract):
             llm_tokens_usage.nb_tokens_by_category = OpenAIFactory.make_nb_tokens_by_category(usage=usage)
 
         return result_object
+
+    @override
+    @llm_job_stream_func
+    async def gen_object_list_stream(
+        self,
+        llm_job: LLMJob,
+        schema: Type[BaseModelType],
+    ) -> AsyncIterator[BaseModelType]:
+        messages = OpenAIFactory.make_simple_messages(
+            llm_job=llm_job,
+            llm_engine=self.llm_engine,
+        )
+        # instructor parses each item of the list as soon as its JSON is complete in the stream
+        # the token usage is not available from the iterable stream
+        try:
+            async for item in self.instructor_for_objects.chat.completions.create_iterable(
+                model=self.llm_engine.llm_id,
+                messages=messages,
+                response_model=schema,
+                max_retries=llm_job.job_config.max_retries,
+                **OpenAIFactory.make_sampling_params(llm_job=llm_job, llm_engine=self.llm_engine),
+            ):
+                yield item
+        except NotFoundError as exc:
+            raise OpenAIWorkerError(f"OpenAI model or deployment '{self.llm_engine.llm_id}' not found: {exc}") from exc
@@ -2,19 +2,25 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional, Union
 
 import shortuuid
+from pydantic import Field
 
 from pipelex.cogt.config_cogt import Cogt
 from pipelex.cogt.llm.llm_models.llm_prompting_target import LLMPromptingTarget
+from pipelex.core.pipe_run_params import BranchFailurePolicy, SequenceExecutionMode
 from pipelex.exceptions import PipelexError
 from pipelex.hub import get_required_config
 from pipelex.libraries.library_config import LibraryConfig
 from pipelex.mission.track.tracker_config import TrackerConfig
+from pipelex.pipe_controllers.batch_checkpoint_config import BatchCheckpointConfig
 from pipelex.tools.aws.aws_config import AwsConfig
+from pipelex.tools.blob.blob_store_config import BlobStoreConfig
 from pipelex.tools.config.models import ConfigModel, ConfigRoot
 from pipelex.tools.log.log_config import LogConfig
+from pipelex.tools.misc.file_fetcher_config import FileFetcherConfig
+from pipelex.tools.pdf.pdf_renderer_config import PdfRendererConfig
 from pipelex.tools.templating.templating_models import PromptingStyle
 
 
@@ -24,6 +30,17 @@ class PipelexConfigError(PipelexError):
 
 class PipeRunConfig(ConfigModel):
     pipe_stack_limit: int
+    batch_max_concurrency: Union[int, Literal["unlimited"]]
+    branch_failure_policy: BranchFailurePolicy = Field(strict=False)
+    branch_retry_failed_n_times: int = Field(ge=0)
+    sequence_execution_mode: SequenceExecutionMode = Field(strict=False)
+
+    @property
+    def applied_batch_max_concurrency(self) -> Optional[int]:
+        if self.batch_max_concurrency == "unlimited":
+            return None
+        else:
+            return self.batch_max_concurrency
 
 
 class GenericTemplateNames(ConfigModel):
@@ -55,6 +72,9 @@ class Pipelex(ConfigModel):
     feature_config: FeatureConfig
     log_config: LogConfig
     aws_config: AwsConfig
+    file_fetcher_config: FileFetcherConfig
+    blob_store_config: BlobStoreConfig
+    pdf_renderer_config: PdfRendererConfig
 
     library_config: LibraryConfig
     generic_template_names: GenericTemplateNames
@@ -63,6 +83,7 @@ class Pipelex(ConfigModel):
     prompting_config: PromptingConfig
 
     pipe_run_config: PipeRunConfig
+    batch_checkpoint_config: BatchCheckpointConfig
 
 
 class PipelexConfig(ConfigRoot):
@@ -53,6 +53,10 @@ class PipeAbstract(ABC, BaseModel):
     def required_variables(self) -> Set[str]:
         return set()
 
+    def has_exhaustive_required_variables(self) -> bool:
+        """Whether required_variables() lists all the stuffs the pipe reads, which allows running it concurrently with other pipes."""
+        return False
+
     # Run pipe
 
     @abstractmethod
@@ -0,0 +1,33 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from typing import Set
+
+from pydantic import BaseModel, ConfigDict
+
+from pipelex.core.pipe_abstract import PipeAbstract
+
+
+class PipeExecutionPlan(BaseModel):
+    """What the runtime needs to know about a pipe, resolved once so that it doesn't need to be recomputed on every run."""
+
+    model_config = ConfigDict(frozen=True)
+
+    pipe: PipeAbstract
+    required_variables: Set[str]
+    # the required variables which are stuffs of the working memory, i.e. not the run params starting with "_"
+    required_stuff_names: Set[str]
+    has_exhaustive_required_variables: bool
+    pipe_dependencies: Set[str]
+
+    @classmethod
+    def make_from_pipe(cls, pipe: PipeAbstract) -> "PipeExecutionPlan":
+        required_variables = pipe.required_variables()
+        return PipeExecutionPlan(
+            pipe=pipe,
+            required_variables=required_variables,
+            required_stuff_names=set(required_variable for required_variable in required_variables if not required_variable.startswith("_")),
+            has_exhaustive_required_variables=pipe.has_exhaustive_required_variables(),
+            pipe_dependencies=pipe.pipe_dependencies(),
+        )
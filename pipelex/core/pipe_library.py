@@ -4,10 +4,12 @@
 
 from typing import Dict, List, Optional
 
-from pydantic import Field, RootModel
+from pydantic import Field, PrivateAttr, RootModel
 from typing_extensions import override
 
+from pipelex import log
 from pipelex.core.pipe_abstract import PipeAbstract
+from pipelex.core.pipe_execution_plan import PipeExecutionPlan
 from pipelex.core.pipe_provider_abstract import PipeProviderAbstract
 from pipelex.exceptions import ConceptError, ConceptLibraryConceptNotFoundError, PipeLibraryError, PipeLibraryPipeNotFoundError
 from pipelex.hub import get_concept_provider
@@ -17,6 +19,7 @@ PipeLibraryRoot = Dict[str, PipeAbstract]
 
 class PipeLibrary(RootModel[PipeLibraryRoot], PipeProviderAbstract):
     root: PipeLibraryRoot = Field(default_factory=dict)
+    _execution_plans: Dict[str, PipeExecutionPlan] = PrivateAttr(default_factory=dict[str, PipeExecutionPlan])
 
     def validate_with_libraries(self):
         concept_provider = get_concept_provider()
@@ -35,6 +38,11 @@ class PipeLibrary(RootModel[PipeLibraryRoot], PipeProviderAbstract):
             except (ConceptLibraryConceptNotFoundError, PipeLibraryPipeNotFoundError) as not_found_error:
                 raise PipeLibraryError(f"Missing dependency for pipe '{pipe.code}': {not_found_error}") from not_found_error
 
+    def compile_execution_plans(self):
+        """Resolve the execution plan of every pipe, to be done once the libraries are validated."""
+        self._execution_plans = {pipe_code: PipeExecutionPlan.make_from_pipe(pipe=pipe) for pipe_code, pipe in self.root.items()}
+        log.debug(f"Compiled execution plans for {len(self._execution_plans)} pipes")
+
     def add_new_pipe(self, pipe: PipeAbstract):
         name = pipe.code
         if pipe.input_concept_code and "." not in pipe.input_concept_code:
@@ -44,6 +52,7 @@ class PipeLibrary(RootModel[PipeLibraryRoot], PipeProviderAbstract):
         if name in self.root:
             raise PipeLibraryError(f"Pipe '{name}' already exists in the library")
         self.root[pipe.code] = pipe
+        self._execution_plans.pop(pipe.code, None)
 
     @override
     def get_optional_pipe(self, pipe_code: str) -> Optional[PipeAbstract]:
@@ -58,6 +67,15 @@ class PipeLibrary(RootModel[PipeLibraryRoot], PipeProviderAbstract):
             )
         return the_pipe
 
+    @override
+    def get_required_execution_plan(self, pipe_code: str) -> PipeExecutionPlan:
+        if execution_plan := self._execution_plans.get(pipe_code):
+            return execution_plan
+        # pipes added after the plans were compiled get their plan on first use
+        execution_plan = PipeExecutionPlan.make_from_pipe(pipe=self.get_required_pipe(pipe_code=pipe_code))
+        self._execution_plans[pipe_code] = execution_plan
+        return execution_plan
+
     @override
     def get_pipes(self) -> List[PipeAbstract]:
         return list(self.root.values())
@@ -69,3 +87,4 @@ class PipeLibrary(RootModel[PipeLibraryRoot], PipeProviderAbstract):
     @override
     def teardown(self) -> None:
         self.root = {}
+        self._execution_plans = {}
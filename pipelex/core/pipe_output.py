@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import List, Type, TypeVar
+from typing import List, Optional, Type, TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -20,8 +20,20 @@ from pipelex.core.stuff_content import (
 from pipelex.core.working_memory import WorkingMemory
 
 
+class BranchFailure(BaseModel):
+    """Failure of a branch of a PipeBatch or PipeParallel, reported when the failure policy is to collect errors."""
+
+    # the code of the PipeBatch or PipeParallel, as failures of nested pipes are reported along with those of their callers
+    pipe_code: Optional[str] = None
+    branch_index: int
+    error_type: str
+    error_message: str
+    nb_attempts: int
+
+
 class PipeOutput(BaseModel):
     working_memory: WorkingMemory = Field(default_factory=WorkingMemory)
+    branch_failures: List[BranchFailure] = Field(default_factory=list[BranchFailure])
 
     @property
     def main_stuff(self) -> Stuff:
@@ -79,4 +91,11 @@ class PipeOutput(BaseModel):
         return self.working_memory.main_stuff_as_mermaid
 
 
+class BatchBranchOutput(BaseModel):
+    """Output of a single branch of a PipeBatch, streamed as soon as the branch completes."""
+
+    branch_index: int
+    pipe_output: PipeOutput
+
+
 PipeOutputType = TypeVar("PipeOutputType", bound=PipeOutput)
@@ -6,6 +6,7 @@ from abc import ABC, abstractmethod
 from typing import ClassVar, Dict, List, Optional
 
 from pipelex.core.pipe_abstract import PipeAbstract
+from pipelex.core.pipe_execution_plan import PipeExecutionPlan
 
 
 class PipeProviderAbstract(ABC):
@@ -19,6 +20,10 @@ class PipeProviderAbstract(ABC):
     def get_optional_pipe(self, pipe_code: str) -> Optional[PipeAbstract]:
         pass
 
+    @abstractmethod
+    def get_required_execution_plan(self, pipe_code: str) -> PipeExecutionPlan:
+        pass
+
     @abstractmethod
     def get_pipes(self) -> List[PipeAbstract]:
         pass
@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional, Self, Tuple, Union
 from pydantic import BaseModel, Field, field_validator
 
 from pipelex import log
+from pipelex.cogt.llm.llm_job_components import LLMExecutionMode, ObjectItemSink, TextChunkSink
 from pipelex.core.working_memory import BATCH_ITEM_STUFF_NAME, MAIN_STUFF_NAME
 
 
@@ -72,6 +73,57 @@ def output_multiplicity_to_apply(
         return output_multiplicity_override, True, output_multiplicity_override
 
 
+class SequenceExecutionMode(StrEnum):
+    # run the steps one after another
+    SEQUENTIAL = "sequential"
+    # run concurrently the steps which don't read or write each other's stuffs
+    DATAFLOW = "dataflow"
+
+
+class BatchCheckpointMode(StrEnum):
+    OFF = "off"
+    # save each completed branch output, overwriting previous checkpoints of the same batch
+    SAVE = "save"
+    # restore the branch outputs already checkpointed and only run the missing branches
+    RESUME = "resume"
+
+
+class BranchFailurePolicy(StrEnum):
+    # cancel the sibling branches and raise as soon as a branch has failed (after its retries)
+    FAIL_FAST = "fail_fast"
+    # let the other branches complete and report the failed ones alongside the successful outputs
+    COLLECT_ERRORS = "collect_errors"
+
+
+class BatchOptions(BaseModel):
+    """How the branches of a PipeBatch are executed, independently of what the batch runs over."""
+
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+    checkpoint_mode: Optional[BatchCheckpointMode] = None
+    failure_policy: Optional[BranchFailurePolicy] = None
+    retry_failed_n_times: Optional[int] = Field(default=None, ge=0)
+    llm_execution_mode: Optional[LLMExecutionMode] = None
+
+    @classmethod
+    def make_optional_batch_options(
+        cls,
+        max_concurrency: Optional[int] = None,
+        checkpoint_mode: Optional[BatchCheckpointMode] = None,
+        failure_policy: Optional[BranchFailurePolicy] = None,
+        retry_failed_n_times: Optional[int] = None,
+        llm_execution_mode: Optional[LLMExecutionMode] = None,
+    ) -> Optional["BatchOptions"]:
+        if not (max_concurrency or checkpoint_mode or failure_policy or retry_failed_n_times is not None or llm_execution_mode):
+            return None
+        return BatchOptions(
+            max_concurrency=max_concurrency,
+            checkpoint_mode=checkpoint_mode,
+            failure_policy=failure_policy,
+            retry_failed_n_times=retry_failed_n_times,
+            llm_execution_mode=llm_execution_mode,
+        )
+
+
 class BatchParams(BaseModel):
     input_list_stuff_name: str
     input_item_stuff_name: str
@@ -109,7 +161,15 @@ class PipeRunParams(BaseModel):
     output_multiplicity: Optional[PipeOutputMultiplicity] = None
     dynamic_output_concept_code: Optional[str] = None
     batch_params: Optional[BatchParams] = None
+    # overrides the batch options set on the PipeBatch pipes of the run
+    batch_options: Optional[BatchOptions] = None
     params: Dict[str, Any] = Field(default_factory=dict)
+    # receives the chunks of the final text output as they are generated, if it's generated by a PipeLLM
+    text_chunk_sink: Optional[TextChunkSink] = Field(default=None, exclude=True)
+    # receives the items of the final list output as soon as each one is generated, if it's generated by a PipeLLM
+    object_item_sink: Optional[ObjectItemSink] = Field(default=None, exclude=True)
+    # set by a PipeBatch running in provider batch mode, for the text generations of its branches
+    llm_execution_mode: LLMExecutionMode = LLMExecutionMode.REALTIME
 
     pipe_stack_limit: int
     pipe_stack: List[str] = Field(default_factory=list)
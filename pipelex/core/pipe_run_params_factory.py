@@ -4,8 +4,9 @@
 
 from typing import Any, Dict, Optional
 
+from pipelex.cogt.llm.llm_job_components import ObjectItemSink, TextChunkSink
 from pipelex.config import get_config
-from pipelex.core.pipe_run_params import BatchParams, PipeOutputMultiplicity, PipeRunParams
+from pipelex.core.pipe_run_params import BatchOptions, BatchParams, PipeOutputMultiplicity, PipeRunParams
 
 
 class PipeRunParamsFactory:
@@ -16,7 +17,10 @@ class PipeRunParamsFactory:
         output_multiplicity: Optional[PipeOutputMultiplicity] = None,
         dynamic_output_concept_code: Optional[str] = None,
         batch_params: Optional[BatchParams] = None,
+        batch_options: Optional[BatchOptions] = None,
         params: Optional[Dict[str, Any]] = None,
+        text_chunk_sink: Optional[TextChunkSink] = None,
+        object_item_sink: Optional[ObjectItemSink] = None,
     ) -> PipeRunParams:
         pipe_stack_limit = pipe_stack_limit or get_config().pipelex.pipe_run_config.pipe_stack_limit
         return PipeRunParams(
@@ -24,5 +28,8 @@ class PipeRunParamsFactory:
             output_multiplicity=output_multiplicity,
             dynamic_output_concept_code=dynamic_output_concept_code,
             batch_params=batch_params,
+            batch_options=batch_options,
             params=params or {},
+            text_chunk_sink=text_chunk_sink,
+            object_item_sink=object_item_sink,
         )
@@ -18,13 +18,14 @@ from yattag import Doc
 
 from pipelex.cogt.llm.llm_prompt import LLMPrompt
 from pipelex.cogt.ocr.ocr_output import ExtractedImage
-from pipelex.tools.misc.base_64 import save_base64_to_binary_file
+from pipelex.tools.blob.blob_store import get_hub_blob_store
+from pipelex.tools.misc.base_64 import decode_base64_str
 from pipelex.tools.misc.custom_base_model import CustomBaseModel
 from pipelex.tools.misc.markdown_helpers import convert_to_markdown
 from pipelex.tools.misc.model_helpers import clean_model_to_dict
 from pipelex.tools.templating.templating_models import TextFormat
-from pipelex.tools.utils.file_utils import ensure_directory_exists, save_text_to_path
-from pipelex.tools.utils.filetype_utils import detect_file_type_from_base64
+from pipelex.tools.utils.file_utils import ensure_directory_exists, save_bytes_to_binary_file, save_text_to_path
+from pipelex.tools.utils.filetype_utils import detect_file_type_from_bytes
 from pipelex.tools.utils.path_utils import InterpretedPathOrUrl, get_incremental_file_path, interpret_path_or_url
 
 ObjectContentType = TypeVar("ObjectContentType", bound=BaseModel)
@@ -191,6 +192,8 @@ class ImageContent(StuffContentInitableFromStr):
     source_prompt: Optional[str] = None
     caption: Optional[str] = None
     base_64: Optional[str] = None
+    # reference to the image bytes in the blob store, rather than the whole image as base64 text
+    blob_digest: Optional[str] = None
 
     @property
     @override
@@ -210,13 +213,23 @@ class ImageContent(StuffContentInitableFromStr):
     @override
     def rendered_html(self) -> str:
         doc = Doc()
-        doc.stag("img", src=self.url, klass="msg-img")
-
+        doc.stag("img", src=self.get_resolvable_url(), klass="msg-img")
         return doc.getvalue()
 
     @override
     def rendered_markdown(self, level: int = 1, is_pretty: bool = False) -> str:
-        return f"![{self.url}]({self.url})"
+        return f"![{self.url}]({self.get_resolvable_url()})"
+
+    def get_resolvable_url(self) -> str:
+        """
+        The url of the image, which can be resolved outside of Pipelex:
+        a blob url only makes sense within Pipelex, so the image held in the blob store is given inline, as a data url.
+        """
+        if self.blob_digest and (image_bytes := self.get_image_bytes()):
+            file_type = detect_file_type_from_bytes(buf=image_bytes)
+            b64 = base64.b64encode(image_bytes).decode("utf-8")
+            return f"data:{file_type.mime};base64,{b64}"
+        return self.url
 
     @override
     def rendered_json(self) -> str:
@@ -227,6 +240,7 @@ class ImageContent(StuffContentInitableFromStr):
         return cls(
             url=extracted_image.image_id,
             base_64=extracted_image.base_64,
+            blob_digest=extracted_image.blob_digest,
             caption=extracted_image.caption,
         )
 
@@ -234,24 +248,38 @@ class ImageContent(StuffContentInitableFromStr):
     def make_from_image(cls, image: Image.Image) -> Self:
         buffer = BytesIO()
         image.save(buffer, format="PNG")
-        base_64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        return cls.make_from_image_bytes(image_bytes=buffer.getvalue())
+
+    @classmethod
+    def make_from_image_bytes(cls, image_bytes: bytes) -> Self:
+        """Make an image content from encoded image bytes, which are stored in the blob store."""
+
+        blob_digest = get_hub_blob_store().put_bytes(data=image_bytes)
         return cls(
-            url=f"data:image/png;base64,{base_64}",
-            base_64=base_64,
+            url=f"blob:{blob_digest}",
+            blob_digest=blob_digest,
         )
 
+    def get_image_bytes(self) -> Optional[bytes]:
+        if self.blob_digest:
+            return get_hub_blob_store().get_bytes(digest=self.blob_digest)
+        elif self.base_64:
+            return decode_base64_str(b64=self.base_64)
+        return None
+
     def save_to_directory(self, directory: str, base_name: Optional[str] = None, extension: Optional[str] = None):
         ensure_directory_exists(directory)
         base_name = base_name or "img"
-        if base_64 := self.base_64:
+        if image_bytes := self.get_image_bytes():
             if not extension:
                 match interpret_path_or_url(path_or_uri=self.url):
-                    case InterpretedPathOrUrl.FILE_NAME:
+                    case InterpretedPathOrUrl.FILE_NAME if "." in self.url:
+                        # blob urls have no extension, their file type is detected below
                         parts = self.url.rsplit(".", 1)
                         base_name = parts[0]
                         extension = parts[1]
                     case _:
-                        file_type = detect_file_type_from_base64(b64=base_64)
+                        file_type = detect_file_type_from_bytes(buf=image_bytes)
                         base_name = base_name or "img"
                         extension = file_type.extension
                 file_path = get_incremental_file_path(
@@ -260,7 +288,7 @@ class ImageContent(StuffContentInitableFromStr):
                     extension=extension,
                     avoid_suffix_if_possible=True,
                 )
-                save_base64_to_binary_file(b64=base_64, file_path=file_path)
+                save_bytes_to_binary_file(file_path=file_path, byte_data=image_bytes)
 
         if caption := self.caption:
             caption_file_path = get_incremental_file_path(
@@ -408,6 +436,26 @@ class LLMPromptContent(StructuredContent, LLMPrompt):
     pass
 
 
+class FailedItemContent(StuffContent):
+    """Stands for the output of a failed batch branch, so that the items of the output list stay aligned with the input list."""
+
+    error_type: str
+    error_message: str
+
+    @property
+    @override
+    def short_desc(self) -> str:
+        return f"failed item ({self.error_type})"
+
+    @override
+    def rendered_html(self) -> str:
+        return f"<p>Failed item: {self.error_type}: {self.error_message}</p>"
+
+    @override
+    def rendered_markdown(self, level: int = 1, is_pretty: bool = False) -> str:
+        return f"Failed item: {self.error_type}: {self.error_message}"
+
+
 class ListContent(StuffContent, Generic[StuffContentType]):
     items: List[StuffContentType]
 
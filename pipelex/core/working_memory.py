@@ -3,9 +3,10 @@
 # "Pipelex" is a trademark of Evotis S.A.S.
 
 from operator import attrgetter
-from typing import Any, Dict, List, Optional, Self, Set, Type, TypeVar
+from typing import Any, Dict, List, Optional, Self, Set, Tuple, Type, TypeVar
 
 from pydantic import BaseModel, Field, model_validator
+from typing_extensions import override
 
 from pipelex import log, pretty_print
 from pipelex.activity_manager import get_activity_manager
@@ -57,8 +58,38 @@ class WorkingMemory(BaseModel):
 
         return self
 
+    ################################################################################################
+    # Storage primitives: all reads and writes go through these, so that overlays can override them
+    ################################################################################################
+
+    def _get_root_stuff(self, name: str) -> Optional[Stuff]:
+        return self.root.get(name)
+
+    def _get_alias_target(self, alias: str) -> Optional[str]:
+        return self.aliases.get(alias)
+
+    def _root_items(self) -> List[Tuple[str, Stuff]]:
+        return list(self.root.items())
+
+    def _alias_items(self) -> List[Tuple[str, str]]:
+        return list(self.aliases.items())
+
+    def _put_root_stuff(self, name: str, stuff: Stuff) -> None:
+        self.root[name] = stuff
+
+    def _put_alias(self, alias: str, target: str) -> None:
+        self.aliases[alias] = target
+
+    def _pop_root_stuff(self, name: str) -> None:
+        self.root.pop(name, None)
+
+    def _pop_alias(self, alias: str) -> None:
+        self.aliases.pop(alias, None)
+
+    ################################################################################################
+
     def pretty_print_summary(self):
-        for stuff in self.root.values():
+        for _, stuff in self._root_items():
             content = stuff.content.rendered_plain()
             if len(content) > 300:
                 content = content[:300] + "..."
@@ -67,24 +98,32 @@ class WorkingMemory(BaseModel):
     def make_deep_copy(self) -> Self:
         return self.model_copy(deep=True)
 
+    def make_overlay(self) -> "WorkingMemoryOverlay":
+        """
+        Make a copy-on-write view of this memory, for branches of PipeBatch and PipeParallel.
+        Unlike make_deep_copy(), this does not duplicate any stuff.
+        """
+        return WorkingMemoryOverlay(parent=self)
+
     def generate_full_stuff_dict(self) -> StuffDict:
-        full_stuff_dict: StuffDict = self.root.copy()
-        full_stuff_dict.update({alias: self.root[target] for alias, target in self.aliases.items()})
+        root_stuff_dict: StuffDict = dict(self._root_items())
+        full_stuff_dict: StuffDict = root_stuff_dict.copy()
+        full_stuff_dict.update({alias: root_stuff_dict[target] for alias, target in self._alias_items()})
         return full_stuff_dict
 
     def generate_stuff_artefact_dict(self) -> StuffArtefactDict:
         artefact_dict: StuffArtefactDict = {}
-        for name, stuff in self.root.items():
+        for name, stuff in self._root_items():
             artefact_dict[name] = stuff.make_artefact()
-        for alias, target in self.aliases.items():
+        for alias, target in self._alias_items():
             artefact_dict[alias] = artefact_dict[target]
         return artefact_dict
 
     def get_optional_stuff(self, name: str) -> Optional[Stuff]:
-        if named_stuff := self.root.get(name):
+        if named_stuff := self._get_root_stuff(name):
             return named_stuff
-        if alias := self.aliases.get(name):
-            return self.root.get(alias)
+        if alias := self._get_alias_target(name):
+            return self._get_root_stuff(alias)
         return None
 
     def get_optional_main_stuff(self) -> Optional[Stuff]:
@@ -92,10 +131,10 @@ class WorkingMemory(BaseModel):
 
     # TODO: all calls to get_stuff should catch WorkingMemoryStuffNotFoundError in order to indicate what pipe is missing a required stuff
     def get_stuff(self, name: str) -> Stuff:
-        if named_stuff := self.root.get(name):
+        if named_stuff := self._get_root_stuff(name):
             return named_stuff
-        if alias := self.aliases.get(name):
-            stuff = self.root.get(alias)
+        if alias := self._get_alias_target(name):
+            stuff = self._get_root_stuff(alias)
             if stuff is None:
                 raise WorkingMemoryStuffNotFoundError(f"Alias '{alias}' points to a non-existent stuff '{name}'")
             return stuff
@@ -134,7 +173,7 @@ class WorkingMemory(BaseModel):
 
     def get_stuff_by_stuff_code(self, stuff_code: str) -> Stuff:
         matching_stuffs: List[Stuff] = []
-        for stuff in self.root.values():
+        for _, stuff in self._root_items():
             if stuff.concept_code == stuff_code:
                 matching_stuffs.append(stuff)
         if len(matching_stuffs) == 0:
@@ -144,7 +183,7 @@ class WorkingMemory(BaseModel):
         return matching_stuffs[0]
 
     def is_stuff_code_used(self, stuff_code: str) -> bool:
-        for stuff in self.root.values():
+        for _, stuff in self._root_items():
             if stuff.concept_code == stuff_code:
                 return True
         return False
@@ -153,20 +192,19 @@ class WorkingMemory(BaseModel):
         return self.get_stuff(name=MAIN_STUFF_NAME)
 
     def remove_stuff(self, name: str):
-        self.root.pop(name, None)
+        self._pop_root_stuff(name)
 
     def remove_main_stuff(self):
-        if MAIN_STUFF_NAME in self.root:
-            del self.root[MAIN_STUFF_NAME]
+        self._pop_root_stuff(MAIN_STUFF_NAME)
 
     def set_stuff(self, name: str, stuff: Stuff):
-        self.root[name] = stuff
+        self._put_root_stuff(name=name, stuff=stuff)
 
     def add_new_stuff(self, name: str, stuff: Stuff, aliases: Optional[List[str]] = None):
         log.debug(f"Adding new stuff '{name}' to WorkingMemory with aliases: {aliases}")
         if self.is_stuff_code_used(stuff_code=stuff.stuff_code):
             raise WorkingMemoryError(f"Stuff code '{stuff.stuff_code}' is already used by another stuff")
-        if name in self.root or name in self.aliases:
+        if self._get_root_stuff(name) is not None or self._get_alias_target(name) is not None:
             existing_stuff = self.get_stuff(name=name)
             if existing_stuff == stuff:
                 log.warning(f"Key '{name}' already exists in WorkingMemory with the same stuff")
@@ -198,22 +236,21 @@ class WorkingMemory(BaseModel):
         """Add an alias pointing to a target name."""
         if alias == target:
             raise WorkingMemoryError(f"Cannot create alias '{alias}' pointing to itself")
-        if target not in self.root:
+        if self._get_root_stuff(target) is None:
             raise WorkingMemoryError(f"Cannot create alias to non-existent target '{target}'")
         log.debug(f"Setting alias '{alias}' pointing to target '{target}'")
-        self.aliases[alias] = target
+        self._put_alias(alias=alias, target=target)
 
     def add_alias(self, alias: str, target: str) -> None:
         """Add an alias pointing to a target name."""
-        if alias in self.root:
+        if self._get_root_stuff(alias) is not None:
             raise WorkingMemoryError(f"Cannot add alias '{alias}' as it already exists")
         self.set_alias(alias=alias, target=target)
         log.debug(f"Added alias '{alias}' pointing to target '{target}'")
 
     def remove_alias(self, alias: str) -> None:
         """Remove an alias if it exists."""
-        if alias in self.aliases:
-            del self.aliases[alias]
+        self._pop_alias(alias)
 
     def remove_alias_to_main_stuff(self) -> None:
         """Remove the alias pointing to the main stuff if it exists."""
@@ -221,23 +258,23 @@ class WorkingMemory(BaseModel):
 
     def get_aliases_for(self, target: str) -> List[str]:
         """Get all aliases pointing to a target name."""
-        return [alias for alias, t in self.aliases.items() if t == target]
+        return [alias for alias, t in self._alias_items() if t == target]
 
     def list_keys(self) -> List[str]:
-        return list(self.root.keys()) + list(self.aliases.keys())
+        return [name for name, _ in self._root_items()] + [alias for alias, _ in self._alias_items()]
 
     ################################################################################################
     # Export methods
     ################################################################################################
 
     def content_dict(self) -> Dict[str, StuffContent]:
-        result = {name: stuff.content for name, stuff in self.root.items()}
+        result = {name: stuff.content for name, stuff in self._root_items()}
         # Include aliased content
-        result.update({alias: self.root[target].content for alias, target in self.aliases.items()})
+        result.update({alias: result[target] for alias, target in self._alias_items()})
         return result
 
     def pretty_print(self):
-        for name, stuff in self.root.items():
+        for name, stuff in self._root_items():
             pretty_print(stuff.content.rendered_plain(), title=f"{name}: {stuff.concept_code}")
 
     def update_from_strings_from_dict(self, context_dict: Dict[str, Any]) -> "WorkingMemory":
@@ -260,7 +297,8 @@ class WorkingMemory(BaseModel):
                 concept_code=NativeConcept.TEXT.code,
                 content=stuff_content,
             )
-        self.root.update(update_stuff_dict)
+        for name, stuff in update_stuff_dict.items():
+            self._put_root_stuff(name=name, stuff=stuff)
         return self
 
     def save_to_memory_file(self, memory_file_path: str):
@@ -353,3 +391,84 @@ class WorkingMemory(BaseModel):
     def main_stuff_as_mermaid(self) -> MermaidContent:
         """Get main stuff content as MermaidContent if applicable."""
         return self.get_stuff_as_mermaid(name=MAIN_STUFF_NAME)
+
+
+class WorkingMemoryOverlay(WorkingMemory):
+    """
+    Copy-on-write view over a parent WorkingMemory, used by the branches of PipeBatch and PipeParallel.
+
+    Reads fall through to the parent, which is never modified by the overlay: root and aliases only hold
+    the stuffs and aliases set by the branch, and the names it removed are recorded to hide them from the parent.
+    The parent's stuffs are shared, so they must be treated as read-only.
+    """
+
+    parent: WorkingMemory = Field(exclude=True, repr=False)
+    removed_names: Set[str] = Field(default_factory=set)
+    removed_aliases: Set[str] = Field(default_factory=set)
+
+    @override
+    def _get_root_stuff(self, name: str) -> Optional[Stuff]:
+        if name in self.root:
+            return self.root[name]
+        if name in self.removed_names:
+            return None
+        return self.parent._get_root_stuff(name)
+
+    @override
+    def _get_alias_target(self, alias: str) -> Optional[str]:
+        if alias in self.aliases:
+            return self.aliases[alias]
+        if alias in self.removed_aliases:
+            return None
+        return self.parent._get_alias_target(alias)
+
+    @override
+    def _root_items(self) -> List[Tuple[str, Stuff]]:
+        inherited_items = [(name, stuff) for name, stuff in self.parent._root_items() if name not in self.root and name not in self.removed_names]
+        return inherited_items + list(self.root.items())
+
+    @override
+    def _alias_items(self) -> List[Tuple[str, str]]:
+        inherited_items = [
+            (alias, target) for alias, target in self.parent._alias_items() if alias not in self.aliases and alias not in self.removed_aliases
+        ]
+        return inherited_items + list(self.aliases.items())
+
+    @override
+    def _put_root_stuff(self, name: str, stuff: Stuff) -> None:
+        self.removed_names.discard(name)
+        self.root[name] = stuff
+
+    @override
+    def _put_alias(self, alias: str, target: str) -> None:
+        self.removed_aliases.discard(alias)
+        self.aliases[alias] = target
+
+    @override
+    def _pop_root_stuff(self, name: str) -> None:
+        self.root.pop(name, None)
+        self.removed_names.add(name)
+
+    @override
+    def _pop_alias(self, alias: str) -> None:
+        self.aliases.pop(alias, None)
+        self.removed_aliases.add(alias)
+
+    def merge_into(self, target_memory: WorkingMemory) -> None:
+        """Apply the changes recorded by this overlay (removals, then new stuffs and aliases) onto target_memory, typically its parent."""
+        for name in self.removed_names:
+            target_memory.remove_stuff(name=name)
+        for alias in self.removed_aliases:
+            target_memory.remove_alias(alias=alias)
+        for name, stuff in self.root.items():
+            target_memory.set_stuff(name=name, stuff=stuff)
+        for alias, target in self.aliases.items():
+            target_memory.set_alias(alias=alias, target=target)
+
+    def make_flat_copy(self) -> WorkingMemory:
+        """Make a standalone WorkingMemory with the same content, sharing the same stuffs."""
+        return WorkingMemory(root=dict(self._root_items()), aliases=dict(self._alias_items()))
+
+    @override
+    def save_to_memory_file(self, memory_file_path: str):
+        self.make_flat_copy().save_to_memory_file(memory_file_path=memory_file_path)
@@ -139,6 +139,12 @@ class PipeBatchBranchError(PipeBatchError):
     pass
 
 
+class PipeBatchCheckpointError(PipeBatchError):
+    """Raised when a PipeBatch branch checkpoint cannot be saved or restored."""
+
+    pass
+
+
 class JobHistoryError(PipelexError):
     pass
 
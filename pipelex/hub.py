@@ -7,12 +7,15 @@ from typing import ClassVar, Dict, List, Optional, Type
 
 from pipelex import log
 from pipelex.cogt.content_generation.content_generator_protocol import ContentGeneratorProtocol
+from pipelex.cogt.image.prompt_image_cache import PromptImageCache
+from pipelex.cogt.image.prompt_image_preparer import PromptImagePreparer
 from pipelex.cogt.imgg.imgg_worker_abstract import ImggWorkerAbstract
 from pipelex.cogt.inference.inference_manager_protocol import InferenceManagerProtocol
 from pipelex.cogt.inference.inference_report_delegate import InferenceReportDelegate
 from pipelex.cogt.llm.llm_models.llm_deck_abstract import LLMDeckAbstract
 from pipelex.cogt.llm.llm_models.llm_engine_blueprint import LLMEngineBlueprint
 from pipelex.cogt.llm.llm_models.llm_model_provider_abstract import LLMModelProviderAbstract
+from pipelex.cogt.llm.llm_response_cache_abstract import LLMResponseCacheAbstract
 from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
 from pipelex.cogt.ocr.ocr_worker_abstract import OcrWorkerAbstract
 from pipelex.cogt.plugin_manager import PluginManager
@@ -21,13 +24,17 @@ from pipelex.core.concept_provider_abstract import ConceptProviderAbstract
 from pipelex.core.domain import Domain
 from pipelex.core.domain_provider_abstract import DomainProviderAbstract
 from pipelex.core.pipe_abstract import PipeAbstract
+from pipelex.core.pipe_execution_plan import PipeExecutionPlan
 from pipelex.core.pipe_provider_abstract import PipeProviderAbstract
 from pipelex.mission.mission import Mission
 from pipelex.mission.mission_manager_abstract import MissionManagerAbstract
 from pipelex.mission.track.mission_tracker_protocol import MissionTrackerProtocol
+from pipelex.pipe_controllers.batch_checkpoint_store_abstract import BatchCheckpointStoreAbstract
 from pipelex.pipe_works.pipe_router_protocol import PipeRouterProtocol
+from pipelex.tools.blob.blob_store_abstract import BlobStoreAbstract
 from pipelex.tools.config.manager import config_manager
 from pipelex.tools.config.models import ConfigRoot
+from pipelex.tools.misc.file_fetcher import FileFetcher
 from pipelex.tools.secrets.secrets_provider_abstract import SecretsProviderAbstract
 from pipelex.tools.templating.template_provider_abstract import TemplateProviderAbstract
 
@@ -46,10 +53,15 @@ class PipelexHub:
         self._config: Optional[ConfigRoot] = None
         self._secrets_provider: Optional[SecretsProviderAbstract] = None
         self._template_provider: Optional[TemplateProviderAbstract] = None
+        self._file_fetcher: Optional[FileFetcher] = None
+        self._blob_store: Optional[BlobStoreAbstract] = None
         # cogt
         self._llm_models_provider: Optional[LLMModelProviderAbstract] = None
         self._llm_deck_provider: Optional[LLMDeckAbstract] = None
         self._plugin_manager: Optional[PluginManager] = None
+        self._llm_response_cache: Optional[LLMResponseCacheAbstract] = None
+        self._prompt_image_cache: Optional[PromptImageCache] = None
+        self._prompt_image_preparer: Optional[PromptImagePreparer] = None
         self._inference_manager: InferenceManagerProtocol
         self._report_delegate: InferenceReportDelegate
         self._content_generator: Optional[ContentGeneratorProtocol] = None
@@ -59,6 +71,7 @@ class PipelexHub:
         self._concept_provider: Optional[ConceptProviderAbstract] = None
         self._pipe_provider: Optional[PipeProviderAbstract] = None
         self._pipe_router: Optional[PipeRouterProtocol] = None
+        self._batch_checkpoint_store: Optional[BatchCheckpointStoreAbstract] = None
 
         # mission
         self._mission_tracker: Optional[MissionTrackerProtocol] = None
@@ -114,6 +127,12 @@ class PipelexHub:
     def set_template_provider(self, template_provider: TemplateProviderAbstract):
         self._template_provider = template_provider
 
+    def set_file_fetcher(self, file_fetcher: Optional[FileFetcher]):
+        self._file_fetcher = file_fetcher
+
+    def set_blob_store(self, blob_store: Optional[BlobStoreAbstract]):
+        self._blob_store = blob_store
+
     # cogt
 
     def set_llm_models_provider(self, llm_models_provider: LLMModelProviderAbstract):
@@ -128,6 +147,15 @@ class PipelexHub:
     def set_inference_manager(self, inference_manager: InferenceManagerProtocol):
         self._inference_manager = inference_manager
 
+    def set_llm_response_cache(self, llm_response_cache: Optional[LLMResponseCacheAbstract]):
+        self._llm_response_cache = llm_response_cache
+
+    def set_prompt_image_cache(self, prompt_image_cache: Optional[PromptImageCache]):
+        self._prompt_image_cache = prompt_image_cache
+
+    def set_prompt_image_preparer(self, prompt_image_preparer: Optional[PromptImagePreparer]):
+        self._prompt_image_preparer = prompt_image_preparer
+
     def set_report_delegate(self, report_delegate: InferenceReportDelegate):
         self._report_delegate = report_delegate
 
@@ -148,6 +176,9 @@ class PipelexHub:
     def set_pipe_router(self, pipe_router: PipeRouterProtocol):
         self._pipe_router = pipe_router
 
+    def set_batch_checkpoint_store(self, batch_checkpoint_store: BatchCheckpointStoreAbstract):
+        self._batch_checkpoint_store = batch_checkpoint_store
+
     def set_mission_tracker(self, mission_tracker: MissionTrackerProtocol):
         self._mission_tracker = mission_tracker
 
@@ -186,6 +217,14 @@ class PipelexHub:
             raise RuntimeError("Template provider is not set. You must initialize Pipelex first.")
         return self._template_provider
 
+    def get_optional_file_fetcher(self) -> Optional[FileFetcher]:
+        return self._file_fetcher
+
+    def get_required_blob_store(self) -> BlobStoreAbstract:
+        if self._blob_store is None:
+            raise RuntimeError("BlobStore is not initialized")
+        return self._blob_store
+
     # cogt
 
     def get_required_llm_models_provider(self) -> LLMModelProviderAbstract:
@@ -212,6 +251,15 @@ class PipelexHub:
     def get_report_delegate(self) -> InferenceReportDelegate:
         return self._report_delegate
 
+    def get_optional_llm_response_cache(self) -> Optional[LLMResponseCacheAbstract]:
+        return self._llm_response_cache
+
+    def get_optional_prompt_image_cache(self) -> Optional[PromptImageCache]:
+        return self._prompt_image_cache
+
+    def get_optional_prompt_image_preparer(self) -> Optional[PromptImagePreparer]:
+        return self._prompt_image_preparer
+
     def get_required_content_generator(self) -> ContentGeneratorProtocol:
         if self._content_generator is None:
             raise RuntimeError("ContentGenerator is not initialized")
@@ -245,6 +293,11 @@ class PipelexHub:
             raise RuntimeError("PipeRouter is not initialized")
         return self._pipe_router
 
+    def get_required_batch_checkpoint_store(self) -> BatchCheckpointStoreAbstract:
+        if self._batch_checkpoint_store is None:
+            raise RuntimeError("BatchCheckpointStore is not initialized")
+        return self._batch_checkpoint_store
+
     def get_mission_tracker(self) -> MissionTrackerProtocol:
         if self._mission_tracker is None:
             raise RuntimeError("MissionTracker is not initialized")
@@ -284,6 +337,14 @@ def get_template_provider() -> TemplateProviderAbstract:
     return get_pipelex_hub().get_required_template_provider()
 
 
+def get_file_fetcher() -> Optional[FileFetcher]:
+    return get_pipelex_hub().get_optional_file_fetcher()
+
+
+def get_blob_store() -> BlobStoreAbstract:
+    return get_pipelex_hub().get_required_blob_store()
+
+
 def get_template(template_name: str) -> str:
     return get_template_provider().get_template(template_name=template_name)
 
@@ -333,6 +394,18 @@ def get_report_delegate() -> InferenceReportDelegate:
     return get_pipelex_hub().get_report_delegate()
 
 
+def get_llm_response_cache() -> Optional[LLMResponseCacheAbstract]:
+    return get_pipelex_hub().get_optional_llm_response_cache()
+
+
+def get_prompt_image_cache() -> Optional[PromptImageCache]:
+    return get_pipelex_hub().get_optional_prompt_image_cache()
+
+
+def get_prompt_image_preparer() -> Optional[PromptImagePreparer]:
+    return get_pipelex_hub().get_optional_prompt_image_preparer()
+
+
 def get_content_generator() -> ContentGeneratorProtocol:
     return get_pipelex_hub().get_required_content_generator()
 
@@ -388,6 +461,10 @@ def get_optional_pipe(pipe_code: str) -> Optional[PipeAbstract]:
     return get_pipelex_hub().get_required_pipe_provider().get_optional_pipe(pipe_code=pipe_code)
 
 
+def get_pipe_execution_plan(pipe_code: str) -> PipeExecutionPlan:
+    return get_pipelex_hub().get_required_pipe_provider().get_required_execution_plan(pipe_code=pipe_code)
+
+
 def get_concept_provider() -> ConceptProviderAbstract:
     return get_pipelex_hub().get_required_concept_provider()
 
@@ -404,6 +481,10 @@ def get_pipe_router() -> PipeRouterProtocol:
     return get_pipelex_hub().get_required_pipe_router()
 
 
+def get_batch_checkpoint_store() -> BatchCheckpointStoreAbstract:
+    return get_pipelex_hub().get_required_batch_checkpoint_store()
+
+
 def get_mission_tracker() -> MissionTrackerProtocol:
     return get_pipelex_hub().get_mission_tracker()
 
@@ -226,6 +226,7 @@ class LibraryManager:
         self.concept_library.validate_with_libraries()
         self.pipe_library.validate_with_libraries()
         self.domain_library.validate_with_libraries()
+        self.pipe_library.compile_execution_plans()
 
     @classmethod
     def make_pipe_from_details_dict(
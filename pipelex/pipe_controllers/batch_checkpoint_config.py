@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from enum import StrEnum
+
+from pydantic import Field
+
+from pipelex.core.pipe_run_params import BatchCheckpointMode
+from pipelex.tools.config.models import ConfigModel
+
+
+class BatchCheckpointStoreType(StrEnum):
+    DIRECTORY = "directory"
+    SQLITE = "sqlite"
+
+
+class BatchCheckpointConfig(ConfigModel):
+    default_checkpoint_mode: BatchCheckpointMode = Field(strict=False)
+    store_type: BatchCheckpointStoreType = Field(strict=False)
+    directory_path: str
+    sqlite_path: str
@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+from kajson import kajson
+from typing_extensions import override
+
+from pipelex import log
+from pipelex.exceptions import PipeBatchCheckpointError
+from pipelex.pipe_controllers.batch_checkpoint_config import BatchCheckpointConfig, BatchCheckpointStoreType
+from pipelex.pipe_controllers.batch_checkpoint_store_abstract import BatchBranchCheckpoint, BatchCheckpointStoreAbstract
+from pipelex.tools.utils.file_utils import ensure_directory_exists, remove_folder
+
+
+def _dump_checkpoint(branch_checkpoint: BatchBranchCheckpoint) -> str:
+    # kajson keeps the class of the StuffContent so that structured contents are restored as such
+    return kajson.dumps(branch_checkpoint)
+
+
+def _load_checkpoint(checkpoint_json: str) -> BatchBranchCheckpoint:
+    loaded: Any = kajson.loads(checkpoint_json)
+    if not isinstance(loaded, BatchBranchCheckpoint):
+        raise PipeBatchCheckpointError(f"Batch checkpoint does not contain a BatchBranchCheckpoint but a {type(loaded).__name__}")
+    return loaded
+
+
+class DirectoryBatchCheckpointStore(BatchCheckpointStoreAbstract):
+    """Stores each branch output as a JSON file: <directory_path>/<batch_key>/branch_<branch_index>.json"""
+
+    BRANCH_FILE_PATTERN = re.compile(r"^branch_(\d+)\.json$")
+
+    def __init__(self, directory_path: str):
+        self.directory_path = directory_path
+
+    def _get_batch_dir(self, batch_key: str) -> str:
+        return os.path.join(self.directory_path, batch_key)
+
+    @override
+    def setup(self) -> None:
+        pass
+
+    @override
+    def teardown(self) -> None:
+        pass
+
+    @override
+    def save_branch_checkpoint(self, batch_key: str, branch_index: int, branch_checkpoint: BatchBranchCheckpoint) -> None:
+        batch_dir = self._get_batch_dir(batch_key=batch_key)
+        ensure_directory_exists(batch_dir)
+        file_path = os.path.join(batch_dir, f"branch_{branch_index}.json")
+        # write then rename, so that a crash during the write never leaves a truncated checkpoint
+        tmp_file_path = f"{file_path}.tmp"
+        with open(tmp_file_path, "w", encoding="utf-8") as file:
+            file.write(_dump_checkpoint(branch_checkpoint=branch_checkpoint))
+        os.replace(tmp_file_path, file_path)
+
+    @override
+    def load_branch_checkpoints(self, batch_key: str) -> Dict[int, BatchBranchCheckpoint]:
+        batch_dir = self._get_batch_dir(batch_key=batch_key)
+        branch_checkpoints: Dict[int, BatchBranchCheckpoint] = {}
+        if not os.path.isdir(batch_dir):
+            return branch_checkpoints
+        for file_name in os.listdir(batch_dir):
+            match = self.BRANCH_FILE_PATTERN.match(file_name)
+            if not match:
+                continue
+            with open(os.path.join(batch_dir, file_name), encoding="utf-8") as file:
+                branch_checkpoints[int(match.group(1))] = _load_checkpoint(checkpoint_json=file.read())
+        return branch_checkpoints
+
+    @override
+    def clear_batch(self, batch_key: str) -> None:
+        remove_folder(self._get_batch_dir(batch_key=batch_key))
+
+
+class SQLiteBatchCheckpointStore(BatchCheckpointStoreAbstract):
+    """
+    Stores each branch output as a JSON row of a single SQLite table, keyed by (batch_key, branch_index).
+    The batches call the store from worker threads, which share the connection one at a time.
+    """
+
+    def __init__(self, sqlite_path: str):
+        self.sqlite_path = sqlite_path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if directory_path := os.path.dirname(self.sqlite_path):
+                ensure_directory_exists(directory_path)
+            self._connection = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS batch_checkpoint ("
+                "batch_key TEXT NOT NULL, branch_index INTEGER NOT NULL, checkpoint_json TEXT NOT NULL, "
+                "PRIMARY KEY (batch_key, branch_index))"
+            )
+            self._connection.commit()
+        return self._connection
+
+    @override
+    def setup(self) -> None:
+        pass
+
+    @override
+    def teardown(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    @override
+    def save_branch_checkpoint(self, batch_key: str, branch_index: int, branch_checkpoint: BatchBranchCheckpoint) -> None:
+        checkpoint_json = _dump_checkpoint(branch_checkpoint=branch_checkpoint)
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO batch_checkpoint (batch_key, branch_index, checkpoint_json) VALUES (?, ?, ?)",
+                (batch_key, branch_index, checkpoint_json),
+            )
+            self.connection.commit()
+
+    @override
+    def load_branch_checkpoints(self, batch_key: str) -> Dict[int, BatchBranchCheckpoint]:
+        with self._lock:
+            cursor = self.connection.execute(
+                "SELECT branch_index, checkpoint_json FROM batch_checkpoint WHERE batch_key = ?",
+                (batch_key,),
+            )
+            rows = cursor.fetchall()
+        return {branch_index: _load_checkpoint(checkpoint_json=checkpoint_json) for branch_index, checkpoint_json in rows}
+
+    @override
+    def clear_batch(self, batch_key: str) -> None:
+        with self._lock:
+            self.connection.execute("DELETE FROM batch_checkpoint WHERE batch_key = ?", (batch_key,))
+            self.connection.commit()
+
+
+class BatchCheckpointStoreFactory:
+    @classmethod
+    def make_batch_checkpoint_store(cls, batch_checkpoint_config: BatchCheckpointConfig) -> BatchCheckpointStoreAbstract:
+        log.debug(f"Making batch checkpoint store of type '{batch_checkpoint_config.store_type}'")
+        match batch_checkpoint_config.store_type:
+            case BatchCheckpointStoreType.DIRECTORY:
+                return DirectoryBatchCheckpointStore(directory_path=batch_checkpoint_config.directory_path)
+            case BatchCheckpointStoreType.SQLITE:
+                return SQLiteBatchCheckpointStore(sqlite_path=batch_checkpoint_config.sqlite_path)
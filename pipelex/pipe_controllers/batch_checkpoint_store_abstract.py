@@ -0,0 +1,44 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from abc import ABC, abstractmethod
+from typing import Dict
+
+from pydantic import BaseModel
+
+from pipelex.core.stuff import Stuff
+
+
+class BatchBranchCheckpoint(BaseModel):
+    """Output stuff of a completed branch, with the digest of the input item it was computed from."""
+
+    item_digest: str
+    stuff: Stuff
+
+
+class BatchCheckpointStoreAbstract(ABC):
+    """
+    Persists the output stuff of each completed PipeBatch branch, so that an interrupted batch can be resumed.
+    Checkpoints are keyed by a batch key (derived from the batch pipe and the digest of its input list) and the branch index.
+    """
+
+    @abstractmethod
+    def setup(self) -> None:
+        pass
+
+    @abstractmethod
+    def teardown(self) -> None:
+        pass
+
+    @abstractmethod
+    def save_branch_checkpoint(self, batch_key: str, branch_index: int, branch_checkpoint: BatchBranchCheckpoint) -> None:
+        pass
+
+    @abstractmethod
+    def load_branch_checkpoints(self, batch_key: str) -> Dict[int, BatchBranchCheckpoint]:
+        pass
+
+    @abstractmethod
+    def clear_batch(self, batch_key: str) -> None:
+        pass
@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+from typing import AsyncGenerator, Awaitable, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from pipelex import log
+from pipelex.core.pipe_output import BranchFailure
+from pipelex.core.pipe_run_params import BranchFailurePolicy
+from pipelex.exceptions import PipeBatchError
+
+BranchResultType = TypeVar("BranchResultType")
+
+BranchFactory = Callable[[], Awaitable[BranchResultType]]
+
+
+class BatchExecutor(Generic[BranchResultType]):
+    """
+    Runs batch branches with a bounded number of them in flight at any time.
+
+    Branches are provided as factories so that each branch (and the working memory it requires)
+    is only built when a slot becomes available in the sliding window.
+    Results are either streamed as branches complete, or returned in the order of the branch factories.
+
+    A failed branch is retried up to retry_failed_n_times, then handled according to the failure policy:
+    with FAIL_FAST, the branches still in flight are cancelled and the exception is raised,
+    with COLLECT_ERRORS, the failure is recorded in branch_failures and the other branches go on.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        failure_policy: BranchFailurePolicy = BranchFailurePolicy.FAIL_FAST,
+        retry_failed_n_times: int = 0,
+    ):
+        if max_concurrency is not None and max_concurrency < 1:
+            raise PipeBatchError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        if retry_failed_n_times < 0:
+            raise PipeBatchError(f"retry_failed_n_times must be positive or zero, got {retry_failed_n_times}")
+        self.max_concurrency = max_concurrency
+        self.failure_policy = failure_policy
+        self.retry_failed_n_times = retry_failed_n_times
+        self.branch_failures: List[BranchFailure] = []
+
+    def _has_free_slot(self, nb_in_flight: int) -> bool:
+        return self.max_concurrency is None or nb_in_flight < self.max_concurrency
+
+    async def _run_branch_with_retries(self, branch_index: int, branch_factory: BranchFactory[BranchResultType]) -> BranchResultType:
+        # the factory is called again for each attempt, so that each attempt gets a fresh coroutine
+        nb_attempts = 1
+        while True:
+            try:
+                return await branch_factory()
+            except Exception as exc:
+                if nb_attempts > self.retry_failed_n_times:
+                    raise
+                log.warning(f"BatchExecutor: branch {branch_index} failed on attempt {nb_attempts}, retrying: {exc}")
+                nb_attempts += 1
+
+    def _record_failure(self, branch_index: int, exc: BaseException):
+        log.error(f"BatchExecutor: branch {branch_index} failed: {exc}")
+        self.branch_failures.append(
+            BranchFailure(
+                branch_index=branch_index,
+                error_type=type(exc).__name__,
+                error_message=str(exc),
+                nb_attempts=1 + self.retry_failed_n_times,
+            )
+        )
+
+    async def iter_completed(
+        self,
+        branch_factories: Iterable[BranchFactory[BranchResultType]],
+    ) -> AsyncGenerator[Tuple[int, BranchResultType], None]:
+        """
+        Run the branches and yield (branch_index, result) for each branch as soon as it completes successfully.
+        If a branch fails with FAIL_FAST, or if the caller stops iterating, the branches still in flight are cancelled.
+        """
+        factories_iterator = enumerate(branch_factories)
+        in_flight: Dict["asyncio.Task[BranchResultType]", int] = {}
+        nb_completed = 0
+        is_exhausted = False
+
+        try:
+            while True:
+                while not is_exhausted and self._has_free_slot(nb_in_flight=len(in_flight)):
+                    next_branch = next(factories_iterator, None)
+                    if next_branch is None:
+                        is_exhausted = True
+                        break
+                    branch_index, branch_factory = next_branch
+                    branch_task = asyncio.ensure_future(self._run_branch_with_retries(branch_index=branch_index, branch_factory=branch_factory))
+                    in_flight[branch_task] = branch_index
+                if not in_flight:
+                    break
+                done, _ = await asyncio.wait(in_flight.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    branch_index = in_flight.pop(task)
+                    nb_completed += 1
+                    if (exc := task.exception()) and self.failure_policy == BranchFailurePolicy.COLLECT_ERRORS:
+                        self._record_failure(branch_index=branch_index, exc=exc)
+                        continue
+                    yield branch_index, task.result()
+                log.verbose(f"BatchExecutor: {nb_completed} branches done, {len(in_flight)} in flight")
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight.keys(), return_exceptions=True)
+
+    async def run_by_index(
+        self,
+        branch_factories: Iterable[BranchFactory[BranchResultType]],
+    ) -> Dict[int, BranchResultType]:
+        """Run all the branches and return the results of the successful ones by branch index."""
+        results_by_index: Dict[int, BranchResultType] = {}
+        async for branch_index, result in self.iter_completed(branch_factories=branch_factories):
+            results_by_index[branch_index] = result
+        return results_by_index
+
+    async def run(
+        self,
+        branch_factories: Iterable[BranchFactory[BranchResultType]],
+    ) -> List[BranchResultType]:
+        """
+        Run all the branches and return the results of the successful ones in branch order.
+        With FAIL_FAST, if a branch fails, the branches still in flight are cancelled and the exception is raised.
+        """
+        results_by_index = await self.run_by_index(branch_factories=branch_factories)
+        return [results_by_index[branch_index] for branch_index in sorted(results_by_index.keys())]
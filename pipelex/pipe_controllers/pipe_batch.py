@@ -3,49 +3,190 @@
 # "Pipelex" is a trademark of Evotis S.A.S.
 
 import asyncio
-from typing import Any, Coroutine, List, Optional, Set, cast
+import hashlib
+from functools import partial
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, cast
 
 import shortuuid
+from kajson import kajson
 from typing_extensions import override
 
 from pipelex import log
+from pipelex.cogt.llm.llm_job_components import LLMExecutionMode
 from pipelex.config import get_config
-from pipelex.core.pipe_output import PipeOutput
-from pipelex.core.pipe_run_params import BatchParams, PipeRunParams
+from pipelex.core.pipe_output import BatchBranchOutput, BranchFailure, PipeOutput
+from pipelex.core.pipe_run_params import BatchCheckpointMode, BatchOptions, BatchParams, BranchFailurePolicy, PipeRunParams
 from pipelex.core.stuff import Stuff
-from pipelex.core.stuff_content import ListContent, StuffContent
+from pipelex.core.stuff_content import FailedItemContent, ListContent, StuffContent
 from pipelex.core.stuff_factory import StuffFactory
 from pipelex.core.working_memory import WorkingMemory
-from pipelex.exceptions import PipeExecutionError
-from pipelex.hub import get_pipe_router
+from pipelex.core.working_memory_factory import WorkingMemoryFactory
+from pipelex.exceptions import PipeBatchCheckpointError, PipeExecutionError
+from pipelex.hub import get_batch_checkpoint_store, get_blob_store, get_pipe_router
 from pipelex.mission.job_metadata import JobMetadata
+from pipelex.pipe_controllers.batch_checkpoint_store_abstract import BatchBranchCheckpoint
+from pipelex.pipe_controllers.batch_executor import BatchExecutor, BranchFactory
 from pipelex.pipe_controllers.pipe_controller import PipeController
 
 
+def _make_content_digest(content: StuffContent) -> str:
+    # the dump includes the fields of the content subclasses, e.g. the blob digest of an ImageContent
+    return hashlib.sha256(kajson.dumps(content).encode()).hexdigest()
+
+
+def _find_blob_digests(dumped_content: Any) -> Set[str]:
+    """The blob digests referenced anywhere in a dumped content, e.g. by the page views of a list of pages."""
+    blob_digests: Set[str] = set()
+    if isinstance(dumped_content, dict):
+        for key, value in cast(Dict[str, Any], dumped_content).items():
+            if key == "blob_digest" and isinstance(value, str):
+                blob_digests.add(value)
+            else:
+                blob_digests.update(_find_blob_digests(dumped_content=value))
+    elif isinstance(dumped_content, list):
+        for value in cast(List[Any], dumped_content):
+            blob_digests.update(_find_blob_digests(dumped_content=value))
+    return blob_digests
+
+
 class PipeBatch(PipeController):
     """Runs a PipeSequence in parallel for each item in a list."""
 
     branch_pipe_code: str
     batch_params: Optional[BatchParams] = None
+    batch_options: Optional[BatchOptions] = None
 
     @override
     def pipe_dependencies(self) -> Set[str]:
         return set([self.branch_pipe_code])
 
-    @override
-    async def _run_controller_pipe(
+    def _get_llm_execution_mode(self, pipe_run_params: PipeRunParams) -> LLMExecutionMode:
+        if pipe_run_params.batch_options and pipe_run_params.batch_options.llm_execution_mode:
+            return pipe_run_params.batch_options.llm_execution_mode
+        if self.batch_options and self.batch_options.llm_execution_mode:
+            return self.batch_options.llm_execution_mode
+        # a batch nested in the branch of a provider batch inherits its mode
+        return pipe_run_params.llm_execution_mode
+
+    def _get_max_concurrency(self, pipe_run_params: PipeRunParams) -> Optional[int]:
+        """The max_concurrency set in the run params overrides the one set on the pipe, which overrides the config default."""
+        if self._get_llm_execution_mode(pipe_run_params=pipe_run_params) == LLMExecutionMode.PROVIDER_BATCH:
+            # all branches must be in flight together for their LLM jobs to be collected into the same provider batch
+            return None
+        if pipe_run_params.batch_options and pipe_run_params.batch_options.max_concurrency:
+            return pipe_run_params.batch_options.max_concurrency
+        if self.batch_options and self.batch_options.max_concurrency:
+            return self.batch_options.max_concurrency
+        return get_config().pipelex.pipe_run_config.applied_batch_max_concurrency
+
+    def _get_checkpoint_mode(self, pipe_run_params: PipeRunParams) -> BatchCheckpointMode:
+        """The checkpoint_mode set in the run params overrides the one set on the pipe, which overrides the config default."""
+        if pipe_run_params.batch_options and pipe_run_params.batch_options.checkpoint_mode:
+            return pipe_run_params.batch_options.checkpoint_mode
+        if self.batch_options and self.batch_options.checkpoint_mode:
+            return self.batch_options.checkpoint_mode
+        return get_config().pipelex.batch_checkpoint_config.default_checkpoint_mode
+
+    def _get_failure_policy(self, pipe_run_params: PipeRunParams) -> BranchFailurePolicy:
+        if pipe_run_params.batch_options and pipe_run_params.batch_options.failure_policy:
+            return pipe_run_params.batch_options.failure_policy
+        if self.batch_options and self.batch_options.failure_policy:
+            return self.batch_options.failure_policy
+        return get_config().pipelex.pipe_run_config.branch_failure_policy
+
+    def _get_retry_failed_n_times(self, pipe_run_params: PipeRunParams) -> int:
+        if pipe_run_params.batch_options and pipe_run_params.batch_options.retry_failed_n_times is not None:
+            return pipe_run_params.batch_options.retry_failed_n_times
+        if self.batch_options and self.batch_options.retry_failed_n_times is not None:
+            return self.batch_options.retry_failed_n_times
+        return get_config().pipelex.pipe_run_config.branch_retry_failed_n_times
+
+    def _make_checkpoint_batch_key(self, input_content: ListContent[StuffContent]) -> str:
+        # the stuff code of the input list is random, so the batch is keyed by its content, which is the same after a restart
+        return f"{self.code}-{_make_content_digest(content=input_content)}"
+
+    def _check_blobs_can_be_checkpointed(self, stuff: Stuff):
+        """Checkpoints only hold the digests of the blobs, which a later run can only resolve if the blob store outlives the process."""
+        if get_blob_store().is_persistent:
+            return
+        if _find_blob_digests(dumped_content=stuff.content.model_dump(serialize_as_any=True)):
+            raise PipeBatchCheckpointError(
+                f"PipeBatch '{self.code}' cannot checkpoint the output '{stuff.stuff_name}' because it holds blobs, e.g. images, "
+                "and the blob store does not outlive the process: set store_type = 'directory' with a directory_path "
+                "in [pipelex.blob_store_config] to checkpoint such outputs"
+            )
+
+    def _restore_branch_stuff(self, branch_checkpoint: BatchBranchCheckpoint, item: StuffContent, branch_index: int) -> Stuff:
+        if branch_checkpoint.item_digest != _make_content_digest(content=item):
+            raise PipeBatchCheckpointError(
+                f"PipeBatch '{self.code}' cannot restore branch {branch_index}: its checkpoint was computed from another input item"
+            )
+        restored_stuff = branch_checkpoint.stuff
+        blob_store = get_blob_store()
+        blob_digests = _find_blob_digests(dumped_content=restored_stuff.content.model_dump(serialize_as_any=True))
+        if missing_blob_digests := [blob_digest for blob_digest in blob_digests if not blob_store.has_blob(digest=blob_digest)]:
+            raise PipeBatchCheckpointError(
+                f"PipeBatch '{self.code}' cannot restore branch {branch_index}: {len(missing_blob_digests)} blobs it refers to "
+                "are not in the blob store"
+            )
+        return restored_stuff
+
+    async def _run_branch(
+        self,
+        job_metadata: JobMetadata,
+        working_memory: WorkingMemory,
+        item_input_stuff: Stuff,
+        input_item_stuff_name: str,
+        branch_pipe_run_params: PipeRunParams,
+        branch_output_name: str,
+        branch_index: int,
+        checkpoint_batch_key: Optional[str] = None,
+        item_digest: Optional[str] = None,
+    ) -> PipeOutput:
+        # the branch memory is only made when the branch is actually launched, it shares the stuffs of the batch memory
+        branch_memory = working_memory.make_overlay()
+        branch_memory.set_new_main_stuff(stuff=item_input_stuff, name=input_item_stuff_name)
+        pipe_output: PipeOutput = await get_pipe_router().run_pipe_code(
+            pipe_code=self.branch_pipe_code,
+            job_metadata=job_metadata,
+            working_memory=branch_memory,
+            output_name=branch_output_name,
+            # the run params are copied for each attempt because running the pipe updates them, e.g. its pipe stack
+            pipe_run_params=branch_pipe_run_params.model_copy(deep=True),
+        )
+        if checkpoint_batch_key and item_digest:
+            self._check_blobs_can_be_checkpointed(stuff=pipe_output.main_stuff)
+            # the checkpoint is written out of the event loop, so that it doesn't stall the other branches
+            await asyncio.to_thread(
+                get_batch_checkpoint_store().save_branch_checkpoint,
+                batch_key=checkpoint_batch_key,
+                branch_index=branch_index,
+                branch_checkpoint=BatchBranchCheckpoint(item_digest=item_digest, stuff=pipe_output.main_stuff),
+            )
+        return pipe_output
+
+    async def _restore_branch(self, restored_stuff: Stuff, branch_output_name: str) -> PipeOutput:
+        return PipeOutput(
+            working_memory=WorkingMemoryFactory.make_from_stuff_and_name(stuff=restored_stuff, name=branch_output_name),
+        )
+
+    async def _make_branch_factories(
         self,
         job_metadata: JobMetadata,
         working_memory: WorkingMemory,
         pipe_run_params: PipeRunParams,
         output_name: Optional[str] = None,
-    ) -> PipeOutput:
-        """Run a sequence of steps in batch for each item in the input list."""
+    ) -> List[BranchFactory[PipeOutput]]:
+        """Make the factories of the branches to run for each item in the input list."""
         if not self.input_concept_code:
             raise PipeExecutionError(f"Missing input concept code for pipe '{self.code}' but it is required for PipeBatch")
         if pipe_run_params.final_stuff_code:
             log.debug(f"PipeBatch.run_pipe() final_stuff_code: {pipe_run_params.final_stuff_code}")
             pipe_run_params.final_stuff_code = None
+        # the branches would interleave their outputs in the sinks
+        pipe_run_params.text_chunk_sink = None
+        pipe_run_params.object_item_sink = None
+        pipe_run_params.llm_execution_mode = self._get_llm_execution_mode(pipe_run_params=pipe_run_params)
 
         pipe_run_params.push_pipe_layer(pipe_code=self.branch_pipe_code)
         batch_params = pipe_run_params.batch_params or self.batch_params or BatchParams.make_default()
@@ -58,14 +199,30 @@ class PipeBatch(PipeController):
             raise ValueError(
                 f"Input of PipeBatch must be ListContent, got {input_stuff.stuff_name or 'unnamed'} = {type(input_content)}. stuff: {input_stuff}"
             )
+        input_content = cast(ListContent[StuffContent], input_content)
+
+        checkpoint_mode = self._get_checkpoint_mode(pipe_run_params=pipe_run_params)
+        checkpoint_batch_key: Optional[str] = None
+        branch_checkpoints: Dict[int, BatchBranchCheckpoint] = {}
+        match checkpoint_mode:
+            case BatchCheckpointMode.OFF:
+                pass
+            case BatchCheckpointMode.SAVE:
+                checkpoint_batch_key = self._make_checkpoint_batch_key(input_content=input_content)
+                await asyncio.to_thread(get_batch_checkpoint_store().clear_batch, batch_key=checkpoint_batch_key)
+            case BatchCheckpointMode.RESUME:
+                checkpoint_batch_key = self._make_checkpoint_batch_key(input_content=input_content)
+                branch_checkpoints = await asyncio.to_thread(get_batch_checkpoint_store().load_branch_checkpoints, batch_key=checkpoint_batch_key)
+                log.info(
+                    f"PipeBatch '{self.code}' resuming batch '{checkpoint_batch_key}': "
+                    f"{len(branch_checkpoints)} of {len(input_content.items)} branches restored from checkpoints"
+                )
 
         # TODO: Make commented code work when inputing images named "a.b.c"
         # sub_pipe = get_required_pipe(pipe_code=self.branch_pipe_code)
         nb_history_items_limit = get_config().pipelex.tracker_config.applied_nb_items_limit
-        pipe_router = get_pipe_router()
-        input_content = cast(ListContent[StuffContent], input_content)
         batch_output_stuff_code = shortuuid.uuid()
-        tasks: List[Coroutine[Any, Any, PipeOutput]] = []
+        branch_factories: List[BranchFactory[PipeOutput]] = []
         item_stuffs: List[Stuff] = []
         # required_stuff_lists: List[List[Stuff]] = []
         branch_output_item_codes: List[str] = []
@@ -82,8 +239,6 @@ class PipeBatch(PipeController):
                 name=batch_params.input_item_stuff_name,
             )
             item_stuffs.append(item_input_stuff)
-            branch_memory = working_memory.make_deep_copy()
-            branch_memory.set_new_main_stuff(stuff=item_input_stuff, name=batch_params.input_item_stuff_name)
 
             # required_variables = sub_pipe.required_variables()
             # required_stuffs = branch_memory.get_stuffs(names=required_variables)
@@ -95,25 +250,69 @@ class PipeBatch(PipeController):
                     "final_stuff_code": branch_output_item_code,
                 },
             )
-            tasks.append(
-                pipe_router.run_pipe_code(
-                    pipe_code=self.branch_pipe_code,
+            branch_output_name = f"Batch result {branch_index + 1} of {output_name}"
+            if isinstance(item, FailedItemContent):
+                # the item stands for a failed branch of a previous batch, it stays failed at the same position of the output list
+                branch_factories.append(partial(self._restore_branch, restored_stuff=item_input_stuff, branch_output_name=branch_output_name))
+                continue
+            if branch_checkpoint := branch_checkpoints.get(branch_index):
+                restored_stuff = self._restore_branch_stuff(branch_checkpoint=branch_checkpoint, item=item, branch_index=branch_index)
+                branch_factories.append(partial(self._restore_branch, restored_stuff=restored_stuff, branch_output_name=branch_output_name))
+                continue
+            branch_factories.append(
+                partial(
+                    self._run_branch,
                     job_metadata=job_metadata,
-                    working_memory=branch_memory,
-                    output_name=f"Batch result {branch_index + 1} of {output_name}",
-                    pipe_run_params=branch_pipe_run_params,
+                    working_memory=working_memory,
+                    item_input_stuff=item_input_stuff,
+                    input_item_stuff_name=batch_params.input_item_stuff_name,
+                    branch_pipe_run_params=branch_pipe_run_params,
+                    branch_output_name=branch_output_name,
+                    branch_index=branch_index,
+                    checkpoint_batch_key=checkpoint_batch_key,
+                    item_digest=_make_content_digest(content=item) if checkpoint_batch_key else None,
                 )
             )
 
-        pipe_outputs = await asyncio.gather(*tasks)
+        return branch_factories
+
+    def _make_batch_executor(self, pipe_run_params: PipeRunParams, nb_branches: int) -> BatchExecutor[PipeOutput]:
+        max_concurrency = self._get_max_concurrency(pipe_run_params=pipe_run_params)
+        failure_policy = self._get_failure_policy(pipe_run_params=pipe_run_params)
+        retry_failed_n_times = self._get_retry_failed_n_times(pipe_run_params=pipe_run_params)
+        log.debug(
+            f"PipeBatch '{self.code}' running {nb_branches} branches with max_concurrency={max_concurrency}, "
+            f"failure_policy={failure_policy}, retry_failed_n_times={retry_failed_n_times}"
+        )
+        return BatchExecutor[PipeOutput](
+            max_concurrency=max_concurrency,
+            failure_policy=failure_policy,
+            retry_failed_n_times=retry_failed_n_times,
+        )
 
+    def _set_batch_output(
+        self,
+        working_memory: WorkingMemory,
+        pipe_outputs_by_index: Dict[int, PipeOutput],
+        branch_failures: List[BranchFailure],
+        output_name: Optional[str] = None,
+    ):
+        """
+        Gather the outputs of the branches, in branch order, into a ListContent set as main stuff of the working memory.
+        Each failed branch gets a FailedItemContent, so that item i of the output list is always the output for item i of the input list.
+        """
         output_items: List[StuffContent] = []
         output_stuffs: List[Stuff] = []
         output_stuff_code = shortuuid.uuid()[:5]
-        for branch_index, pipe_output in enumerate(pipe_outputs):
-            branch_output_stuff = pipe_output.main_stuff
-            output_stuffs.append(branch_output_stuff)
-            output_items.append(branch_output_stuff.content)
+        branch_failures_by_index = {branch_failure.branch_index: branch_failure for branch_failure in branch_failures}
+        for branch_index in sorted(set(pipe_outputs_by_index.keys()) | set(branch_failures_by_index.keys())):
+            if pipe_output := pipe_outputs_by_index.get(branch_index):
+                branch_output_stuff = pipe_output.main_stuff
+                output_stuffs.append(branch_output_stuff)
+                output_items.append(branch_output_stuff.content)
+            else:
+                branch_failure = branch_failures_by_index[branch_index]
+                output_items.append(FailedItemContent(error_type=branch_failure.error_type, error_message=branch_failure.error_message))
 
         list_content: ListContent[StuffContent] = ListContent(items=output_items)
         output_stuff = StuffFactory.make_stuff(
@@ -158,6 +357,84 @@ class PipeBatch(PipeController):
             name=output_name,
         )
 
+    def _collect_branch_failures(
+        self, batch_executor: BatchExecutor[PipeOutput], pipe_outputs_by_index: Dict[int, PipeOutput]
+    ) -> List[BranchFailure]:
+        """The failures of the branches of this batch, followed by those reported by the pipes nested in its branches."""
+        branch_failures = [branch_failure.model_copy(update={"pipe_code": self.code}) for branch_failure in batch_executor.branch_failures]
+        for _, pipe_output in sorted(pipe_outputs_by_index.items()):
+            branch_failures.extend(pipe_output.branch_failures)
+        return branch_failures
+
+    @override
+    async def _run_controller_pipe(
+        self,
+        job_metadata: JobMetadata,
+        working_memory: WorkingMemory,
+        pipe_run_params: PipeRunParams,
+        output_name: Optional[str] = None,
+    ) -> PipeOutput:
+        """Run a sequence of steps in batch for each item in the input list."""
+        branch_factories = await self._make_branch_factories(
+            job_metadata=job_metadata,
+            working_memory=working_memory,
+            pipe_run_params=pipe_run_params,
+            output_name=output_name,
+        )
+        batch_executor = self._make_batch_executor(pipe_run_params=pipe_run_params, nb_branches=len(branch_factories))
+        pipe_outputs_by_index = await batch_executor.run_by_index(branch_factories=branch_factories)
+        if batch_executor.branch_failures:
+            log.warning(f"PipeBatch '{self.code}': {len(batch_executor.branch_failures)} of {len(branch_factories)} branches failed")
+        self._set_batch_output(
+            working_memory=working_memory,
+            pipe_outputs_by_index=pipe_outputs_by_index,
+            branch_failures=batch_executor.branch_failures,
+            output_name=output_name,
+        )
+
         return PipeOutput(
             working_memory=working_memory,
+            branch_failures=self._collect_branch_failures(batch_executor=batch_executor, pipe_outputs_by_index=pipe_outputs_by_index),
         )
+
+    async def stream_pipe(
+        self,
+        job_metadata: JobMetadata,
+        working_memory: WorkingMemory,
+        pipe_run_params: PipeRunParams,
+        output_name: Optional[str] = None,
+        is_output_assembled: bool = True,
+    ) -> AsyncGenerator[BatchBranchOutput, None]:
+        """
+        Run the batch and yield the output of each branch as soon as it completes, in completion order.
+        If is_output_assembled, once all branches are done, the ordered ListContent is set as main stuff of the working memory,
+        just like run_pipe() would do. Stopping the iteration early and closing the generator, e.g. with contextlib.aclosing(),
+        cancels the branches still in flight.
+        """
+        self._enter_controller_pipe(job_metadata=job_metadata, pipe_run_params=pipe_run_params)
+        # the pipe must leave the stack even if the caller stops iterating early or a branch fails
+        try:
+            branch_factories = await self._make_branch_factories(
+                job_metadata=job_metadata,
+                working_memory=working_memory,
+                pipe_run_params=pipe_run_params,
+                output_name=output_name,
+            )
+            batch_executor = self._make_batch_executor(pipe_run_params=pipe_run_params, nb_branches=len(branch_factories))
+            pipe_outputs_by_index: Dict[int, PipeOutput] = {}
+            async for branch_index, pipe_output in batch_executor.iter_completed(branch_factories=branch_factories):
+                if is_output_assembled:
+                    pipe_outputs_by_index[branch_index] = pipe_output
+                yield BatchBranchOutput(branch_index=branch_index, pipe_output=pipe_output)
+            if batch_executor.branch_failures:
+                log.warning(f"PipeBatch '{self.code}': {len(batch_executor.branch_failures)} of {len(branch_factories)} branches failed")
+
+            if is_output_assembled:
+                self._set_batch_output(
+                    working_memory=working_memory,
+                    pipe_outputs_by_index=pipe_outputs_by_index,
+                    branch_failures=batch_executor.branch_failures,
+                    output_name=output_name,
+                )
+        finally:
+            pipe_run_params.pop_pipe_from_stack(pipe_code=self.code)
@@ -6,8 +6,9 @@ from typing import Any, Dict, Optional
 
 from typing_extensions import override
 
+from pipelex.cogt.llm.llm_job_components import LLMExecutionMode
 from pipelex.core.pipe_blueprint import PipeBlueprint, PipeSpecificFactoryProtocol
-from pipelex.core.pipe_run_params import BatchParams
+from pipelex.core.pipe_run_params import BatchCheckpointMode, BatchOptions, BatchParams, BranchFailurePolicy
 from pipelex.pipe_controllers.pipe_batch import PipeBatch
 
 
@@ -16,6 +17,11 @@ class PipeBatchBlueprint(PipeBlueprint):
 
     input_list_name: Optional[str] = None
     input_item_name: Optional[str] = None
+    max_concurrency: Optional[int] = None
+    checkpoint_mode: Optional[BatchCheckpointMode] = None
+    failure_policy: Optional[BranchFailurePolicy] = None
+    retry_failed_n_times: Optional[int] = None
+    llm_execution_mode: Optional[LLMExecutionMode] = None
 
 
 class PipeBatchFactory(PipeSpecificFactoryProtocol[PipeBatchBlueprint, PipeBatch]):
@@ -31,6 +37,13 @@ class PipeBatchFactory(PipeSpecificFactoryProtocol[PipeBatchBlueprint, PipeBatch
             input_list_name=pipe_blueprint.input_list_name or False,
             input_item_name=pipe_blueprint.input_item_name,
         )
+        batch_options = BatchOptions.make_optional_batch_options(
+            max_concurrency=pipe_blueprint.max_concurrency,
+            checkpoint_mode=pipe_blueprint.checkpoint_mode,
+            failure_policy=pipe_blueprint.failure_policy,
+            retry_failed_n_times=pipe_blueprint.retry_failed_n_times,
+            llm_execution_mode=pipe_blueprint.llm_execution_mode,
+        )
         return PipeBatch(
             domain=domain_code,
             code=pipe_code,
@@ -39,6 +52,7 @@ class PipeBatchFactory(PipeSpecificFactoryProtocol[PipeBatchBlueprint, PipeBatch
             output_concept_code=pipe_blueprint.output,
             branch_pipe_code=pipe_blueprint.branch_pipe_code,
             batch_params=batch_params,
+            batch_options=batch_options,
         )
 
     @classmethod
@@ -23,13 +23,7 @@ class PipeController(PipeAbstract):
         pipe_run_params: PipeRunParams,
         output_name: Optional[str] = None,
     ) -> PipeOutput:
-        pipe_run_params.push_pipe_to_stack(pipe_code=self.code)
-        self.monitor_pipe_stack(pipe_run_params=pipe_run_params)
-
-        updated_metadata = JobMetadata(
-            pipe_job_ids=[self.code],
-        )
-        job_metadata.update(updated_metadata=updated_metadata)
+        self._enter_controller_pipe(job_metadata=job_metadata, pipe_run_params=pipe_run_params)
 
         pipe_output = await self._run_controller_pipe(
             job_metadata=job_metadata,
@@ -42,6 +36,15 @@ class PipeController(PipeAbstract):
 
         return pipe_output
 
+    def _enter_controller_pipe(self, job_metadata: JobMetadata, pipe_run_params: PipeRunParams):
+        pipe_run_params.push_pipe_to_stack(pipe_code=self.code)
+        self.monitor_pipe_stack(pipe_run_params=pipe_run_params)
+
+        updated_metadata = JobMetadata(
+            pipe_job_ids=[self.code],
+        )
+        job_metadata.update(updated_metadata=updated_metadata)
+
     @abstractmethod
     async def _run_controller_pipe(
         self,
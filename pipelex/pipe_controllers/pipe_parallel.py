@@ -2,21 +2,23 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-import asyncio
-from typing import Any, Coroutine, Dict, List, Optional, Set
+from functools import partial
+from typing import Dict, List, Optional, Set
 
 from typing_extensions import override
 
 from pipelex import log
+from pipelex.config import get_config
 from pipelex.core.pipe_output import PipeOutput
-from pipelex.core.pipe_run_params import PipeRunParams
+from pipelex.core.pipe_run_params import BranchFailurePolicy, PipeRunParams
 from pipelex.core.stuff import Stuff
 from pipelex.core.stuff_content import StuffContent
 from pipelex.core.stuff_factory import StuffFactory
 from pipelex.core.working_memory import WorkingMemory
-from pipelex.exceptions import PipeDefinitionError
+from pipelex.exceptions import PipeDefinitionError, PipeExecutionError
 from pipelex.hub import get_mission_tracker
 from pipelex.mission.job_metadata import JobMetadata
+from pipelex.pipe_controllers.batch_executor import BatchExecutor, BranchFactory
 from pipelex.pipe_controllers.pipe_controller import PipeController
 from pipelex.pipe_controllers.sub_pipe import SubPipe
 
@@ -27,11 +29,27 @@ class PipeParallel(PipeController):
     parallel_sub_pipes: List[SubPipe]
     add_each_output: bool
     combined_output: Optional[str]
+    failure_policy: Optional[BranchFailurePolicy] = None
+    retry_failed_n_times: Optional[int] = None
 
     @override
     def pipe_dependencies(self) -> Set[str]:
         return set(sub_pipe.pipe_code for sub_pipe in self.parallel_sub_pipes)
 
+    async def _run_parallel_sub_pipe(
+        self,
+        parallel_sub_pipe: SubPipe,
+        job_metadata: JobMetadata,
+        working_memory: WorkingMemory,
+        pipe_run_params: PipeRunParams,
+    ) -> PipeOutput:
+        # each attempt of each sub pipe gets its own memory overlay and its own copy of the run params
+        return await parallel_sub_pipe.run(
+            job_metadata=job_metadata,
+            working_memory=working_memory.make_overlay(),
+            sub_pipe_run_params=pipe_run_params.model_copy(deep=True),
+        )
+
     @override
     async def _run_controller_pipe(
         self,
@@ -48,25 +66,34 @@ class PipeParallel(PipeController):
         if pipe_run_params.final_stuff_code:
             log.debug(f"PipeBatch.run_pipe() final_stuff_code: {pipe_run_params.final_stuff_code}")
             pipe_run_params.final_stuff_code = None
+        # the branches would interleave their outputs in the sinks
+        pipe_run_params.text_chunk_sink = None
+        pipe_run_params.object_item_sink = None
 
-        tasks: List[Coroutine[Any, Any, PipeOutput]] = []
-
-        for parallel_sub_pipe in self.parallel_sub_pipes:
-            tasks.append(
-                parallel_sub_pipe.run(
-                    job_metadata=job_metadata,
-                    working_memory=working_memory.make_deep_copy(),
-                    sub_pipe_run_params=pipe_run_params,
-                )
+        branch_factories: List[BranchFactory[PipeOutput]] = [
+            partial(
+                self._run_parallel_sub_pipe,
+                parallel_sub_pipe=parallel_sub_pipe,
+                job_metadata=job_metadata,
+                working_memory=working_memory,
+                pipe_run_params=pipe_run_params,
             )
-
-        pipe_outputs = await asyncio.gather(*tasks)
+            for parallel_sub_pipe in self.parallel_sub_pipes
+        ]
+        pipe_run_config = get_config().pipelex.pipe_run_config
+        batch_executor = BatchExecutor[PipeOutput](
+            failure_policy=self.failure_policy or pipe_run_config.branch_failure_policy,
+            retry_failed_n_times=self.retry_failed_n_times if self.retry_failed_n_times is not None else pipe_run_config.branch_retry_failed_n_times,
+        )
+        pipe_outputs_by_index = await batch_executor.run_by_index(branch_factories=branch_factories)
+        if batch_executor.branch_failures:
+            log.warning(f"PipeParallel '{self.code}': {len(batch_executor.branch_failures)} of {len(branch_factories)} sub pipes failed")
 
         output_stuff_content_items: List[StuffContent] = []
         output_stuffs: Dict[str, Stuff] = {}
         output_stuff_contents: Dict[str, StuffContent] = {}
 
-        for output_index, pipe_output in enumerate(pipe_outputs):
+        for output_index, pipe_output in sorted(pipe_outputs_by_index.items()):
             output_stuff = pipe_output.main_stuff
             sub_pipe_output_name = self.parallel_sub_pipes[output_index].output_name
             if not sub_pipe_output_name:
@@ -87,6 +114,15 @@ class PipeParallel(PipeController):
                 )
             output_stuff_contents[sub_pipe_output_name] = output_stuff.content
         if combined_output := self.combined_output:
+            if batch_executor.branch_failures:
+                # the outputs of the failed sub pipes are missing, they can't be combined
+                failed_sub_pipe_codes = [
+                    self.parallel_sub_pipes[branch_failure.branch_index].pipe_code for branch_failure in batch_executor.branch_failures
+                ]
+                raise PipeExecutionError(
+                    f"PipeParallel '{self.code}' can't combine its outputs into '{combined_output}' "
+                    f"because these sub pipes failed: {', '.join(failed_sub_pipe_codes)}"
+                )
             combined_output_stuff = StuffFactory.combine_stuffs(
                 concept_code=combined_output,
                 stuff_contents=output_stuff_contents,
@@ -103,6 +139,11 @@ class PipeParallel(PipeController):
                     pipe_layer=pipe_run_params.pipe_layers,
                     comment="PipeParallel on output_stuffs",
                 )
+        # the failures of the sub pipes, followed by those reported by the pipes nested in them
+        branch_failures = [branch_failure.model_copy(update={"pipe_code": self.code}) for branch_failure in batch_executor.branch_failures]
+        for _, pipe_output in sorted(pipe_outputs_by_index.items()):
+            branch_failures.extend(pipe_output.branch_failures)
         return PipeOutput(
             working_memory=working_memory,
+            branch_failures=branch_failures,
         )
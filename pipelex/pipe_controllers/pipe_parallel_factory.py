@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Optional
 from typing_extensions import override
 
 from pipelex.core.pipe_blueprint import PipeBlueprint, PipeSpecificFactoryProtocol
+from pipelex.core.pipe_run_params import BranchFailurePolicy
 from pipelex.exceptions import PipeDefinitionError
 from pipelex.pipe_controllers.pipe_parallel import PipeParallel
 from pipelex.pipe_controllers.sub_pipe import SubPipe
@@ -17,6 +18,8 @@ class PipeParallelBlueprint(PipeBlueprint):
     parallels: List[SubPipeBlueprint]
     add_each_output: bool = True
     combined_output: Optional[str] = None
+    failure_policy: Optional[BranchFailurePolicy] = None
+    retry_failed_n_times: Optional[int] = None
 
 
 class PipeParallelFactory(PipeSpecificFactoryProtocol[PipeParallelBlueprint, PipeParallel]):
@@ -45,6 +48,8 @@ class PipeParallelFactory(PipeSpecificFactoryProtocol[PipeParallelBlueprint, Pip
             parallel_sub_pipes=parallel_sub_pipes,
             add_each_output=pipe_blueprint.add_each_output,
             combined_output=pipe_blueprint.combined_output,
+            failure_policy=pipe_blueprint.failure_policy,
+            retry_failed_n_times=pipe_blueprint.retry_failed_n_times,
         )
 
     @classmethod
@@ -2,27 +2,128 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
+import asyncio
 from typing import List, Optional, Set
 
 from typing_extensions import override
 
 from pipelex import log
-from pipelex.core.pipe_output import PipeOutput
-from pipelex.core.pipe_run_params import PipeRunParams
-from pipelex.core.working_memory import WorkingMemory
+from pipelex.config import get_config
+from pipelex.core.pipe_output import BranchFailure, PipeOutput
+from pipelex.core.pipe_run_params import PipeRunParams, SequenceExecutionMode
+from pipelex.core.stuff import Stuff
+from pipelex.core.working_memory import MAIN_STUFF_NAME, WorkingMemory
 from pipelex.exceptions import PipeRunParamsError
+from pipelex.hub import get_pipe_execution_plan
 from pipelex.mission.job_metadata import JobMetadata
 from pipelex.pipe_controllers.pipe_controller import PipeController
+from pipelex.pipe_controllers.sequence_dag import make_step_dependencies
 from pipelex.pipe_controllers.sub_pipe import SubPipe
 
 
 class PipeSequence(PipeController):
     pipe_steps: List[SubPipe]
+    execution_mode: Optional[SequenceExecutionMode] = None
 
     @override
     def pipe_dependencies(self) -> Set[str]:
         return set(step.pipe_code for step in self.pipe_steps)
 
+    def _make_step_run_params(self, pipe_run_params: PipeRunParams, step_index: int) -> PipeRunParams:
+        # only the last step should apply the final_stuff_code and stream its output into the sinks
+        if step_index == len(self.pipe_steps) - 1:
+            return pipe_run_params.model_copy()
+        else:
+            return pipe_run_params.model_copy(update=({"final_stuff_code": None, "text_chunk_sink": None, "object_item_sink": None}))
+
+    def _get_step_required_names(self, step: SubPipe) -> Optional[Set[str]]:
+        """The names of the stuffs read by the step, or None if they are not known."""
+        execution_plan = get_pipe_execution_plan(pipe_code=step.pipe_code)
+        if not execution_plan.has_exhaustive_required_variables:
+            return None
+        # variables such as "doc.title" read the stuff "doc"
+        required_names = set(required_stuff_name.split(".", maxsplit=1)[0] for required_stuff_name in execution_plan.required_stuff_names)
+        if batch_params := step.batch_params:
+            required_names.discard(batch_params.input_item_stuff_name)
+            required_names.add(batch_params.input_list_stuff_name)
+        return required_names
+
+    async def _run_steps_sequentially(
+        self,
+        job_metadata: JobMetadata,
+        working_memory: WorkingMemory,
+        pipe_run_params: PipeRunParams,
+        branch_failures: List[BranchFailure],
+    ) -> WorkingMemory:
+        current_memory = working_memory
+
+        for step_index, step in enumerate(self.pipe_steps):
+            pipe_output = await step.run(
+                working_memory=current_memory,
+                job_metadata=job_metadata,
+                sub_pipe_run_params=self._make_step_run_params(pipe_run_params=pipe_run_params, step_index=step_index),
+            )
+            current_memory = pipe_output.working_memory
+            branch_failures.extend(pipe_output.branch_failures)
+
+        return current_memory
+
+    async def _run_steps_as_dataflow(
+        self,
+        job_metadata: JobMetadata,
+        working_memory: WorkingMemory,
+        pipe_run_params: PipeRunParams,
+        branch_failures: List[BranchFailure],
+    ) -> WorkingMemory:
+        """
+        Run each step as soon as the steps it depends on are done, so that independent steps run concurrently.
+        Each step runs on its own overlay of the working memory, which is merged back as soon as the step is done.
+        """
+        step_dependencies = make_step_dependencies(
+            steps_required_names=[self._get_step_required_names(step=step) for step in self.pipe_steps],
+            steps_output_names=[step.output_name for step in self.pipe_steps],
+        )
+        log.debug(f"PipeSequence '{self.code}' step dependencies: {step_dependencies}")
+        step_tasks: List["asyncio.Task[None]"] = []
+        steps_branch_failures: List[List[BranchFailure]] = [[] for _ in self.pipe_steps]
+        last_step_index = len(self.pipe_steps) - 1
+        last_step_outputs: List[Stuff] = []
+
+        async def run_step(step_index: int, step: SubPipe):
+            if dependencies := step_dependencies[step_index]:
+                await asyncio.gather(*[step_tasks[dependency_index] for dependency_index in dependencies])
+            step_memory = working_memory.make_overlay()
+            # the run params are deep copied because running the step updates them, e.g. its pipe stack
+            step_run_params = self._make_step_run_params(pipe_run_params=pipe_run_params, step_index=step_index).model_copy(deep=True)
+            pipe_output = await step.run(
+                working_memory=step_memory,
+                job_metadata=job_metadata,
+                sub_pipe_run_params=step_run_params,
+            )
+            step_memory.merge_into(target_memory=working_memory)
+            steps_branch_failures[step_index] = pipe_output.branch_failures
+            if step_index == last_step_index:
+                last_step_outputs.append(pipe_output.main_stuff)
+
+        for step_index, step in enumerate(self.pipe_steps):
+            step_tasks.append(asyncio.ensure_future(run_step(step_index=step_index, step=step)))
+        try:
+            await asyncio.gather(*step_tasks)
+        finally:
+            for step_task in step_tasks:
+                step_task.cancel()
+            await asyncio.gather(*step_tasks, return_exceptions=True)
+        # reported in step order, whatever the order in which the steps completed
+        for step_branch_failures in steps_branch_failures:
+            branch_failures.extend(step_branch_failures)
+
+        # steps may have completed in any order, the main stuff must be the output of the last step, as in sequential mode
+        if last_output_name := self.pipe_steps[-1].output_name:
+            working_memory.set_alias(alias=MAIN_STUFF_NAME, target=last_output_name)
+        else:
+            working_memory.set_new_main_stuff(stuff=last_step_outputs[0])
+        return working_memory
+
     @override
     async def _run_controller_pipe(
         self,
@@ -43,22 +144,26 @@ class PipeSequence(PipeController):
         if not self.output_concept_code:
             raise ValueError("No output concept code")
 
-        current_memory = working_memory
-
-        for step_index, step in enumerate(self.pipe_steps):
-            step_run_params: PipeRunParams
-            # only the last step should apply the final_stuff_code
-            if step_index == len(self.pipe_steps) - 1:
-                step_run_params = pipe_run_params.model_copy()
-            else:
-                step_run_params = pipe_run_params.model_copy(update=({"final_stuff_code": None}))
-            pipe_output = await step.run(
-                working_memory=current_memory,
-                job_metadata=job_metadata,
-                sub_pipe_run_params=step_run_params,
-            )
-            current_memory = pipe_output.working_memory
+        execution_mode = self.execution_mode or get_config().pipelex.pipe_run_config.sequence_execution_mode
+        current_memory: WorkingMemory
+        branch_failures: List[BranchFailure] = []
+        match execution_mode:
+            case SequenceExecutionMode.SEQUENTIAL:
+                current_memory = await self._run_steps_sequentially(
+                    job_metadata=job_metadata,
+                    working_memory=working_memory,
+                    pipe_run_params=pipe_run_params,
+                    branch_failures=branch_failures,
+                )
+            case SequenceExecutionMode.DATAFLOW:
+                current_memory = await self._run_steps_as_dataflow(
+                    job_metadata=job_metadata,
+                    working_memory=working_memory,
+                    pipe_run_params=pipe_run_params,
+                    branch_failures=branch_failures,
+                )
 
         return PipeOutput(
             working_memory=current_memory,
+            branch_failures=branch_failures,
         )
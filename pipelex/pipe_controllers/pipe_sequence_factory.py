@@ -2,17 +2,19 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from typing_extensions import override
 
 from pipelex.core.pipe_blueprint import PipeBlueprint, PipeSpecificFactoryProtocol
+from pipelex.core.pipe_run_params import SequenceExecutionMode
 from pipelex.pipe_controllers.pipe_sequence import PipeSequence
 from pipelex.pipe_controllers.sub_pipe_factory import SubPipeBlueprint
 
 
 class PipeSequenceBlueprint(PipeBlueprint):
     steps: List[SubPipeBlueprint]
+    execution_mode: Optional[SequenceExecutionMode] = None
 
 
 class PipeSequenceFactory(PipeSpecificFactoryProtocol[PipeSequenceBlueprint, PipeSequence]):
@@ -32,6 +34,7 @@ class PipeSequenceFactory(PipeSpecificFactoryProtocol[PipeSequenceBlueprint, Pip
             input_concept_code=pipe_blueprint.input,
             output_concept_code=pipe_blueprint.output,
             pipe_steps=pipe_steps,
+            execution_mode=pipe_blueprint.execution_mode,
         )
 
     @classmethod
@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from typing import List, Optional, Set
+
+from pipelex.core.working_memory import MAIN_STUFF_NAME
+
+
+def _are_steps_dependent(
+    earlier_required_names: Optional[Set[str]],
+    earlier_output_name: Optional[str],
+    later_required_names: Optional[Set[str]],
+    later_output_name: Optional[str],
+) -> bool:
+    if earlier_required_names is None or later_required_names is None:
+        # the stuffs read by one of the steps are unknown, so it must keep its place in the sequence
+        return True
+    if MAIN_STUFF_NAME in later_required_names:
+        # the main stuff is whatever the previous steps produced last
+        return True
+    if earlier_output_name and earlier_output_name in later_required_names:
+        # the later step reads the output of the earlier step
+        return True
+    if later_output_name and later_output_name in earlier_required_names:
+        # the later step overwrites a stuff read by the earlier step
+        return True
+    if earlier_output_name and earlier_output_name == later_output_name:
+        # both steps write the same stuff, the later one must win
+        return True
+    return False
+
+
+def make_step_dependencies(
+    steps_required_names: List[Optional[Set[str]]],
+    steps_output_names: List[Optional[str]],
+) -> List[Set[int]]:
+    """
+    Build the dataflow DAG of the steps of a sequence, from the stuff names each step reads and the name of the stuff it writes.
+    A step whose required names are None (unknown) depends on all the steps before it and all the steps after it depend on it.
+
+    Returns:
+        For each step, the indices of the earlier steps it depends on.
+    """
+    step_dependencies: List[Set[int]] = []
+    for later_index, (later_required_names, later_output_name) in enumerate(zip(steps_required_names, steps_output_names)):
+        dependencies: Set[int] = set()
+        for earlier_index in range(later_index):
+            if _are_steps_dependent(
+                earlier_required_names=steps_required_names[earlier_index],
+                earlier_output_name=steps_output_names[earlier_index],
+                later_required_names=later_required_names,
+                later_output_name=later_output_name,
+            ):
+                dependencies.add(earlier_index)
+        step_dependencies.append(dependencies)
+    return step_dependencies
@@ -11,7 +11,7 @@ from pipelex.core.pipe_output import PipeOutput
 from pipelex.core.pipe_run_params import BatchParams, PipeOutputMultiplicity, PipeRunParams
 from pipelex.core.working_memory import WorkingMemory
 from pipelex.exceptions import PipeInputError, WorkingMemoryStuffNotFoundError
-from pipelex.hub import get_mission_tracker, get_pipe_router, get_required_pipe
+from pipelex.hub import get_mission_tracker, get_pipe_execution_plan, get_pipe_router
 from pipelex.mission.job_metadata import JobMetadata
 from pipelex.pipe_controllers.pipe_batch import PipeBatch
 from pipelex.pipe_controllers.pipe_condition import PipeCondition
@@ -36,7 +36,8 @@ class SubPipe(BaseModel):
         # step_run_params.push_pipe_code(pipe_code=self.pipe_code)
         if self.output_multiplicity:
             sub_pipe_run_params.output_multiplicity = self.output_multiplicity
-        pipe = get_required_pipe(pipe_code=self.pipe_code)
+        execution_plan = get_pipe_execution_plan(pipe_code=self.pipe_code)
+        pipe = execution_plan.pipe
         pipe_output: PipeOutput
         sub_pipe_run_params.batch_params = self.batch_params
         if batch_params := self.batch_params:
@@ -65,11 +66,10 @@ class SubPipe(BaseModel):
                 pipe_run_params=sub_pipe_run_params,
             )
         else:
-            required_variables = pipe.required_variables()
+            required_variables = execution_plan.required_variables
             log.debug(required_variables, title=f"Required variables for {self.pipe_code}")
-            required_stuff_names = set([required_variable for required_variable in required_variables if not required_variable.startswith("_")])
             try:
-                required_stuffs = working_memory.get_stuffs(names=required_stuff_names)
+                required_stuffs = working_memory.get_stuffs(names=execution_plan.required_stuff_names)
             except WorkingMemoryStuffNotFoundError as exc:
                 error_details = f"sub_pipe '{self.pipe_code}', stack: {sub_pipe_run_params.pipe_layers}, required_variables: {required_variables}"
                 raise PipeInputError(f"Some required stuff(s) not found - {error_details}") from exc
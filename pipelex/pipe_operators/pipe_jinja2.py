@@ -81,6 +81,10 @@ class PipeJinja2(PipeOperator):
         )
         return required_variables
 
+    @override
+    def has_exhaustive_required_variables(self) -> bool:
+        return True
+
     @override
     async def _run_operator_pipe(
         self,
@@ -10,6 +10,7 @@ from pydantic import model_validator
 from typing_extensions import override
 
 from pipelex import log
+from pipelex.cogt.llm.llm_job_components import ObjectItemSink
 from pipelex.cogt.llm.llm_models.llm_deck import LLMSettingChoices
 from pipelex.cogt.llm.llm_models.llm_deck_check import check_llm_setting_with_config
 from pipelex.cogt.llm.llm_models.llm_setting import LLMSetting
@@ -115,6 +116,10 @@ class PipeLLM(PipeOperator):
         required_variables.update(self.pipe_llm_prompt.required_variables())
         return required_variables
 
+    @override
+    def has_exhaustive_required_variables(self) -> bool:
+        return True
+
     @override
     async def _run_operator_pipe(
         self,
@@ -214,6 +219,8 @@ class PipeLLM(PipeOperator):
                 llm_prompt_for_text=llm_prompt_1,
                 llm_setting_main=self.llm_setting_main,
                 wfid=f"{self.class_name}_gen_text",
+                text_chunk_sink=pipe_run_params.text_chunk_sink,
+                llm_execution_mode=pipe_run_params.llm_execution_mode,
             )
 
             the_content = TextContent(
@@ -279,6 +286,7 @@ class PipeLLM(PipeOperator):
                 output_class_name=output_concept.structure_class_name,
                 llm_prompt_1=llm_prompt_1,
                 llm_prompt_2_factory=llm_prompt_2_factory,
+                object_item_sink=pipe_run_params.object_item_sink,
             )
 
         output_stuff = StuffFactory.make_stuff_using_concept(
@@ -305,6 +313,7 @@ class PipeLLM(PipeOperator):
         output_class_name: str,
         llm_prompt_1: LLMPrompt,
         llm_prompt_2_factory: Optional[LLMPromptFactoryAbstract],
+        object_item_sink: Optional[ObjectItemSink] = None,
     ) -> StuffContent:
         content_class: Type[StuffContent] = class_registry.get_required_subclass(name=output_class_name, base_class=StuffContent)
         task_desc: str
@@ -331,6 +340,7 @@ class PipeLLM(PipeOperator):
                     llm_prompt_factory_for_object_list=llm_prompt_2_factory,
                     llm_setting_for_object_list=self.llm_setting_for_object_list,
                     wfid=task_desc,
+                    object_item_sink=object_item_sink,
                 )
             else:
                 # We're generating a list of objects directly
@@ -342,6 +352,7 @@ class PipeLLM(PipeOperator):
                     llm_prompt_for_object_list=llm_prompt_1,
                     llm_setting_for_object_list=self.llm_setting_for_object_list_direct,
                     wfid=task_desc,
+                    object_item_sink=object_item_sink,
                 )
 
             the_content = ListContent(items=generated_objects)
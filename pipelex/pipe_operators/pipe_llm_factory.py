@@ -26,6 +26,8 @@ class PipeLLMBlueprint(PipeBlueprint):
     system_prompt_template_name: Optional[str] = None
     system_prompt_name: Optional[str] = None
     system_prompt: Optional[str] = None
+    # by default, only the domain's system prompt, which is shared by its pipes, is cacheable
+    is_system_prompt_cacheable: Optional[bool] = None
 
     prompt_template: Optional[str] = None
     template_name: Optional[str] = None
@@ -33,6 +35,8 @@ class PipeLLMBlueprint(PipeBlueprint):
     prompt: Optional[str] = None
 
     images: Optional[List[str]] = None
+    # inputs shared by many jobs, e.g. a large document, rendered tagged ahead of the prompt as a cacheable prefix
+    cacheable_inputs: Optional[List[str]] = None
 
     llm: Optional[LLMSettingOrPresetId] = None
     llm_to_structure: Optional[LLMSettingOrPresetId] = None
@@ -72,6 +76,7 @@ class PipeLLMFactory(PipeSpecificFactoryProtocol[PipeLLMBlueprint, PipeLLM]):
     ) -> PipeLLM:
         system_prompt_pipe_jinja2: Optional[PipeJinja2] = None
         system_prompt: Optional[str] = None
+        is_system_prompt_cacheable = pipe_blueprint.is_system_prompt_cacheable or False
         if pipe_blueprint.system_prompt_template or pipe_blueprint.system_prompt_template_name:
             try:
                 system_prompt_pipe_jinja2 = PipeJinja2(
@@ -91,6 +96,8 @@ class PipeLLMFactory(PipeSpecificFactoryProtocol[PipeLLMBlueprint, PipeLLM]):
             # really no system prompt provided, let's use the domain's default system prompt
             if domain := get_optional_domain(domain_code=domain_code):
                 system_prompt = domain.system_prompt
+                if pipe_blueprint.is_system_prompt_cacheable is None:
+                    is_system_prompt_cacheable = True
 
         user_pipe_jinja2: Optional[PipeJinja2] = None
         if pipe_blueprint.prompt_template or pipe_blueprint.template_name:
@@ -115,15 +122,25 @@ class PipeLLMFactory(PipeSpecificFactoryProtocol[PipeLLMBlueprint, PipeLLM]):
                 jinja2_name=pipe_code,
             )
 
+        cacheable_user_pipe_jinja2: Optional[PipeJinja2] = None
+        if pipe_blueprint.cacheable_inputs:
+            cacheable_user_pipe_jinja2 = PipeJinja2(
+                code="adhoc_for_cacheable_user_prompt",
+                domain=domain_code,
+                jinja2="\n\n".join(f"@{input_name}" for input_name in pipe_blueprint.cacheable_inputs),
+            )
+
         pipe_llm_prompt = PipeLLMPrompt(
             code="adhoc_for_pipe_llm_prompt",
             domain=domain_code,
             system_prompt_pipe_jinja2=system_prompt_pipe_jinja2,
             system_prompt_verbatim_name=pipe_blueprint.system_prompt_name,
             system_prompt=pipe_blueprint.system_prompt or system_prompt,
+            is_system_prompt_cacheable=is_system_prompt_cacheable,
             user_pipe_jinja2=user_pipe_jinja2,
             user_prompt_verbatim_name=pipe_blueprint.prompt_name,
             user_text=pipe_blueprint.prompt,
+            cacheable_user_pipe_jinja2=cacheable_user_pipe_jinja2,
             user_images=pipe_blueprint.images,
         )
 
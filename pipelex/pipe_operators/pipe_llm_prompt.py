@@ -53,10 +53,13 @@ class PipeLLMPrompt(PipeOperator):
     system_prompt_pipe_jinja2: Optional[PipeJinja2] = None
     system_prompt_verbatim_name: Optional[str] = None
     system_prompt: Optional[str] = None
+    is_system_prompt_cacheable: bool = False
 
     user_pipe_jinja2: Optional[PipeJinja2] = None
     user_prompt_verbatim_name: Optional[str] = None
     user_text: Optional[str] = None
+    # renders the inputs which are shared by many jobs, e.g. a large document, as a cacheable prefix of the user text
+    cacheable_user_pipe_jinja2: Optional[PipeJinja2] = None
 
     user_images: Optional[List[str]] = None
 
@@ -97,6 +100,8 @@ class PipeLLMPrompt(PipeOperator):
             self.user_pipe_jinja2.validate_with_libraries()
         if self.system_prompt_pipe_jinja2:
             self.system_prompt_pipe_jinja2.validate_with_libraries()
+        if self.cacheable_user_pipe_jinja2:
+            self.cacheable_user_pipe_jinja2.validate_with_libraries()
 
     @override
     def required_variables(self) -> Set[str]:
@@ -105,10 +110,16 @@ class PipeLLMPrompt(PipeOperator):
             required_variables.update(self.user_pipe_jinja2.required_variables())
         if self.system_prompt_pipe_jinja2:
             required_variables.update(self.system_prompt_pipe_jinja2.required_variables())
+        if self.cacheable_user_pipe_jinja2:
+            required_variables.update(self.cacheable_user_pipe_jinja2.required_variables())
         if self.user_images:
             required_variables.update(self.user_images)
         return required_variables
 
+    @override
+    def has_exhaustive_required_variables(self) -> bool:
+        return True
+
     @override
     async def _run_operator_pipe(
         self,
@@ -136,7 +147,9 @@ class PipeLLMPrompt(PipeOperator):
                 except (WorkingMemoryNotFoundError, WorkingMemoryStuffNotFoundError, WorkingMemoryTypeError) as exc:
                     raise PipeInputError(f"A valid user image named '{user_image_name}' was not found in the working_memory: {exc}") from exc
 
-                if base_64 := prompt_image_content.base_64:
+                if blob_digest := prompt_image_content.blob_digest:
+                    user_image = PromptImageFactory.make_prompt_image(blob_digest=blob_digest)
+                elif base_64 := prompt_image_content.base_64:
                     user_image = PromptImageFactory.make_prompt_image(base_64=base_64)
                 else:
                     image_uri = prompt_image_content.url
@@ -157,6 +170,20 @@ class PipeLLMPrompt(PipeOperator):
         if not user_text:
             raise ValueError("For user_text we need either a pipe_jinja2, a text_verbatim_name or a fixed user_text")
 
+        # the cacheable inputs come first, so that the prompts of the jobs sharing them start with the same prefix
+        cacheable_user_text_prefix: Optional[str] = None
+        if self.cacheable_user_pipe_jinja2:
+            if cacheable_user_text := await self._unravel_text(
+                job_metadata=job_metadata,
+                working_memory=working_memory,
+                pipe_jinja2=self.cacheable_user_pipe_jinja2,
+                text_verbatim_name=None,
+                fixed_text=None,
+                pipe_run_params=pipe_run_params,
+            ):
+                cacheable_user_text_prefix = f"{cacheable_user_text}\n\n"
+                user_text = cacheable_user_text_prefix + user_text
+
         # Append output structure prompt if needed
         if pipe_run_params.dynamic_output_concept_code:
             user_text += PipeLLMPrompt.get_output_structure_prompt(output_concept=pipe_run_params.dynamic_output_concept_code)
@@ -180,6 +207,8 @@ class PipeLLMPrompt(PipeOperator):
             system_text=system_text,
             user_text=user_text,
             user_images=prompt_user_images,
+            is_system_text_cacheable=self.is_system_prompt_cacheable,
+            cacheable_user_text_prefix=cacheable_user_text_prefix,
         )
 
         output_stuff = StuffFactory.make_stuff(
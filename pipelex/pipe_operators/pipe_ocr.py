@@ -59,7 +59,8 @@ class PipeOcr(PipeOperator):
         pdf_uri: Optional[str] = None
         if self.image_stuff_name:
             image_stuff = working_memory.get_stuff_as_image(name=self.image_stuff_name)
-            image_uri = image_stuff.url
+            # an image held in the blob store is sent as a data url
+            image_uri = image_stuff.get_resolvable_url()
         elif self.pdf_stuff_name:
             pdf_stuff = working_memory.get_stuff_as_pdf(name=self.pdf_stuff_name)
             pdf_uri = pdf_stuff.url
@@ -104,8 +105,12 @@ class PipeOcr(PipeOperator):
                     needs_to_generate_page_views = False
 
                 if needs_to_generate_page_views:
-                    page_views = await pypdfium2_renderer.render_pdf_pages_from_uri(pdf_uri=pdf_uri, dpi=self.page_views_dpi)
-                    page_view_contents = [ImageContent.make_from_image(image=img) for img in page_views]
+                    # the pages are rendered one at a time, straight to PNG bytes stored in the blob store
+                    page_view_contents = [
+                        ImageContent.make_from_image_bytes(image_bytes=rendered_page.image_bytes)
+                        async for rendered_page in pypdfium2_renderer.iter_pdf_pages_from_uri(pdf_uri=pdf_uri, dpi=self.page_views_dpi)
+                        if rendered_page.image_bytes
+                    ]
             elif image_uri:
                 page_view_contents = [ImageContent.make_from_str(str_value=image_uri)]
 
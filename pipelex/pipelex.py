@@ -14,10 +14,14 @@ from pipelex import log
 from pipelex.activity_manager import ActivityManager
 from pipelex.cogt.content_generation.content_generator import ContentGenerator
 from pipelex.cogt.content_generation.content_generator_protocol import ContentGeneratorProtocol
+from pipelex.cogt.image.prompt_image_cache import PromptImageCache
+from pipelex.cogt.image.prompt_image_preparer import PromptImagePreparer
 from pipelex.cogt.inference.inference_manager import InferenceManager
 from pipelex.cogt.inference.inference_report_manager import InferenceReportManager
 from pipelex.cogt.llm.llm_models.llm_model import LATEST_VERSION_NAME
 from pipelex.cogt.llm.llm_models.llm_model_library import LLMModelLibrary
+from pipelex.cogt.llm.llm_response_cache import LLMResponseCacheFactory
+from pipelex.cogt.llm.llm_response_cache_abstract import LLMResponseCacheAbstract
 from pipelex.cogt.plugin_manager import PluginManager
 from pipelex.config import PipelexConfig, get_config
 from pipelex.exceptions import PipelexConfigError, PipelexSetupError
@@ -26,14 +30,20 @@ from pipelex.libraries.library_manager import LibraryManager
 from pipelex.mission.mission_manager import MissionManager
 from pipelex.mission.track.mission_tracker import MissionTracker
 from pipelex.mission.track.mission_tracker_protocol import MissionTrackerNoOp, MissionTrackerProtocol
+from pipelex.pipe_controllers.batch_checkpoint_store import BatchCheckpointStoreFactory
+from pipelex.pipe_controllers.batch_checkpoint_store_abstract import BatchCheckpointStoreAbstract
 from pipelex.pipe_works.pipe_router import PipeRouter
 from pipelex.pipe_works.pipe_router_protocol import PipeRouterProtocol
 from pipelex.registry_funcs import PipelexRegistryFuncs
 from pipelex.registry_models import PipelexRegistryModels
 from pipelex.test_extras.registry_test_models import PipelexTestModels
+from pipelex.tools.blob.blob_store import BlobStoreFactory
+from pipelex.tools.blob.blob_store_abstract import BlobStoreAbstract
 from pipelex.tools.config.models import ConfigRoot
 from pipelex.tools.func_registry import func_registry
+from pipelex.tools.misc.file_fetcher import FileFetcher
 from pipelex.tools.misc.model_helpers import format_pydantic_validation_error
+from pipelex.tools.pdf.pypdfium2_renderer import pypdfium2_renderer
 from pipelex.tools.runtime_manager import runtime_manager
 from pipelex.tools.secrets.env_secrets_provider import EnvSecretsProvider
 from pipelex.tools.secrets.secrets_provider_abstract import SecretsProviderAbstract
@@ -141,6 +151,12 @@ class Pipelex:
         self.pipelex_hub.set_mission_tracker(mission_tracker=self.mission_tracker)
         self.mission_manager = mission_manager or MissionManager()
         self.pipelex_hub.set_mission_manager(mission_manager=self.mission_manager)
+        self.batch_checkpoint_store: Optional[BatchCheckpointStoreAbstract] = None
+        self.llm_response_cache: Optional[LLMResponseCacheAbstract] = None
+        self.file_fetcher: Optional[FileFetcher] = None
+        self.blob_store: Optional[BlobStoreAbstract] = None
+        self.prompt_image_cache: Optional[PromptImageCache] = None
+        self.prompt_image_preparer: Optional[PromptImagePreparer] = None
 
         Pipelex._pipelex_instance = self
         log.info(f"{PACKAGE_NAME} version {PACKAGE_VERSION} init done")
@@ -151,13 +167,40 @@ class Pipelex:
         content_generator: Optional[ContentGeneratorProtocol] = None,
         pipe_router: Optional[PipeRouterProtocol] = None,
         structure_classes: Optional[List[Type[Any]]] = None,
+        batch_checkpoint_store: Optional[BatchCheckpointStoreAbstract] = None,
+        llm_response_cache: Optional[LLMResponseCacheAbstract] = None,
+        blob_store: Optional[BlobStoreAbstract] = None,
     ):
         # tools
         self.pipelex_hub.set_secrets_provider(secrets_provider or EnvSecretsProvider())
+        self.file_fetcher = FileFetcher(file_fetcher_config=get_config().pipelex.file_fetcher_config)
+        self.file_fetcher.setup()
+        self.pipelex_hub.set_file_fetcher(file_fetcher=self.file_fetcher)
+        blob_store = blob_store or BlobStoreFactory.make_blob_store(blob_store_config=get_config().pipelex.blob_store_config)
+        blob_store.setup()
+        self.pipelex_hub.set_blob_store(blob_store=blob_store)
+        self.blob_store = blob_store
+        pypdfium2_renderer.setup(pdf_renderer_config=get_config().pipelex.pdf_renderer_config)
 
         # cogt
         self.pipelex_hub.set_content_generator(content_generator or ContentGenerator())
         self.report_manager.setup()
+        llm_response_cache_config = get_config().cogt.llm_config.llm_response_cache_config
+        if llm_response_cache is None and llm_response_cache_config.is_enabled:
+            llm_response_cache = LLMResponseCacheFactory.make_llm_response_cache(llm_response_cache_config=llm_response_cache_config)
+        if llm_response_cache:
+            llm_response_cache.setup()
+        self.pipelex_hub.set_llm_response_cache(llm_response_cache=llm_response_cache)
+        self.llm_response_cache = llm_response_cache
+        prompt_image_cache_config = get_config().cogt.prompt_image_cache_config
+        if prompt_image_cache_config.is_enabled:
+            self.prompt_image_cache = PromptImageCache.make_from_config(prompt_image_cache_config=prompt_image_cache_config)
+        self.pipelex_hub.set_prompt_image_cache(prompt_image_cache=self.prompt_image_cache)
+        prompt_image_prep_config = get_config().cogt.prompt_image_prep_config
+        if prompt_image_prep_config.is_enabled:
+            self.prompt_image_preparer = PromptImagePreparer.make_from_config(prompt_image_prep_config=prompt_image_prep_config)
+            self.prompt_image_preparer.setup()
+        self.pipelex_hub.set_prompt_image_preparer(prompt_image_preparer=self.prompt_image_preparer)
         class_registry.register_classes(PipelexRegistryModels.get_all_models())
         if runtime_manager.is_unit_testing:
             log.debug("Registering test models for unit testing")
@@ -169,6 +212,12 @@ class Pipelex:
             class_registry.register_classes(structure_classes)
 
         self.pipelex_hub.set_pipe_router(pipe_router or PipeRouter())
+        batch_checkpoint_store = batch_checkpoint_store or BatchCheckpointStoreFactory.make_batch_checkpoint_store(
+            batch_checkpoint_config=get_config().pipelex.batch_checkpoint_config
+        )
+        batch_checkpoint_store.setup()
+        self.pipelex_hub.set_batch_checkpoint_store(batch_checkpoint_store=batch_checkpoint_store)
+        self.batch_checkpoint_store = batch_checkpoint_store
 
         # mission
         self.mission_tracker.setup()
@@ -202,6 +251,8 @@ class Pipelex:
         # pipelex
         self.mission_manager.teardown()
         self.mission_tracker.teardown()
+        if self.batch_checkpoint_store:
+            self.batch_checkpoint_store.teardown()
         self.library_manager.teardown()
         self.template_provider.teardown()
         ActivityManager.teardown()
@@ -209,9 +260,22 @@ class Pipelex:
         # cogt
         self.inference_manager.teardown()
         self.report_manager.teardown()
+        if self.llm_response_cache:
+            self.llm_response_cache.teardown()
+        if self.prompt_image_cache:
+            self.prompt_image_cache.teardown()
+        if self.prompt_image_preparer:
+            self.prompt_image_preparer.teardown()
         self.llm_model_provider.teardown()
 
         # tools
+        if self.file_fetcher:
+            self.file_fetcher.teardown()
+            self.pipelex_hub.set_file_fetcher(file_fetcher=None)
+        if self.blob_store:
+            self.blob_store.teardown()
+            self.pipelex_hub.set_blob_store(blob_store=None)
+        pypdfium2_renderer.teardown()
         class_registry.reset()
         func_registry.teardown()
 
@@ -9,6 +9,7 @@ from pipelex.core.pipe_blueprint import PipeSpecificFactoryProtocol
 from pipelex.core.stuff import Stuff
 from pipelex.core.stuff_content import (
     DynamicContent,
+    FailedItemContent,
     HtmlContent,
     ImageContent,
     ListContent,
@@ -90,6 +91,7 @@ class PipelexRegistryModels(RegistryModels):
         PDFContent,
         TextAndImagesContent,
         PageContent,
+        FailedItemContent,
     ]
 
     EXPERIMENTAL: ClassVar[List[ModelType]] = [
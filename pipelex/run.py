@@ -2,16 +2,20 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Optional
+from contextlib import aclosing
+from typing import AsyncGenerator, Optional
 
 from pipelex import pretty_print
+from pipelex.cogt.llm.llm_job_components import ObjectItemSink, TextChunkSink
 from pipelex.core.pipe_abstract import PipeAbstract
-from pipelex.core.pipe_output import PipeOutput
+from pipelex.core.pipe_output import BatchBranchOutput, PipeOutput
 from pipelex.core.pipe_run_params import PipeOutputMultiplicity, PipeRunParams
 from pipelex.core.pipe_run_params_factory import PipeRunParamsFactory
 from pipelex.core.working_memory import WorkingMemory
+from pipelex.exceptions import PipeRunError
 from pipelex.hub import get_pipe_router, get_required_pipe
 from pipelex.mission.job_metadata import JobMetadata
+from pipelex.pipe_controllers.pipe_batch import PipeBatch
 from pipelex.pipe_works.pipe_job_factory import PipeJobFactory
 
 
@@ -22,6 +26,8 @@ async def run_pipe_code(
     output_multiplicity: Optional[PipeOutputMultiplicity] = None,
     dynamic_output_concept_code: Optional[str] = None,
     job_id: Optional[str] = None,
+    text_chunk_sink: Optional[TextChunkSink] = None,
+    object_item_sink: Optional[ObjectItemSink] = None,
 ) -> PipeOutput:
     """
     Simple wrapper to run a pipe with a working memory using the default PipeRouter.
@@ -33,6 +39,8 @@ async def run_pipe_code(
         output_multiplicity: The multiplicity of the output
         output_concept_code: Optional output concept code to use for dynamic output concept
         job_id: Optional job ID (defaults to pipe_code)
+        text_chunk_sink: Optional async callback receiving the chunks of the final text output as they are generated
+        object_item_sink: Optional async callback receiving the items of the final list output as soon as each one is generated
 
     Returns:
         PipeOutput: The output of the pipe execution
@@ -46,6 +54,8 @@ async def run_pipe_code(
     pipe_run_params = PipeRunParamsFactory.make_run_params(
         output_multiplicity=output_multiplicity,
         dynamic_output_concept_code=dynamic_output_concept_code,
+        text_chunk_sink=text_chunk_sink,
+        object_item_sink=object_item_sink,
     )
 
     pretty_print(pipe, title=f"Running pipe '{pipe_code}'")
@@ -79,3 +89,46 @@ async def run_pipe(
     )
 
     return await get_pipe_router().run_pipe_job(pipe_job)
+
+
+async def stream_pipe_batch(
+    pipe_code: str,
+    working_memory: WorkingMemory,
+    output_name: Optional[str] = None,
+    is_output_assembled: bool = True,
+    job_id: Optional[str] = None,
+) -> AsyncGenerator[BatchBranchOutput, None]:
+    """
+    Simple wrapper to run a PipeBatch and get the output of each branch as soon as it completes.
+
+    Args:
+        pipe_code: The code of the PipeBatch to run
+        working_memory: The working memory containing all necessary stuffs, including the input list
+        output_name: The name of the output for the main output of the pipe
+        is_output_assembled: Whether to set the ordered list of branch outputs as main stuff of the working memory at the end
+        job_id: Optional job ID (defaults to pipe_code)
+
+    Yields:
+        BatchBranchOutput: The branch index and the output of each branch, in completion order
+    """
+    pipe = get_required_pipe(pipe_code=pipe_code)
+    if not isinstance(pipe, PipeBatch):
+        raise PipeRunError(f"Pipe '{pipe_code}' is a {pipe.__class__.__name__}, only a PipeBatch can be streamed")
+
+    job_metadata = JobMetadata(
+        top_job_id=job_id or pipe_code,
+    )
+    pipe_run_params = PipeRunParamsFactory.make_run_params()
+
+    # closing the batch stream as soon as this one is closed cancels its pending branches and pops it from the pipe stack
+    async with aclosing(
+        pipe.stream_pipe(
+            job_metadata=job_metadata,
+            working_memory=working_memory,
+            pipe_run_params=pipe_run_params,
+            output_name=output_name,
+            is_output_assembled=is_output_assembled,
+        )
+    ) as batch_stream:
+        async for batch_branch_output in batch_stream:
+            yield batch_branch_output
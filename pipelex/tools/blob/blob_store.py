@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import hashlib
+import importlib
+import os
+import shutil
+import tempfile
+from typing import Dict, Optional
+
+from typing_extensions import override
+
+from pipelex import log
+from pipelex.tools.blob.blob_store_abstract import BlobStoreAbstract
+from pipelex.tools.blob.blob_store_config import BlobStoreConfig, BlobStoreType
+from pipelex.tools.exceptions import ToolException
+from pipelex.tools.utils.file_utils import ensure_directory_exists
+
+
+class BlobStoreError(ToolException):
+    pass
+
+
+class BlobNotFoundError(BlobStoreError):
+    pass
+
+
+def make_blob_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class MemoryBlobStore(BlobStoreAbstract):
+    """Keeps the blobs in memory, for the lifetime of the process."""
+
+    def __init__(self):
+        self._blobs: Dict[str, bytes] = {}
+
+    @property
+    @override
+    def is_persistent(self) -> bool:
+        return False
+
+    @override
+    def setup(self) -> None:
+        pass
+
+    @override
+    def teardown(self) -> None:
+        self._blobs.clear()
+
+    @override
+    def put_bytes(self, data: bytes) -> str:
+        digest = make_blob_digest(data=data)
+        self._blobs.setdefault(digest, data)
+        return digest
+
+    @override
+    def get_bytes(self, digest: str) -> bytes:
+        if (data := self._blobs.get(digest)) is None:
+            raise BlobNotFoundError(f"No blob for digest '{digest}' in the memory blob store")
+        return data
+
+    @override
+    def has_blob(self, digest: str) -> bool:
+        return digest in self._blobs
+
+
+class DirectoryBlobStore(BlobStoreAbstract):
+    """
+    Stores each blob as a file: <directory_path>/<first 2 chars of the digest>/<digest>
+    Without a directory path, the blobs go to a temporary directory which is removed at teardown.
+    """
+
+    def __init__(self, directory_path: Optional[str] = None):
+        self.directory_path = directory_path
+        self._is_temporary = directory_path is None
+        self._applied_directory_path: Optional[str] = None
+
+    @property
+    @override
+    def is_persistent(self) -> bool:
+        return not self._is_temporary
+
+    @property
+    def applied_directory_path(self) -> str:
+        if self._applied_directory_path is None:
+            self._applied_directory_path = self.directory_path or tempfile.mkdtemp(prefix="pipelex_blobs_")
+        return self._applied_directory_path
+
+    def _get_blob_path(self, digest: str) -> str:
+        return os.path.join(self.applied_directory_path, digest[:2], digest)
+
+    @override
+    def setup(self) -> None:
+        ensure_directory_exists(self.applied_directory_path)
+
+    @override
+    def teardown(self) -> None:
+        if self._is_temporary and self._applied_directory_path:
+            shutil.rmtree(self._applied_directory_path, ignore_errors=True)
+            self._applied_directory_path = None
+
+    @override
+    def put_bytes(self, data: bytes) -> str:
+        digest = make_blob_digest(data=data)
+        blob_path = self._get_blob_path(digest=digest)
+        if os.path.exists(blob_path):
+            return digest
+        ensure_directory_exists(os.path.dirname(blob_path))
+        # write then rename, so that a crash during the write never leaves a truncated blob
+        tmp_blob_path = f"{blob_path}.tmp"
+        with open(tmp_blob_path, "wb") as blob_file:
+            blob_file.write(data)
+        os.replace(tmp_blob_path, blob_path)
+        return digest
+
+    @override
+    def get_bytes(self, digest: str) -> bytes:
+        try:
+            with open(self._get_blob_path(digest=digest), "rb") as blob_file:
+                return blob_file.read()
+        except FileNotFoundError as exc:
+            raise BlobNotFoundError(f"No blob for digest '{digest}' in '{self.applied_directory_path}'") from exc
+
+    @override
+    def has_blob(self, digest: str) -> bool:
+        return os.path.exists(self._get_blob_path(digest=digest))
+
+
+class BlobStoreFactory:
+    @classmethod
+    def make_blob_store(cls, blob_store_config: BlobStoreConfig) -> BlobStoreAbstract:
+        log.debug(f"Making blob store of type '{blob_store_config.store_type}'")
+        match blob_store_config.store_type:
+            case BlobStoreType.MEMORY:
+                return MemoryBlobStore()
+            case BlobStoreType.DIRECTORY:
+                return DirectoryBlobStore(directory_path=blob_store_config.applied_directory_path)
+
+
+def get_hub_blob_store() -> BlobStoreAbstract:
+    """
+    Get the blob store held by the hub, for the models which resolve their blobs but are themselves imported by the hub.
+    The hub is imported when the blob is resolved, so that it stays out of the import graph of those models.
+    """
+    hub_module = importlib.import_module("pipelex.hub")
+    blob_store: BlobStoreAbstract = hub_module.get_blob_store()
+    return blob_store
@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from abc import ABC, abstractmethod
+
+
+class BlobStoreAbstract(ABC):
+    """
+    Stores binary contents once, as raw bytes, under the digest of their content.
+    Models hold the digest as a reference, and the bytes are only materialized where they're needed, e.g. when sending them to a provider.
+    """
+
+    @property
+    @abstractmethod
+    def is_persistent(self) -> bool:
+        """Whether the blobs outlive the process, so that digests saved by a run can be resolved by a later one."""
+        pass
+
+    @abstractmethod
+    def setup(self) -> None:
+        pass
+
+    @abstractmethod
+    def teardown(self) -> None:
+        pass
+
+    @abstractmethod
+    def put_bytes(self, data: bytes) -> str:
+        """Store the bytes if they're not stored yet, and return their digest."""
+        pass
+
+    @abstractmethod
+    def get_bytes(self, digest: str) -> bytes:
+        """Raise BlobNotFoundError if there are no bytes for the digest."""
+        pass
+
+    @abstractmethod
+    def has_blob(self, digest: str) -> bool:
+        pass
@@ -0,0 +1,24 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from enum import StrEnum
+from typing import Optional
+
+from pydantic import Field
+
+from pipelex.tools.config.models import ConfigModel
+
+
+class BlobStoreType(StrEnum):
+    MEMORY = "memory"
+    DIRECTORY = "directory"
+
+
+class BlobStoreConfig(ConfigModel):
+    store_type: BlobStoreType = Field(strict=False)
+    directory_path: str  # empty means a temporary directory, removed at teardown
+
+    @property
+    def applied_directory_path(self) -> Optional[str]:
+        return self.directory_path or None
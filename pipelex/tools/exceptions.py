@@ -3,6 +3,7 @@
 # "Pipelex" is a trademark of Evotis S.A.S.
 
 import logging
+from typing import Iterator, Optional, Set
 
 from kajson.sandbox_manager import sandbox_manager
 
@@ -32,3 +33,13 @@ class TracebackMessageError(RootException):
 
 class FatalError(TracebackMessageError):
     pass
+
+
+def iter_exception_chain(exc: BaseException) -> Iterator[BaseException]:
+    """Iterate over the exception and the exceptions it was raised from or while handling, e.g. the SDK error wrapped by a library."""
+    current: Optional[BaseException] = exc
+    seen_ids: Set[int] = set()
+    while current is not None and id(current) not in seen_ids:
+        seen_ids.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
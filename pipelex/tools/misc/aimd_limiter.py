@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+from collections import deque
+from typing import Deque
+
+from pipelex.tools.exceptions import ToolException
+
+
+class AIMDLimiterError(ToolException):
+    pass
+
+
+class AIMDLimiter:
+    """
+    Async concurrency limiter whose ceiling adapts with additive increase / multiplicative decrease (AIMD):
+    each success raises the ceiling by additive_increase / ceiling, i.e. by about additive_increase per round of calls,
+    and a throttled call multiplies it by multiplicative_decrease.
+
+    Calls that were started before the last decrease don't decrease the ceiling again,
+    so that a burst of throttled calls from the same round only counts as one throttling event.
+    """
+
+    def __init__(
+        self,
+        initial_ceiling: float,
+        min_ceiling: float,
+        max_ceiling: float,
+        additive_increase: float,
+        multiplicative_decrease: float,
+    ):
+        if not 1 <= min_ceiling <= initial_ceiling <= max_ceiling:
+            raise AIMDLimiterError(f"AIMDLimiter requires 1 <= min <= initial <= max ceiling, got {min_ceiling}, {initial_ceiling}, {max_ceiling}")
+        if additive_increase <= 0 or not 0 < multiplicative_decrease < 1:
+            raise AIMDLimiterError(
+                f"AIMDLimiter requires a positive additive increase and a multiplicative decrease in ]0, 1[, "
+                f"got {additive_increase} and {multiplicative_decrease}"
+            )
+        self.ceiling = initial_ceiling
+        self.min_ceiling = min_ceiling
+        self.max_ceiling = max_ceiling
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.nb_in_flight = 0
+        self.nb_throttled = 0
+        self._epoch = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+    def _has_free_slot(self) -> bool:
+        return self.nb_in_flight < int(self.ceiling)
+
+    def _wake_up_waiters(self):
+        nb_free_slots = int(self.ceiling) - self.nb_in_flight
+        while nb_free_slots > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                nb_free_slots -= 1
+
+    async def acquire(self) -> int:
+        """Wait for a free slot, and return the epoch to pass back to release()."""
+        while not self._has_free_slot():
+            waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # pass our wake-up on to the next waiter
+                self._wake_up_waiters()
+                raise
+        self.nb_in_flight += 1
+        return self._epoch
+
+    def release(self, epoch: int, is_success: bool = True, is_throttled: bool = False):
+        """Free the slot, increasing the ceiling after a success and decreasing it after throttling. Other failures leave it unchanged."""
+        self.nb_in_flight -= 1
+        if is_throttled:
+            self.nb_throttled += 1
+            if epoch == self._epoch:
+                self.ceiling = max(self.min_ceiling, self.ceiling * self.multiplicative_decrease)
+                self._epoch += 1
+        elif is_success:
+            self.ceiling = min(self.max_ceiling, self.ceiling + self.additive_increase / self.ceiling)
+        self._wake_up_waiters()
@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import time
+from enum import StrEnum
+from typing import Optional
+
+from pipelex.tools.exceptions import ToolException
+
+
+class CircuitBreakerError(ToolException):
+    pass
+
+
+class CircuitBreakerState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Takes a failing dependency out of rotation: after failure_threshold consecutive failures the circuit opens for cool_down_seconds,
+    then it is half-open and lets a single trial call through, which closes it on success or opens it again on failure.
+    """
+
+    def __init__(self, failure_threshold: int, cool_down_seconds: float):
+        if failure_threshold < 1 or cool_down_seconds <= 0:
+            raise CircuitBreakerError(
+                f"CircuitBreaker requires failure_threshold >= 1 and cool_down_seconds > 0, got {failure_threshold} and {cool_down_seconds}"
+            )
+        self.failure_threshold = failure_threshold
+        self.cool_down_seconds = cool_down_seconds
+        self.nb_consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._is_trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitBreakerState:
+        if self._opened_at is None:
+            return CircuitBreakerState.CLOSED
+        if time.monotonic() - self._opened_at < self.cool_down_seconds:
+            return CircuitBreakerState.OPEN
+        return CircuitBreakerState.HALF_OPEN
+
+    @property
+    def is_available(self) -> bool:
+        match self.state:
+            case CircuitBreakerState.CLOSED:
+                return True
+            case CircuitBreakerState.OPEN:
+                return False
+            case CircuitBreakerState.HALF_OPEN:
+                return not self._is_trial_in_flight
+
+    def record_call_start(self):
+        if self.state == CircuitBreakerState.HALF_OPEN:
+            self._is_trial_in_flight = True
+
+    def record_call_abandoned(self):
+        # e.g. a cancelled call, which says nothing about the dependency's health
+        self._is_trial_in_flight = False
+
+    def record_success(self):
+        self.nb_consecutive_failures = 0
+        self._opened_at = None
+        self._is_trial_in_flight = False
+
+    def record_failure(self):
+        self.nb_consecutive_failures += 1
+        if self.state == CircuitBreakerState.HALF_OPEN or self.nb_consecutive_failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._is_trial_in_flight = False
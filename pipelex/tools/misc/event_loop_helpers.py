@@ -0,0 +1,46 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+from typing import Any, Callable, Coroutine, Optional, Set
+
+from pipelex import log
+
+# the closing tasks scheduled on the running loop, referenced until they are done so that they are not garbage collected
+_closing_tasks: Set["asyncio.Task[Any]"] = set()
+
+
+def _get_running_loop_or_none() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def close_loop_bound_resource(
+    make_close_coroutine: Callable[[], Coroutine[Any, Any, Any]],
+    resource_loop: asyncio.AbstractEventLoop,
+    resource_desc: str,
+):
+    """
+    Close a resource bound to the event loop it was opened in, such as a pool of connections, from sync code,
+    without ever driving an event loop from inside another one that is running:
+    - on the running loop, the closing is scheduled as a task of that loop,
+    - on a loop running in another thread, the closing is submitted to that thread,
+    - on a stopped loop, the closing is run to completion, unless another loop is running in this thread,
+    in which case the resource is dropped, as it is when its loop is closed: its connections are released when it is garbage collected.
+    """
+    running_loop = _get_running_loop_or_none()
+    if resource_loop.is_closed():
+        log.verbose(f"Dropping {resource_desc}, its event loop is already closed")
+    elif resource_loop is running_loop:
+        closing_task = resource_loop.create_task(make_close_coroutine())
+        _closing_tasks.add(closing_task)
+        closing_task.add_done_callback(_closing_tasks.discard)
+    elif resource_loop.is_running():
+        asyncio.run_coroutine_threadsafe(make_close_coroutine(), resource_loop)
+    elif running_loop is not None:
+        log.verbose(f"Dropping {resource_desc}, its event loop is stopped and can't be run from within another running loop")
+    else:
+        resource_loop.run_until_complete(make_close_coroutine())
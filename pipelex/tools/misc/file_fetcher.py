@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+import importlib.util
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Dict, Optional
+
+import aiofiles
+import httpx
+from pydantic import BaseModel
+
+from pipelex import log
+from pipelex.tools.exceptions import ToolException
+from pipelex.tools.misc.event_loop_helpers import close_loop_bound_resource
+from pipelex.tools.misc.file_fetcher_config import FileFetcherConfig
+from pipelex.tools.utils.file_utils import ensure_directory_exists
+
+
+class FileFetcherError(ToolException):
+    pass
+
+
+class FileFetchMetrics(BaseModel):
+    nb_fetches: int = 0
+    nb_failed: int = 0
+    nb_bytes: int = 0
+    nb_in_flight: int = 0
+    max_nb_in_flight: int = 0
+
+
+class FileFetcher:
+    """
+    Process-wide service fetching files over HTTP with pooled keep-alive connections, so that fetching many files
+    from the same hosts does not pay a TLS handshake per file.
+    The async client is bound to the event loop it was opened in, and is reopened if it's used from another loop.
+    """
+
+    def __init__(self, file_fetcher_config: FileFetcherConfig):
+        self.file_fetcher_config = file_fetcher_config
+        self.metrics = FileFetchMetrics()
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # the sync client may be shared by threads, which are capped per host like the coroutines of the async client
+        self._sync_host_semaphores: Dict[str, threading.Semaphore] = {}
+        self._sync_host_semaphores_lock = threading.Lock()
+
+    def setup(self):
+        if self.file_fetcher_config.is_http2_enabled and importlib.util.find_spec("h2") is None:
+            raise FileFetcherError("HTTP/2 is enabled for the file fetcher but the 'h2' package is not installed, install 'httpx[http2]'")
+        self._client = httpx.Client(**self._make_client_kwargs())
+
+    def teardown(self):
+        if self._client:
+            self._client.close()
+            self._client = None
+        self._close_async_client()
+        log.verbose(f"FileFetcher teardown done, metrics: {self.metrics}")
+
+    def _make_client_kwargs(self) -> Dict[str, Any]:
+        file_fetcher_config = self.file_fetcher_config
+        return {
+            "limits": httpx.Limits(
+                max_connections=file_fetcher_config.max_connections,
+                max_keepalive_connections=file_fetcher_config.max_keepalive_connections,
+                keepalive_expiry=file_fetcher_config.keepalive_expiry_seconds,
+            ),
+            "timeout": httpx.Timeout(
+                timeout=file_fetcher_config.read_timeout_seconds,
+                connect=file_fetcher_config.connect_timeout_seconds,
+            ),
+            "http2": file_fetcher_config.is_http2_enabled,
+            "follow_redirects": True,
+        }
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            # the pooled connections belong to the event loop the client was opened in, they can't be used from another one
+            self._close_async_client()
+            self._async_client = httpx.AsyncClient(**self._make_client_kwargs())
+            self._async_client_loop = loop
+            self._host_semaphores = {}
+        return self._async_client
+
+    def _close_async_client(self):
+        async_client = self._async_client
+        async_client_loop = self._async_client_loop
+        self._async_client = None
+        self._async_client_loop = None
+        self._host_semaphores = {}
+        if async_client is None or async_client_loop is None:
+            return
+        close_loop_bound_resource(
+            make_close_coroutine=async_client.aclose, resource_loop=async_client_loop, resource_desc="file fetcher async client"
+        )
+
+    @asynccontextmanager
+    async def _fetching(self, url: str) -> AsyncGenerator[httpx.AsyncClient, None]:
+        """Hold one of the connections allowed to the host of the url, and count the fetch in the metrics."""
+        async_client = self._get_async_client()
+        host = httpx.URL(url).host
+        host_semaphore = self._host_semaphores.setdefault(host, asyncio.Semaphore(self.file_fetcher_config.max_connections_per_host))
+        async with host_semaphore:
+            self.metrics.nb_fetches += 1
+            self.metrics.nb_in_flight += 1
+            self.metrics.max_nb_in_flight = max(self.metrics.max_nb_in_flight, self.metrics.nb_in_flight)
+            try:
+                yield async_client
+            except Exception:
+                self.metrics.nb_failed += 1
+                raise
+            finally:
+                self.metrics.nb_in_flight -= 1
+
+    async def fetch_file_async(self, url: str, timeout: Optional[float] = None) -> bytes:
+        async with self._fetching(url=url) as async_client:
+            response = await async_client.get(url, timeout=timeout or httpx.USE_CLIENT_DEFAULT)
+            response.raise_for_status()
+            self.metrics.nb_bytes += len(response.content)
+            return response.content
+
+    async def fetch_file_to_path_async(self, url: str, file_path: str, timeout: Optional[float] = None) -> int:
+        """Stream the file to disk chunk by chunk, for files too large to be held in memory. Returns the number of bytes written."""
+        parent_dir = os.path.dirname(file_path)
+        if parent_dir:
+            ensure_directory_exists(parent_dir)
+        # write then rename, so that a failed download never leaves a truncated file
+        tmp_file_path = f"{file_path}.part"
+        nb_bytes = 0
+        try:
+            async with self._fetching(url=url) as async_client:
+                async with async_client.stream("GET", url, timeout=timeout or httpx.USE_CLIENT_DEFAULT) as response:
+                    response.raise_for_status()
+                    async with aiofiles.open(tmp_file_path, "wb") as file:  # type: ignore[reportUnknownMemberType]
+                        async for chunk in response.aiter_bytes(chunk_size=self.file_fetcher_config.download_chunk_size):
+                            await file.write(chunk)
+                            nb_bytes += len(chunk)
+        except Exception:
+            if os.path.exists(tmp_file_path):
+                os.remove(tmp_file_path)
+            raise
+        os.replace(tmp_file_path, file_path)
+        self.metrics.nb_bytes += nb_bytes
+        return nb_bytes
+
+    def fetch_file(self, url: str, timeout: Optional[float] = None) -> bytes:
+        if self._client is None:
+            raise FileFetcherError("FileFetcher is not set up")
+        host = httpx.URL(url).host
+        with self._sync_host_semaphores_lock:
+            sync_host_semaphore = self._sync_host_semaphores.get(host)
+            if sync_host_semaphore is None:
+                sync_host_semaphore = threading.Semaphore(self.file_fetcher_config.max_connections_per_host)
+                self._sync_host_semaphores[host] = sync_host_semaphore
+        with sync_host_semaphore:
+            self.metrics.nb_fetches += 1
+            try:
+                response = self._client.get(url, timeout=timeout or httpx.USE_CLIENT_DEFAULT)
+                response.raise_for_status()
+            except Exception:
+                self.metrics.nb_failed += 1
+                raise
+        self.metrics.nb_bytes += len(response.content)
+        return response.content
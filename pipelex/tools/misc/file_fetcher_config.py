@@ -0,0 +1,18 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from pydantic import Field
+
+from pipelex.tools.config.models import ConfigModel
+
+
+class FileFetcherConfig(ConfigModel):
+    max_connections: int = Field(gt=0)
+    max_connections_per_host: int = Field(gt=0)
+    max_keepalive_connections: int = Field(ge=0)
+    keepalive_expiry_seconds: float = Field(ge=0)
+    connect_timeout_seconds: float = Field(gt=0)
+    read_timeout_seconds: float = Field(gt=0)
+    is_http2_enabled: bool
+    download_chunk_size: int = Field(gt=0)
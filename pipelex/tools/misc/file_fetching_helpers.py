@@ -7,11 +7,17 @@ from typing import Optional
 import httpx
 from httpx import Response
 
+from pipelex.hub import get_file_fetcher
+
 
 async def fetch_file_from_url_httpx_async(
     url: str,
     timeout: Optional[int] = None,
 ) -> bytes:
+    # use the pooled client of the file fetcher once Pipelex is set up
+    if file_fetcher := get_file_fetcher():
+        return await file_fetcher.fetch_file_async(url=url, timeout=timeout)
+
     async with httpx.AsyncClient() as client:
         response: Response = await client.get(
             url,
@@ -24,10 +30,33 @@ async def fetch_file_from_url_httpx_async(
         return bytes_content
 
 
+async def fetch_file_from_url_to_path_httpx_async(
+    url: str,
+    file_path: str,
+    timeout: Optional[int] = None,
+) -> int:
+    """Stream a large file to disk rather than holding it in memory. Returns the number of bytes written."""
+    if file_fetcher := get_file_fetcher():
+        return await file_fetcher.fetch_file_to_path_async(url=url, file_path=file_path, timeout=timeout)
+
+    nb_bytes = 0
+    async with httpx.AsyncClient() as client:
+        async with client.stream("GET", url, timeout=timeout, follow_redirects=True) as response:
+            response.raise_for_status()
+            with open(file_path, "wb") as file:
+                async for chunk in response.aiter_bytes():
+                    file.write(chunk)
+                    nb_bytes += len(chunk)
+    return nb_bytes
+
+
 def fetch_file_from_url_httpx(
     url: str,
     timeout: Optional[int] = None,
 ) -> bytes:
+    if file_fetcher := get_file_fetcher():
+        return file_fetcher.fetch_file(url=url, timeout=timeout)
+
     with httpx.Client() as client:
         response: Response = client.get(
             url,
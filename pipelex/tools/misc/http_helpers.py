@@ -0,0 +1,31 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+def parse_retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    The delay a server asked to wait before retrying, from the standard Retry-After header, in seconds or as an HTTP date,
+    or from the retry-after-ms header sent by some providers. None if there is none or it can't be parsed.
+    """
+    if retry_after_ms := headers.get("retry-after-ms"):
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
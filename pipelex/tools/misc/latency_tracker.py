@@ -0,0 +1,39 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import math
+from collections import deque
+from typing import Deque, Optional
+
+from pipelex.tools.exceptions import ToolException
+
+
+class LatencyTrackerError(ToolException):
+    pass
+
+
+class LatencyTracker:
+    """Keeps a sliding window of the most recent latencies to compute percentiles over them."""
+
+    def __init__(self, max_nb_samples: int):
+        if max_nb_samples < 1:
+            raise LatencyTrackerError(f"LatencyTracker requires max_nb_samples >= 1, got {max_nb_samples}")
+        self._samples: Deque[float] = deque(maxlen=max_nb_samples)
+
+    @property
+    def nb_samples(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency_seconds: float):
+        self._samples.append(latency_seconds)
+
+    def get_percentile(self, percentile: float) -> Optional[float]:
+        """Nearest-rank percentile of the recorded latencies, None if nothing was recorded yet."""
+        if not 0 < percentile <= 100:
+            raise LatencyTrackerError(f"Percentile must be in ]0, 100], got {percentile}")
+        if not self._samples:
+            return None
+        sorted_samples = sorted(self._samples)
+        rank = math.ceil(percentile / 100 * len(sorted_samples))
+        return sorted_samples[rank - 1]
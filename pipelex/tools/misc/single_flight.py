@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Tuple, TypeVar
+
+ResultType = TypeVar("ResultType")
+
+
+class SingleFlight(Generic[ResultType]):
+    """
+    De-duplicates identical concurrent calls: while a call is in flight for a given key,
+    later callers with the same key await the same result instead of making the call again.
+    If the first caller is cancelled, the callers that were waiting for it make the call themselves.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, "asyncio.Future[ResultType]"] = {}
+
+    @property
+    def nb_in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def run(self, key: str, call: Callable[[], Awaitable[ResultType]]) -> Tuple[ResultType, bool]:
+        """
+        Run the call unless an identical one is already in flight.
+        Returns the result and whether it was shared from another caller's call.
+        """
+        while in_flight_future := self._in_flight.get(key):
+            try:
+                # shielded so that cancelling a waiting caller does not cancel the call it waits for
+                return await asyncio.shield(in_flight_future), True
+            except asyncio.CancelledError:
+                if not in_flight_future.cancelled():
+                    raise
+                # the caller that made the call was cancelled: loop to join another call or make it ourselves
+
+        future: "asyncio.Future[ResultType]" = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # the exception is raised here, retrieving it from the future avoids the "never retrieved" warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+import time
+
+from pipelex.tools.exceptions import ToolException
+
+
+class TokenBucketError(ToolException):
+    pass
+
+
+class TokenBucket:
+    """
+    Async token bucket that refills continuously up to its capacity.
+
+    Acquiring debits the bucket right away, possibly below zero, and then waits until the debt is refilled:
+    concurrent callers are thus served in order of arrival without needing a lock.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        if capacity <= 0 or refill_per_second <= 0:
+            raise TokenBucketError(f"TokenBucket capacity and refill rate must be positive, got {capacity} and {refill_per_second}")
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._level = capacity
+        self._updated_at = time.monotonic()
+
+    @classmethod
+    def make_per_minute(cls, nb_per_minute: int) -> "TokenBucket":
+        return cls(capacity=nb_per_minute, refill_per_second=nb_per_minute / 60)
+
+    @property
+    def level(self) -> float:
+        self._refill()
+        return self._level
+
+    def _refill(self):
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+
+    async def acquire(self, amount: float) -> float:
+        """
+        Debit the amount and wait until the bucket is no longer in debt.
+        An amount larger than the capacity is capped to the capacity, otherwise it could never be granted.
+        Returns the amount actually debited, which is what must be given back to cancel the acquisition.
+        If the wait is cancelled, the amount is given back right away, so that the bucket isn't left in debt.
+        """
+        self._refill()
+        debited_amount = min(amount, self.capacity)
+        self._level -= debited_amount
+        if self._level < 0:
+            try:
+                await asyncio.sleep(-self._level / self.refill_per_second)
+            except asyncio.CancelledError:
+                self.adjust(amount=debited_amount)
+                raise
+        return debited_amount
+
+    def adjust(self, amount: float):
+        """Credit (positive amount) or debit (negative amount) the bucket without waiting, e.g. to reconcile an estimate."""
+        self._refill()
+        self._level = min(self.capacity, self._level + amount)
@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+# this module is imported by each rendering process, so it's kept free of heavy imports
+import pathlib
+from io import BytesIO
+from typing import Optional, cast
+
+import pypdfium2 as pdfium
+from PIL import Image
+from pydantic import BaseModel
+from pypdfium2.raw import FPDFBitmap_BGRA
+
+PdfInput = str | pathlib.Path | bytes
+
+PAGE_IMAGE_FORMAT = "PNG"
+PAGE_IMAGE_EXTENSION = "png"
+
+
+class RenderedPdfPage(BaseModel):
+    """A rendered page, encoded either in image_bytes or in the file at file_path."""
+
+    page_index: int
+    width: int
+    height: int
+    image_bytes: Optional[bytes] = None
+    file_path: Optional[str] = None
+
+
+def get_pdf_nb_pages(pdf_input: PdfInput) -> int:
+    pdf_doc = pdfium.PdfDocument(pdf_input)
+    try:
+        return len(pdf_doc)
+    finally:
+        pdf_doc.close()
+
+
+def render_pdf_page(pdf_doc: pdfium.PdfDocument, page_index: int, dpi: float, output_file_path: Optional[str] = None) -> RenderedPdfPage:
+    """Render the page and encode it right away, so that the raw bitmap of the page is released before the next one is rendered."""
+    page = pdf_doc[page_index]
+    try:
+        pil_img = cast(
+            Image.Image,
+            page.render(  # pyright: ignore[reportUnknownMemberType]
+                scale=dpi / 72,  # pyright: ignore[reportArgumentType]
+                force_bitmap_format=FPDFBitmap_BGRA,  # always 4-channel
+                rev_byteorder=True,  # so we get RGBA
+            ).to_pil(),
+        )
+    finally:
+        page.close()
+    width, height = pil_img.size
+    if output_file_path:
+        pil_img.save(output_file_path, format=PAGE_IMAGE_FORMAT)
+        return RenderedPdfPage(page_index=page_index, width=width, height=height, file_path=output_file_path)
+    buffer = BytesIO()
+    pil_img.save(buffer, format=PAGE_IMAGE_FORMAT)
+    return RenderedPdfPage(page_index=page_index, width=width, height=height, image_bytes=buffer.getvalue())
+
+
+def render_pdf_page_from_path(pdf_path: str, page_index: int, dpi: float, output_file_path: Optional[str] = None) -> RenderedPdfPage:
+    """Entry point of the rendering processes: each one opens the document on its own, as PDFium documents can't be shared."""
+    pdf_doc = pdfium.PdfDocument(pdf_path)
+    try:
+        return render_pdf_page(pdf_doc=pdf_doc, page_index=page_index, dpi=dpi, output_file_path=output_file_path)
+    finally:
+        pdf_doc.close()
@@ -0,0 +1,13 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from pydantic import Field
+
+from pipelex.tools.config.models import ConfigModel
+
+
+class PdfRendererConfig(ConfigModel):
+    is_process_pool_enabled: bool
+    max_nb_processes: int = Field(ge=1)
+    max_nb_pages_in_flight: int = Field(ge=1)
@@ -5,74 +5,266 @@
 from __future__ import annotations
 
 import asyncio
-import pathlib
-from typing import List
+import multiprocessing
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from io import BytesIO
+from typing import AsyncGenerator, AsyncIterator, Callable, Deque, List, Optional, ParamSpec, Sequence, TypeVar
 
 import pypdfium2 as pdfium
 from PIL import Image
-from pypdfium2.raw import FPDFBitmap_BGRA
 
+from pipelex import log
 from pipelex.tools.exceptions import ToolException
-from pipelex.tools.misc.file_fetching_helpers import fetch_file_from_url_httpx_async
+from pipelex.tools.misc.file_fetching_helpers import fetch_file_from_url_to_path_httpx_async
+from pipelex.tools.pdf.pdf_page_rendering import (
+    PAGE_IMAGE_EXTENSION,
+    PdfInput,
+    RenderedPdfPage,
+    get_pdf_nb_pages,
+    render_pdf_page,
+    render_pdf_page_from_path,
+)
+from pipelex.tools.pdf.pdf_renderer_config import PdfRendererConfig
+from pipelex.tools.utils.file_utils import ensure_directory_exists
 from pipelex.tools.utils.path_utils import clarify_path_or_url
 
+P = ParamSpec("P")
+R = TypeVar("R")
+
 
 class PyPdfium2RendererError(ToolException):
     pass
 
 
-PdfInput = str | pathlib.Path | bytes
-
-
 class PyPdfium2Renderer:
     """
-    Thread-safe PDF page renderer built on pypdfium2.
+    PDF page renderer built on pypdfium2, yielding the pages one at a time, encoded as PNG bytes or files.
+
+    • PDFium is not thread-safe: in this process, all entry into the native library is protected by a single
+      asyncio.Lock, and the blocking work runs inside `asyncio.to_thread` to keep the event loop responsive.
 
-    • All entry into the native PDFium library is protected by a single
-      asyncio.Lock, so the enclosing *process* is safe even if other
-      libraries spin up worker threads.
+    • With the process pool enabled, pages are rendered in separate processes, each with its own PDFium,
+      for true parallelism across cores. Each process opens the document from a file.
 
-    • Heavy work runs inside `asyncio.to_thread`, keeping the event-loop
-      responsive for the rest of your application.
+    • At most max_nb_pages_in_flight pages are rendered ahead of the consumer, so memory does not grow with the document.
     """
 
     _pdfium_lock: asyncio.Lock = asyncio.Lock()  # shared per process
 
-    # ---- internal blocking helper ------------------------------------
-    @staticmethod
-    def _render_pdf_pages_sync(pdf_input: PdfInput, dpi: float = 300) -> List[Image.Image]:
-        pdf_doc = pdfium.PdfDocument(pdf_input)
-        images: List[Image.Image] = []
-        for index in range(len(pdf_doc)):
-            # page = doc.get_page(index)
-            page = pdf_doc[index]
-
-            pil_img: Image.Image = page.render(  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
-                scale=dpi / 72,  # pyright: ignore[reportArgumentType]
-                force_bitmap_format=FPDFBitmap_BGRA,  # always 4-channel
-                rev_byteorder=True,  # so we get RGBA
-            ).to_pil()
-
-            images.append(pil_img)  # pyright: ignore[reportUnknownArgumentType]
-            page.close()
-        pdf_doc.close()
-        return images
+    def __init__(self, is_process_pool_enabled: bool = False, max_nb_processes: int = 4, max_nb_pages_in_flight: int = 8):
+        self.is_process_pool_enabled = is_process_pool_enabled
+        self.max_nb_processes = max_nb_processes
+        self.max_nb_pages_in_flight = max_nb_pages_in_flight
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def setup(self, pdf_renderer_config: PdfRendererConfig):
+        self.teardown()
+        self.is_process_pool_enabled = pdf_renderer_config.is_process_pool_enabled
+        self.max_nb_processes = pdf_renderer_config.max_nb_processes
+        self.max_nb_pages_in_flight = pdf_renderer_config.max_nb_pages_in_flight
+
+    def teardown(self):
+        if self._process_pool:
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
+            self._process_pool = None
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            # the processes are spawned rather than forked, as forking a process which runs threads and an event loop is unsafe
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_nb_processes, mp_context=multiprocessing.get_context("spawn"))
+        return self._process_pool
 
     # ---- public async façade -----------------------------------------
     async def render_pdf_pages(self, pdf_input: PdfInput, dpi: int = 300) -> List[Image.Image]:
-        """Render *one* page and return PNG bytes."""
-        async with self._pdfium_lock:
-            return await asyncio.to_thread(self._render_pdf_pages_sync, pdf_input, dpi)
+        """Render all the pages and return them as PIL images, prefer iter_pdf_pages which does not hold the whole document."""
+        images: List[Image.Image] = []
+        async for rendered_page in self.iter_pdf_pages(pdf_input=pdf_input, dpi=dpi):
+            # the images are opened lazily, so they are held as PNG bytes until they are used
+            images.append(Image.open(BytesIO(rendered_page.image_bytes or b"")))
+        return images
 
     async def render_pdf_pages_from_uri(self, pdf_uri: str, dpi: int = 300) -> List[Image.Image]:
+        images: List[Image.Image] = []
+        async for rendered_page in self.iter_pdf_pages_from_uri(pdf_uri=pdf_uri, dpi=dpi):
+            images.append(Image.open(BytesIO(rendered_page.image_bytes or b"")))
+        return images
+
+    async def iter_pdf_pages_from_uri(
+        self,
+        pdf_uri: str,
+        dpi: int = 300,
+        page_indices: Optional[Sequence[int]] = None,
+        output_directory: Optional[str] = None,
+    ) -> AsyncIterator[RenderedPdfPage]:
         pdf_path, pdf_url = clarify_path_or_url(path_or_uri=pdf_uri)  # pyright: ignore
         if pdf_url:
-            pdf_bytes = await fetch_file_from_url_httpx_async(url=pdf_url)
-            return await self.render_pdf_pages(pdf_input=pdf_bytes, dpi=dpi)
+            # the document is downloaded to a file rather than into memory, the rendering processes need a file anyway
+            async with self._temporary_pdf_path() as tmp_pdf_path:
+                await fetch_file_from_url_to_path_httpx_async(url=pdf_url, file_path=tmp_pdf_path)
+                async for rendered_page in self.iter_pdf_pages(
+                    pdf_input=tmp_pdf_path,
+                    dpi=dpi,
+                    page_indices=page_indices,
+                    output_directory=output_directory,
+                ):
+                    yield rendered_page
         elif pdf_path:
-            return await self.render_pdf_pages(pdf_input=pdf_path, dpi=dpi)
+            async for rendered_page in self.iter_pdf_pages(pdf_input=pdf_path, dpi=dpi, page_indices=page_indices, output_directory=output_directory):
+                yield rendered_page
         else:
             raise PyPdfium2RendererError(f"Invalid PDF URI: {pdf_uri}")
 
+    async def iter_pdf_pages(
+        self,
+        pdf_input: PdfInput,
+        dpi: int = 300,
+        page_indices: Optional[Sequence[int]] = None,
+        output_directory: Optional[str] = None,
+    ) -> AsyncIterator[RenderedPdfPage]:
+        """
+        Render the pages one at a time, in order, and yield each one encoded as PNG.
+
+        Args:
+            pdf_input: The path of the PDF, or its bytes.
+            dpi: The resolution of the rendered pages.
+            page_indices: The 0-based indices of the pages to render, such as range(10, 20), or None for all the pages.
+            output_directory: If set, each page is written to <output_directory>/page_<page number>.png rather than returned as bytes.
+        """
+        if output_directory:
+            ensure_directory_exists(output_directory)
+        if not self.is_process_pool_enabled:
+            async for rendered_page in self._iter_pdf_pages_in_process(
+                pdf_input=pdf_input,
+                dpi=dpi,
+                page_indices=page_indices,
+                output_directory=output_directory,
+            ):
+                yield rendered_page
+            return
+
+        if isinstance(pdf_input, bytes):
+            # each rendering process opens the document on its own, from a file rather than from a copy of the bytes sent for each page
+            async with self._temporary_pdf_path() as tmp_pdf_path:
+                with open(tmp_pdf_path, "wb") as tmp_pdf_file:
+                    tmp_pdf_file.write(pdf_input)
+                async for rendered_page in self._iter_pdf_pages_in_process_pool(
+                    pdf_path=tmp_pdf_path,
+                    dpi=dpi,
+                    page_indices=page_indices,
+                    output_directory=output_directory,
+                ):
+                    yield rendered_page
+        else:
+            async for rendered_page in self._iter_pdf_pages_in_process_pool(
+                pdf_path=str(pdf_input),
+                dpi=dpi,
+                page_indices=page_indices,
+                output_directory=output_directory,
+            ):
+                yield rendered_page
+
+    @staticmethod
+    def _check_page_indices(page_indices: Optional[Sequence[int]], nb_pages: int) -> Sequence[int]:
+        if page_indices is None:
+            return range(nb_pages)
+        for page_index in page_indices:
+            if not 0 <= page_index < nb_pages:
+                raise PyPdfium2RendererError(f"Page index {page_index} is out of the {nb_pages} pages of the PDF")
+        return page_indices
+
+    async def _iter_pdf_pages_in_process(
+        self,
+        pdf_input: PdfInput,
+        dpi: int,
+        page_indices: Optional[Sequence[int]],
+        output_directory: Optional[str],
+    ) -> AsyncIterator[RenderedPdfPage]:
+        async with self._pdfium_lock:
+            pdf_doc = await self._run_pdfium(pdfium.PdfDocument, pdf_input)
+        try:
+            checked_page_indices = self._check_page_indices(page_indices=page_indices, nb_pages=len(pdf_doc))
+            for page_index in checked_page_indices:
+                # the lock is taken for each page, so that the renderings of several documents take turns
+                async with self._pdfium_lock:
+                    rendered_page = await self._run_pdfium(
+                        render_pdf_page,
+                        pdf_doc,
+                        page_index,
+                        dpi,
+                        self._make_page_file_path(output_directory=output_directory, page_index=page_index),
+                    )
+                yield rendered_page
+        finally:
+            async with self._pdfium_lock:
+                await self._run_pdfium(pdf_doc.close)
+
+    async def _iter_pdf_pages_in_process_pool(
+        self,
+        pdf_path: str,
+        dpi: int,
+        page_indices: Optional[Sequence[int]],
+        output_directory: Optional[str],
+    ) -> AsyncIterator[RenderedPdfPage]:
+        async with self._pdfium_lock:
+            nb_pages = await self._run_pdfium(get_pdf_nb_pages, pdf_path)
+        checked_page_indices = self._check_page_indices(page_indices=page_indices, nb_pages=nb_pages)
+        loop = asyncio.get_running_loop()
+        process_pool = self._get_process_pool()
+        pending_pages: Deque[asyncio.Future[RenderedPdfPage]] = deque()
+        page_indices_iterator = iter(checked_page_indices)
+        try:
+            while True:
+                # keep up to max_nb_pages_in_flight pages rendering ahead of the consumer, and yield them in order
+                while len(pending_pages) < self.max_nb_pages_in_flight and (page_index := next(page_indices_iterator, None)) is not None:
+                    pending_pages.append(
+                        loop.run_in_executor(
+                            process_pool,
+                            render_pdf_page_from_path,
+                            pdf_path,
+                            page_index,
+                            dpi,
+                            self._make_page_file_path(output_directory=output_directory, page_index=page_index),
+                        )
+                    )
+                if not pending_pages:
+                    break
+                try:
+                    rendered_page = await pending_pages.popleft()
+                except pdfium.PdfiumError as exc:
+                    raise PyPdfium2RendererError(f"Failed to render a page of '{pdf_path}': {exc}") from exc
+                yield rendered_page
+        finally:
+            # the consumer may stop early: the pages not started yet are not rendered for nothing
+            for pending_page in pending_pages:
+                pending_page.cancel()
+
+    @staticmethod
+    def _make_page_file_path(output_directory: Optional[str], page_index: int) -> Optional[str]:
+        if not output_directory:
+            return None
+        return os.path.join(output_directory, f"page_{page_index + 1}.{PAGE_IMAGE_EXTENSION}")
+
+    @staticmethod
+    async def _run_pdfium(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        """Run blocking PDFium work out of the event loop, to be called while holding the lock."""
+        try:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        except pdfium.PdfiumError as exc:
+            raise PyPdfium2RendererError(f"PDFium failed: {exc}") from exc
+
+    @asynccontextmanager
+    async def _temporary_pdf_path(self) -> AsyncGenerator[str, None]:
+        tmp_pdf_fd, tmp_pdf_path = tempfile.mkstemp(prefix="pipelex_pdf_", suffix=".pdf")
+        os.close(tmp_pdf_fd)
+        try:
+            yield tmp_pdf_path
+        finally:
+            os.remove(tmp_pdf_path)
+            log.debug(f"Removed temporary PDF '{tmp_pdf_path}'")
+
 
 pypdfium2_renderer = PyPdfium2Renderer()
@@ -4,7 +4,6 @@
 
 from typing import Any, Dict, Optional
 
-from jinja2 import Template, meta
 from jinja2.exceptions import (
     TemplateAssertionError,
     TemplateSyntaxError,
@@ -19,7 +18,6 @@ from pipelex.tools.templating.jinja2_errors import (
     make_jinja2_error_explanation,
 )
 from pipelex.tools.templating.jinja2_models import Jinja2ContextKey
-from pipelex.tools.templating.jinja2_required_variables import make_jinja2_env_from_template_provider
 from pipelex.tools.templating.jinja2_template_category import Jinja2TemplateCategory
 from pipelex.tools.templating.template_provider_abstract import TemplateProviderAbstract
 from pipelex.tools.templating.templating_models import PromptingStyle
@@ -43,32 +41,21 @@ async def render_jinja2(
     jinja2: Optional[str] = None,
     prompting_style: Optional[PromptingStyle] = None,
 ) -> str:
-    jinja2_env, loader = make_jinja2_env_from_template_provider(
-        template_category=template_category,
-        template_provider=template_provider,
-    )
-
-    template: Template
-    template_source: str
+    jinja2_template_cache = template_provider.get_jinja2_template_cache()
     try:
-        if jinja2:
-            template = jinja2_env.from_string(jinja2)
-            template_source = jinja2
-        elif jinja2_name:
-            template = jinja2_env.get_template(jinja2_name)
-            template_source = loader.get_source(jinja2_env, jinja2_name)[0]
-        else:
-            raise Jinja2StuffError("No jinja2 or jinja2_name in Jinja2Assignment")
+        compiled_template = jinja2_template_cache.get_compiled_template(
+            template_category=template_category,
+            jinja2_name=jinja2_name,
+            jinja2=jinja2,
+        )
     except TemplateAssertionError as exc:
         explanation = make_jinja2_error_explanation(jinja2_name=jinja2_name, template_text=jinja2)
         raise Jinja2RenderError(f"Jinja2 render error: '{exc}' {explanation}") from exc
+    template = compiled_template.template
+    template_source = compiled_template.template_source
 
-    parsed_ast = jinja2_env.parse(template_source)
-    if undeclared_variables := meta.find_undeclared_variables(parsed_ast):
-        undeclared_variables.discard("preliminary_text")
-        if undeclared_variables:
-            log.verbose(undeclared_variables, "Jinja2 undeclared_variables")
-            # pretty_print(undeclared_variables, title="Jinja2 undeclared_variables")
+    if undeclared_variables := compiled_template.undeclared_variables - {"preliminary_text"}:
+        log.verbose(undeclared_variables, "Jinja2 undeclared_variables")
     temlating_context = temlating_context.copy()
     if prompting_style:
         _add_to_templating_context(
@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from jinja2 import Environment, Template, meta
+from typing_extensions import override
+
+from pipelex import log
+from pipelex.tools.templating.jinja2_environment import make_jinja2_env_from_template_provider
+from pipelex.tools.templating.jinja2_errors import Jinja2StuffError
+from pipelex.tools.templating.jinja2_template_cache_abstract import Jinja2CompiledTemplate, Jinja2TemplateCacheAbstract
+from pipelex.tools.templating.jinja2_template_category import Jinja2TemplateCategory
+from pipelex.tools.templating.template_provider_abstract import TemplateProviderAbstract
+
+JINJA2_TEMPLATE_CACHE_MAX_SIZE = 256
+
+Jinja2TemplateCacheKey = Tuple[Jinja2TemplateCategory, str]
+
+
+class Jinja2TemplateCache(Jinja2TemplateCacheAbstract):
+    """
+    Holds one Jinja2 environment per template category for the lifetime of a template provider,
+    and an LRU of compiled templates keyed by template name or by the hash of the template source.
+    The template provider must clear this cache whenever its templates change.
+    """
+
+    def __init__(self, template_provider: TemplateProviderAbstract, max_size: int = JINJA2_TEMPLATE_CACHE_MAX_SIZE):
+        self.template_provider = template_provider
+        self.max_size = max_size
+        self._envs: Dict[Jinja2TemplateCategory, Environment] = {}
+        self._compiled_templates: OrderedDict[Jinja2TemplateCacheKey, Jinja2CompiledTemplate] = OrderedDict()
+
+    @override
+    def clear(self) -> None:
+        # the environments are dropped too, because jinja2 keeps its own cache of the templates loaded by name
+        self._envs.clear()
+        self._compiled_templates.clear()
+
+    @override
+    def get_env(self, template_category: Jinja2TemplateCategory) -> Environment:
+        jinja2_env = self._envs.get(template_category)
+        if jinja2_env is None:
+            jinja2_env, _ = make_jinja2_env_from_template_provider(
+                template_category=template_category,
+                template_provider=self.template_provider,
+            )
+            self._envs[template_category] = jinja2_env
+        return jinja2_env
+
+    @staticmethod
+    def _make_cache_key(
+        template_category: Jinja2TemplateCategory,
+        jinja2_name: Optional[str],
+        jinja2: Optional[str],
+    ) -> Jinja2TemplateCacheKey:
+        if jinja2:
+            source_hash = hashlib.sha256(jinja2.encode()).hexdigest()
+            return template_category, f"source:{source_hash}"
+        elif jinja2_name:
+            return template_category, f"name:{jinja2_name}"
+        else:
+            raise Jinja2StuffError("No jinja2 or jinja2_name provided")
+
+    @override
+    def get_compiled_template(
+        self,
+        template_category: Jinja2TemplateCategory,
+        jinja2_name: Optional[str] = None,
+        jinja2: Optional[str] = None,
+    ) -> Jinja2CompiledTemplate:
+        """
+        Returns the compiled template along with its source and undeclared variables, compiling it on first use.
+        Jinja2 errors raised while compiling are left to the caller to handle.
+        """
+        cache_key = self._make_cache_key(template_category=template_category, jinja2_name=jinja2_name, jinja2=jinja2)
+        if compiled_template := self._compiled_templates.get(cache_key):
+            self._compiled_templates.move_to_end(cache_key)
+            return compiled_template
+
+        compiled_template = self._compile_template(template_category=template_category, jinja2_name=jinja2_name, jinja2=jinja2)
+        self._compiled_templates[cache_key] = compiled_template
+        if len(self._compiled_templates) > self.max_size:
+            self._compiled_templates.popitem(last=False)
+        return compiled_template
+
+    def _compile_template(
+        self,
+        template_category: Jinja2TemplateCategory,
+        jinja2_name: Optional[str],
+        jinja2: Optional[str],
+    ) -> Jinja2CompiledTemplate:
+        jinja2_env = self.get_env(template_category=template_category)
+        template: Template
+        template_source: str
+        if jinja2:
+            template = jinja2_env.from_string(jinja2)
+            template_source = jinja2
+        elif jinja2_name:
+            template = jinja2_env.get_template(jinja2_name)
+            template_source = self.template_provider.get_template(template_name=jinja2_name)
+        else:
+            raise Jinja2StuffError("No jinja2 or jinja2_name provided")
+
+        undeclared_variables = meta.find_undeclared_variables(jinja2_env.parse(template_source))
+        log.debug(f"Jinja2TemplateCache: compiled template '{jinja2_name or 'from source'}' for category '{template_category}'")
+        return Jinja2CompiledTemplate(
+            template=template,
+            template_source=template_source,
+            undeclared_variables=frozenset(undeclared_variables),
+        )
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from abc import ABC, abstractmethod
+from typing import FrozenSet, Optional
+
+from jinja2 import Environment, Template
+from pydantic import BaseModel, ConfigDict
+
+from pipelex.tools.templating.jinja2_template_category import Jinja2TemplateCategory
+
+
+class Jinja2CompiledTemplate(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    template: Template
+    template_source: str
+    undeclared_variables: FrozenSet[str]
+
+
+class Jinja2TemplateCacheAbstract(ABC):
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def get_env(self, template_category: Jinja2TemplateCategory) -> Environment:
+        pass
+
+    @abstractmethod
+    def get_compiled_template(
+        self,
+        template_category: Jinja2TemplateCategory,
+        jinja2_name: Optional[str] = None,
+        jinja2: Optional[str] = None,
+    ) -> Jinja2CompiledTemplate:
+        pass
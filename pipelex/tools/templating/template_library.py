@@ -2,10 +2,10 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from jinja2 import TemplateSyntaxError
-from pydantic import Field, RootModel, ValidationError
+from pydantic import Field, PrivateAttr, RootModel, ValidationError
 from typing_extensions import override
 
 from pipelex import log
@@ -14,6 +14,7 @@ from pipelex.tools.exceptions import ToolException
 from pipelex.tools.misc.model_helpers import format_pydantic_validation_error
 from pipelex.tools.misc.toml_helpers import load_toml_from_path
 from pipelex.tools.templating.jinja2_parsing import check_jinja2_parsing
+from pipelex.tools.templating.jinja2_template_cache import Jinja2TemplateCache
 from pipelex.tools.templating.jinja2_template_category import Jinja2TemplateCategory
 from pipelex.tools.templating.template_preprocessor import preprocess_template
 from pipelex.tools.templating.template_provider_abstract import TemplateNotFoundError, TemplateProviderAbstract
@@ -27,9 +28,11 @@ class TemplateLibraryError(ToolException):
 
 class TemplateLibrary(TemplateProviderAbstract, RootModel[TemplateLibraryRoot]):
     root: TemplateLibraryRoot = Field(default_factory=dict)
+    _jinja2_template_cache: Optional[Jinja2TemplateCache] = PrivateAttr(default=None)
 
     @override
     def setup(self) -> None:
+        self._clear_jinja2_template_cache()
         template_toml_paths = LibraryConfig.get_templates_paths()
         for template_toml_path in template_toml_paths:
             self._load_from_toml(toml_path=template_toml_path)
@@ -38,6 +41,7 @@ class TemplateLibrary(TemplateProviderAbstract, RootModel[TemplateLibraryRoot]):
     @override
     def teardown(self) -> None:
         self.root = {}
+        self._clear_jinja2_template_cache()
 
     @override
     def get_template(self, template_name: str) -> str:
@@ -46,9 +50,20 @@ class TemplateLibrary(TemplateProviderAbstract, RootModel[TemplateLibraryRoot]):
         except KeyError as exc:
             raise TemplateNotFoundError(f"Template '{template_name}' not found in template library") from exc
 
+    @override
+    def get_jinja2_template_cache(self) -> Jinja2TemplateCache:
+        if self._jinja2_template_cache is None:
+            self._jinja2_template_cache = Jinja2TemplateCache(template_provider=self)
+        return self._jinja2_template_cache
+
+    def _clear_jinja2_template_cache(self):
+        if self._jinja2_template_cache is not None:
+            self._jinja2_template_cache.clear()
+
     def _set_template(self, template: str, name: str):
         preprocessed_template = preprocess_template(template)
         self.root[name] = preprocessed_template
+        self._clear_jinja2_template_cache()
 
     def _add_new_template(self, template: str, name: str):
         if name in self.root:
@@ -5,6 +5,7 @@
 from abc import ABC, abstractmethod
 
 from pipelex.tools.exceptions import ToolException
+from pipelex.tools.templating.jinja2_template_cache_abstract import Jinja2TemplateCacheAbstract
 
 
 class TemplateNotFoundError(ToolException):
@@ -23,3 +24,7 @@ class TemplateProviderAbstract(ABC):
     @abstractmethod
     def get_template(self, template_name: str) -> str:
         pass
+
+    @abstractmethod
+    def get_jinja2_template_cache(self) -> Jinja2TemplateCacheAbstract:
+        pass
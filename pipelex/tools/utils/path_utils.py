@@ -118,6 +118,7 @@ class InterpretedPathOrUrl(StrEnum):
     URL = "uri"
     FILE_NAME = "file_name"
     BASE_64 = "base_64"
+    DATA_URL = "data_url"
 
     @property
     def desc(self) -> str:
@@ -132,6 +133,8 @@ class InterpretedPathOrUrl(StrEnum):
                 return "File Name"
             case InterpretedPathOrUrl.BASE_64:
                 return "Base 64"
+            case InterpretedPathOrUrl.DATA_URL:
+                return "Data URL"
 
 
 def interpret_path_or_url(path_or_uri: str) -> InterpretedPathOrUrl:
@@ -152,6 +155,7 @@ def interpret_path_or_url(path_or_uri: str) -> InterpretedPathOrUrl:
             - FILE_URI for file:// URIs
             - FILE_PATH for everything else
             - URL for http(s) URLs
+            - DATA_URL for data: URLs, which carry their content
             - FILE_NAME for file names
             - BASE_64 for base64-encoded images
 
@@ -167,6 +171,8 @@ def interpret_path_or_url(path_or_uri: str) -> InterpretedPathOrUrl:
         return InterpretedPathOrUrl.FILE_URI
     elif path_or_uri.startswith("http"):
         return InterpretedPathOrUrl.URL
+    elif path_or_uri.startswith("data:"):
+        return InterpretedPathOrUrl.DATA_URL
     elif os.sep in path_or_uri:
         return InterpretedPathOrUrl.FILE_PATH
     else:
@@ -205,7 +211,8 @@ def clarify_path_or_url(path_or_uri: str) -> Tuple[Optional[str], Optional[str]]
             parsed_uri = urllib.parse.urlparse(path_or_uri)
             file_path = urllib.parse.unquote(parsed_uri.path)
             url = None
-        case InterpretedPathOrUrl.URL:
+        case InterpretedPathOrUrl.URL | InterpretedPathOrUrl.DATA_URL:
+            # a data url carries its content, it's passed along like an online url
             file_path = None
             url = path_or_uri
         case InterpretedPathOrUrl.FILE_PATH:
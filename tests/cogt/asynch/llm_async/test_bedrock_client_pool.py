@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from pipelex.cogt.bedrock.bedrock_client_aioboto3 import BedrockClientAioboto3
+from pipelex.cogt.llm.token_category import TokenCategory
+
+
+class StandInBedrockRuntimeClient:
+    def __init__(self):
+        self.nb_opened = 0
+        self.nb_closed = 0
+
+    async def __aenter__(self) -> "StandInBedrockRuntimeClient":
+        self.nb_opened += 1
+        return self
+
+    async def __aexit__(self, *args: Any):
+        self.nb_closed += 1
+
+    async def converse(self, **params: Any) -> Dict[str, Any]:
+        return {
+            "usage": {"inputTokens": 5, "outputTokens": 2},
+            "output": {"message": {"content": [{"text": f"answer from {params['modelId']}"}]}},
+        }
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestBedrockClientPool:
+    async def test_client_is_opened_once_and_closed_on_close(self, monkeypatch: pytest.MonkeyPatch):
+        bedrock_client = BedrockClientAioboto3(aws_region="us-west-2", max_pool_connections=4)
+        stand_in_client = StandInBedrockRuntimeClient()
+
+        def make_stand_in_client(*args: Any, **kwargs: Any) -> StandInBedrockRuntimeClient:
+            return stand_in_client
+
+        monkeypatch.setattr(bedrock_client.session, "client", make_stand_in_client)
+
+        results = await asyncio.gather(
+            *[bedrock_client.chat(messages=[], system_text=None, model="claude", temperature=0.5) for _ in range(3)],
+        )
+        assert results[0] == ("answer from claude", {TokenCategory.INPUT: 5, TokenCategory.OUTPUT: 2})
+        assert stand_in_client.nb_opened == 1
+
+        # closing from within the running loop schedules the client's exit on that loop
+        bedrock_client.close()
+        await asyncio.sleep(0.01)
+        assert stand_in_client.nb_closed == 1
+
+        # the client reconnects on the next call
+        await bedrock_client.chat(messages=[], system_text=None, model="claude", temperature=0.5)
+        assert stand_in_client.nb_opened == 2
+
+
+class TestBedrockClientAcrossLoops:
+    def test_client_is_reopened_in_a_new_loop_without_driving_the_old_one(self, monkeypatch: pytest.MonkeyPatch):
+        bedrock_client = BedrockClientAioboto3(aws_region="us-west-2", max_pool_connections=4)
+        stand_in_clients: List[StandInBedrockRuntimeClient] = []
+
+        def make_stand_in_client(*args: Any, **kwargs: Any) -> StandInBedrockRuntimeClient:
+            stand_in_clients.append(StandInBedrockRuntimeClient())
+            return stand_in_clients[-1]
+
+        monkeypatch.setattr(bedrock_client.session, "client", make_stand_in_client)
+
+        async def chat() -> str:
+            answer, _ = await bedrock_client.chat(messages=[], system_text=None, model="claude", temperature=0.5)
+            return answer
+
+        # a loop which is stopped but not closed, as left by a caller driving its own loop
+        first_loop = asyncio.new_event_loop()
+        try:
+            assert first_loop.run_until_complete(chat()) == "answer from claude"
+            # the old loop can't be run from within the new running one: its client is dropped instead
+            assert asyncio.run(chat()) == "answer from claude"
+        finally:
+            first_loop.close()
+        assert [stand_in_client.nb_opened for stand_in_client in stand_in_clients] == [1, 1]
+        assert stand_in_clients[0].nb_closed == 0
+
+        # from outside any loop, a stopped loop is run to close its client
+        second_loop = asyncio.new_event_loop()
+        try:
+            second_loop.run_until_complete(chat())
+            bedrock_client.close()
+        finally:
+            second_loop.close()
+        assert stand_in_clients[-1].nb_closed == 1
@@ -0,0 +1,165 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, cast
+
+import openai
+import pytest
+from typing_extensions import override
+
+from pipelex.cogt.content_generation.llm_generate import gen_text_in_provider_batch
+from pipelex.cogt.exceptions import LLMBatchError
+from pipelex.cogt.llm.llm_batch_collector import LLMBatchCollector
+from pipelex.cogt.llm.token_category import TokenCategory
+from pipelex.cogt.openai.openai_batch_client import OpenAIBatchClient
+from tests.cogt.asynch.llm_async.test_llm_response_cache import CountingLLMWorker, make_llm_job
+
+
+class StandInBatchServer(ThreadingHTTPServer):
+    """Local stand-in for the files and batches endpoints of the OpenAI Batch API."""
+
+    def __init__(self, nb_polls_in_progress: int, failed_user_text: str):
+        super().__init__(("127.0.0.1", 0), StandInBatchHandler)
+        self.nb_polls_in_progress = nb_polls_in_progress
+        self.failed_user_text = failed_user_text
+        self.uploaded_requests: Dict[str, List[Dict[str, Any]]] = {}
+        self.batch_input_file_ids: Dict[str, str] = {}
+        self.nb_polls: Dict[str, int] = {}
+
+    def make_output_lines(self, batch_id: str) -> List[str]:
+        output_lines: List[str] = []
+        for request in self.uploaded_requests[self.batch_input_file_ids[batch_id]]:
+            user_text: str = request["body"]["messages"][-1]["content"][0]["text"]
+            response: Dict[str, Any]
+            if user_text == self.failed_user_text:
+                response = {"status_code": 400, "body": {"error": {"message": "invalid request"}}}
+            else:
+                response = {
+                    "status_code": 200,
+                    "body": {
+                        "choices": [{"message": {"role": "assistant", "content": f"batched answer to {user_text}"}}],
+                        "usage": {"prompt_tokens": 7, "completion_tokens": 3},
+                    },
+                }
+            output_lines.append(json.dumps({"custom_id": request["custom_id"], "response": response}))
+        return output_lines
+
+
+class StandInBatchHandler(BaseHTTPRequestHandler):
+    @property
+    def stand_in_server(self) -> StandInBatchServer:
+        return cast(StandInBatchServer, self.server)
+
+    @override
+    def log_message(self, format: str, *args: Any):
+        pass
+
+    def _send_json(self, payload: Dict[str, Any]):
+        self._send_bytes(body=json.dumps(payload).encode("utf-8"), content_type="application/json")
+
+    def _send_bytes(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _make_batch_dict(self, batch_id: str) -> Dict[str, Any]:
+        nb_polls = self.stand_in_server.nb_polls.get(batch_id, 0)
+        is_completed = nb_polls > self.stand_in_server.nb_polls_in_progress
+        return {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": self.stand_in_server.batch_input_file_ids[batch_id],
+            "completion_window": "24h",
+            "status": "completed" if is_completed else "in_progress",
+            "output_file_id": f"output-{batch_id}" if is_completed else None,
+            "created_at": 0,
+        }
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+        if self.path == "/v1/files":
+            # the multipart body holds the JSONL file, one request per line
+            file_id = f"file-{len(self.stand_in_server.uploaded_requests)}"
+            self.stand_in_server.uploaded_requests[file_id] = [json.loads(line) for line in body.splitlines() if line.startswith('{"custom_id"')]
+            self._send_json({"id": file_id, "object": "file", "bytes": len(body), "created_at": 0, "filename": "batch", "purpose": "batch"})
+        elif self.path == "/v1/batches":
+            batch_id = f"batch-{len(self.stand_in_server.batch_input_file_ids)}"
+            self.stand_in_server.batch_input_file_ids[batch_id] = json.loads(body)["input_file_id"]
+            self._send_json(self._make_batch_dict(batch_id=batch_id))
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        path_parts = self.path.strip("/").split("/")
+        if path_parts[:2] == ["v1", "batches"]:
+            batch_id = path_parts[2]
+            self.stand_in_server.nb_polls[batch_id] = self.stand_in_server.nb_polls.get(batch_id, 0) + 1
+            self._send_json(self._make_batch_dict(batch_id=batch_id))
+        elif path_parts[:2] == ["v1", "files"] and path_parts[-1] == "content":
+            batch_id = path_parts[2].removeprefix("output-")
+            output_lines = self.stand_in_server.make_output_lines(batch_id=batch_id)
+            self._send_bytes(body="\n".join(output_lines).encode("utf-8"), content_type="application/octet-stream")
+        else:
+            self.send_error(404)
+
+
+@pytest.fixture
+def stand_in_batch_server() -> Iterator[StandInBatchServer]:
+    server = StandInBatchServer(nb_polls_in_progress=2, failed_user_text="Fail")
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_llm_batch_collector(server: StandInBatchServer) -> LLMBatchCollector:
+    openai_client = openai.AsyncOpenAI(api_key="test", base_url=f"http://127.0.0.1:{server.server_address[1]}/v1")
+    return LLMBatchCollector(
+        llm_batch_client=OpenAIBatchClient(openai_client=openai_client),
+        collect_window_seconds=0.05,
+        poll_interval_seconds=0.01,
+        max_wait_seconds=5,
+    )
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestLLMBatch:
+    async def test_concurrent_jobs_run_as_one_provider_batch(self, stand_in_batch_server: StandInBatchServer):
+        llm_worker = CountingLLMWorker()
+        llm_batch_collector = make_llm_batch_collector(server=stand_in_batch_server)
+        llm_jobs = [make_llm_job(user_text) for user_text in ("Alan", "Ada", "Grace")]
+        generated_texts = await asyncio.gather(
+            *[gen_text_in_provider_batch(llm_worker=llm_worker, llm_batch_collector=llm_batch_collector, llm_job=llm_job) for llm_job in llm_jobs]
+        )
+
+        assert generated_texts == ["batched answer to Alan", "batched answer to Ada", "batched answer to Grace"]
+        assert llm_batch_collector.nb_batches_submitted == 1
+        # polled twice while in progress, once completed, then retrieved once more to download the results
+        assert stand_in_batch_server.nb_polls["batch-0"] == 4
+        assert llm_worker.nb_calls == 0
+        llm_tokens_usage = llm_jobs[0].job_report.llm_tokens_usage
+        assert llm_tokens_usage is not None
+        assert llm_tokens_usage.is_provider_batch
+        assert llm_tokens_usage.nb_tokens_by_category[TokenCategory.OUTPUT] == 3
+
+    async def test_failed_request_only_fails_its_own_job(self, stand_in_batch_server: StandInBatchServer):
+        llm_worker = CountingLLMWorker()
+        llm_batch_collector = make_llm_batch_collector(server=stand_in_batch_server)
+        results = await asyncio.gather(
+            gen_text_in_provider_batch(llm_worker=llm_worker, llm_batch_collector=llm_batch_collector, llm_job=make_llm_job("Alan")),
+            gen_text_in_provider_batch(llm_worker=llm_worker, llm_batch_collector=llm_batch_collector, llm_job=make_llm_job("Fail")),
+            return_exceptions=True,
+        )
+
+        assert results[0] == "batched answer to Alan"
+        assert isinstance(results[1], LLMBatchError)
+        assert llm_batch_collector.nb_batches_submitted == 1
@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import pytest
+
+from pipelex.cogt.exceptions import LLMContextWindowError
+from pipelex.cogt.image.prompt_image import PromptImagePath
+from pipelex.cogt.llm.llm_models.llm_family import LLMFamily
+from pipelex.cogt.llm.llm_rate_limiter import estimate_llm_job_nb_tokens
+from pipelex.cogt.llm.llm_token_estimator import NB_TOKENS_PER_IMAGE_ESTIMATE, LLMTokenEstimator
+from tests.cogt.asynch.llm_async.test_llm_response_cache import CountingLLMWorker, make_llm_job
+
+EIFFEL_TOWER_IMAGE_PATH = "tests/data/images/eiffel_tower.png"  # 1024x768
+
+
+def make_llm_worker_with_context_window(context_window: int) -> CountingLLMWorker:
+    llm_worker = CountingLLMWorker()
+    # the llm model is shared by the engines made from the library, so we change a copy of it
+    llm_worker.llm_engine = llm_worker.llm_engine.model_copy(deep=True)
+    llm_worker.llm_engine.llm_model.context_window = context_window
+    llm_worker.llm_engine.llm_model.max_tokens = 1000
+    return llm_worker
+
+
+class TestLLMTokenEstimator:
+    def test_text_estimate_falls_back_to_chars_heuristic(self):
+        assert LLMTokenEstimator.estimate_text_nb_tokens(text="x" * 400, llm_family=LLMFamily.GEMINI) == 100
+
+    def test_image_estimate_depends_on_the_family(self):
+        prompt_image = PromptImagePath(file_path=EIFFEL_TOWER_IMAGE_PATH)
+        # 4 tiles of 512px
+        assert LLMTokenEstimator.estimate_image_nb_tokens(prompt_image=prompt_image, llm_family=LLMFamily.GPT_4O) == 85 + 170 * 4
+        assert LLMTokenEstimator.estimate_image_nb_tokens(prompt_image=prompt_image, llm_family=LLMFamily.CLAUDE_3_5) == 1049
+        assert LLMTokenEstimator.estimate_image_nb_tokens(prompt_image=prompt_image, llm_family=LLMFamily.GEMINI) == NB_TOKENS_PER_IMAGE_ESTIMATE
+
+    def test_unreadable_image_falls_back_to_heuristic(self):
+        prompt_image = PromptImagePath(file_path="tests/data/images/missing.png")
+        assert LLMTokenEstimator.estimate_image_nb_tokens(prompt_image=prompt_image, llm_family=LLMFamily.GPT_4O) == NB_TOKENS_PER_IMAGE_ESTIMATE
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestLLMContextWindowGuard:
+    async def test_prompt_over_the_context_window_is_rejected_before_sending(self):
+        llm_worker = make_llm_worker_with_context_window(context_window=100)
+        with pytest.raises(LLMContextWindowError):
+            await llm_worker.gen_text(llm_job=make_llm_job("word " * 1000))
+        assert llm_worker.nb_calls == 0
+
+    async def test_max_tokens_is_trimmed_to_what_the_prompt_leaves(self):
+        llm_worker = make_llm_worker_with_context_window(context_window=500)
+        llm_job = make_llm_job("x" * 1600)
+        await llm_worker.gen_text(llm_job=llm_job)
+
+        assert llm_worker.nb_calls == 1
+        nb_tokens_input_estimate = llm_job.job_report.nb_tokens_input_estimate
+        assert nb_tokens_input_estimate is not None
+        assert llm_job.job_params.max_tokens == 500 - nb_tokens_input_estimate
+        assert llm_job.job_report.cost_estimate_usd is not None
+        # the rate limiter reserves the pre-flight estimate rather than its own heuristic
+        assert estimate_llm_job_nb_tokens(llm_job=llm_job) == 500
+
+    async def test_guard_can_be_disabled(self):
+        llm_worker = make_llm_worker_with_context_window(context_window=100)
+        llm_job = make_llm_job("word " * 1000)
+        llm_job.job_config.is_context_window_guard_enabled = False
+        await llm_worker.gen_text(llm_job=llm_job)
+        assert llm_worker.nb_calls == 1
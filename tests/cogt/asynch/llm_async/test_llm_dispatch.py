@@ -0,0 +1,141 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+import time
+from typing import List, Optional
+
+import pytest
+from typing_extensions import override
+
+from pipelex.cogt.exceptions import LLMCompletionError
+from pipelex.cogt.llm.llm_dispatch import compute_retry_delay, dispatch_llm_job
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_job_func import llm_job_func
+from pipelex.cogt.llm.llm_models.llm_engine import LLMEngine
+from pipelex.cogt.llm.llm_models.llm_platform import LLMPlatform
+from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
+from pipelex.config import get_config
+from pipelex.hub import get_inference_manager
+from tests.cogt.asynch.llm_async.test_llm_response_cache import CountingLLMWorker, make_llm_job
+
+
+class TransientError(Exception):
+    pass
+
+
+class ScriptedLLMWorker(CountingLLMWorker):
+    def __init__(
+        self,
+        answer: str,
+        delay_seconds: float = 0,
+        nb_transient_errors: int = 0,
+        llm_platform: Optional[LLMPlatform] = None,
+        retry_after_seconds: Optional[float] = None,
+    ):
+        super().__init__()
+        if llm_platform:
+            self.llm_engine = LLMEngine(llm_platform=llm_platform, llm_model=self.llm_engine.llm_model)
+        self.answer = answer
+        self.delay_seconds = delay_seconds
+        self.nb_transient_errors = nb_transient_errors
+        self.retry_after_seconds = retry_after_seconds
+
+    @override
+    def is_transient_error(self, exc: BaseException) -> bool:
+        return isinstance(exc, TransientError)
+
+    @override
+    def get_retry_after_seconds(self, exc: BaseException) -> Optional[float]:
+        return self.retry_after_seconds if isinstance(exc, TransientError) else None
+
+    @override
+    @llm_job_func
+    async def gen_text(self, llm_job: LLMJob) -> str:
+        self.nb_calls += 1
+        if self.nb_calls <= self.nb_transient_errors:
+            raise LLMCompletionError("wrapped SDK error") from TransientError("503")
+        await asyncio.sleep(self.delay_seconds)
+        return self.answer
+
+
+def use_llm_workers(monkeypatch: pytest.MonkeyPatch, llm_workers: List[LLMWorkerAbstract]):
+    def get_llm_worker(llm_handle: str) -> LLMWorkerAbstract:
+        return llm_workers[0]
+
+    def get_alternate_llm_workers(llm_handle: str) -> List[LLMWorkerAbstract]:
+        return llm_workers[1:]
+
+    def compute_no_retry_delay(attempt_index: int, base_delay_seconds: float, max_delay_seconds: float) -> float:
+        return 0
+
+    inference_manager = get_inference_manager()
+    monkeypatch.setattr(inference_manager, "get_llm_worker", get_llm_worker)
+    monkeypatch.setattr(inference_manager, "get_alternate_llm_workers", get_alternate_llm_workers)
+    monkeypatch.setattr("pipelex.cogt.llm.llm_dispatch.compute_retry_delay", compute_no_retry_delay)
+
+
+def test_compute_retry_delay():
+    for attempt_index in range(10):
+        assert 0 <= compute_retry_delay(attempt_index=attempt_index, base_delay_seconds=1, max_delay_seconds=8) <= min(8, 2**attempt_index)
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestLLMDispatch:
+    async def test_transient_errors_are_retried_on_alternate_platforms(self, monkeypatch: pytest.MonkeyPatch):
+        primary_llm_worker = ScriptedLLMWorker(answer="primary", nb_transient_errors=10)
+        alternate_llm_worker = ScriptedLLMWorker(answer="alternate")
+        use_llm_workers(monkeypatch=monkeypatch, llm_workers=[primary_llm_worker, alternate_llm_worker])
+
+        answer = await dispatch_llm_job(
+            llm_handle="gpt-4o-mini",
+            llm_job=make_llm_job("Retry"),
+            call=lambda llm_worker, llm_job: llm_worker.gen_text(llm_job=llm_job),
+        )
+        assert answer == "alternate"
+        assert primary_llm_worker.nb_calls == 1
+
+    async def test_retries_are_bounded(self, monkeypatch: pytest.MonkeyPatch):
+        llm_worker = ScriptedLLMWorker(answer="never", nb_transient_errors=100)
+        use_llm_workers(monkeypatch=monkeypatch, llm_workers=[llm_worker])
+
+        with pytest.raises(LLMCompletionError):
+            await dispatch_llm_job(
+                llm_handle="gpt-4o-mini",
+                llm_job=make_llm_job("Retry"),
+                call=lambda llm_worker, llm_job: llm_worker.gen_text(llm_job=llm_job),
+            )
+        assert llm_worker.nb_calls == get_config().cogt.llm_config.llm_dispatch_config.max_retries + 1
+
+    async def test_slow_job_is_hedged_on_alternate_platform(self, monkeypatch: pytest.MonkeyPatch):
+        primary_llm_worker = ScriptedLLMWorker(answer="primary", delay_seconds=2)
+        alternate_llm_worker = ScriptedLLMWorker(answer="alternate")
+        use_llm_workers(monkeypatch=monkeypatch, llm_workers=[primary_llm_worker, alternate_llm_worker])
+        monkeypatch.setattr(get_config().cogt.llm_config.llm_dispatch_config, "is_hedging_enabled", True)
+        latency_tracker = get_inference_manager().get_llm_latency_tracker(llm_engine=primary_llm_worker.llm_engine)
+        for _ in range(get_config().cogt.llm_config.llm_dispatch_config.hedging_min_nb_samples):
+            latency_tracker.record(latency_seconds=0.05)
+
+        started_at = time.perf_counter()
+        answer = await dispatch_llm_job(
+            llm_handle="gpt-4o-mini",
+            llm_job=make_llm_job("Hedge"),
+            call=lambda llm_worker, llm_job: llm_worker.gen_text(llm_job=llm_job),
+        )
+        assert answer == "alternate"
+        assert time.perf_counter() - started_at < 1
+
+    async def test_retry_after_is_honoured_on_the_same_platform(self, monkeypatch: pytest.MonkeyPatch):
+        llm_worker = ScriptedLLMWorker(answer="later", nb_transient_errors=1, retry_after_seconds=0.3)
+        use_llm_workers(monkeypatch=monkeypatch, llm_workers=[llm_worker])
+
+        started_at = time.perf_counter()
+        answer = await dispatch_llm_job(
+            llm_handle="gpt-4o-mini",
+            llm_job=make_llm_job("Retry after"),
+            call=lambda llm_worker, llm_job: llm_worker.gen_text(llm_job=llm_job),
+        )
+        assert answer == "later"
+        assert llm_worker.nb_calls == 2
+        assert time.perf_counter() - started_at >= 0.3
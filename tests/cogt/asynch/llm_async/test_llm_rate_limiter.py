@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+
+import pytest
+from typing_extensions import override
+
+from pipelex.cogt.exceptions import LLMWorkerError
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_job_components import LLMJobParams
+from pipelex.cogt.llm.llm_job_factory import LLMJobFactory
+from pipelex.cogt.llm.llm_job_func import llm_job_func
+from pipelex.cogt.llm.llm_models.llm_engine_factory import LLMEngineFactory
+from pipelex.cogt.llm.llm_models.llm_rate_limits import LLMRateLimits
+from pipelex.cogt.llm.llm_prompt import LLMPrompt
+from pipelex.cogt.llm.llm_rate_limiter import LLMRateLimiter, estimate_llm_job_nb_tokens
+from pipelex.cogt.llm.token_category import TokenCategory
+from pipelex.config import get_config
+from pipelex.hub import get_inference_manager, get_llm_deck
+from tests.cogt.asynch.llm_async.test_llm_response_cache import CountingLLMWorker, make_llm_job
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestLLMRateLimiter:
+    async def test_reserve_and_reconcile(self):
+        llm_rate_limiter = LLMRateLimiter(rate_limits=LLMRateLimits(requests_per_minute=60, tokens_per_minute=1000))
+        assert llm_rate_limiter.request_bucket and llm_rate_limiter.token_bucket
+
+        assert await llm_rate_limiter.reserve(nb_tokens=500) == 500
+        assert abs(llm_rate_limiter.token_bucket.level - 500) <= 1
+
+        # the job actually used fewer tokens than reserved: the difference is given back
+        llm_rate_limiter.reconcile(nb_tokens_reserved=500, nb_tokens_by_category={TokenCategory.INPUT: 100, TokenCategory.OUTPUT: 50})
+        assert abs(llm_rate_limiter.token_bucket.level - 850) <= 1
+
+    async def test_reservation_above_capacity_is_reconciled_against_what_was_debited(self):
+        llm_rate_limiter = LLMRateLimiter(rate_limits=LLMRateLimits(tokens_per_minute=1000))
+        assert llm_rate_limiter.token_bucket
+        nb_tokens_reserved = await llm_rate_limiter.reserve(nb_tokens=5000)
+        assert nb_tokens_reserved == 1000
+
+        # the job used 300 tokens out of the 1000 debited: 700 are given back, not 4700
+        llm_rate_limiter.reconcile(nb_tokens_reserved=nb_tokens_reserved, nb_tokens_by_category={TokenCategory.INPUT: 200, TokenCategory.OUTPUT: 100})
+        assert abs(llm_rate_limiter.token_bucket.level - 700) <= 1
+
+    async def test_cancelled_reservation_is_given_back(self):
+        llm_rate_limiter = LLMRateLimiter(rate_limits=LLMRateLimits(requests_per_minute=60, tokens_per_minute=1000))
+        assert llm_rate_limiter.request_bucket and llm_rate_limiter.token_bucket
+        await llm_rate_limiter.reserve(nb_tokens=800)
+
+        # the job is cancelled while it waits for tokens, as a sibling of a failed branch would be
+        reservation = asyncio.create_task(llm_rate_limiter.reserve(nb_tokens=500))
+        await asyncio.sleep(0.01)
+        reservation.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await reservation
+        assert abs(llm_rate_limiter.token_bucket.level - 200) <= 1
+        assert abs(llm_rate_limiter.request_bucket.level - 59) <= 0.1
+
+    async def test_estimate_includes_max_tokens(self):
+        llm_job = LLMJobFactory.make_llm_job(
+            llm_prompt=LLMPrompt(system_text="a" * 40, user_text="b" * 400),
+            llm_job_params=LLMJobParams(temperature=0.5, max_tokens=200, seed=None),
+        )
+        assert estimate_llm_job_nb_tokens(llm_job=llm_job) == 110 + 200
+
+    async def test_limiter_is_shared_per_model_and_platform(self):
+        llm_engine_blueprint = get_llm_deck().get_llm_engine_blueprint(llm_handle="gpt-4o-mini")
+        llm_engine = LLMEngineFactory.make_llm_engine(llm_engine_blueprint=llm_engine_blueprint)
+        llm_engine.llm_model.rate_limits[llm_engine.llm_platform] = LLMRateLimits(requests_per_minute=100)
+        try:
+            llm_rate_limiter = get_inference_manager().get_llm_rate_limiter(llm_engine=llm_engine)
+            assert llm_rate_limiter is not None
+            assert llm_rate_limiter.token_bucket is None
+            assert get_inference_manager().get_llm_rate_limiter(llm_engine=llm_engine) is llm_rate_limiter
+        finally:
+            llm_engine.llm_model.rate_limits.pop(llm_engine.llm_platform)
+
+
+class ThrottledError(Exception):
+    pass
+
+
+class ThrottledLLMWorker(CountingLLMWorker):
+    def __init__(self):
+        super().__init__()
+        self.is_throttled = True
+
+    @override
+    def is_throttling_error(self, exc: BaseException) -> bool:
+        return isinstance(exc, ThrottledError)
+
+    @override
+    @llm_job_func
+    async def gen_text(self, llm_job: LLMJob) -> str:
+        self.nb_calls += 1
+        if self.is_throttled:
+            raise LLMWorkerError("wrapped SDK error") from ThrottledError("429")
+        return "answer"
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestLLMConcurrencyLimiter:
+    async def test_limiter_is_disabled_by_default(self):
+        llm_worker = ThrottledLLMWorker()
+        assert get_inference_manager().get_llm_concurrency_limiter(llm_engine=llm_worker.llm_engine) is None
+
+    async def test_throttling_lowers_the_concurrency_ceiling(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(get_config().cogt.llm_config.llm_concurrency_config, "is_enabled", True)
+        llm_worker = ThrottledLLMWorker()
+        llm_concurrency_limiter = get_inference_manager().get_llm_concurrency_limiter(llm_engine=llm_worker.llm_engine)
+        assert llm_concurrency_limiter is not None
+        initial_ceiling = llm_concurrency_limiter.ceiling
+
+        with pytest.raises(LLMWorkerError):
+            await llm_worker.gen_text(llm_job=make_llm_job("Hello"))
+        assert llm_concurrency_limiter.ceiling < initial_ceiling
+        throttled_ceiling = llm_concurrency_limiter.ceiling
+
+        llm_worker.is_throttled = False
+        await llm_worker.gen_text(llm_job=make_llm_job("Hello"))
+        assert llm_concurrency_limiter.ceiling > throttled_ceiling
+
+        metrics = next(metrics for metrics in get_inference_manager().get_llm_concurrency_metrics() if metrics.llm_id == llm_worker.llm_engine.llm_id)
+        assert metrics.concurrency_ceiling == llm_concurrency_limiter.ceiling
+        assert metrics.nb_throttled >= 1
+        assert metrics.nb_in_flight == 0
@@ -0,0 +1,157 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+import os
+from typing import Type
+
+import pytest
+from typing_extensions import override
+
+from pipelex.cogt.image.prompt_image import PromptImageBytes, PromptImagePath
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_job_components import LLMJobParams
+from pipelex.cogt.llm.llm_job_factory import LLMJobFactory
+from pipelex.cogt.llm.llm_job_func import llm_job_func
+from pipelex.cogt.llm.llm_models.llm_engine_factory import LLMEngineFactory
+from pipelex.cogt.llm.llm_prompt import LLMPrompt
+from pipelex.cogt.llm.llm_response_cache import MemoryLLMResponseCache, SQLiteLLMResponseCache, make_llm_response_cache_key_async
+from pipelex.cogt.llm.llm_response_cache_abstract import LLMResponseCacheAbstract
+from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
+from pipelex.config import get_config
+from pipelex.hub import get_llm_deck, get_pipelex_hub
+from pipelex.tools.misc.base_64 import load_binary_as_base64
+from pipelex.tools.misc.model_helpers import BaseModelType
+from tests.cogt.test_data import Person, Pet
+
+
+class CountingLLMWorker(LLMWorkerAbstract):
+    def __init__(self):
+        llm_engine_blueprint = get_llm_deck().get_llm_engine_blueprint(llm_handle="gpt-4o-mini")
+        super().__init__(llm_engine=LLMEngineFactory.make_llm_engine(llm_engine_blueprint=llm_engine_blueprint), structure_method=None)
+        self.nb_calls: int = 0
+
+    @override
+    @llm_job_func
+    async def gen_text(self, llm_job: LLMJob) -> str:
+        self.nb_calls += 1
+        return f"answer to {llm_job.llm_prompt.user_text}"
+
+    @override
+    @llm_job_func
+    async def gen_object(self, llm_job: LLMJob, schema: Type[BaseModelType]) -> BaseModelType:
+        self.nb_calls += 1
+        await asyncio.sleep(0.01)
+        return schema.model_validate({"name": "Alan", "age": 41})
+
+
+def make_llm_job(user_text: str, temperature: float = 0.5, is_single_flight_enabled: bool = False) -> LLMJob:
+    llm_job_config = get_config().cogt.llm_config.llm_job_config.model_copy(update={"is_single_flight_enabled": is_single_flight_enabled})
+    return LLMJobFactory.make_llm_job(
+        llm_prompt=LLMPrompt(user_text=user_text),
+        llm_job_params=LLMJobParams(temperature=temperature, max_tokens=None, seed=None),
+        llm_job_config=llm_job_config,
+    )
+
+
+def make_llm_response_cache(store_type: str, directory_path: str) -> LLMResponseCacheAbstract:
+    if store_type == "memory":
+        return MemoryLLMResponseCache(max_nb_entries=2)
+    return SQLiteLLMResponseCache(sqlite_path=os.path.join(directory_path, "llm_responses.sqlite"), max_nb_entries=2)
+
+
+@pytest.mark.parametrize("store_type", ["memory", "sqlite"])
+def test_llm_response_cache_lru_eviction(store_type: str, tmp_path: str):
+    llm_response_cache = make_llm_response_cache(store_type=store_type, directory_path=str(tmp_path))
+    llm_response_cache.setup()
+    llm_response_cache.set_response(cache_key="a", response="response a")
+    llm_response_cache.set_response(cache_key="b", response="response b")
+    assert llm_response_cache.get_response(cache_key="a") == "response a"
+    llm_response_cache.set_response(cache_key="c", response="response c")
+
+    # "b" was the least recently used one
+    assert llm_response_cache.get_response(cache_key="b") is None
+    assert llm_response_cache.get_response(cache_key="a") == "response a"
+    assert llm_response_cache.get_response(cache_key="c") == "response c"
+    llm_response_cache.teardown()
+
+
+def test_llm_response_cache_ttl(monkeypatch: pytest.MonkeyPatch):
+    llm_response_cache = MemoryLLMResponseCache(max_nb_entries=10, ttl_seconds=60)
+    monkeypatch.setattr("pipelex.cogt.llm.llm_response_cache.time.time", lambda: 1000.0)
+    llm_response_cache.set_response(cache_key="a", response="response a")
+    monkeypatch.setattr("pipelex.cogt.llm.llm_response_cache.time.time", lambda: 1030.0)
+    assert llm_response_cache.get_response(cache_key="a") == "response a"
+    monkeypatch.setattr("pipelex.cogt.llm.llm_response_cache.time.time", lambda: 1061.0)
+    assert llm_response_cache.get_response(cache_key="a") is None
+
+
+@pytest.mark.asyncio
+async def test_llm_response_cache_key():
+    cache_key = await make_llm_response_cache_key_async(func_name="gen_object", llm_job=make_llm_job("Hello"), llm_id="model", schema=Person)
+    assert cache_key == await make_llm_response_cache_key_async(func_name="gen_object", llm_job=make_llm_job("Hello"), llm_id="model", schema=Person)
+    assert cache_key != await make_llm_response_cache_key_async(func_name="gen_object", llm_job=make_llm_job("Hello"), llm_id="model", schema=Pet)
+    assert cache_key != await make_llm_response_cache_key_async(
+        func_name="gen_object", llm_job=make_llm_job("Hello"), llm_id="other_model", schema=Person
+    )
+    assert cache_key != await make_llm_response_cache_key_async(
+        func_name="gen_object", llm_job=make_llm_job("Hello", temperature=0.1), llm_id="model", schema=Person
+    )
+
+
+@pytest.mark.asyncio
+async def test_llm_response_cache_key_hashes_image_contents():
+    image_path = "tests/data/images/gantt_tree_house.png"
+    llm_job_params = LLMJobParams(temperature=0.5, max_tokens=None, seed=None)
+    path_llm_job = LLMJobFactory.make_llm_job(
+        llm_prompt=LLMPrompt(user_text="Describe", user_images=[PromptImagePath(file_path=image_path)]),
+        llm_job_params=llm_job_params,
+    )
+    bytes_llm_job = LLMJobFactory.make_llm_job(
+        llm_prompt=LLMPrompt(user_text="Describe", user_images=[PromptImageBytes(b64_image_bytes=load_binary_as_base64(image_path))]),
+        llm_job_params=llm_job_params,
+    )
+    # the same image gets the same digest, whether it is read from disk, held by the prompt image cache or given as bytes
+    path_cache_key = await make_llm_response_cache_key_async(func_name="gen_text", llm_job=path_llm_job, llm_id="model")
+    assert path_cache_key == await make_llm_response_cache_key_async(func_name="gen_text", llm_job=path_llm_job, llm_id="model")
+    assert path_cache_key == await make_llm_response_cache_key_async(func_name="gen_text", llm_job=bytes_llm_job, llm_id="model")
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestLLMResponseCacheInWorker:
+    async def test_cache_hit_is_reported_as_zero_cost_job(self):
+        get_pipelex_hub().set_llm_response_cache(llm_response_cache=MemoryLLMResponseCache(max_nb_entries=10))
+        try:
+            llm_worker = CountingLLMWorker()
+            first_text = await llm_worker.gen_text(llm_job=make_llm_job("Hello"))
+            llm_job = make_llm_job("Hello")
+            second_text = await llm_worker.gen_text(llm_job=llm_job)
+            first_person = await llm_worker.gen_object(llm_job=make_llm_job("Hello"), schema=Person)
+            second_person = await llm_worker.gen_object(llm_job=make_llm_job("Hello"), schema=Person)
+        finally:
+            get_pipelex_hub().set_llm_response_cache(llm_response_cache=None)
+
+        assert first_text == second_text
+        assert first_person == second_person
+        assert llm_worker.nb_calls == 2
+        llm_tokens_usage = llm_job.job_report.llm_tokens_usage
+        assert llm_tokens_usage is not None
+        assert llm_tokens_usage.is_cache_hit
+        assert sum(llm_tokens_usage.compute_cost_report().costs_by_token_category.values()) == 0
+
+    async def test_identical_jobs_in_flight_share_one_call(self):
+        llm_worker = CountingLLMWorker()
+        llm_jobs = [make_llm_job("Hello", is_single_flight_enabled=True) for _ in range(3)]
+        persons = await asyncio.gather(*[llm_worker.gen_object(llm_job=llm_job, schema=Person) for llm_job in llm_jobs])
+
+        assert llm_worker.nb_calls == 1
+        assert persons[0] == persons[1] == persons[2]
+        assert persons[0] is not persons[1]
+        assert sum(1 for llm_job in llm_jobs if llm_job.job_report.llm_tokens_usage and llm_job.job_report.llm_tokens_usage.is_cache_hit) == 2
+
+    async def test_identical_jobs_are_not_shared_by_default(self):
+        llm_worker = CountingLLMWorker()
+        llm_jobs = [make_llm_job("Hello") for _ in range(3)]
+        await asyncio.gather(*[llm_worker.gen_object(llm_job=llm_job, schema=Person) for llm_job in llm_jobs])
+        assert llm_worker.nb_calls == 3
@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from typing import List, Optional
+
+import pytest
+
+from pipelex.cogt.llm.llm_dispatch import dispatch_llm_job
+from pipelex.cogt.llm.llm_models.llm_platform import LLMPlatform
+from pipelex.cogt.llm.llm_router import LLMRouter
+from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerAbstract
+from pipelex.hub import get_inference_manager
+from pipelex.tools.misc.circuit_breaker import CircuitBreakerState
+from tests.cogt.asynch.llm_async.test_llm_dispatch import ScriptedLLMWorker, use_llm_workers
+from tests.cogt.asynch.llm_async.test_llm_response_cache import make_llm_job
+
+LLM_HANDLE = "gpt-4o-mini"
+
+
+def make_llm_router() -> LLMRouter:
+    return LLMRouter(min_nb_samples=3, window_size=10, exploration_rate=0, failure_threshold=2, cool_down_seconds=60)
+
+
+def use_llm_router(monkeypatch: pytest.MonkeyPatch, llm_router: LLMRouter):
+    def get_llm_router() -> Optional[LLMRouter]:
+        return llm_router
+
+    monkeypatch.setattr(get_inference_manager(), "get_llm_router", get_llm_router)
+
+
+class TestLLMRouter:
+    def test_rank_by_latency_and_errors(self):
+        llm_router = make_llm_router()
+        openai_llm_worker = ScriptedLLMWorker(answer="openai", llm_platform=LLMPlatform.OPENAI)
+        azure_llm_worker = ScriptedLLMWorker(answer="azure", llm_platform=LLMPlatform.AZURE_OPENAI)
+        llm_workers: List[LLMWorkerAbstract] = [openai_llm_worker, azure_llm_worker]
+
+        # without enough samples, the llm handle's own worker comes first
+        assert llm_router.rank_llm_workers(llm_handle=LLM_HANDLE, llm_workers=llm_workers) == llm_workers
+
+        openai_health = llm_router.get_platform_health(llm_handle=LLM_HANDLE, llm_platform=LLMPlatform.OPENAI)
+        azure_health = llm_router.get_platform_health(llm_handle=LLM_HANDLE, llm_platform=LLMPlatform.AZURE_OPENAI)
+        for _ in range(3):
+            openai_health.record_success(latency_seconds=1.5)
+            azure_health.record_success(latency_seconds=1)
+        assert llm_router.rank_llm_workers(llm_handle=LLM_HANDLE, llm_workers=llm_workers) == [azure_llm_worker, openai_llm_worker]
+
+        # errors make azure's expected latency worse than openai's
+        azure_health.record_failure()
+        azure_health.record_success(latency_seconds=1)
+        azure_health.record_failure()
+        azure_health.record_success(latency_seconds=1)
+        azure_health.record_failure()
+        assert llm_router.rank_llm_workers(llm_handle=LLM_HANDLE, llm_workers=llm_workers) == [openai_llm_worker, azure_llm_worker]
+
+    def test_open_circuit_is_out_of_rotation(self):
+        llm_router = make_llm_router()
+        openai_llm_worker = ScriptedLLMWorker(answer="openai", llm_platform=LLMPlatform.OPENAI)
+        azure_llm_worker = ScriptedLLMWorker(answer="azure", llm_platform=LLMPlatform.AZURE_OPENAI)
+        openai_health = llm_router.get_platform_health(llm_handle=LLM_HANDLE, llm_platform=LLMPlatform.OPENAI)
+        openai_health.record_failure()
+        openai_health.record_failure()
+        assert openai_health.circuit_breaker.state == CircuitBreakerState.OPEN
+        assert llm_router.rank_llm_workers(llm_handle=LLM_HANDLE, llm_workers=[openai_llm_worker, azure_llm_worker]) == [azure_llm_worker]
+
+        metrics = {metrics.llm_platform: metrics for metrics in llm_router.get_health_metrics()}
+        assert metrics[LLMPlatform.OPENAI].error_rate == 1
+        assert metrics[LLMPlatform.OPENAI].circuit_breaker_state == CircuitBreakerState.OPEN
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestLLMRouterInDispatch:
+    async def test_failing_platform_is_taken_out_of_rotation(self, monkeypatch: pytest.MonkeyPatch):
+        llm_router = make_llm_router()
+        use_llm_router(monkeypatch=monkeypatch, llm_router=llm_router)
+        openai_llm_worker = ScriptedLLMWorker(answer="openai", nb_transient_errors=100, llm_platform=LLMPlatform.OPENAI)
+        azure_llm_worker = ScriptedLLMWorker(answer="azure", llm_platform=LLMPlatform.AZURE_OPENAI)
+        use_llm_workers(monkeypatch=monkeypatch, llm_workers=[openai_llm_worker, azure_llm_worker])
+
+        for _ in range(3):
+            answer = await dispatch_llm_job(
+                llm_handle=LLM_HANDLE,
+                llm_job=make_llm_job("Route"),
+                call=lambda llm_worker, llm_job: llm_worker.gen_text(llm_job=llm_job),
+            )
+            assert answer == "azure"
+        # openai failed twice, which opened its circuit, so the third job went straight to azure
+        assert openai_llm_worker.nb_calls == 2
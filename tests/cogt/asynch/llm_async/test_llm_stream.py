@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from typing import AsyncIterator, List, Optional, Type
+
+import pytest
+from pydantic import BaseModel
+from typing_extensions import override
+
+from pipelex.cogt.content_generation.llm_generate import gen_object_list_into_sink, gen_text_into_sink
+from pipelex.cogt.exceptions import LLMCompletionError, LLMStreamInterruptedError
+from pipelex.cogt.llm.llm_dispatch import dispatch_llm_job
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_job_func import llm_job_stream_func
+from pipelex.cogt.llm.llm_response_cache import MemoryLLMResponseCache
+from pipelex.cogt.llm.token_category import TokenCategory
+from pipelex.hub import get_pipelex_hub
+from pipelex.tools.misc.model_helpers import BaseModelType
+from tests.cogt.asynch.llm_async.test_llm_dispatch import ScriptedLLMWorker, TransientError, use_llm_workers
+from tests.cogt.asynch.llm_async.test_llm_response_cache import make_llm_job
+from tests.cogt.test_data import Person
+
+
+class StreamingLLMWorker(ScriptedLLMWorker):
+    def __init__(self, text_chunks: List[str], nb_chunks_before_error: Optional[int] = None):
+        super().__init__(answer="".join(text_chunks))
+        self.text_chunks = text_chunks
+        self.nb_chunks_before_error = nb_chunks_before_error
+        self.events: List[str] = []
+
+    @property
+    @override
+    def is_text_streaming_supported(self) -> bool:
+        return True
+
+    @override
+    @llm_job_stream_func
+    async def gen_text_stream(self, llm_job: LLMJob) -> AsyncIterator[str]:
+        self.nb_calls += 1
+        for chunk_index, text_chunk in enumerate(self.text_chunks):
+            if chunk_index == self.nb_chunks_before_error:
+                raise LLMCompletionError("wrapped SDK error") from TransientError("connection reset")
+            yield text_chunk
+        if llm_tokens_usage := llm_job.job_report.llm_tokens_usage:
+            llm_tokens_usage.nb_tokens_by_category = {TokenCategory.INPUT: 5, TokenCategory.OUTPUT: len(self.text_chunks)}
+
+    @property
+    @override
+    def is_object_list_streaming_supported(self) -> bool:
+        return True
+
+    @override
+    @llm_job_stream_func
+    async def gen_object_list_stream(self, llm_job: LLMJob, schema: Type[BaseModelType]) -> AsyncIterator[BaseModelType]:
+        self.nb_calls += 1
+        for chunk_index, text_chunk in enumerate(self.text_chunks):
+            self.events.append(f"parsed {text_chunk}")
+            yield schema.model_validate({"name": text_chunk, "age": chunk_index})
+
+
+def make_streaming_llm_job(user_text: str) -> LLMJob:
+    llm_job = make_llm_job(user_text)
+    llm_job.job_config.is_streaming_enabled = True
+    return llm_job
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestLLMStream:
+    async def test_stream_reports_chunks_usage_and_time_to_first_token(self):
+        llm_worker = StreamingLLMWorker(text_chunks=["Hel", "lo ", "world"])
+        llm_job = make_streaming_llm_job("Stream")
+        text_chunks = [text_chunk async for text_chunk in llm_worker.gen_text_stream(llm_job=llm_job)]
+
+        assert text_chunks == ["Hel", "lo ", "world"]
+        assert llm_job.job_report.time_to_first_token_seconds is not None
+        llm_tokens_usage = llm_job.job_report.llm_tokens_usage
+        assert llm_tokens_usage is not None
+        assert llm_tokens_usage.nb_tokens_by_category[TokenCategory.OUTPUT] == 3
+
+    async def test_sink_receives_whole_text_when_streaming_is_disabled(self):
+        received_chunks: List[str] = []
+
+        async def text_chunk_sink(text_chunk: str):
+            received_chunks.append(text_chunk)
+
+        llm_worker = StreamingLLMWorker(text_chunks=["Hel", "lo"])
+        llm_job = make_llm_job("No stream")
+        llm_job.job_config.is_streaming_enabled = False
+        generated_text = await gen_text_into_sink(llm_worker=llm_worker, llm_job=llm_job, text_chunk_sink=text_chunk_sink)
+
+        assert generated_text == "Hello"
+        assert received_chunks == ["Hello"]
+
+    async def test_streamed_response_is_cached_for_gen_text(self):
+        get_pipelex_hub().set_llm_response_cache(llm_response_cache=MemoryLLMResponseCache(max_nb_entries=10))
+        try:
+            llm_worker = StreamingLLMWorker(text_chunks=["Hel", "lo"])
+            _ = [text_chunk async for text_chunk in llm_worker.gen_text_stream(llm_job=make_streaming_llm_job("Cached"))]
+            generated_text = await llm_worker.gen_text(llm_job=make_streaming_llm_job("Cached"))
+        finally:
+            get_pipelex_hub().set_llm_response_cache(llm_response_cache=None)
+
+        assert generated_text == "Hello"
+        assert llm_worker.nb_calls == 1
+
+    async def test_interrupted_stream_is_not_retried(self, monkeypatch: pytest.MonkeyPatch):
+        received_chunks: List[str] = []
+
+        async def text_chunk_sink(text_chunk: str):
+            received_chunks.append(text_chunk)
+
+        primary_llm_worker = StreamingLLMWorker(text_chunks=["Hel", "lo"], nb_chunks_before_error=1)
+        alternate_llm_worker = StreamingLLMWorker(text_chunks=["Bye"])
+        use_llm_workers(monkeypatch=monkeypatch, llm_workers=[primary_llm_worker, alternate_llm_worker])
+
+        with pytest.raises(LLMStreamInterruptedError):
+            await dispatch_llm_job(
+                llm_handle="gpt-4o-mini",
+                llm_job=make_streaming_llm_job("Interrupted"),
+                call=lambda llm_worker, llm_job: gen_text_into_sink(llm_worker=llm_worker, llm_job=llm_job, text_chunk_sink=text_chunk_sink),
+                is_streamed=True,
+            )
+        assert received_chunks == ["Hel"]
+        assert alternate_llm_worker.nb_calls == 0
+
+    async def test_object_list_items_reach_the_sink_as_they_are_parsed(self):
+        llm_worker = StreamingLLMWorker(text_chunks=["Alan", "Ada"])
+
+        async def object_item_sink(item: BaseModel):
+            assert isinstance(item, Person)
+            llm_worker.events.append(f"sunk {item.name}")
+
+        persons = await gen_object_list_into_sink(
+            llm_worker=llm_worker,
+            llm_job=make_streaming_llm_job("List"),
+            item_class=Person,
+            object_item_sink=object_item_sink,
+        )
+
+        assert [person.model_dump() for person in persons] == [{"name": "Alan", "age": 0}, {"name": "Ada", "age": 1}]
+        assert llm_worker.events == ["parsed Alan", "sunk Alan", "parsed Ada", "sunk Ada"]
@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import base64
+from io import BytesIO
+from typing import Iterator, List
+
+import pytest
+from PIL import Image
+
+from pipelex.cogt.image.prompt_image import PromptImage, PromptImageBytes, PromptImagePath, PromptImageUrl
+from pipelex.cogt.image.prompt_image_factory import PromptImageFactory
+from pipelex.cogt.image.prompt_image_prep_config import PromptImagePrepFormat
+from pipelex.cogt.image.prompt_image_preparer import PromptImagePreparer
+from pipelex.cogt.llm.llm_job import LLMJob
+from pipelex.cogt.llm.llm_job_components import LLMJobParams
+from pipelex.cogt.llm.llm_job_factory import LLMJobFactory
+from pipelex.cogt.llm.llm_prompt import LLMPrompt
+from pipelex.cogt.llm.llm_worker_abstract import LLMWorkerJobFuncName
+from pipelex.hub import get_pipelex_hub, get_prompt_image_cache, get_prompt_image_preparer
+from pipelex.tools.misc.base_64 import load_binary_as_base64
+from tests.cogt.asynch.llm_async.test_llm_response_cache import CountingLLMWorker
+
+# a 3294x982 RGBA png
+GANTT_IMAGE_PATH = "tests/data/images/gantt_tree_house.png"
+
+
+def open_b64_image(b64_image_bytes: bytes) -> Image.Image:
+    return Image.open(BytesIO(base64.b64decode(b64_image_bytes)))
+
+
+@pytest.fixture
+def enabled_prompt_image_preparer() -> Iterator[PromptImagePreparer]:
+    """The prompt image preparer is disabled by default, as its recompression is lossy."""
+    prompt_image_preparer = PromptImagePreparer(output_format=PromptImagePrepFormat.JPEG, quality=85, max_nb_workers=1)
+    prompt_image_preparer.setup()
+    get_pipelex_hub().set_prompt_image_preparer(prompt_image_preparer=prompt_image_preparer)
+    yield prompt_image_preparer
+    get_pipelex_hub().set_prompt_image_preparer(prompt_image_preparer=None)
+    prompt_image_preparer.teardown()
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestPromptImagePreparer:
+    async def test_oversized_image_is_downscaled_and_recompressed(self):
+        prompt_image_preparer = PromptImagePreparer(output_format=PromptImagePrepFormat.JPEG, quality=85, max_nb_workers=1)
+        prompt_image_preparer.setup()
+        b64_image_bytes = load_binary_as_base64(GANTT_IMAGE_PATH)
+        prepared_b64_image_bytes = await prompt_image_preparer.prepare_b64_async(b64_image_bytes=b64_image_bytes, max_image_edge=1024)
+        prompt_image_preparer.teardown()
+
+        with open_b64_image(prepared_b64_image_bytes) as prepared_image:
+            assert prepared_image.format == "JPEG"
+            assert prepared_image.mode == "RGB"
+            assert max(prepared_image.size) == 1024
+        assert len(prepared_b64_image_bytes) < len(b64_image_bytes)
+        assert prompt_image_preparer.nb_prepared == 1
+
+    async def test_image_within_the_edge_is_left_as_is(self):
+        prompt_image_preparer = PromptImagePreparer(output_format=PromptImagePrepFormat.WEBP, quality=85, max_nb_workers=1)
+        b64_image_bytes = load_binary_as_base64(GANTT_IMAGE_PATH)
+        prepared_b64_image_bytes = await prompt_image_preparer.prepare_b64_async(b64_image_bytes=b64_image_bytes, max_image_edge=4096)
+        assert prepared_b64_image_bytes is b64_image_bytes
+        assert prompt_image_preparer.nb_prepared == 0
+
+    async def test_preparer_is_disabled_by_default(self):
+        assert get_prompt_image_preparer() is None
+        prompt_images: List[PromptImage] = [PromptImagePath(file_path=GANTT_IMAGE_PATH)]
+        assert await PromptImageFactory.prepare_prompt_images_async(prompt_images=prompt_images, max_image_edge=768) is prompt_images
+
+    async def test_prepared_variant_is_cached_per_edge(self, enabled_prompt_image_preparer: PromptImagePreparer):
+        prompt_image_preparer = enabled_prompt_image_preparer
+        prompt_image_cache = get_prompt_image_cache()
+        assert prompt_image_cache is not None
+        prompt_images: List[PromptImage] = [PromptImagePath(file_path=GANTT_IMAGE_PATH), PromptImageUrl(url="https://example.com/image.png")]
+
+        prepared_images = await PromptImageFactory.prepare_prompt_images_async(prompt_images=prompt_images, max_image_edge=768)
+        assert isinstance(prepared_images[0], PromptImageBytes)
+        with open_b64_image(prepared_images[0].b64_image_bytes) as prepared_image:
+            assert max(prepared_image.size) == 768
+        # urls are left for the provider to fetch
+        assert prepared_images[1] == prompt_images[1]
+
+        nb_prepared = prompt_image_preparer.nb_prepared
+        prepared_again = await PromptImageFactory.prepare_prompt_images_async(prompt_images=prompt_images, max_image_edge=768)
+        assert prepared_again == prepared_images
+        assert prompt_image_preparer.nb_prepared == nb_prepared
+
+        # another model with another edge gets its own variant
+        await PromptImageFactory.prepare_prompt_images_async(prompt_images=prompt_images[:1], max_image_edge=512)
+        assert prompt_image_preparer.nb_prepared == nb_prepared + 1
+
+    async def test_llm_job_images_are_fitted_to_the_model_before_sending(
+        self,
+        enabled_prompt_image_preparer: PromptImagePreparer,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        llm_worker = CountingLLMWorker()
+        checked_image_types: List[type] = []
+        check_can_perform_job = llm_worker.check_can_perform_job
+
+        def spy_check_can_perform_job(llm_job: LLMJob, func_name: LLMWorkerJobFuncName):
+            checked_image_types.extend(type(prompt_image) for prompt_image in llm_job.llm_prompt.user_images)
+            check_can_perform_job(llm_job=llm_job, func_name=func_name)
+
+        monkeypatch.setattr(llm_worker, "check_can_perform_job", spy_check_can_perform_job)
+        max_image_edge = llm_worker.llm_engine.llm_model.max_image_edge
+        assert max_image_edge is not None
+        llm_prompt = LLMPrompt(user_text="Describe the image", user_images=[PromptImagePath(file_path=GANTT_IMAGE_PATH)])
+        llm_job = LLMJobFactory.make_llm_job(
+            llm_prompt=llm_prompt,
+            llm_job_params=LLMJobParams(temperature=0.5, max_tokens=None, seed=None),
+        )
+        await llm_worker.gen_text(llm_job=llm_job)
+
+        prepared_image = llm_job.llm_prompt.user_images[0]
+        assert isinstance(prepared_image, PromptImageBytes)
+        with open_b64_image(prepared_image.b64_image_bytes) as image:
+            assert max(image.size) == max_image_edge
+        # the feasibility check, which estimates the tokens of the prompt, was made on the image which was sent
+        assert checked_image_types == [PromptImageBytes]
+        # the prompt given by the caller is left as it was
+        assert isinstance(llm_prompt.user_images[0], PromptImagePath)
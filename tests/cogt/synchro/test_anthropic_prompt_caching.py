@@ -0,0 +1,42 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from anthropic.types import Usage
+
+from pipelex.cogt.anthropic.anthropic_factory import CACHE_CONTROL_EPHEMERAL, AnthropicFactory
+from pipelex.cogt.llm.llm_prompt import LLMPrompt
+from pipelex.cogt.llm.token_category import TokenCategory
+
+SHARED_DOCUMENT = "document: ```\nA long document shared by all the items of the batch\n```\n\n"
+
+
+class TestAnthropicPromptCaching:
+    def test_cacheable_system_text_is_a_cache_breakpoint(self):
+        llm_prompt = LLMPrompt(system_text="You are an expert.", user_text="Hello", is_system_text_cacheable=True)
+        assert AnthropicFactory.make_system_blocks(llm_prompt=llm_prompt) == [
+            {"type": "text", "text": "You are an expert.", "cache_control": CACHE_CONTROL_EPHEMERAL}
+        ]
+        llm_prompt.is_system_text_cacheable = False
+        assert AnthropicFactory.make_system_blocks(llm_prompt=llm_prompt) == [{"type": "text", "text": "You are an expert."}]
+
+    def test_cacheable_user_text_prefix_is_a_separate_block(self):
+        llm_prompt = LLMPrompt(user_text=f"{SHARED_DOCUMENT}Summarize the document.", cacheable_user_text_prefix=SHARED_DOCUMENT)
+        assert AnthropicFactory.make_user_text_blocks(llm_prompt=llm_prompt) == [
+            {"type": "text", "text": SHARED_DOCUMENT, "cache_control": CACHE_CONTROL_EPHEMERAL},
+            {"type": "text", "text": "Summarize the document."},
+        ]
+
+    def test_prefix_not_matching_user_text_is_ignored(self):
+        llm_prompt = LLMPrompt(user_text="Summarize the document.", cacheable_user_text_prefix=SHARED_DOCUMENT)
+        assert llm_prompt.split_user_text() == (None, "Summarize the document.")
+        assert AnthropicFactory.make_user_text_blocks(llm_prompt=llm_prompt) == [{"type": "text", "text": "Summarize the document."}]
+
+    def test_cache_reads_are_counted_as_cached_input(self):
+        usage = Usage(input_tokens=50, output_tokens=20, cache_read_input_tokens=3000, cache_creation_input_tokens=1000)
+        nb_tokens_by_category = AnthropicFactory.make_nb_tokens_by_category(usage=usage)
+        assert nb_tokens_by_category == {
+            TokenCategory.INPUT: 4050,
+            TokenCategory.INPUT_CACHED: 3000,
+            TokenCategory.OUTPUT: 20,
+        }
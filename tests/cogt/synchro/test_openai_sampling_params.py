@@ -0,0 +1,42 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from typing import Any, Dict
+
+import pytest
+
+from pipelex.cogt.llm.llm_job_components import LLMJobParams
+from pipelex.cogt.llm.llm_job_factory import LLMJobFactory
+from pipelex.cogt.llm.llm_models.llm_engine_factory import LLMEngineFactory
+from pipelex.cogt.llm.llm_prompt import LLMPrompt
+from pipelex.cogt.openai.openai_factory import OpenAIFactory
+from pipelex.hub import get_llm_deck
+
+
+class TestOpenAISamplingParams:
+    @pytest.mark.parametrize(
+        "llm_handle, expected_sampling_params",
+        [
+            ("gpt-4o-mini", {"temperature": 0.5, "max_tokens": 100, "seed": 42}),
+            ("o4-mini", {"temperature": 1, "max_completion_tokens": 100, "seed": 42}),
+            ("best-gemini", {"temperature": 1.0, "max_tokens": 100, "seed": 42}),
+        ],
+    )
+    def test_sampling_params_depend_on_the_family(self, llm_handle: str, expected_sampling_params: Dict[str, Any]):
+        llm_engine_blueprint = get_llm_deck().get_llm_engine_blueprint(llm_handle=llm_handle)
+        llm_engine = LLMEngineFactory.make_llm_engine(llm_engine_blueprint=llm_engine_blueprint)
+        llm_job = LLMJobFactory.make_llm_job(
+            llm_prompt=LLMPrompt(user_text="Hello"),
+            llm_job_params=LLMJobParams(temperature=0.5, max_tokens=100, seed=42),
+        )
+        assert OpenAIFactory.make_sampling_params(llm_job=llm_job, llm_engine=llm_engine) == expected_sampling_params
+
+    def test_unset_params_are_left_out(self):
+        llm_engine_blueprint = get_llm_deck().get_llm_engine_blueprint(llm_handle="gpt-4o-mini")
+        llm_engine = LLMEngineFactory.make_llm_engine(llm_engine_blueprint=llm_engine_blueprint)
+        llm_job = LLMJobFactory.make_llm_job(
+            llm_prompt=LLMPrompt(user_text="Hello"),
+            llm_job_params=LLMJobParams(temperature=0.5, max_tokens=None, seed=None),
+        )
+        assert OpenAIFactory.make_sampling_params(llm_job=llm_job, llm_engine=llm_engine) == {"temperature": 0.5}
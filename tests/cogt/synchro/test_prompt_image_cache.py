@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import os
+import shutil
+
+from pipelex.cogt.image.prompt_image import PromptImagePath
+from pipelex.cogt.image.prompt_image_cache import PromptImageCache
+from pipelex.cogt.image.prompt_image_factory import PromptImageFactory
+from pipelex.hub import get_pipelex_hub, get_prompt_image_cache
+from pipelex.tools.misc.base_64 import load_binary_as_base64
+
+EIFFEL_TOWER_IMAGE_PATH = "tests/data/images/eiffel_tower.png"
+
+
+class TestPromptImageCache:
+    def test_least_recently_used_images_are_evicted_beyond_the_memory_budget(self):
+        prompt_image_cache = PromptImageCache(max_memory_bytes=10)
+        prompt_image_cache.set_b64(source_key="url:a", b64_image_bytes=b"aaaaa")
+        prompt_image_cache.set_b64(source_key="url:b", b64_image_bytes=b"bbbbb")
+        assert prompt_image_cache.get_b64(source_key="url:a") == b"aaaaa"
+        prompt_image_cache.set_b64(source_key="url:c", b64_image_bytes=b"ccccc")
+
+        # "b" was the least recently used one
+        assert prompt_image_cache.get_b64(source_key="url:b") is None
+        assert prompt_image_cache.get_b64(source_key="url:a") == b"aaaaa"
+        assert prompt_image_cache.nb_memory_bytes == 10
+
+    def test_same_content_from_two_sources_is_held_once(self):
+        prompt_image_cache = PromptImageCache(max_memory_bytes=100)
+        digest_a = prompt_image_cache.set_b64(source_key="url:a", b64_image_bytes=b"same")
+        digest_b = prompt_image_cache.set_b64(source_key="path:b:1", b64_image_bytes=b"same")
+        assert digest_a == digest_b
+        assert prompt_image_cache.nb_memory_bytes == 4
+
+    def test_evicted_images_are_spilled_to_disk_and_reloaded(self, tmp_path: str):
+        prompt_image_cache = PromptImageCache(max_memory_bytes=5, spill_directory_path=os.path.join(tmp_path, "spill"))
+        prompt_image_cache.set_b64(source_key="url:a", b64_image_bytes=b"aaaaa")
+        prompt_image_cache.set_b64(source_key="url:b", b64_image_bytes=b"bbbbb")
+        assert prompt_image_cache.nb_memory_bytes == 5
+        assert prompt_image_cache.get_b64(source_key="url:a") == b"aaaaa"
+
+    def test_factory_reads_an_image_path_once_until_it_changes(self, tmp_path: str):
+        prompt_image_cache = get_prompt_image_cache()
+        assert prompt_image_cache is not None
+        image_path = os.path.join(tmp_path, "image.png")
+        shutil.copyfile(EIFFEL_TOWER_IMAGE_PATH, image_path)
+        prompt_image = PromptImagePath(file_path=image_path)
+
+        nb_hits_before = prompt_image_cache.nb_hits
+        b64_image_bytes = PromptImageFactory.promptimage_to_b64(image_prompt=prompt_image)
+        assert b64_image_bytes == load_binary_as_base64(image_path)
+        assert PromptImageFactory.promptimage_to_b64(image_prompt=prompt_image) == b64_image_bytes
+        assert prompt_image_cache.nb_hits == nb_hits_before + 1
+
+        # a new modification time makes a new source key, so the edited file is read again
+        with open(image_path, "ab") as image_file:
+            image_file.write(b"\0")
+        os.utime(image_path, ns=(0, os.stat(image_path).st_mtime_ns + 1_000_000))
+        assert PromptImageFactory.promptimage_to_b64(image_prompt=prompt_image) == load_binary_as_base64(image_path)
+        assert prompt_image_cache.nb_hits == nb_hits_before + 1
+
+    def test_factory_works_without_cache(self):
+        pipelex_hub = get_pipelex_hub()
+        prompt_image_cache = pipelex_hub.get_optional_prompt_image_cache()
+        pipelex_hub.set_prompt_image_cache(prompt_image_cache=None)
+        try:
+            prompt_image = PromptImagePath(file_path=EIFFEL_TOWER_IMAGE_PATH)
+            assert PromptImageFactory.promptimage_to_b64(image_prompt=prompt_image) == load_binary_as_base64(EIFFEL_TOWER_IMAGE_PATH)
+        finally:
+            pipelex_hub.set_prompt_image_cache(prompt_image_cache=prompt_image_cache)
@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+from functools import partial
+from typing import List, Optional
+
+import pytest
+
+from pipelex.core.pipe_run_params import BranchFailurePolicy
+from pipelex.exceptions import PipeBatchError
+from pipelex.pipe_controllers.batch_executor import BatchExecutor, BranchFactory
+
+
+class ConcurrencyProbe:
+    def __init__(self):
+        self.nb_in_flight = 0
+        self.max_nb_in_flight = 0
+
+    async def run_branch(self, branch_index: int, delay: float) -> int:
+        self.nb_in_flight += 1
+        self.max_nb_in_flight = max(self.max_nb_in_flight, self.nb_in_flight)
+        await asyncio.sleep(delay)
+        self.nb_in_flight -= 1
+        return branch_index
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestBatchExecutor:
+    @pytest.mark.parametrize("max_concurrency", [1, 3, None])
+    async def test_run_bounded_and_ordered(self, max_concurrency: Optional[int]):
+        probe = ConcurrencyProbe()
+        nb_branches = 10
+        # later branches finish first, to check that the results are still in branch order
+        branch_factories: List[BranchFactory[int]] = [
+            partial(probe.run_branch, branch_index=branch_index, delay=0.001 * (nb_branches - branch_index)) for branch_index in range(nb_branches)
+        ]
+        batch_executor = BatchExecutor[int](max_concurrency=max_concurrency)
+        results = await batch_executor.run(branch_factories=branch_factories)
+
+        assert results == list(range(nb_branches))
+        assert probe.max_nb_in_flight <= (max_concurrency or nb_branches)
+        assert probe.nb_in_flight == 0
+
+    async def test_run_failure_cancels_in_flight_branches(self):
+        probe = ConcurrencyProbe()
+
+        async def failing_branch() -> int:
+            raise ValueError("branch failed")
+
+        branch_factories: List[BranchFactory[int]] = [partial(probe.run_branch, branch_index=0, delay=10), failing_branch]
+        batch_executor = BatchExecutor[int](max_concurrency=2)
+        with pytest.raises(ValueError):
+            await batch_executor.run(branch_factories=branch_factories)
+        assert probe.nb_in_flight == 1  # the slow branch was cancelled before completing
+
+    async def test_iter_completed_streams_in_completion_order(self):
+        probe = ConcurrencyProbe()
+        nb_branches = 4
+        # the first branch is the slowest, so it must be streamed last
+        branch_factories: List[BranchFactory[int]] = [
+            partial(probe.run_branch, branch_index=branch_index, delay=0.2 if branch_index == 0 else 0) for branch_index in range(nb_branches)
+        ]
+        batch_executor = BatchExecutor[int](max_concurrency=None)
+        completed: List[int] = []
+        async for branch_index, result in batch_executor.iter_completed(branch_factories=branch_factories):
+            assert branch_index == result
+            completed.append(branch_index)
+
+        assert completed[-1] == 0
+        assert sorted(completed) == list(range(nb_branches))
+
+    async def test_iter_completed_early_exit_cancels_in_flight_branches(self):
+        probe = ConcurrencyProbe()
+        branch_factories: List[BranchFactory[int]] = [
+            partial(probe.run_branch, branch_index=0, delay=0),
+            partial(probe.run_branch, branch_index=1, delay=10),
+        ]
+        batch_executor = BatchExecutor[int](max_concurrency=2)
+        branch_stream = batch_executor.iter_completed(branch_factories=branch_factories)
+        async for branch_index, _ in branch_stream:
+            assert branch_index == 0
+            break
+        await branch_stream.aclose()
+        assert probe.nb_in_flight == 1  # the slow branch was cancelled before completing
+
+    async def test_collect_errors_keeps_successful_branches(self):
+        probe = ConcurrencyProbe()
+
+        async def failing_branch() -> int:
+            raise ValueError("branch failed")
+
+        branch_factories: List[BranchFactory[int]] = [
+            partial(probe.run_branch, branch_index=0, delay=0.01),
+            failing_branch,
+            partial(probe.run_branch, branch_index=2, delay=0),
+        ]
+        batch_executor = BatchExecutor[int](max_concurrency=2, failure_policy=BranchFailurePolicy.COLLECT_ERRORS, retry_failed_n_times=1)
+        results = await batch_executor.run(branch_factories=branch_factories)
+
+        assert results == [0, 2]
+        assert len(batch_executor.branch_failures) == 1
+        branch_failure = batch_executor.branch_failures[0]
+        assert branch_failure.branch_index == 1
+        assert branch_failure.error_type == "ValueError"
+        assert branch_failure.nb_attempts == 2
+
+    async def test_retry_failed_branch(self):
+        nb_calls = 0
+
+        async def flaky_branch() -> int:
+            nonlocal nb_calls
+            nb_calls += 1
+            if nb_calls < 3:
+                raise ValueError("transient failure")
+            return 42
+
+        batch_executor = BatchExecutor[int](retry_failed_n_times=2)
+        results = await batch_executor.run(branch_factories=[flaky_branch])
+
+        assert results == [42]
+        assert nb_calls == 3
+        assert not batch_executor.branch_failures
+
+    async def test_invalid_max_concurrency(self):
+        with pytest.raises(PipeBatchError):
+            BatchExecutor[int](max_concurrency=0)
@@ -2,17 +2,52 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
+import os
+from contextlib import aclosing
+from pathlib import Path
+from typing import Any, AsyncGenerator, Iterator, List, cast
+
 import pytest
 from pytest import FixtureRequest
 
 from pipelex import pretty_print
-from pipelex.core.pipe_output import PipeOutput
+from pipelex.core.pipe_output import BatchBranchOutput, PipeOutput
+from pipelex.core.pipe_run_params import BatchCheckpointMode, BatchOptions, BranchFailurePolicy, PipeRunParams
 from pipelex.core.pipe_run_params_factory import PipeRunParamsFactory
-from pipelex.core.stuff_content import ListContent, TextContent
+from pipelex.core.stuff_content import FailedItemContent, ListContent, StuffContent, TextContent
 from pipelex.core.stuff_factory import StuffFactory
+from pipelex.core.working_memory import WorkingMemory
 from pipelex.core.working_memory_factory import WorkingMemoryFactory
-from pipelex.hub import get_mission_tracker, get_report_delegate
+from pipelex.exceptions import PipeBatchCheckpointError, PipeExecutionError
+from pipelex.hub import get_batch_checkpoint_store, get_mission_tracker, get_pipelex_hub, get_report_delegate, get_required_pipe
+from pipelex.mission.job_metadata import JobMetadata
+from pipelex.pipe_controllers.batch_checkpoint_store import DirectoryBatchCheckpointStore
+from pipelex.pipe_controllers.pipe_batch import PipeBatch
 from pipelex.pipe_works.pipe_router_protocol import PipeRouterProtocol
+from pipelex.run import stream_pipe_batch
+
+
+def make_item_list_memory(texts: List[str]) -> WorkingMemory:
+    item_list_stuff = StuffFactory.make_stuff(
+        concept_code="test_pipe_batch.TestPipeBatchItem",
+        content=ListContent(items=[TextContent(text=text) for text in texts]),
+        name="items",
+    )
+    return WorkingMemoryFactory.make_from_single_stuff(item_list_stuff)
+
+
+def make_checkpoint_run_params(checkpoint_mode: BatchCheckpointMode) -> PipeRunParams:
+    return PipeRunParamsFactory.make_run_params(batch_options=BatchOptions(checkpoint_mode=checkpoint_mode))
+
+
+@pytest.fixture
+def checkpoint_store(tmp_path: Path) -> Iterator[DirectoryBatchCheckpointStore]:
+    pipelex_hub = get_pipelex_hub()
+    previous_checkpoint_store = get_batch_checkpoint_store()
+    checkpoint_store = DirectoryBatchCheckpointStore(directory_path=str(tmp_path / "checkpoints"))
+    pipelex_hub.set_batch_checkpoint_store(batch_checkpoint_store=checkpoint_store)
+    yield checkpoint_store
+    pipelex_hub.set_batch_checkpoint_store(batch_checkpoint_store=previous_checkpoint_store)
 
 
 @pytest.mark.llm
@@ -56,3 +91,154 @@ class TestPipeBatch:
         assert pipe_output.main_stuff is not None
 
         get_mission_tracker().output_flowchart()
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestPipeBatchStream:
+    async def test_stream_pipe_stopped_early_leaves_the_pipe_stack(self):
+        pipe_batch = get_required_pipe(pipe_code="test_pipe_batch_greet")
+        assert isinstance(pipe_batch, PipeBatch)
+        working_memory = make_item_list_memory(texts=["a", "b", "c"])
+        pipe_run_params: PipeRunParams = PipeRunParamsFactory.make_run_params()
+
+        streamed_texts: List[str] = []
+        async with aclosing(
+            pipe_batch.stream_pipe(
+                job_metadata=JobMetadata(),
+                working_memory=working_memory,
+                pipe_run_params=pipe_run_params,
+                output_name="greetings",
+            )
+        ) as branch_outputs:
+            async for branch_output in branch_outputs:
+                streamed_texts.append(branch_output.pipe_output.main_stuff_as_text.text)
+                break
+
+        assert streamed_texts == ["Hello a"]
+        assert pipe_run_params.pipe_stack == []
+        # the batch output is only assembled when all the branches are done
+        assert working_memory.get_optional_stuff(name="greetings") is None
+
+    async def test_stream_pipe_assembles_the_output_in_branch_order(self):
+        pipe_batch = get_required_pipe(pipe_code="test_pipe_batch_greet")
+        assert isinstance(pipe_batch, PipeBatch)
+        working_memory = make_item_list_memory(texts=["a", "b", "c"])
+        pipe_run_params: PipeRunParams = PipeRunParamsFactory.make_run_params()
+
+        branch_indexes = [
+            branch_output.branch_index
+            async for branch_output in pipe_batch.stream_pipe(
+                job_metadata=JobMetadata(),
+                working_memory=working_memory,
+                pipe_run_params=pipe_run_params,
+                output_name="greetings",
+            )
+        ]
+
+        assert sorted(branch_indexes) == [0, 1, 2]
+        assert pipe_run_params.pipe_stack == []
+        greetings = working_memory.get_stuff_as_list(name="greetings", item_type=TextContent)
+        assert [greeting.text for greeting in greetings.items] == ["Hello a", "Hello b", "Hello c"]
+
+    async def test_stream_pipe_batch_closes_the_batch_stream_when_stopped_early(self, monkeypatch: pytest.MonkeyPatch):
+        closed_batch_streams: List[str] = []
+        stream_pipe = PipeBatch.stream_pipe
+
+        async def tracked_stream_pipe(pipe_batch: PipeBatch, **kwargs: Any) -> AsyncGenerator[BatchBranchOutput, None]:
+            try:
+                async for branch_output in stream_pipe(pipe_batch, **kwargs):
+                    yield branch_output
+            finally:
+                closed_batch_streams.append(pipe_batch.code)
+
+        monkeypatch.setattr(PipeBatch, "stream_pipe", tracked_stream_pipe)
+
+        async with aclosing(
+            stream_pipe_batch(pipe_code="test_pipe_batch_greet", working_memory=make_item_list_memory(texts=["a", "b", "c"]))
+        ) as branch_outputs:
+            async for _ in branch_outputs:
+                break
+
+        # the batch stream is closed along with the wrapper, not when it's garbage-collected
+        assert closed_batch_streams == ["test_pipe_batch_greet"]
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestPipeBatchCheckpoint:
+    async def test_resume_finds_the_checkpoints_of_the_same_input_list(self, checkpoint_store: DirectoryBatchCheckpointStore):
+        pipe_batch = get_required_pipe(pipe_code="test_pipe_batch_greet")
+        await pipe_batch.run_pipe(
+            job_metadata=JobMetadata(),
+            working_memory=make_item_list_memory(texts=["a", "b"]),
+            pipe_run_params=make_checkpoint_run_params(checkpoint_mode=BatchCheckpointMode.SAVE),
+            output_name="greetings",
+        )
+        batch_keys = os.listdir(checkpoint_store.directory_path)
+        assert len(batch_keys) == 1
+        # tamper with a checkpoint, to check that it's the one restored
+        branch_checkpoint = checkpoint_store.load_branch_checkpoints(batch_key=batch_keys[0])[0]
+        branch_checkpoint.stuff.content = TextContent(text="Restored a")
+        checkpoint_store.save_branch_checkpoint(batch_key=batch_keys[0], branch_index=0, branch_checkpoint=branch_checkpoint)
+
+        # after a restart, the same input list is a new stuff, with another stuff code
+        pipe_output = await pipe_batch.run_pipe(
+            job_metadata=JobMetadata(),
+            working_memory=make_item_list_memory(texts=["a", "b"]),
+            pipe_run_params=make_checkpoint_run_params(checkpoint_mode=BatchCheckpointMode.RESUME),
+            output_name="greetings",
+        )
+        assert [greeting.text for greeting in pipe_output.main_stuff_as_items(item_type=TextContent)] == ["Restored a", "Hello b"]
+
+    async def test_resume_refuses_a_checkpoint_of_another_item(self, checkpoint_store: DirectoryBatchCheckpointStore):
+        pipe_batch = get_required_pipe(pipe_code="test_pipe_batch_greet")
+        await pipe_batch.run_pipe(
+            job_metadata=JobMetadata(),
+            working_memory=make_item_list_memory(texts=["a", "b"]),
+            pipe_run_params=make_checkpoint_run_params(checkpoint_mode=BatchCheckpointMode.SAVE),
+            output_name="greetings",
+        )
+        batch_key = os.listdir(checkpoint_store.directory_path)[0]
+        branch_checkpoint = checkpoint_store.load_branch_checkpoints(batch_key=batch_key)[1]
+        branch_checkpoint.item_digest = "digest of another item"
+        checkpoint_store.save_branch_checkpoint(batch_key=batch_key, branch_index=1, branch_checkpoint=branch_checkpoint)
+
+        with pytest.raises(PipeBatchCheckpointError):
+            await pipe_batch.run_pipe(
+                job_metadata=JobMetadata(),
+                working_memory=make_item_list_memory(texts=["a", "b"]),
+                pipe_run_params=make_checkpoint_run_params(checkpoint_mode=BatchCheckpointMode.RESUME),
+                output_name="greetings",
+            )
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestPipeBatchFailures:
+    async def test_collected_failures_keep_the_positions_and_reach_the_caller(self, pipe_router: PipeRouterProtocol):
+        pipe_output: PipeOutput = await pipe_router.run_pipe_code(
+            pipe_code="test_pipe_batch_greet_in_sequence",
+            pipe_run_params=PipeRunParamsFactory.make_run_params(
+                batch_options=BatchOptions(failure_policy=BranchFailurePolicy.COLLECT_ERRORS),
+            ),
+            working_memory=make_item_list_memory(texts=["a", "bomb", "c"]),
+        )
+
+        # the items are greetings and failed items: no concrete item type fits them all
+        greetings = cast(ListContent[StuffContent], pipe_output.main_stuff.content).items
+        assert len(greetings) == 3
+        assert [greeting.rendered_plain() for greeting in (greetings[0], greetings[2])] == ["Hello a", "Hello c"]
+        assert isinstance(greetings[1], FailedItemContent)
+        # the failure of the batch nested in the sequence is reported by the sequence
+        assert len(pipe_output.branch_failures) == 1
+        branch_failure = pipe_output.branch_failures[0]
+        assert branch_failure.pipe_code == "test_pipe_batch_greet_or_fail_item"
+        assert branch_failure.branch_index == 1
+        assert branch_failure.error_type == greetings[1].error_type
+
+    async def test_parallel_outputs_are_not_combined_when_a_sub_pipe_failed(self, pipe_router: PipeRouterProtocol):
+        document_stuff = StuffFactory.make_stuff(concept_code="native.Text", content=TextContent(text="document"), name="document")
+        with pytest.raises(PipeExecutionError, match="because these sub pipes failed: test_pipe_parallel_fail"):
+            await pipe_router.run_pipe_code(
+                pipe_code="test_pipe_parallel_combine_greet_and_fail",
+                pipe_run_params=PipeRunParamsFactory.make_run_params(),
+                working_memory=WorkingMemoryFactory.make_from_single_stuff(document_stuff),
+            )
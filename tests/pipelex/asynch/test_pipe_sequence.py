@@ -0,0 +1,30 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import pytest
+
+from pipelex.core.pipe_output import PipeOutput
+from pipelex.core.pipe_run_params_factory import PipeRunParamsFactory
+from pipelex.core.stuff_content import TextContent
+from pipelex.core.stuff_factory import StuffFactory
+from pipelex.core.working_memory_factory import WorkingMemoryFactory
+from pipelex.pipe_works.pipe_router_protocol import PipeRouterProtocol
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestPipeSequence:
+    async def test_dataflow_runs_dependent_steps_after_their_inputs(self, pipe_router: PipeRouterProtocol):
+        document_stuff = StuffFactory.make_stuff(concept_code="native.Text", content=TextContent(text="the doc"), name="document")
+        pipe_output: PipeOutput = await pipe_router.run_pipe_code(
+            pipe_code="test_dataflow_sequence",
+            pipe_run_params=PipeRunParamsFactory.make_run_params(),
+            working_memory=WorkingMemoryFactory.make_from_single_stuff(document_stuff),
+        )
+
+        working_memory = pipe_output.working_memory
+        # the outputs of the concurrent steps are merged back into the sequence memory
+        assert working_memory.get_stuff_as_text(name="title").text == "Title of the doc"
+        assert working_memory.get_stuff_as_text(name="summary").text == "Summary of the doc"
+        # the unnamed last step ran once both were done, and its output is the main stuff, as in sequential mode
+        assert pipe_output.main_stuff_as_text.text == "Title of the doc / Summary of the doc"
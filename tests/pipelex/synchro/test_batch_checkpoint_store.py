@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from pipelex.core.stuff import Stuff
+from pipelex.core.stuff_content import ListContent, TextContent
+from pipelex.pipe_controllers.batch_checkpoint_store import DirectoryBatchCheckpointStore, SQLiteBatchCheckpointStore
+from pipelex.pipe_controllers.batch_checkpoint_store_abstract import BatchBranchCheckpoint, BatchCheckpointStoreAbstract
+
+
+def make_store(store_type: str, tmp_path: Path) -> BatchCheckpointStoreAbstract:
+    if store_type == "directory":
+        return DirectoryBatchCheckpointStore(directory_path=str(tmp_path / "checkpoints"))
+    else:
+        return SQLiteBatchCheckpointStore(sqlite_path=str(tmp_path / "checkpoints" / "batch.sqlite"))
+
+
+def make_branch_checkpoint(branch_index: int) -> BatchBranchCheckpoint:
+    return BatchBranchCheckpoint(
+        item_digest=f"item-digest-{branch_index}",
+        stuff=Stuff(
+            stuff_code=f"output-branch-{branch_index}",
+            stuff_name=f"Batch result {branch_index + 1}",
+            concept_code="native.Text",
+            content=ListContent(items=[TextContent(text=f"text {branch_index}")]),
+        ),
+    )
+
+
+@pytest.mark.parametrize("store_type", ["directory", "sqlite"])
+class TestBatchCheckpointStore:
+    def test_save_and_load_branch_checkpoints(self, store_type: str, tmp_path: Path):
+        store = make_store(store_type=store_type, tmp_path=tmp_path)
+        store.setup()
+        for branch_index in [0, 2]:
+            store.save_branch_checkpoint(
+                batch_key="my_batch-abc",
+                branch_index=branch_index,
+                branch_checkpoint=make_branch_checkpoint(branch_index=branch_index),
+            )
+        store.save_branch_checkpoint(batch_key="other_batch-def", branch_index=1, branch_checkpoint=make_branch_checkpoint(branch_index=1))
+
+        branch_checkpoints = store.load_branch_checkpoints(batch_key="my_batch-abc")
+
+        assert set(branch_checkpoints.keys()) == {0, 2}
+        assert branch_checkpoints[2] == make_branch_checkpoint(branch_index=2)
+        assert isinstance(branch_checkpoints[2].stuff.content, ListContent)
+        store.teardown()
+
+    def test_clear_batch(self, store_type: str, tmp_path: Path):
+        store = make_store(store_type=store_type, tmp_path=tmp_path)
+        store.setup()
+        store.save_branch_checkpoint(batch_key="my_batch-abc", branch_index=0, branch_checkpoint=make_branch_checkpoint(branch_index=0))
+        store.save_branch_checkpoint(batch_key="other_batch-def", branch_index=0, branch_checkpoint=make_branch_checkpoint(branch_index=0))
+
+        store.clear_batch(batch_key="my_batch-abc")
+
+        assert store.load_branch_checkpoints(batch_key="my_batch-abc") == {}
+        assert set(store.load_branch_checkpoints(batch_key="other_batch-def").keys()) == {0}
+        store.teardown()
+
+    def test_save_from_worker_threads(self, store_type: str, tmp_path: Path):
+        store = make_store(store_type=store_type, tmp_path=tmp_path)
+        store.setup()
+        # the batches save their checkpoints from worker threads, out of the event loop
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(
+                    store.save_branch_checkpoint,
+                    batch_key="my_batch-abc",
+                    branch_index=branch_index,
+                    branch_checkpoint=make_branch_checkpoint(branch_index=branch_index),
+                )
+                for branch_index in range(8)
+            ]
+            for future in futures:
+                future.result()
+        assert set(store.load_branch_checkpoints(batch_key="my_batch-abc").keys()) == set(range(8))
+        store.teardown()
@@ -0,0 +1,25 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from pipelex.core.pipe_run_params import BatchOptions, BatchParams, BranchFailurePolicy
+from pipelex.core.working_memory import BATCH_ITEM_STUFF_NAME, MAIN_STUFF_NAME
+
+
+class TestBatchParams:
+    def test_batch_params_are_only_made_for_a_batch(self):
+        assert BatchParams.make_optional_batch_params(input_list_name=False) is None
+        assert BatchParams.make_optional_batch_params(input_list_name="documents") == BatchParams(
+            input_list_stuff_name="documents",
+            input_item_stuff_name=BATCH_ITEM_STUFF_NAME,
+        )
+        assert BatchParams.make_optional_batch_params(input_list_name=True, input_item_name="document") == BatchParams(
+            input_list_stuff_name=MAIN_STUFF_NAME,
+            input_item_stuff_name="document",
+        )
+
+    def test_batch_options_do_not_make_a_batch(self):
+        assert BatchOptions.make_optional_batch_options() is None
+        batch_options = BatchOptions.make_optional_batch_options(max_concurrency=4, retry_failed_n_times=0)
+        assert batch_options == BatchOptions(max_concurrency=4, retry_failed_n_times=0)
+        assert BatchOptions.make_optional_batch_options(failure_policy=BranchFailurePolicy.COLLECT_ERRORS) is not None
@@ -16,6 +16,7 @@ from rich.table import Table
 from pipelex import pretty_print
 from pipelex.core.concept_library import ConceptLibrary
 from pipelex.core.pipe_library import PipeLibrary
+from pipelex.hub import get_pipe_execution_plan, get_required_pipe
 from pipelex.libraries.library_manager import LibraryManager
 from tests.pipelex.test_data import LibraryTestCases
 
@@ -106,3 +107,17 @@ class TestLibraries:
         pretty_print(f"Concept: {known_concept} is correctly loaded as {library_manager.concept_library.get_concept(known_concept)}")
         assert library_manager.pipe_library.get_optional_pipe(known_pipe) is not None
         pretty_print(f"Pipe: {known_pipe} is correctly loaded as {library_manager.pipe_library.get_optional_pipe(known_pipe)}")
+
+    @pytest.mark.parametrize("known_concept, known_pipe", LibraryTestCases.KNOWN_CONCEPTS_AND_PIPES)
+    def test_execution_plans(
+        self,
+        known_concept: str,
+        known_pipe: str,
+    ):
+        pipe = get_required_pipe(pipe_code=known_pipe)
+        execution_plan = get_pipe_execution_plan(pipe_code=known_pipe)
+
+        assert execution_plan.pipe is pipe
+        assert execution_plan.required_variables == pipe.required_variables()
+        assert execution_plan.pipe_dependencies == pipe.pipe_dependencies()
+        assert get_pipe_execution_plan(pipe_code=known_pipe) is execution_plan
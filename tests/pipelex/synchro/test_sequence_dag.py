@@ -0,0 +1,29 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from pipelex.core.working_memory import MAIN_STUFF_NAME
+from pipelex.pipe_controllers.sequence_dag import make_step_dependencies
+
+
+class TestSequenceDag:
+    def test_independent_extractions_then_merge(self):
+        step_dependencies = make_step_dependencies(
+            steps_required_names=[{"document"}, {"document"}, {"document"}, {"title", "summary", "keywords"}],
+            steps_output_names=["title", "summary", "keywords", "report"],
+        )
+        assert step_dependencies == [set(), set(), set(), {0, 1, 2}]
+
+    def test_write_after_read_and_write_after_write(self):
+        step_dependencies = make_step_dependencies(
+            steps_required_names=[{"document"}, {"source"}, {"source"}],
+            steps_output_names=["summary", "document", "summary"],
+        )
+        assert step_dependencies == [set(), {0}, {0}]
+
+    def test_unknown_reads_and_main_stuff_are_barriers(self):
+        step_dependencies = make_step_dependencies(
+            steps_required_names=[{"document"}, None, {"document"}, {MAIN_STUFF_NAME}],
+            steps_output_names=["title", "pages", "summary", "report"],
+        )
+        assert step_dependencies == [set(), {0}, {1}, {0, 1, 2}]
@@ -0,0 +1,63 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+from pipelex.core.stuff_content import TextContent
+from pipelex.core.stuff_factory import StuffFactory
+from pipelex.core.working_memory import MAIN_STUFF_NAME
+from pipelex.core.working_memory_factory import WorkingMemoryFactory
+
+
+class TestWorkingMemoryOverlay:
+    def test_overlay_reads_through_without_copying(self):
+        working_memory = WorkingMemoryFactory.make_from_text(text="parent text", name="parent_text")
+        parent_stuff = working_memory.get_stuff(name="parent_text")
+
+        overlay = working_memory.make_overlay()
+
+        assert overlay.get_stuff(name="parent_text") is parent_stuff
+        assert overlay.get_main_stuff() is parent_stuff
+        assert overlay.root == {}
+        assert set(overlay.list_keys()) == set(working_memory.list_keys())
+
+    def test_overlay_changes_do_not_leak_into_parent(self):
+        working_memory = WorkingMemoryFactory.make_from_text(text="parent text", name="parent_text")
+        overlay = working_memory.make_overlay()
+        branch_stuff = StuffFactory.make_stuff(
+            concept_code="native.Text",
+            content=TextContent(text="branch text"),
+            name="branch_text",
+        )
+
+        overlay.set_new_main_stuff(stuff=branch_stuff, name="branch_text")
+        overlay.remove_stuff(name="parent_text")
+
+        assert overlay.get_main_stuff() is branch_stuff
+        assert overlay.get_optional_stuff(name="parent_text") is None
+        assert working_memory.get_main_stuff().as_text.text == "parent text"
+        assert working_memory.get_optional_stuff(name="branch_text") is None
+        assert set(overlay.make_flat_copy().list_keys()) == {"branch_text", MAIN_STUFF_NAME}
+
+    def test_overlay_merge_into_parent(self):
+        working_memory = WorkingMemoryFactory.make_from_text(text="parent text", name="parent_text")
+        overlay = working_memory.make_overlay()
+        branch_stuff = StuffFactory.make_stuff(
+            concept_code="native.Text",
+            content=TextContent(text="branch text"),
+            name="branch_text",
+        )
+        overlay.set_new_main_stuff(stuff=branch_stuff, name="branch_text")
+
+        overlay.merge_into(target_memory=working_memory)
+
+        assert working_memory.get_main_stuff() is branch_stuff
+        assert working_memory.get_stuff(name="parent_text").as_text.text == "parent text"
+
+    def test_nested_overlays(self):
+        working_memory = WorkingMemoryFactory.make_from_text(text="parent text", name="parent_text")
+        overlay = working_memory.make_overlay()
+        overlay.remove_stuff(name="parent_text")
+        nested_overlay = overlay.make_overlay()
+
+        assert nested_overlay.get_optional_stuff(name="parent_text") is None
+        assert working_memory.get_optional_stuff(name="parent_text") is not None
@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+
+import pytest
+
+from pipelex.tools.misc.aimd_limiter import AIMDLimiter, AIMDLimiterError
+
+
+def make_aimd_limiter(initial_ceiling: float = 4) -> AIMDLimiter:
+    return AIMDLimiter(initial_ceiling=initial_ceiling, min_ceiling=1, max_ceiling=8, additive_increase=1, multiplicative_decrease=0.5)
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestAIMDLimiter:
+    async def test_ceiling_increases_by_about_one_per_round_of_successes(self):
+        aimd_limiter = make_aimd_limiter()
+        for _ in range(4):
+            epoch = await aimd_limiter.acquire()
+            aimd_limiter.release(epoch=epoch)
+        assert 4.8 <= aimd_limiter.ceiling <= 5
+
+    async def test_burst_of_throttled_calls_decreases_once(self):
+        aimd_limiter = make_aimd_limiter()
+        epochs = [await aimd_limiter.acquire() for _ in range(4)]
+        for epoch in epochs:
+            aimd_limiter.release(epoch=epoch, is_success=False, is_throttled=True)
+        assert aimd_limiter.ceiling == 2
+        assert aimd_limiter.nb_throttled == 4
+
+    async def test_other_failures_leave_the_ceiling_unchanged(self):
+        aimd_limiter = make_aimd_limiter()
+        epoch = await aimd_limiter.acquire()
+        aimd_limiter.release(epoch=epoch, is_success=False)
+        assert aimd_limiter.ceiling == 4
+
+    async def test_concurrency_is_bounded_by_the_ceiling(self):
+        aimd_limiter = make_aimd_limiter(initial_ceiling=2)
+        max_nb_in_flight = 0
+
+        async def call():
+            nonlocal max_nb_in_flight
+            epoch = await aimd_limiter.acquire()
+            max_nb_in_flight = max(max_nb_in_flight, aimd_limiter.nb_in_flight)
+            await asyncio.sleep(0.01)
+            aimd_limiter.release(epoch=epoch, is_success=False)
+
+        await asyncio.gather(*[call() for _ in range(6)])
+        assert max_nb_in_flight == 2
+        assert aimd_limiter.nb_in_flight == 0
+
+    async def test_invalid_ceilings(self):
+        with pytest.raises(AIMDLimiterError):
+            AIMDLimiter(initial_ceiling=10, min_ceiling=1, max_ceiling=8, additive_increase=1, multiplicative_decrease=0.5)
@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import os
+
+import pytest
+from PIL import Image
+
+from pipelex.activity_handler import ActivityHandlerForResultFiles
+from pipelex.cogt.image.prompt_image import PromptImageBlob
+from pipelex.cogt.image.prompt_image_factory import PromptImageFactory
+from pipelex.core.stuff_content import ImageContent
+from pipelex.core.stuff_factory import StuffFactory
+from pipelex.hub import get_blob_store, get_pipelex_hub
+from pipelex.tools.blob.blob_store import BlobNotFoundError, DirectoryBlobStore, MemoryBlobStore, make_blob_digest
+from pipelex.tools.blob.blob_store_abstract import BlobStoreAbstract
+from pipelex.tools.misc.base_64 import encode_to_base64
+from pipelex.tools.utils.path_utils import clarify_path_or_url
+
+
+def check_put_and_get(blob_store: BlobStoreAbstract):
+    digest = blob_store.put_bytes(data=b"some binary content")
+    assert digest == make_blob_digest(data=b"some binary content")
+    assert blob_store.has_blob(digest=digest)
+    assert blob_store.get_bytes(digest=digest) == b"some binary content"
+    # the same content is stored once, under the same digest
+    assert blob_store.put_bytes(data=b"some binary content") == digest
+
+    with pytest.raises(BlobNotFoundError):
+        blob_store.get_bytes(digest=make_blob_digest(data=b"never stored"))
+
+
+class TestBlobStore:
+    def test_memory_blob_store(self):
+        blob_store = MemoryBlobStore()
+        blob_store.setup()
+        check_put_and_get(blob_store=blob_store)
+        blob_store.teardown()
+
+    def test_directory_blob_store(self, tmp_path: str):
+        directory_path = os.path.join(tmp_path, "blobs")
+        blob_store = DirectoryBlobStore(directory_path=directory_path)
+        blob_store.setup()
+        check_put_and_get(blob_store=blob_store)
+        blob_store.teardown()
+        # a configured directory outlives the store, so that blobs can be found again by a later run
+        assert DirectoryBlobStore(directory_path=directory_path).has_blob(digest=make_blob_digest(data=b"some binary content"))
+
+    def test_temporary_directory_is_removed_at_teardown(self):
+        blob_store = DirectoryBlobStore()
+        blob_store.setup()
+        directory_path = blob_store.applied_directory_path
+        blob_store.put_bytes(data=b"some binary content")
+        blob_store.teardown()
+        assert not os.path.exists(directory_path)
+
+    def test_image_content_holds_a_digest_instead_of_base64(self, tmp_path: str):
+        image = Image.new("RGB", (8, 8), color="red")
+        image_content = ImageContent.make_from_image(image=image)
+        assert image_content.base_64 is None
+        assert image_content.blob_digest is not None
+        assert image_content.url == f"blob:{image_content.blob_digest}"
+
+        image_bytes = get_blob_store().get_bytes(digest=image_content.blob_digest)
+        assert image_content.get_image_bytes() == image_bytes
+        prompt_image = PromptImageFactory.make_prompt_image(blob_digest=image_content.blob_digest)
+        assert isinstance(prompt_image, PromptImageBlob)
+        assert PromptImageFactory.promptimage_to_b64(image_prompt=prompt_image) == encode_to_base64(image_bytes)
+
+        image_content.save_to_directory(directory=str(tmp_path))
+        with open(os.path.join(tmp_path, "img.png"), "rb") as image_file:
+            assert image_file.read() == image_bytes
+
+    def test_blob_url_is_resolved_outside_of_pipelex(self, tmp_path: str):
+        image_content = ImageContent.make_from_image(image=Image.new("RGB", (8, 8), color="blue"))
+        image_bytes = image_content.get_image_bytes()
+        assert image_bytes is not None
+        data_url = f"data:image/png;base64,{encode_to_base64(image_bytes).decode('utf-8')}"
+        assert image_content.get_resolvable_url() == data_url
+        assert image_content.rendered_markdown() == f"![{image_content.url}]({data_url})"
+        # the data url is passed along like an online url, e.g. to the OCR worker
+        assert clarify_path_or_url(path_or_uri=image_content.get_resolvable_url()) == (None, data_url)
+
+        activity_handler = ActivityHandlerForResultFiles(result_dir_path=str(tmp_path))
+        activity_handler.handle_stuff(stuff=StuffFactory.make_stuff(concept_code="native.Image", content=image_content, name="picture"))
+        saved_image_paths = os.listdir(activity_handler.images_dir_path)
+        assert len(saved_image_paths) == 1
+        with open(os.path.join(activity_handler.images_dir_path, saved_image_paths[0]), "rb") as image_file:
+            assert image_file.read() == image_bytes
+
+    def test_hub_holds_the_blob_store(self):
+        assert get_pipelex_hub().get_required_blob_store() is get_blob_store()
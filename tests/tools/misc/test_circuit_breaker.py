@@ -0,0 +1,45 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import pytest
+
+from pipelex.tools.misc.circuit_breaker import CircuitBreaker, CircuitBreakerError, CircuitBreakerState
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=3, cool_down_seconds=60)
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure()
+        circuit_breaker.record_success()
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure()
+        assert circuit_breaker.state == CircuitBreakerState.CLOSED
+        circuit_breaker.record_failure()
+        assert circuit_breaker.state == CircuitBreakerState.OPEN
+        assert not circuit_breaker.is_available
+
+    def test_half_open_lets_a_single_trial_through(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr("pipelex.tools.misc.circuit_breaker.time.monotonic", lambda: 1000.0)
+        circuit_breaker = CircuitBreaker(failure_threshold=1, cool_down_seconds=30)
+        circuit_breaker.record_failure()
+        assert circuit_breaker.state == CircuitBreakerState.OPEN
+
+        monkeypatch.setattr("pipelex.tools.misc.circuit_breaker.time.monotonic", lambda: 1031.0)
+        assert circuit_breaker.state == CircuitBreakerState.HALF_OPEN
+        assert circuit_breaker.is_available
+        circuit_breaker.record_call_start()
+        assert not circuit_breaker.is_available
+
+        # a failed trial opens the circuit again, a successful one closes it
+        circuit_breaker.record_failure()
+        assert circuit_breaker.state == CircuitBreakerState.OPEN
+        monkeypatch.setattr("pipelex.tools.misc.circuit_breaker.time.monotonic", lambda: 1062.0)
+        circuit_breaker.record_call_start()
+        circuit_breaker.record_success()
+        assert circuit_breaker.state == CircuitBreakerState.CLOSED
+
+    def test_invalid_params(self):
+        with pytest.raises(CircuitBreakerError):
+            CircuitBreaker(failure_threshold=0, cool_down_seconds=30)
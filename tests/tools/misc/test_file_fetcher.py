@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import httpx
+import pytest
+from typing_extensions import override
+
+from pipelex.config import get_config
+from pipelex.tools.misc.file_fetcher import FileFetcher
+
+FILE_BYTES = b"0123456789" * 10_000
+
+
+class StandInFileHandler(BaseHTTPRequestHandler):
+    @override
+    def log_message(self, format: str, *args: Any):
+        pass
+
+    def do_GET(self):
+        if self.path != "/file.bin":
+            self.send_error(404)
+            return
+        time.sleep(0.05)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(FILE_BYTES)))
+        self.end_headers()
+        self.wfile.write(FILE_BYTES)
+
+
+@pytest.fixture
+def stand_in_file_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInFileHandler)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_file_fetcher(max_connections_per_host: int) -> FileFetcher:
+    file_fetcher_config = get_config().pipelex.file_fetcher_config.model_copy(update={"max_connections_per_host": max_connections_per_host})
+    file_fetcher = FileFetcher(file_fetcher_config=file_fetcher_config)
+    file_fetcher.setup()
+    return file_fetcher
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestFileFetcher:
+    async def test_concurrent_fetches_are_capped_per_host(self, stand_in_file_url: str):
+        file_fetcher = make_file_fetcher(max_connections_per_host=2)
+        fetched = await asyncio.gather(*[file_fetcher.fetch_file_async(url=f"{stand_in_file_url}/file.bin") for _ in range(6)])
+        file_fetcher.teardown()
+        # closing from within the running loop schedules the client's closing on that loop
+        await asyncio.sleep(0.01)
+
+        assert all(file_bytes == FILE_BYTES for file_bytes in fetched)
+        assert file_fetcher.metrics.nb_fetches == 6
+        assert file_fetcher.metrics.max_nb_in_flight == 2
+        assert file_fetcher.metrics.nb_in_flight == 0
+        assert file_fetcher.metrics.nb_bytes == 6 * len(FILE_BYTES)
+
+    async def test_download_is_streamed_to_disk(self, stand_in_file_url: str, tmp_path: str):
+        file_fetcher = make_file_fetcher(max_connections_per_host=2)
+        file_path = os.path.join(tmp_path, "downloads", "file.bin")
+        nb_bytes = await file_fetcher.fetch_file_to_path_async(url=f"{stand_in_file_url}/file.bin", file_path=file_path)
+
+        assert nb_bytes == len(FILE_BYTES)
+        with open(file_path, "rb") as file:
+            assert file.read() == FILE_BYTES
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await file_fetcher.fetch_file_to_path_async(url=f"{stand_in_file_url}/missing.bin", file_path=file_path + ".missing")
+        assert not os.path.exists(file_path + ".missing.part")
+        assert file_fetcher.metrics.nb_failed == 1
+        file_fetcher.teardown()
+        await asyncio.sleep(0.01)
+
+
+class TestFileFetcherAcrossLoops:
+    def test_client_is_reopened_in_a_new_loop_without_driving_the_old_one(self, stand_in_file_url: str):
+        file_fetcher = make_file_fetcher(max_connections_per_host=2)
+        url = f"{stand_in_file_url}/file.bin"
+        # a loop which is stopped but not closed, as left by a caller driving its own loop
+        first_loop = asyncio.new_event_loop()
+        try:
+            assert first_loop.run_until_complete(file_fetcher.fetch_file_async(url=url)) == FILE_BYTES
+            # the old loop can't be run from within the new running one: its client is dropped instead
+            assert asyncio.run(file_fetcher.fetch_file_async(url=url)) == FILE_BYTES
+        finally:
+            first_loop.close()
+        # the loop of the current client is closed by now: teardown drops it too
+        file_fetcher.teardown()
+        assert file_fetcher.metrics.nb_fetches == 2
+
+    def test_sync_fetches_are_capped_per_host(self, stand_in_file_url: str):
+        file_fetcher = make_file_fetcher(max_connections_per_host=2)
+        nb_in_flight = 0
+        max_nb_in_flight = 0
+        lock = threading.Lock()
+        client = file_fetcher._client  # pyright: ignore[reportPrivateUsage]
+        assert client is not None
+        original_get = client.get
+
+        def counting_get(*args: Any, **kwargs: Any) -> httpx.Response:
+            nonlocal nb_in_flight, max_nb_in_flight
+            with lock:
+                nb_in_flight += 1
+                max_nb_in_flight = max(max_nb_in_flight, nb_in_flight)
+            try:
+                return original_get(*args, **kwargs)
+            finally:
+                with lock:
+                    nb_in_flight -= 1
+
+        client.get = counting_get  # type: ignore[method-assign]
+        threads = [threading.Thread(target=file_fetcher.fetch_file, kwargs={"url": f"{stand_in_file_url}/file.bin"}) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        file_fetcher.teardown()
+
+        assert file_fetcher.metrics.nb_fetches == 6
+        assert max_nb_in_flight == 2
@@ -0,0 +1,20 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import time
+from email.utils import formatdate
+
+from pipelex.tools.misc.http_helpers import parse_retry_after_seconds
+
+
+class TestHttpHelpers:
+    def test_parse_retry_after_seconds(self):
+        assert parse_retry_after_seconds(headers={}) is None
+        assert parse_retry_after_seconds(headers={"retry-after": "12"}) == 12
+        assert parse_retry_after_seconds(headers={"retry-after": "12", "retry-after-ms": "1500"}) == 1.5
+        assert parse_retry_after_seconds(headers={"retry-after": "soon"}) is None
+
+        retry_after_seconds = parse_retry_after_seconds(headers={"retry-after": formatdate(time.time() + 60, usegmt=True)})
+        assert retry_after_seconds is not None
+        assert 55 <= retry_after_seconds <= 60
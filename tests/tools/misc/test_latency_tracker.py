@@ -0,0 +1,29 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import pytest
+
+from pipelex.tools.misc.latency_tracker import LatencyTracker, LatencyTrackerError
+
+
+class TestLatencyTracker:
+    def test_percentile(self):
+        latency_tracker = LatencyTracker(max_nb_samples=100)
+        assert latency_tracker.get_percentile(percentile=95) is None
+        for latency_seconds in range(1, 101):
+            latency_tracker.record(latency_seconds=float(latency_seconds))
+        assert latency_tracker.get_percentile(percentile=95) == 95
+        assert latency_tracker.get_percentile(percentile=100) == 100
+
+    def test_sliding_window(self):
+        latency_tracker = LatencyTracker(max_nb_samples=3)
+        for latency_seconds in [10.0, 1.0, 2.0, 3.0]:
+            latency_tracker.record(latency_seconds=latency_seconds)
+        assert latency_tracker.nb_samples == 3
+        assert latency_tracker.get_percentile(percentile=100) == 3
+
+    def test_invalid_percentile(self):
+        latency_tracker = LatencyTracker(max_nb_samples=3)
+        with pytest.raises(LatencyTrackerError):
+            latency_tracker.get_percentile(percentile=0)
@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+
+import pytest
+
+from pipelex.tools.misc.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestSingleFlight:
+    async def test_identical_calls_share_one_call(self):
+        nb_calls = 0
+
+        async def call() -> int:
+            nonlocal nb_calls
+            nb_calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        single_flight = SingleFlight[int]()
+        results = await asyncio.gather(*[single_flight.run(key="same", call=call) for _ in range(5)])
+
+        assert nb_calls == 1
+        assert [result for result, _ in results] == [42] * 5
+        assert sum(1 for _, is_shared in results if not is_shared) == 1
+        assert single_flight.nb_in_flight == 0
+
+    async def test_different_keys_are_not_shared(self):
+        nb_calls = 0
+
+        async def call() -> int:
+            nonlocal nb_calls
+            nb_calls += 1
+            await asyncio.sleep(0.01)
+            return nb_calls
+
+        single_flight = SingleFlight[int]()
+        await asyncio.gather(single_flight.run(key="a", call=call), single_flight.run(key="b", call=call))
+        assert nb_calls == 2
+
+    async def test_failure_is_shared(self):
+        async def call() -> int:
+            await asyncio.sleep(0.01)
+            raise ValueError("call failed")
+
+        single_flight = SingleFlight[int]()
+        results = await asyncio.gather(*[single_flight.run(key="same", call=call) for _ in range(3)], return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert single_flight.nb_in_flight == 0
+
+    async def test_waiting_caller_takes_over_when_first_caller_is_cancelled(self):
+        nb_calls = 0
+
+        async def call() -> int:
+            nonlocal nb_calls
+            nb_calls += 1
+            await asyncio.sleep(0.05)
+            return nb_calls
+
+        single_flight = SingleFlight[int]()
+        first_task = asyncio.create_task(single_flight.run(key="same", call=call))
+        await asyncio.sleep(0)
+        second_task = asyncio.create_task(single_flight.run(key="same", call=call))
+        await asyncio.sleep(0)
+        first_task.cancel()
+
+        result, is_shared = await second_task
+        assert (result, is_shared) == (2, False)
@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: © 2025 Evotis S.A.S.
+# SPDX-License-Identifier: Elastic-2.0
+# "Pipelex" is a trademark of Evotis S.A.S.
+
+import asyncio
+import time
+
+import pytest
+
+from pipelex.tools.misc.token_bucket import TokenBucket, TokenBucketError
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestTokenBucket:
+    async def test_acquire_waits_once_capacity_is_used(self):
+        token_bucket = TokenBucket(capacity=2, refill_per_second=20)
+        started_at = time.monotonic()
+        assert await token_bucket.acquire(amount=1) == 1
+        assert await token_bucket.acquire(amount=1) == 1
+        assert time.monotonic() - started_at < 0.04
+        assert await token_bucket.acquire(amount=1) == 1
+        assert time.monotonic() - started_at >= 0.04
+
+    async def test_amount_above_capacity_is_capped(self):
+        token_bucket = TokenBucket(capacity=10, refill_per_second=1000)
+        # only the capacity is debited, and that is what is returned to be given back
+        assert await token_bucket.acquire(amount=1000) == 10
+
+    async def test_cancelled_acquisition_is_given_back(self):
+        token_bucket = TokenBucket(capacity=100, refill_per_second=0.001)
+        await token_bucket.acquire(amount=80)
+        acquisition = asyncio.create_task(token_bucket.acquire(amount=50))
+        await asyncio.sleep(0.01)
+        acquisition.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await acquisition
+        # the bucket is not left in debt by the caller which gave up waiting
+        assert abs(token_bucket.level - 20) <= 0.1
+
+    async def test_adjust(self):
+        token_bucket = TokenBucket(capacity=100, refill_per_second=0.001)
+        await token_bucket.acquire(amount=80)
+        token_bucket.adjust(amount=50)
+        assert abs(token_bucket.level - 70) <= 0.1
+        token_bucket.adjust(amount=-100)
+        assert abs(token_bucket.level + 30) <= 0.1
+
+    async def test_invalid_capacity(self):
+        with pytest.raises(TokenBucketError):
+            TokenBucket(capacity=0, refill_per_second=1)
@@ -9,7 +9,9 @@ import pytest
 from pipelex import log, pretty_print
 from pipelex.hub import get_template_provider
 from pipelex.tools.templating.jinja2_rendering import render_jinja2
+from pipelex.tools.templating.jinja2_template_cache import Jinja2TemplateCache
 from pipelex.tools.templating.jinja2_template_category import Jinja2TemplateCategory
+from pipelex.tools.templating.template_library import TemplateLibrary
 from pipelex.tools.templating.templating_models import PromptingStyle, TagStyle, TextFormat
 from tests.pipelex.test_data import Fruit, JINJA2TestCases
 
@@ -91,3 +93,34 @@ class TestRenderJinja2:
         )
         log.verbose(f"Jinja2 rendered Jinja2 for '{topic}' with style '{prompting_style}':\n{jinja2_text}")
         pretty_print(jinja2_text, title="jinja2_text")
+
+
+class TestJinja2TemplateCache:
+    def test_compiled_template_is_cached_until_library_reload(self):
+        template_library = TemplateLibrary()
+        template_library.root["greeting"] = "Hello {{ name }}"
+        jinja2_template_cache = template_library.get_jinja2_template_cache()
+
+        compiled_template = jinja2_template_cache.get_compiled_template(template_category=Jinja2TemplateCategory.LLM_PROMPT, jinja2_name="greeting")
+        assert compiled_template.undeclared_variables == {"name"}
+        assert (
+            jinja2_template_cache.get_compiled_template(template_category=Jinja2TemplateCategory.LLM_PROMPT, jinja2_name="greeting")
+            is compiled_template
+        )
+        assert jinja2_template_cache.get_env(Jinja2TemplateCategory.LLM_PROMPT) is jinja2_template_cache.get_env(Jinja2TemplateCategory.LLM_PROMPT)
+
+        template_library.teardown()
+        template_library.root["greeting"] = "Bye {{ other_name }}"
+        reloaded_template = jinja2_template_cache.get_compiled_template(template_category=Jinja2TemplateCategory.LLM_PROMPT, jinja2_name="greeting")
+        assert reloaded_template is not compiled_template
+        assert reloaded_template.undeclared_variables == {"other_name"}
+
+    def test_lru_eviction(self):
+        jinja2_template_cache = Jinja2TemplateCache(template_provider=TemplateLibrary(), max_size=2)
+        first_template = jinja2_template_cache.get_compiled_template(template_category=Jinja2TemplateCategory.LLM_PROMPT, jinja2="{{ a }}")
+        jinja2_template_cache.get_compiled_template(template_category=Jinja2TemplateCategory.LLM_PROMPT, jinja2="{{ b }}")
+        jinja2_template_cache.get_compiled_template(template_category=Jinja2TemplateCategory.LLM_PROMPT, jinja2="{{ c }}")
+
+        assert (
+            jinja2_template_cache.get_compiled_template(template_category=Jinja2TemplateCategory.LLM_PROMPT, jinja2="{{ a }}") is not first_template
+        )
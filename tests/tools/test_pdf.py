@@ -2,11 +2,34 @@
 # SPDX-License-Identifier: Elastic-2.0
 # "Pipelex" is a trademark of Evotis S.A.S.
 
+import os
+from io import BytesIO
+from typing import List, Tuple
+
 import pytest
+from PIL import Image
 
-from pipelex.tools.pdf.pypdfium2_renderer import pypdfium2_renderer
+from pipelex.tools.pdf.pdf_page_rendering import RenderedPdfPage
+from pipelex.tools.pdf.pypdfium2_renderer import PyPdfium2Renderer, PyPdfium2RendererError, pypdfium2_renderer
 from tests.test_data import PDFTestCases
 
+PAGE_COLORS = ["red", "green", "blue", "white", "black"]
+
+
+def make_pdf_bytes() -> bytes:
+    # at 72 dpi, each page measures as many points as the image has pixels, and the width tells the pages apart
+    pages = [Image.new("RGB", (100 + page_index * 10, 50), color=color) for page_index, color in enumerate(PAGE_COLORS)]
+    buffer = BytesIO()
+    pages[0].save(buffer, format="PDF", save_all=True, append_images=pages[1:], resolution=72)
+    return buffer.getvalue()
+
+
+def get_page_image_size(rendered_page: RenderedPdfPage) -> Tuple[int, int]:
+    assert rendered_page.image_bytes is not None
+    with Image.open(BytesIO(rendered_page.image_bytes)) as image:
+        assert image.format == "PNG"
+        return image.size
+
 
 @pytest.mark.asyncio(loop_scope="class")
 class TestPDF:
@@ -14,3 +37,44 @@ class TestPDF:
     async def test_pdf_path_to_images(self, file_path: str):
         images = await pypdfium2_renderer.render_pdf_pages(file_path)
         assert len(images) > 0
+
+    async def test_pages_are_yielded_in_order_for_a_page_range(self):
+        rendered_pages: List[RenderedPdfPage] = [
+            rendered_page async for rendered_page in pypdfium2_renderer.iter_pdf_pages(pdf_input=make_pdf_bytes(), dpi=144, page_indices=range(1, 4))
+        ]
+        assert [rendered_page.page_index for rendered_page in rendered_pages] == [1, 2, 3]
+        assert [get_page_image_size(rendered_page) for rendered_page in rendered_pages] == [(220, 100), (240, 100), (260, 100)]
+
+    async def test_pages_are_written_to_files(self, tmp_path: str):
+        pdf_path = os.path.join(tmp_path, "doc.pdf")
+        with open(pdf_path, "wb") as pdf_file:
+            pdf_file.write(make_pdf_bytes())
+        output_directory = os.path.join(tmp_path, "pages")
+        async for rendered_page in pypdfium2_renderer.iter_pdf_pages(pdf_input=pdf_path, dpi=72, output_directory=output_directory):
+            assert rendered_page.image_bytes is None
+            assert rendered_page.file_path == os.path.join(output_directory, f"page_{rendered_page.page_index + 1}.png")
+        assert sorted(os.listdir(output_directory)) == [f"page_{page_number}.png" for page_number in range(1, len(PAGE_COLORS) + 1)]
+
+    async def test_page_index_out_of_range_is_rejected(self):
+        with pytest.raises(PyPdfium2RendererError):
+            async for _ in pypdfium2_renderer.iter_pdf_pages(pdf_input=make_pdf_bytes(), page_indices=[len(PAGE_COLORS)]):
+                pass
+
+    async def test_process_pool_renders_the_same_pages(self):
+        pdf_bytes = make_pdf_bytes()
+        in_process_pages = [rendered_page async for rendered_page in pypdfium2_renderer.iter_pdf_pages(pdf_input=pdf_bytes, dpi=72)]
+
+        process_pool_renderer = PyPdfium2Renderer(is_process_pool_enabled=True, max_nb_processes=2, max_nb_pages_in_flight=2)
+        try:
+            process_pool_pages = [rendered_page async for rendered_page in process_pool_renderer.iter_pdf_pages(pdf_input=pdf_bytes, dpi=72)]
+            # the consumer can stop early, the pages in flight are dropped
+            async for rendered_page in process_pool_renderer.iter_pdf_pages(pdf_input=pdf_bytes, dpi=72):
+                assert rendered_page.page_index == 0
+                break
+        finally:
+            process_pool_renderer.teardown()
+
+        assert [get_page_image_size(rendered_page) for rendered_page in process_pool_pages] == [
+            get_page_image_size(rendered_page) for rendered_page in in_process_pages
+        ]
+        assert [rendered_page.page_index for rendered_page in process_pool_pages] == list(range(len(PAGE_COLORS)))